@@ -2,6 +2,7 @@ import time
 import os
 import json
 import logging
+import signal
 from datetime import datetime, timezone, timedelta
 
 from homeside_api import HomeSideAPI
@@ -11,16 +12,20 @@ from thermal_analyzer import ThermalAnalyzer
 from heat_curve_controller import HeatCurveController
 from control_homeside import HomeSideControl
 from seq_logger import SeqLogger
-from customer_profile import CustomerProfile, find_profile_for_client_id
-from temperature_forecaster import TemperatureForecaster
+from customer_profile import CustomerProfile, defer_profile_saves, find_profile_for_client_id, flush_profiles
+from temperature_forecaster import TemperatureForecaster, forecast_signature
 from energy_models.weather_energy_model import SimpleWeatherModel, WeatherConditions
 from gap_filler import fill_gaps_on_startup, run_daily_gap_fill
-from energy_forecaster import EnergyForecaster, format_energy_forecast
+from energy_forecaster import ENSEMBLE_SCENARIOS, EnergyForecaster, format_energy_forecast, update_energy_forecast
+from fleet_energy_forecaster import FLEET_ENERGY_FORECAST
 from k_recalibrator import recalibrate_house
 from energy_importer import EnergyImporter
 from dropbox_client import create_client_from_env
-from weather_sensitivity_learner import WeatherSensitivityLearner
+from weather_sensitivity_learner import WeatherSensitivityLearner, SNAPSHOT_INTERVAL_MINUTES, snapshot_path
 from thermal_inertia_test import ThermalInertiaTest, request_thermal_test, check_thermal_test_approval
+from metrics import get_registry, start_metrics_server
+from stage_profiler import StageProfiler
+from poll_schedule import read_poll_offset
 
 
 def check_data_staleness(influx, settings: dict, logger) -> dict:
@@ -897,12 +902,14 @@ def monitor_heating_system(config):
 
     # Initialize thermal analyzer (with InfluxDB for persistence if available)
     thermal = ThermalAnalyzer(logger, min_samples=24, influx=influx)
-    if influx and thermal.historical_data:
-        print(f"✓ Thermal analyzer initialized ({len(thermal.historical_data)} historical points loaded)")
+    if influx and len(thermal.buffer):
+        print(f"✓ Thermal analyzer initialized ({len(thermal.buffer)} historical points loaded)")
     else:
         print("✓ Thermal analyzer initialized")
 
     # Load customer profile and initialize forecasters
+    # Profile saves during an iteration are coalesced into one write at its end
+    defer_profile_saves()
     customer_profile = None
     forecaster = None
     energy_forecaster = None
@@ -973,7 +980,13 @@ def monitor_heating_system(config):
             timing=customer_profile.learned.thermal_timing,
             logger=logger
         )
-        print(f"✓ Weather sensitivity learner (ML2) initialized")
+        # Warm start from the last snapshot instead of relearning from scratch
+        learner_snapshot = snapshot_path(customer_profile.customer_id)
+        if weather_learner.load_snapshot(learner_snapshot):
+            print(f"✓ Weather sensitivity learner (ML2) initialized "
+                  f"(warm start: {len(weather_learner.observation_buffer)} observations)")
+        else:
+            print(f"✓ Weather sensitivity learner (ML2) initialized")
     else:
         print("⚠ Weather sensitivity learner disabled (requires calibrated k-value)")
 
@@ -1064,6 +1077,12 @@ def monitor_heating_system(config):
     # Cache energy forecast points for preemptive heating reduction
     cached_energy_forecast_points = None
 
+    # What the last forecast update wrote, so the next one only rewrites
+    # points that changed (None = full rewrite)
+    written_weather_signature = None
+    written_forecast_columns = None
+    written_energy_points = None
+
     # Weather model (created when ML curve control is active)
     weather_model = None
 
@@ -1078,6 +1097,9 @@ def monitor_heating_system(config):
     # Track daily task execution (by date)
     daily_task_last_run = {}
 
+    # Track weather learner snapshots (warm start after restart)
+    last_learner_snapshot_time = datetime.now(timezone.utc)
+
     # Show daily task schedule
     daily_tasks = settings.get('daily_tasks', {})
     if daily_tasks:
@@ -1088,11 +1110,25 @@ def monitor_heating_system(config):
             print(f"  - {task_name}: {', '.join(times)} ({status})")
         print()
 
+    # Metrics endpoint (scraped by the orchestrator, disabled when METRICS_PORT unset)
+    metrics = get_registry()
+    start_metrics_server(config.get('metrics_port', 0))
+    poll_duration = metrics.histogram(
+        'homeside_poll_iteration_seconds', 'Duration of one fetch/write poll iteration')
+    poll_failures = metrics.counter(
+        'homeside_poll_failures_total', 'Poll iterations that produced no data')
+
+    # Per-stage timing of each iteration (slow iterations logged with span tree)
+    profiler = StageProfiler(seq_logger=seq_logger, logger=logger, kind='house')
+
     iteration = 0
     try:
         while True:
             iteration += 1
             now = datetime.now(timezone.utc)
+            iteration_start = time.monotonic()
+            profiler.start_iteration(iteration)
+            profiler.stage('fetch')
             print(f"\n--- Data Collection #{iteration} ---")
             if debug_mode:
                 logger.info(f"Starting data collection #{iteration}")
@@ -1185,6 +1221,8 @@ def monitor_heating_system(config):
                         if baseline_supply is not None:
                             extracted_data['supply_temp_heat_curve'] = round(baseline_supply, 2)
 
+                    profiler.stage('weather_observation')
+
                     # =====================================================
                     # WEATHER: Current observations (every iteration)
                     # Uses shared cache for neighbors with same coordinates
@@ -1201,8 +1239,8 @@ def monitor_heating_system(config):
                             cached_obs = influx.read_shared_weather_observation(lat, lon)
                             if cached_obs:
                                 weather_obs_data = cached_obs
-                                # Write to this house's weather_observation even from cache
-                                influx.write_weather_observation(cached_obs)
+                                # Station series already has it - just link this house to the station
+                                influx.write_weather_observation(cached_obs, shared=True)
                                 print(f"\n📦 Weather: {cached_obs['temperature']:.1f}°C (shared cache from {cached_obs['station_name']})")
 
                         # If no cache, fetch from SMHI
@@ -1218,13 +1256,15 @@ def monitor_heating_system(config):
                                     'humidity': weather_obs.humidity,
                                     'timestamp': weather_obs.timestamp
                                 }
-                                # Write to house-specific and shared cache
+                                # Write to the station series and shared cache
                                 if influx:
                                     influx.write_weather_observation(weather_obs_data)
                                     if lat and lon:
                                         influx.write_shared_weather_observation(weather_obs_data, lat, lon)
                                 print(f"\n🌡️ Current Weather: {weather_obs.temperature:.1f}°C (from {weather_obs.station.name})")
 
+                    profiler.stage('effective_temp')
+
                     # =====================================================
                     # EFFECTIVE TEMP: Calculate ML supply temp using effective temperature
                     # Uses shared weather data from cache or fresh SMHI fetch
@@ -1276,6 +1316,8 @@ def monitor_heating_system(config):
                         if current_supply is not None:
                             extracted_data['supply_temp_heat_curve_ml'] = round(current_supply, 2)
 
+                        profiler.stage('curve_control')
+
                         # =====================================================
                         # CURVE CONTROL MODE: Detect transitions & ML control
                         # =====================================================
@@ -1357,6 +1399,8 @@ def monitor_heating_system(config):
                                         ):
                                             last_ml_curve_update = now
 
+                    profiler.stage('thermal_test')
+
                     # =====================================================
                     # Thermal inertia test (active test polling)
                     # =====================================================
@@ -1444,6 +1488,7 @@ def monitor_heating_system(config):
                         extracted_data['curve_control_mode'] = CURVE_MODE_MAP.get(mode, 1)
 
                     # Add data to thermal analyzer for learning
+                    profiler.stage('thermal_learning')
                     thermal.add_data_point(extracted_data)
 
                     # Update forecaster with thermal coefficient from analyzer
@@ -1469,9 +1514,12 @@ def monitor_heating_system(config):
                                 })
 
                     # Write to InfluxDB (includes supply_temp_heat_curve_ml from effective temp)
+                    profiler.stage('influx_write')
                     if influx:
                         influx.write_heating_data(extracted_data)
 
+                    profiler.stage('ml2_learning')
+
                     # =====================================================
                     # WEATHER SENSITIVITY LEARNING (ML2)
                     # Detect solar heating events and learn coefficients
@@ -1612,6 +1660,31 @@ def monitor_heating_system(config):
                             print(f"📈 ML2 thermal timing updated: heat_up={weather_learner.timing.heat_up_lag_minutes_ml2:.0f}min, "
                                   f"cool_down={weather_learner.timing.cool_down_lag_minutes_ml2:.0f}min")
 
+                        # Daily cross-correlation lag estimate over stored history
+                        if influx and weather_learner.lag_correlation_due(now):
+                            timestamps, effective_temps, indoor_temps = influx.read_thermal_lag_series(
+                                days=WeatherSensitivityLearner.LAG_CORRELATION_DAYS)
+                            lag_result = weather_learner.correlate_thermal_lag(
+                                now, timestamps, effective_temps, indoor_temps)
+                            if lag_result:
+                                customer_profile.learned.thermal_timing = weather_learner.timing
+                                customer_profile.save()
+                                influx.write_thermal_timing_ml2(weather_learner.timing.to_dict())
+
+                                print(f"📈 ML2 thermal lag correlation: heat_up={weather_learner.timing.heat_up_lag_minutes_ml2:.0f}min, "
+                                      f"cool_down={weather_learner.timing.cool_down_lag_minutes_ml2:.0f}min "
+                                      f"(correlation {lag_result['correlation']:.2f})")
+
+                        # Periodic learner snapshot
+                        if (now - last_learner_snapshot_time).total_seconds() >= SNAPSHOT_INTERVAL_MINUTES * 60:
+                            try:
+                                weather_learner.save_snapshot(learner_snapshot)
+                                last_learner_snapshot_time = now
+                            except OSError as e:
+                                logger.warning(f"Failed to save learner snapshot: {e}")
+
+                    profiler.stage('forecast')
+
                     # =====================================================
                     # WEATHER: Forecast (every forecast_interval_minutes)
                     # =====================================================
@@ -1636,9 +1709,6 @@ def monitor_heating_system(config):
                                 influx.write_forecast_data(forecast_trend)
 
                                 # Generate and write detailed forecast points for visualization
-                                influx.delete_future_forecasts()  # Delete future temp forecasts (prevents "curtain" effect)
-                                influx.delete_future_weather_forecasts()
-
                                 # Use new forecaster if available, otherwise legacy
                                 if forecaster:
                                     # Get hourly weather forecast - try shared cache first
@@ -1661,51 +1731,91 @@ def monitor_heating_system(config):
                                             influx.write_shared_weather_forecast(hourly_forecast, lat, lon)
                                     if hourly_forecast:
                                         # Store raw weather forecast for historical analysis
-                                        influx.write_weather_forecast_points(hourly_forecast)
+                                        # (points overwrite; only rewritten when SMHI's forecast changed)
+                                        weather_signature = forecast_signature(hourly_forecast)
+                                        if weather_signature != written_weather_signature:
+                                            influx.delete_future_weather_forecasts()
+                                            written_weather_signature = (
+                                                weather_signature
+                                                if influx.write_weather_forecast_points(hourly_forecast) else None
+                                            )
 
                                         # Generate energy forecast if calibrated
-                                        if energy_forecaster:
-                                            influx.delete_future_energy_forecasts()
-                                            energy_points = energy_forecaster.generate_forecast(
-                                                weather_forecast=hourly_forecast,
-                                                current_indoor_temp=extracted_data.get('room_temperature')
+                                        if energy_forecaster and FLEET_ENERGY_FORECAST:
+                                            # Computed for all houses by fleet_energy_forecaster.py
+                                            energy_points = influx.read_energy_forecast_points(hours=forecast_hours)
+                                            if energy_points:
+                                                cached_energy_forecast_points = energy_points
+                                        elif energy_forecaster:
+                                            with profiler.span('energy_forecast'):
+                                                energy_points = energy_forecaster.generate_forecast(
+                                                    weather_forecast=hourly_forecast,
+                                                    current_indoor_temp=extracted_data.get('room_temperature'),
+                                                    scenarios=ENSEMBLE_SCENARIOS
+                                                )
+                                            changed_energy = (
+                                                update_energy_forecast(written_energy_points, energy_points)
+                                                if written_energy_points and energy_points else None
                                             )
+                                            if changed_energy is None:
+                                                # New hours: delete future points first (prevents "curtain" effect)
+                                                influx.delete_future_energy_forecasts()
+                                                written_energy_points = (
+                                                    list(energy_points)
+                                                    if energy_points and influx.write_energy_forecast(energy_points) else None
+                                                )
+                                            elif changed_energy and not influx.write_energy_forecast(changed_energy):
+                                                written_energy_points = None
                                             if energy_points:
                                                 cached_energy_forecast_points = energy_points
-                                                influx.write_energy_forecast(energy_points)
                                                 # Display summary
                                                 summary_24h = energy_forecaster.get_summary(energy_points, hours=24)
                                                 summary_72h = energy_forecaster.get_summary(energy_points, hours=72)
                                                 print(format_energy_forecast(energy_points, summary_24h, summary_72h))
 
-                                        forecast_points = forecaster.generate_forecast(
-                                            current_indoor=extracted_data.get('room_temperature', 22.0),
-                                            current_outdoor=extracted_data.get('outdoor_temperature', 0.0),
-                                            weather_forecast=hourly_forecast,
-                                            heat_curve=heat_curve,
-                                            weather_model=weather_model,
-                                            latitude=config.get('latitude'),
-                                            longitude=config.get('longitude'),
+                                        with profiler.span('temperature_forecast'):
+                                            forecast_columns = forecaster.generate_forecast_columns(
+                                                current_indoor=extracted_data.get('room_temperature', 22.0),
+                                                current_outdoor=extracted_data.get('outdoor_temperature', 0.0),
+                                                weather_forecast=hourly_forecast,
+                                                heat_curve=heat_curve,
+                                                weather_model=weather_model,
+                                                latitude=config.get('latitude'),
+                                                longitude=config.get('longitude'),
+                                            )
+                                        changed_columns = (
+                                            written_forecast_columns.update_from(forecast_columns)
+                                            if written_forecast_columns is not None else None
                                         )
-                                        if forecast_points:
-                                            # Convert to InfluxDB format
-                                            influx_points = [p.to_influx_dict() for p in forecast_points]
-                                            influx.write_forecast_points(influx_points)
+                                        if changed_columns is None:
+                                            # New hours: delete future points first (prevents "curtain" effect)
+                                            influx.delete_future_forecasts()
+                                            written_forecast_columns = (
+                                                forecast_columns
+                                                if len(forecast_columns) and influx.write_forecast_columns(forecast_columns)
+                                                else None
+                                            )
+                                        elif not influx.write_forecast_columns(written_forecast_columns, changed_columns):
+                                            written_forecast_columns = None
 
+                                        if len(forecast_columns):
                                             # Store first indoor prediction for accuracy tracking
-                                            indoor_forecasts = [
-                                                p for p in forecast_points
-                                                if p.forecast_type == 'indoor_temp'
-                                            ]
-                                            if indoor_forecasts:
-                                                first_indoor = indoor_forecasts[0]
-                                                last_indoor_prediction = (
-                                                    first_indoor.timestamp,
-                                                    first_indoor.value,
-                                                    extracted_data.get('outdoor_temperature', 0.0)
-                                                )
+                                            first_time, first_value, _ = forecast_columns.first_indoor()
+                                            last_indoor_prediction = (
+                                                first_time,
+                                                first_value,
+                                                extracted_data.get('outdoor_temperature', 0.0)
+                                            )
+                                    else:
+                                        influx.delete_future_forecasts()
+                                        influx.delete_future_weather_forecasts()
+                                        written_weather_signature = None
+                                        written_forecast_columns = None
                                 else:
-                                    # Legacy forecaster (fallback)
+                                    # Legacy forecaster (fallback), rewrites everything
+                                    influx.delete_future_forecasts()  # Delete future temp forecasts (prevents "curtain" effect)
+                                    influx.delete_future_weather_forecasts()
+
                                     # First store raw weather forecast for historical analysis
                                     # Try shared cache first
                                     hourly_forecast = None
@@ -1727,11 +1837,17 @@ def monitor_heating_system(config):
                                         influx.write_weather_forecast_points(hourly_forecast)
 
                                         # Generate energy forecast if calibrated
-                                        if energy_forecaster:
+                                        if energy_forecaster and FLEET_ENERGY_FORECAST:
+                                            # Computed for all houses by fleet_energy_forecaster.py
+                                            energy_points = influx.read_energy_forecast_points(hours=forecast_hours)
+                                            if energy_points:
+                                                cached_energy_forecast_points = energy_points
+                                        elif energy_forecaster:
                                             influx.delete_future_energy_forecasts()
                                             energy_points = energy_forecaster.generate_forecast(
                                                 weather_forecast=hourly_forecast,
-                                                current_indoor_temp=extracted_data.get('room_temperature')
+                                                current_indoor_temp=extracted_data.get('room_temperature'),
+                                                scenarios=ENSEMBLE_SCENARIOS
                                             )
                                             if energy_points:
                                                 cached_energy_forecast_points = energy_points
@@ -1806,6 +1922,7 @@ def monitor_heating_system(config):
                                 print(f"  Predicted temp: {thermal_rec.get('predicted_temp', 0):.2f}°C")
 
                     # Check if we have enough data for thermal coefficient
+                    profiler.stage('heat_curve_eval')
                     thermal_data = thermal.calculate_thermal_coefficient()
                     if thermal_data and debug_mode:
                         print(f"\n📈 Thermal Learning:")
@@ -1858,6 +1975,7 @@ def monitor_heating_system(config):
                             print(f"\n📉 Heat Curve: No reduction ({curve_recommendation['reason']})")
 
                     # Send consolidated data to Seq
+                    profiler.stage('seq_log')
                     seq_logger.log_data_collection(
                         iteration=iteration,
                         heating_data=extracted_data,
@@ -1883,6 +2001,7 @@ def monitor_heating_system(config):
                     print("✓ Data collection recovered")
                 first_failure_time = None
             else:
+                poll_failures.inc(kind='house')
                 if first_failure_time is None:
                     first_failure_time = now
                     logger.warning("Data collection failed - starting failure tracking")
@@ -1902,6 +2021,7 @@ def monitor_heating_system(config):
                         print(f"⚠ Data collection failed ({failure_duration:.0f}m of consecutive failures)")
 
             # Check and run daily scheduled tasks (energy pipeline)
+            profiler.stage('daily_tasks')
             daily_task_last_run = check_daily_tasks(
                 settings=settings,
                 last_run_dates=daily_task_last_run,
@@ -1911,6 +2031,8 @@ def monitor_heating_system(config):
                 logger=logger
             )
 
+            profiler.stage('dropbox_check')
+
             # Periodic Dropbox import check — picks up new energy files hourly
             # and immediately runs separation + calibration so data is fresh
             if (last_dropbox_check_time is None or
@@ -1925,11 +2047,15 @@ def monitor_heating_system(config):
                 )
                 last_dropbox_check_time = now
                 if imported > 0 and customer_profile:
-                    # Reload profile in case k-value was updated
-                    customer_profile = find_profile_for_client_id(api.clientid, profiles_dir="profiles")
+                    # Re-read k in case the import recalibrated it (write any
+                    # deferred saves first, keep this iteration's learned state)
+                    flush_profiles()
+                    customer_profile.reload_sections("energy_separation")
                     if energy_forecaster and customer_profile.energy_separation.heat_loss_k:
                         energy_forecaster.heat_loss_k = customer_profile.energy_separation.heat_loss_k
 
+            profiler.stage('recalibration')
+
             # Check if k-value recalibration is due (every 72h) - fallback if daily pipeline hasn't run
             if (recalibration_enabled and customer_profile and
                 customer_profile.energy_separation.enabled and
@@ -1949,8 +2075,9 @@ def monitor_heating_system(config):
                     )
                     if result:
                         old_k = customer_profile.energy_separation.heat_loss_k
-                        # Reload profile to get updated k
-                        customer_profile = find_profile_for_client_id(api.clientid, profiles_dir="profiles")
+                        # Re-read the updated k (the recalibrator saved its own profile object)
+                        flush_profiles()
+                        customer_profile.reload_sections("energy_separation")
                         new_k = customer_profile.energy_separation.heat_loss_k
                         print(f"✓ k-value recalibrated: {old_k:.4f} → {new_k:.4f} kW/°C")
                         print(f"  ({result.days_used} days, {result.confidence:.0%} confidence)")
@@ -1966,6 +2093,8 @@ def monitor_heating_system(config):
                     print(f"⚠ Recalibration error: {e}")
                     last_recalibration_time = now  # Don't retry immediately
 
+            profiler.stage('thermal_test_schedule')
+
             # =====================================================
             # Thermal inertia test: nightly scheduling + approval check
             # =====================================================
@@ -1975,9 +2104,7 @@ def monitor_heating_system(config):
                 # Reload profile from disk to pick up web GUI changes (e.g., approval click)
                 if customer_profile.thermal_test.status == "pending_approval":
                     try:
-                        from customer_profile import CustomerProfile
-                        fresh = CustomerProfile.load(customer_profile.customer_id, "profiles")
-                        customer_profile.thermal_test = fresh.thermal_test
+                        customer_profile.reload_sections("thermal_test")
                     except Exception:
                         pass
 
@@ -2068,6 +2195,12 @@ def monitor_heating_system(config):
                     if result == "expired":
                         logger.info("Thermal test request expired (no response)")
 
+            # Write this iteration's profile changes (one write, merged with GUI edits)
+            flush_profiles()
+
+            poll_duration.observe(time.monotonic() - iteration_start, kind='house')
+            profiler.end_iteration()
+
             # Re-read interval from settings.json (live reload — no restart needed)
             settings = load_settings()
             new_interval = settings.get('data_collection', {}).get('heating_data_interval_minutes', 5)
@@ -2075,6 +2208,12 @@ def monitor_heating_system(config):
                 print(f"⚙ Poll interval changed: {interval_minutes} → {new_interval} min")
                 interval_minutes = new_interval
 
+            # Pick up rebalanced slot from the orchestrator's poll schedule
+            new_offset = read_poll_offset(poll_offset)
+            if new_offset != poll_offset:
+                print(f"⚙ Poll offset changed: {poll_offset}s → {new_offset}s")
+                poll_offset = new_offset
+
             # Wait until next scheduled interval (fixed schedule, not relative)
             now = datetime.now(timezone.utc)
             # Calculate seconds until next interval boundary + per-house offset
@@ -2100,16 +2239,32 @@ def monitor_heating_system(config):
         logger.error(f"Unexpected error ({type(e).__name__}): {str(e)}")
         print(f"Unexpected error: {e}")
     finally:
+        # Snapshot learner state so the next start resumes where this one stopped
+        if weather_learner:
+            try:
+                weather_learner.save_snapshot(learner_snapshot)
+            except OSError as e:
+                logger.warning(f"Failed to save learner snapshot: {e}")
+
         # Exit ML curve control gracefully (restore original Yref)
         if ml_curve_control and customer_profile and customer_profile.heat_curve_control.in_control:
             print("Restoring original Yref before shutdown...")
             ml_curve_control.exit_ml_control(reason="shutdown")
 
+        flush_profiles()
+
         # Cleanup resources
         api.cleanup()
+        seq_logger.close()
 
 
-if __name__ == "__main__":
+def _stop_on_sigterm(signum, _frame):
+    """SIGTERM (orchestrator stop) -> KeyboardInterrupt, so finally blocks and atexit hooks run."""
+    raise KeyboardInterrupt
+
+
+def main():
+    """Entry point: build config from environment variables and start monitoring."""
     # Load configuration from environment variables
     config = {
         'session_token': os.getenv('HOMESIDE_SESSION_TOKEN'),
@@ -2132,6 +2287,7 @@ if __name__ == "__main__":
         'longitude': float(os.getenv('LONGITUDE')) if os.getenv('LONGITUDE') else None,
         'heat_curve_enabled': os.getenv('HEAT_CURVE_ENABLED', 'false').lower() == 'true',
         'poll_offset_seconds': int(os.getenv('POLL_OFFSET_SECONDS', '0')),
+        'metrics_port': int(os.getenv('METRICS_PORT', '0')),
     }
 
     # Validate required config
@@ -2156,4 +2312,9 @@ if __name__ == "__main__":
     else:
         print("✓ Client ID will be auto-discovered after login")
 
+    signal.signal(signal.SIGTERM, _stop_on_sigterm)
     monitor_heating_system(config)
+
+
+if __name__ == "__main__":
+    main()
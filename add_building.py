@@ -93,6 +93,8 @@ def main():
                         help='Import 90 days of historical data after setup')
     parser.add_argument('--bootstrap-days', type=int, default=90,
                         help='Days of historical data to bootstrap')
+    parser.add_argument('--refresh-catalog', action='store_true',
+                        help='Ignore the cached Arrigo signal catalog and rediscover')
     parser.add_argument('--verbose', '-v', action='store_true')
     args = parser.parse_args()
 
@@ -158,7 +160,7 @@ def main():
 
     # Step 2: Full discovery via discover_building()
     print(f"\n2. Discovering building signals...")
-    config = client.discover_building()
+    config = client.discover_building(use_cache=not args.refresh_catalog)
 
     # Override/set fields from user input
     config["building_id"] = building_id
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Alarm Tracker
+Turns successive Arrigo alarm snapshots into state-change events.
+
+The building fetcher used to fetch the full alarm list every poll and store
+only per-status counts. The tracker remembers each alarm's last status and
+emits an AlarmEvent when it changes:
+
+    raised        new alarm (or noOfAlarms went up) in ALARMED
+    returned      signal back to normal, not yet acknowledged
+    acknowledged  acknowledged by an operator
+    blocked       alarm blocked
+    cleared       alarm no longer listed by Arrigo
+
+Events carry the alarm id and how long the alarm had been active. The full
+list is only fetched when the per-status counts change (one small query per
+poll) or every alarm_monitoring.poll_interval_minutes.
+
+State file: <ALARM_STATE_DIR>/<building_id>.json, so a restart doesn't
+re-raise every active alarm.
+
+Usage:
+    tracker = AlarmTracker.load('TE236_HEM_Kontor')
+    if tracker.due(now, client.get_alarm_counts(), interval_minutes=15):
+        events = tracker.update(client.get_alarms(first=100, strict=True), now, complete=True)
+        tracker.save()
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from arrigo_api import BUILDINGS_DIR
+
+
+ALARM_STATE_DIR = os.getenv('ALARM_STATE_DIR', os.path.join(BUILDINGS_DIR, 'alarm_state'))
+ALARM_FETCH_LIMIT = 100              # alarms per full fetch (newest eventTime first)
+DEFAULT_FULL_FETCH_MINUTES = 15      # full list cadence when counts don't change
+
+STATUS_EVENTS = {
+    'ALARMED': 'raised',
+    'RETURNED': 'returned',
+    'ACKNOWLEDGED': 'acknowledged',
+    'BLOCKED': 'blocked',
+}
+
+
+def _parse_time(value) -> Optional[datetime]:
+    """Arrigo timestamp (ISO string) -> aware datetime, None if missing/unparseable."""
+    if not value:
+        return None
+    try:
+        ts = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts
+
+
+@dataclass
+class AlarmEvent:
+    """One alarm state change."""
+    alarm_id: str
+    event: str                  # raised / returned / acknowledged / blocked / cleared
+    status: str                 # new Arrigo status ('' when cleared)
+    previous_status: str        # '' when raised for the first time
+    timestamp: datetime
+    name: str = ''
+    text: str = ''
+    priority: str = ''
+    duration_seconds: Optional[float] = None   # since the alarm was raised
+
+
+class AlarmTracker:
+    """Last known status per alarm for one building."""
+
+    def __init__(self, building_id: str, directory: str = None):
+        self.building_id = building_id
+        self.path = os.path.join(directory or ALARM_STATE_DIR, f"{building_id}.json")
+        # alarm_id -> {status, raised_at, count, name, text, priority}
+        self.alarms: Dict[str, dict] = {}
+        self.initialized = False          # False until the first snapshot is seen
+        self.last_fetch: Optional[datetime] = None
+        self.last_counts: Optional[Dict[str, int]] = None
+        self.dirty = False
+
+    # ── Persistence ──────────────────────────────────────────────────
+
+    @classmethod
+    def load(cls, building_id: str, directory: str = None) -> 'AlarmTracker':
+        """Load tracker state from disk (empty tracker if missing or unreadable)."""
+        tracker = cls(building_id, directory)
+        try:
+            with open(tracker.path) as f:
+                data = json.load(f)
+            tracker.alarms = data.get('alarms', {})
+            tracker.initialized = True
+        except (OSError, ValueError):
+            pass
+        return tracker
+
+    def save(self) -> None:
+        """Write state atomically (only if something changed)."""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        data = {
+            'building_id': self.building_id,
+            'updated_at': datetime.now(timezone.utc).isoformat(),
+            'alarms': self.alarms,
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.write('\n')
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def rollback(self) -> None:
+        """
+        Forget changes since the last save (e.g. the events could not be
+        written), so the next fetch diffs against the saved state again.
+        """
+        saved = AlarmTracker.load(self.building_id, os.path.dirname(self.path))
+        self.alarms = saved.alarms
+        self.initialized = saved.initialized
+        self.last_fetch = None
+        self.last_counts = None
+        self.dirty = False
+
+    # ── Scheduling ───────────────────────────────────────────────────
+
+    def due(self, now: datetime, counts: Optional[Dict[str, int]],
+            interval_minutes: float = DEFAULT_FULL_FETCH_MINUTES) -> bool:
+        """
+        True if the full alarm list should be fetched now: first poll, the
+        per-status counts changed, or interval_minutes since the last fetch.
+        """
+        if self.last_fetch is None:
+            return True
+        if counts is not None and counts != self.last_counts:
+            return True
+        return now - self.last_fetch >= timedelta(minutes=interval_minutes)
+
+    # ── Diffing ──────────────────────────────────────────────────────
+
+    def update(self, alarms: List[dict], now: datetime, complete: bool = True,
+               counts: Optional[Dict[str, int]] = None) -> List[AlarmEvent]:
+        """
+        Diff a snapshot against the known state.
+
+        Args:
+            alarms: Alarm dicts from ArrigoAPI.get_alarms()
+            now: Poll time (used for cleared events and unknown event times)
+            complete: The snapshot lists every alarm - only then are missing
+                alarms reported as cleared (a truncated list may just have
+                pushed old alarms out)
+            counts: Per-status counts probed with this fetch
+
+        Returns:
+            State-change events, oldest first. The very first snapshot of a
+            building only records a baseline and returns no events.
+        """
+        self.last_fetch = now
+        self.last_counts = counts
+        baseline = not self.initialized
+        self.initialized = True
+        if baseline:
+            self.dirty = True
+
+        events = []
+        seen = set()
+        for alarm in alarms:
+            alarm_id = alarm.get('id')
+            if not alarm_id:
+                continue
+            seen.add(alarm_id)
+            status = alarm.get('status') or 'UNKNOWN'
+            count = alarm.get('noOfAlarms') or 0
+            event_time = _parse_time(alarm.get('eventTime')) or now
+            known = self.alarms.get(alarm_id)
+
+            if known is None:
+                raised_at = _parse_time(alarm.get('alarmTime')) or event_time
+                self.alarms[alarm_id] = {
+                    'status': status,
+                    'raised_at': raised_at.isoformat(),
+                    'count': count,
+                    'name': alarm.get('name') or '',
+                    'text': alarm.get('alarmText') or '',
+                    'priority': str(alarm.get('priority') or ''),
+                }
+                self.dirty = True
+                if not baseline:
+                    events.append(self._event(alarm_id, STATUS_EVENTS.get(status, 'raised'),
+                                              status, '', event_time))
+                continue
+
+            previous = known['status']
+            reraised = status == 'ALARMED' and count > known.get('count', 0)
+            if status == previous and not reraised:
+                continue
+
+            if reraised or (status == 'ALARMED' and previous != 'ALARMED'):
+                known['raised_at'] = (_parse_time(alarm.get('alarmTime')) or event_time).isoformat()
+            known['status'] = status
+            known['count'] = count
+            self.dirty = True
+            events.append(self._event(alarm_id, STATUS_EVENTS.get(status, status.lower()),
+                                      status, previous, event_time))
+
+        if complete:
+            for alarm_id in [a for a in self.alarms if a not in seen]:
+                previous = self.alarms[alarm_id]['status']
+                if not baseline:
+                    events.append(self._event(alarm_id, 'cleared', '', previous, now))
+                del self.alarms[alarm_id]
+                self.dirty = True
+
+        events.sort(key=lambda e: e.timestamp)
+        return events
+
+    def _event(self, alarm_id: str, event: str, status: str, previous: str,
+               timestamp: datetime) -> AlarmEvent:
+        known = self.alarms.get(alarm_id, {})
+        raised_at = _parse_time(known.get('raised_at'))
+        duration = None
+        if raised_at is not None and event != 'raised':
+            duration = max(0.0, (timestamp - raised_at).total_seconds())
+        return AlarmEvent(
+            alarm_id=alarm_id,
+            event=event,
+            status=status,
+            previous_status=previous,
+            timestamp=timestamp,
+            name=known.get('name', ''),
+            text=known.get('text', ''),
+            priority=known.get('priority', ''),
+            duration_seconds=duration,
+        )
+
+    def active_count(self) -> int:
+        return sum(1 for a in self.alarms.values() if a['status'] == 'ALARMED')
@@ -39,12 +39,23 @@ import json
 import re
 import time
 import logging
+import threading
 import argparse
 import requests
 import base64
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple
 
+from metrics import instrument_session, record_request_error
+
+CATALOG_REFRESH_SECONDS = 6 * 3600   # max age of the cached signal catalog
+DISCOVERY_PAGE_SIZE = 500            # analogs per discovery page
+DISCOVERY_CONCURRENCY = 4            # parallel page requests when cursors allow it
+TARGETED_REJECT_LIMIT = 3            # consecutive rejected analog(id:) queries before giving up on them
+TARGETED_RETRY_SECONDS = 3600        # re-probe analog(id:) this long after giving up
+ALARM_STATUSES = ('ALARMED', 'RETURNED', 'ACKNOWLEDGED', 'BLOCKED')
 
 # ── Auto-categorization rules for signal names ──────────────────────
 # Maps signal name patterns to categories.
@@ -90,6 +101,28 @@ CATEGORY_RULES = [
 ]
 
 
+def catalog_hash(signal_map: dict) -> str:
+    """Content hash of a signal catalog (ids, names, units — not live values)."""
+    entries = sorted((signal_id, info.get('name', ''), info.get('unit', ''))
+                     for signal_id, info in signal_map.items())
+    return hashlib.sha256(json.dumps(entries, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def _offset_cursors(end_cursor: str, fetched: int, total: int, page_size: int) -> Optional[List[str]]:
+    """
+    Cursors for the remaining pages when the server uses offset-based Relay
+    cursors (base64 "arrayconnection:<index>"); None if cursors are opaque.
+    """
+    try:
+        prefix, _, index = base64.b64decode(end_cursor).decode('utf-8').rpartition(':')
+        if prefix != 'arrayconnection' or int(index) != fetched - 1:
+            return None
+    except Exception:
+        return None
+    return [base64.b64encode(f'arrayconnection:{start - 1}'.encode('utf-8')).decode('ascii')
+            for start in range(fetched, total, page_size)]
+
+
 def categorize_signal(signal_name: str) -> str:
     """Auto-categorize a signal based on its name pattern."""
     # Extract the variable part after the device prefix
@@ -116,7 +149,7 @@ class ArrigoAPI:
     """
 
     def __init__(self, host: str, username: str, password: str,
-                 logger=None, verbose: bool = False):
+                 logger=None, verbose: bool = False, catalog_path: str = None):
         """
         Args:
             host: Arrigo server hostname (e.g., "exodrift05.systeminstallation.se")
@@ -124,6 +157,8 @@ class ArrigoAPI:
             password: Arrigo password
             logger: Optional Python logger
             verbose: Print debug output
+            catalog_path: Signal catalog cache file
+                (default: buildings/catalogs/<host>__<username>.json)
         """
         self.host = host
         self.base_url = f"https://{host}"
@@ -148,6 +183,7 @@ class ArrigoAPI:
             "Content-Type": "application/json",
             "Accept": "application/json",
         })
+        instrument_session(self.session, 'arrigo')
 
         # Building structure (discovered via folder queries)
         self.account_id = None      # Base64 encoded account ID
@@ -159,6 +195,29 @@ class ArrigoAPI:
         # Reverse: field_name -> signal_id
         self.field_to_signal = {}
 
+        # Signal catalog cache (signal_map) bookkeeping
+        self.catalog_path = catalog_path or get_catalog_path(host, username)
+        self.catalog_hash = None            # sha256 of signal ids/names/units
+        self.catalog_refreshed_at = None    # monotonic time of last discover_signals()
+        self._catalog_thread = None
+        # Whether the server accepts per-ID analog(id:) queries (None = not probed yet)
+        self._targeted_supported = None
+        self._targeted_rejections = 0           # consecutive GraphQL-error responses
+        self._targeted_rejected_at = None       # monotonic time _targeted_supported became False
+        # Whether the server supports alarms { totalCount } (None = not probed yet)
+        self._alarm_count_supported = None
+        # Per-thread: the background catalog refresh and the poll thread query concurrently
+        self._call_state = threading.local()
+
+    @property
+    def last_graphql_errors(self) -> Optional[list]:
+        """GraphQL errors of this thread's most recent query (None if it had none)."""
+        return getattr(self._call_state, 'graphql_errors', None)
+
+    @last_graphql_errors.setter
+    def last_graphql_errors(self, errors: Optional[list]) -> None:
+        self._call_state.graphql_errors = errors
+
     def log(self, message: str):
         if self.verbose:
             print(f"  [DEBUG] {message}")
@@ -258,6 +317,7 @@ class ArrigoAPI:
         payload = {'query': query}
         if variables:
             payload['variables'] = variables
+        self.last_graphql_errors = None
 
         try:
             response = self.session.post(
@@ -285,15 +345,18 @@ class ArrigoAPI:
             result = response.json()
 
             if 'errors' in result:
+                self.last_graphql_errors = result['errors']
                 self.logger.error(f"GraphQL errors: {result['errors']}")
                 return None
 
             return result.get('data')
 
-        except requests.exceptions.Timeout:
+        except requests.exceptions.Timeout as e:
+            record_request_error('arrigo', e)
             self.logger.error("GraphQL query timed out")
             return None
         except requests.exceptions.RequestException as e:
+            record_request_error('arrigo', e)
             self.logger.error(f"GraphQL request failed: {e}")
             return None
 
@@ -369,54 +432,321 @@ class ArrigoAPI:
         """
         self.logger.debug("Discovering analog signals...")
 
-        query = '''
-        {
-            analogs(first: 500) {
-                totalCount
-                items {
-                    id
-                    name
-                    value
-                    unit
-                }
-            }
-        }
-        '''
-
-        data = self._graphql(query, timeout=120)
-        if not data or 'analogs' not in data:
+        result = self._fetch_all_analogs()
+        if result is None:
             self.logger.error("Could not discover analog signals")
             return False
+        items, total = result
 
-        items = data['analogs'].get('items', [])
-        total = data['analogs'].get('totalCount', 0)
-
-        self.signal_map = {}
-        self.field_to_signal = {}
-
+        # Build into a new dict and swap, so a background refresh never
+        # exposes a half-filled catalog to the poll loop
+        signal_map = {}
         for item in items:
             signal_id = item['id']
             signal_name = item.get('name', '')
             value = item.get('value')
             unit = item.get('unit', '')
 
-            self.signal_map[signal_id] = {
+            signal_map[signal_id] = {
                 'name': signal_name,
                 'unit': unit,
                 'current_value': value,
             }
 
-            # Decode base64 ID for readable reference
-            try:
-                decoded_id = base64.b64decode(signal_id).decode('utf-8')
-            except Exception:
-                decoded_id = signal_id
+            if self.verbose:
+                # Decode base64 ID for readable reference
+                try:
+                    decoded_id = base64.b64decode(signal_id).decode('utf-8')
+                except Exception:
+                    decoded_id = signal_id
+                self.log(f"  Signal: {signal_name} = {value} {unit} (id: {decoded_id})")
 
-            self.log(f"  Signal: {signal_name} = {value} {unit} (id: {decoded_id})")
+        self.signal_map = signal_map
+        self.field_to_signal = {}
+        self.catalog_refreshed_at = time.monotonic()
 
+        if len(signal_map) < total:
+            self.logger.warning(f"Discovered only {len(signal_map)} of {total} analog signals")
         self.logger.debug(f"Discovered {total} analog signals, mapped {len(self.signal_map)}")
+
+        content_hash = catalog_hash(signal_map)
+        if content_hash != self.catalog_hash:
+            if self.catalog_hash:
+                self.logger.info(f"Signal catalog changed ({self.catalog_hash[:12]} → {content_hash[:12]})")
+            self.catalog_hash = content_hash
+            self.save_catalog()
+        else:
+            self._touch_catalog()
         return True
 
+    def _fetch_all_analogs(self, fields: str = 'id name value unit') -> Optional[Tuple[List[dict], int]]:
+        """
+        Fetch every analog signal using cursor pagination.
+
+        The first page gives totalCount and the first cursor. When cursors are
+        offset-based (Relay "arrayconnection:<n>"), the remaining pages are
+        fetched concurrently; otherwise they are followed one by one.
+
+        Args:
+            fields: Item fields to select (must include id)
+
+        Returns:
+            (items, totalCount), or None if the first page failed
+        """
+        page = self._fetch_analogs_page(None, fields)
+        if page is None:
+            return None
+
+        items = list(page.get('items') or [])
+        total = page.get('totalCount') or len(items)
+        page_info = page.get('pageInfo') or {}
+        cursor = page_info.get('endCursor')
+
+        if page_info.get('hasNextPage') and cursor:
+            cursors = _offset_cursors(cursor, len(items), total, DISCOVERY_PAGE_SIZE)
+            pages = None
+            if cursors:
+                with ThreadPoolExecutor(max_workers=DISCOVERY_CONCURRENCY) as executor:
+                    pages = list(executor.map(
+                        lambda after: self._fetch_analogs_page(after, fields), cursors))
+                if any(p is None for p in pages):
+                    self.logger.warning("Concurrent signal page fetch failed, paging sequentially")
+                    pages = None
+            if pages is not None:
+                for p in pages:
+                    items.extend(p.get('items') or [])
+            else:
+                while cursor:
+                    p = self._fetch_analogs_page(cursor, fields)
+                    if p is None:
+                        break
+                    items.extend(p.get('items') or [])
+                    info = p.get('pageInfo') or {}
+                    cursor = info.get('endCursor') if info.get('hasNextPage') else None
+
+        # Drop duplicates (pages can shift if signals are added mid-discovery)
+        seen = set()
+        unique = []
+        for item in items:
+            if item['id'] not in seen:
+                seen.add(item['id'])
+                unique.append(item)
+        return unique, total
+
+    def _fetch_analogs_page(self, after: Optional[str],
+                            fields: str = 'id name value unit') -> Optional[dict]:
+        """One page of the analogs connection (None on error)."""
+        query = '''
+        query Analogs($first: Int!, $after: String) {
+            analogs(first: $first, after: $after) {
+                totalCount
+                pageInfo {
+                    hasNextPage
+                    endCursor
+                }
+                items {
+                    %s
+                }
+            }
+        }
+        ''' % fields
+
+        variables = {'first': DISCOVERY_PAGE_SIZE}
+        if after:
+            variables['after'] = after
+        data = self._graphql(query, variables, timeout=120)
+        if not data or 'analogs' not in data:
+            return None
+        return data['analogs']
+
+    # ── Signal catalog cache (on disk) ───────────────────────────────
+
+    def save_catalog(self) -> bool:
+        """
+        Write the signal catalog to catalog_path (atomic write + rename).
+
+        Returns:
+            True if written
+        """
+        if not self.catalog_path or not self.signal_map:
+            return False
+        data = {
+            'host': self.host,
+            'username': self.username,
+            'discovered_at': datetime.now(timezone.utc).isoformat(),
+            'content_hash': self.catalog_hash or catalog_hash(self.signal_map),
+            'signal_count': len(self.signal_map),
+            'signals': self.signal_map,
+        }
+        try:
+            os.makedirs(os.path.dirname(self.catalog_path), exist_ok=True)
+            tmp_path = f"{self.catalog_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+            os.replace(tmp_path, self.catalog_path)
+            return True
+        except OSError as e:
+            self.logger.warning(f"Could not save signal catalog: {e}")
+            return False
+
+    def _touch_catalog(self):
+        """Mark an unchanged on-disk catalog as fresh (its mtime is the catalog age)."""
+        if self.catalog_path and os.path.exists(self.catalog_path):
+            try:
+                os.utime(self.catalog_path)
+            except OSError:
+                pass
+
+    def load_catalog(self, max_age: float = None) -> bool:
+        """
+        Load the signal catalog from catalog_path, so polling can start
+        without a discovery round-trip.
+
+        Args:
+            max_age: Ignore the cached catalog if older than this (seconds)
+
+        Returns:
+            True if a valid catalog was loaded
+        """
+        if not self.catalog_path or not os.path.exists(self.catalog_path):
+            return False
+        try:
+            age = max(0.0, time.time() - os.path.getmtime(self.catalog_path))
+            if max_age is not None and age > max_age:
+                return False
+            with open(self.catalog_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not load signal catalog: {e}")
+            return False
+
+        signals = data.get('signals') or {}
+        if not signals or catalog_hash(signals) != data.get('content_hash'):
+            self.logger.warning(f"Ignoring corrupt signal catalog {self.catalog_path}")
+            return False
+
+        self.signal_map = signals
+        self.field_to_signal = {}
+        self.catalog_hash = data['content_hash']
+        self.catalog_refreshed_at = time.monotonic() - age
+        self.logger.debug(f"Loaded {len(signals)} signals from catalog (age {age / 3600:.1f}h)")
+        return True
+
+    def catalog_age(self) -> Optional[float]:
+        """Seconds since the signal catalog was last refreshed (None = never)."""
+        if self.catalog_refreshed_at is None:
+            return None
+        return time.monotonic() - self.catalog_refreshed_at
+
+    def refresh_catalog_if_stale(self, max_age: float = CATALOG_REFRESH_SECONDS,
+                                 background: bool = True) -> bool:
+        """
+        Re-run discover_signals() when the cached catalog is older than max_age.
+
+        Args:
+            max_age: Maximum catalog age in seconds
+            background: Refresh in a daemon thread instead of blocking the caller
+
+        Returns:
+            True if a refresh was started (or completed, when not in background)
+        """
+        age = self.catalog_age()
+        if age is not None and age < max_age:
+            return False
+        if self._catalog_thread is not None and self._catalog_thread.is_alive():
+            return False
+        if not background:
+            return self.discover_signals()
+        self._catalog_thread = threading.Thread(
+            target=self.discover_signals, name='arrigo-catalog-refresh', daemon=True)
+        self._catalog_thread.start()
+        return True
+
+    def get_current_values(self, signal_ids: List[str]) -> Dict[str, Optional[float]]:
+        """
+        Fetch current values for only the given analog signals.
+
+        Uses one aliased GraphQL query with an analog(id:) lookup per signal.
+        If the server rejects per-ID lookups, falls back to a slim analogs
+        query (id and value only, paged) filtered client-side. After
+        TARGETED_REJECT_LIMIT consecutive rejections per-ID lookups are
+        skipped, and re-probed every TARGETED_RETRY_SECONDS. The cached
+        catalog's current_value is updated as a side effect.
+
+        Args:
+            signal_ids: Base64-encoded signal IDs
+
+        Returns:
+            Dict of signal_id -> value for every signal the server returned,
+            or empty dict on error
+        """
+        if not signal_ids:
+            return {}
+
+        values = None
+        rejected = False
+        if (self._targeted_supported is not False
+                or time.monotonic() - self._targeted_rejected_at >= TARGETED_RETRY_SECONDS):
+            values = self._fetch_targeted_values(signal_ids)
+            if values is not None:
+                if self._targeted_supported is False:
+                    self.logger.info("Server accepts analog(id:) queries again")
+                self._targeted_supported = True
+                self._targeted_rejections = 0
+            elif self.last_graphql_errors:
+                # Could be transient: only give up after repeated rejections
+                rejected = True
+                self._targeted_rejections += 1
+                if self._targeted_supported is False:
+                    self._targeted_rejected_at = time.monotonic()
+                elif self._targeted_rejections >= TARGETED_REJECT_LIMIT:
+                    self._targeted_supported = False
+                    self._targeted_rejected_at = time.monotonic()
+                    self.logger.warning("Server rejected analog(id:) queries, "
+                                        "using slim analogs query for current values")
+
+        if values is None and (rejected or self._targeted_supported is False):
+            values = self._fetch_slim_values(signal_ids)
+
+        if not values:
+            return {}
+
+        for signal_id, value in values.items():
+            if signal_id in self.signal_map:
+                self.signal_map[signal_id]['current_value'] = value
+        return values
+
+    def _fetch_targeted_values(self, signal_ids: List[str]) -> Optional[Dict[str, Optional[float]]]:
+        """Aliased analog(id:) query for just the requested signals."""
+        params = ', '.join(f'$id{i}: ID!' for i in range(len(signal_ids)))
+        fields = '\n'.join(f'    s{i}: analog(id: $id{i}) {{ value }}'
+                          for i in range(len(signal_ids)))
+        query = f'query CurrentValues({params}) {{\n{fields}\n}}'
+        variables = {f'id{i}': signal_id for i, signal_id in enumerate(signal_ids)}
+
+        data = self._graphql(query, variables, timeout=30)
+        if data is None:
+            return None
+
+        values = {}
+        for i, signal_id in enumerate(signal_ids):
+            node = data.get(f's{i}')
+            if node is not None:
+                values[signal_id] = node.get('value')
+        return values
+
+    def _fetch_slim_values(self, signal_ids: List[str]) -> Optional[Dict[str, Optional[float]]]:
+        """Fallback: id/value for all analogs (all pages), filtered to the requested signals."""
+        result = self._fetch_all_analogs(fields='id value')
+        if result is None:
+            return None
+
+        items, _ = result
+        wanted = set(signal_ids)
+        return {item['id']: item.get('value')
+                for item in items
+                if item['id'] in wanted}
+
     def discover_digital_signals(self) -> dict:
         """
         Discover available digital (on/off) signals.
@@ -466,13 +796,15 @@ class ArrigoAPI:
 
     # ── Alarms ───────────────────────────────────────────────────────
 
-    def get_alarms(self, status: List[str] = None, first: int = 50) -> List[dict]:
+    def get_alarms(self, status: List[str] = None, first: int = 50,
+                   strict: bool = False) -> Optional[List[dict]]:
         """
         Fetch alarms, optionally filtered by status.
 
         Args:
             status: List of statuses to filter: ALARMED, RETURNED, ACKNOWLEDGED, BLOCKED
             first: Max number of alarms to return
+            strict: Return None instead of an empty list when the query fails
 
         Returns:
             List of alarm dicts
@@ -516,7 +848,7 @@ class ArrigoAPI:
 
         data = self._graphql(query, variables)
         if not data or 'alarms' not in data:
-            return []
+            return None if strict else []
 
         alarms = []
         for edge in data['alarms'].get('edges', []):
@@ -525,6 +857,37 @@ class ArrigoAPI:
 
         return alarms
 
+    def get_alarm_counts(self) -> Optional[Dict[str, int]]:
+        """
+        Number of alarms per status, in one small query.
+
+        Cheap enough to run every poll: the alarm list itself only needs
+        fetching when these counts change. If the server does not support
+        totalCount on alarms, the probe result is remembered and None is
+        returned from then on.
+
+        Returns:
+            Dict of status -> count, or None if unavailable
+        """
+        if self._alarm_count_supported is False:
+            return None
+
+        statuses = ALARM_STATUSES
+        fields = '\n'.join(
+            f'    {status.lower()}: alarms(first: 1, filter: {{ status: [{status}] }}) {{ totalCount }}'
+            for status in statuses)
+        data = self._graphql(f'{{\n{fields}\n}}', timeout=30)
+        if data is None:
+            if self._alarm_count_supported is None and self.last_graphql_errors:
+                self._alarm_count_supported = False
+                self.logger.warning("Server rejected alarms totalCount, "
+                                    "alarm list is fetched on its own cadence only")
+            return None
+
+        self._alarm_count_supported = True
+        return {status: (data.get(status.lower()) or {}).get('totalCount') or 0
+                for status in statuses}
+
     # ── Historical Data ──────────────────────────────────────────────
 
     def fetch_analog_history(
@@ -692,10 +1055,14 @@ class ArrigoAPI:
 
     # ── Building Config Discovery ────────────────────────────────────
 
-    def discover_building(self) -> dict:
+    def discover_building(self, use_cache: bool = True) -> dict:
         """
         Full discovery: folders, analog signals, digital signals, alarms.
 
+        Args:
+            use_cache: Reuse the on-disk signal catalog if it is fresher than
+                CATALOG_REFRESH_SECONDS instead of re-discovering analogs
+
         Returns a complete building inventory dict suitable for saving
         as a building config file.
         """
@@ -707,7 +1074,10 @@ class ArrigoAPI:
         self.discover_folders()
 
         # Analog signals
-        self.discover_signals()
+        if use_cache and self.load_catalog(max_age=CATALOG_REFRESH_SECONDS):
+            print(f"  Using cached signal catalog ({len(self.signal_map)} analog signals)")
+        else:
+            self.discover_signals()
 
         # Digital signals
         digital_map = self.discover_digital_signals()
@@ -846,6 +1216,15 @@ class ArrigoAPI:
 BUILDINGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'buildings')
 
 
+CATALOG_DIR = os.path.join(BUILDINGS_DIR, 'catalogs')
+
+
+def get_catalog_path(host: str, username: str) -> str:
+    """Signal catalog cache file for an Arrigo host/user (what the user can see)."""
+    safe = re.sub(r'[^A-Za-z0-9_.-]', '_', f"{host}__{username}")
+    return os.path.join(CATALOG_DIR, f"{safe}.json")
+
+
 def get_building_config_path(building_id: str) -> str:
     """Get the file path for a building config."""
     return os.path.join(BUILDINGS_DIR, f"{building_id}.json")
@@ -959,6 +1338,8 @@ Examples:
     # Modes
     parser.add_argument('--discover', action='store_true',
                         help='Discover all signals and generate building config file')
+    parser.add_argument('--refresh-catalog', action='store_true',
+                        help='Ignore the cached signal catalog when discovering')
     parser.add_argument('--test', action='store_true', help='Test connection and exit')
     parser.add_argument('--list-signals', action='store_true', help='List all analog signals')
     parser.add_argument('--list-digital', action='store_true', help='List all digital signals')
@@ -989,7 +1370,7 @@ Examples:
         if not client.login():
             sys.exit(1)
 
-        config = client.discover_building()
+        config = client.discover_building(use_cache=not args.refresh_catalog)
 
         # Save to buildings/ directory
         path = save_building_config(config)
@@ -40,6 +40,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from customer_profile import CustomerProfile, find_profile_for_client_id
 from weather_sensitivity_learner import WeatherSensitivityLearner, SolarEvent
+from weather_store import read_entity_weather
 
 
 def get_historical_data(
@@ -89,35 +90,19 @@ def get_historical_data(
                     'outdoor_temp': record.values.get('outdoor_temperature'),
                 }
 
-    # Query weather observations for wind and humidity
-    weather_query = f'''
-        from(bucket: "{bucket}")
-        |> range(start: -{days}d)
-        |> filter(fn: (r) => r["_measurement"] == "weather_observation")
-        |> filter(fn: (r) => r["house_id"] == "{house_id}")
-        |> filter(fn: (r) =>
-            r["_field"] == "wind_speed" or
-            r["_field"] == "humidity" or
-            r["_field"] == "temperature"
-        )
-        |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")
-        |> sort(columns: ["_time"])
-    '''
-
-    weather_tables = query_api.query(weather_query, org=org)
+    # Weather observations for wind and humidity (station series joined via the house's link)
+    weather_rows = read_entity_weather(query_api, bucket, org, house_id, f"-{days}d",
+                                       fields=['wind_speed', 'humidity', 'temperature'])
 
     # Build weather data by hour (for matching with heating data)
     weather_by_hour = {}
-    for table in weather_tables:
-        for record in table.records:
-            ts = record.get_time()
-            if ts:
-                # Round to hour for matching
-                hour_key = ts.replace(minute=0, second=0, microsecond=0).isoformat()
-                weather_by_hour[hour_key] = {
-                    'wind_speed': record.values.get('wind_speed', 3.0),
-                    'humidity': record.values.get('humidity', 60.0),
-                }
+    for row in weather_rows:
+        # Round to hour for matching
+        hour_key = row['timestamp'].replace(minute=0, second=0, microsecond=0).isoformat()
+        weather_by_hour[hour_key] = {
+            'wind_speed': row['wind_speed'] if row['wind_speed'] is not None else 3.0,
+            'humidity': row['humidity'] if row['humidity'] is not None else 60.0,
+        }
 
     # Query cloud cover from weather forecast
     cloud_query = f'''
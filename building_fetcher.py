@@ -18,6 +18,12 @@ Usage:
 
     # Dry run (fetch but don't write to InfluxDB)
     python3 building_fetcher.py --building TE236_HEM_Kontor --once --dry-run
+
+    # Poll several buildings from one process (one thread per building,
+    # one shared InfluxDB write queue). Credentials per building from
+    # BUILDING_<id>_USERNAME / BUILDING_<id>_PASSWORD, else ARRIGO_USERNAME/PASSWORD.
+    python3 building_fetcher.py --buildings TE236_HEM_Kontor TE240_Skola
+    python3 building_fetcher.py --all-buildings
 """
 
 import os
@@ -26,9 +32,19 @@ import json
 import time
 import logging
 import argparse
+import signal
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
+from zoneinfo import ZoneInfo
 
+from alarm_tracker import AlarmTracker, ALARM_FETCH_LIMIT, DEFAULT_FULL_FETCH_MINUTES
 from arrigo_api import ArrigoAPI, load_building_config, get_fetch_signals
+from coverage_index import CoverageIndex
+from import_historical_data import PointBatchWriter, DEFAULT_WRITE_BATCH_SIZE
+from metrics import get_registry, start_metrics_server, SIZE_BUCKETS
+from poll_schedule import PollScheduler, read_poll_offset
 
 try:
     from influxdb_client import InfluxDBClient, Point, WritePrecision
@@ -43,13 +59,27 @@ try:
 except ImportError:
     SEQ_AVAILABLE = False
 
+SWEDISH_TZ = ZoneInfo('Europe/Stockholm')
+BUILDINGS_DIR = 'buildings'
+WRITE_FLUSH_SECONDS = 2.0           # shared write queue flush interval (--buildings mode)
+MAX_PENDING_POINTS = 50_000         # drop new points beyond this while InfluxDB is down
+LATENCY_REPORT_SECONDS = 900        # per-building poll latency summary (--buildings mode)
+LATENCY_WINDOW = 20                 # polls kept per building for the latency summary
+
 
 class BuildingInfluxWriter:
-    """Writes commercial building data to InfluxDB (with circuit breaker)."""
+    """
+    Writes commercial building data to InfluxDB (with circuit breaker).
+
+    With a SharedWriteBatcher the writer has no connection of its own: points
+    are queued on the batcher and written together with the other buildings'.
+    """
 
     def __init__(self, url: str, token: str, org: str, bucket: str,
-                 building_id: str, logger=None, settings: dict = None):
+                 building_id: str, logger=None, settings: dict = None,
+                 batcher: 'SharedWriteBatcher' = None):
         self.building_id = building_id
+        self._batcher = batcher
         self.logger = logger or logging.getLogger(__name__)
         self.bucket = bucket
         self.org = org
@@ -61,12 +91,31 @@ class BuildingInfluxWriter:
         self._circuit_cooldown = influx_settings.get('circuit_breaker_cooldown_seconds', 60)
         self._consecutive_failures = 0
         self._circuit_open_time = None
+        self._coverage = None            # CoverageIndex for building_system, loaded lazily
 
         # Store connection params for reconnect
         self._url = url
         self._token = token
         self._org = org
 
+        # Write latency / batch size / circuit breaker metrics
+        metrics = get_registry()
+        self._write_latency = metrics.histogram(
+            'homeside_influx_write_seconds', 'InfluxDB write latency')
+        self._write_batch_size = metrics.histogram(
+            'homeside_influx_write_points', 'Points per InfluxDB write call', buckets=SIZE_BUCKETS)
+        metrics.gauge(
+            'homeside_influx_circuit_open', '1 while the InfluxDB circuit breaker is open'
+        ).set_function(
+            lambda: int(self._consecutive_failures >= self._circuit_breaker_threshold),
+            writer='building', entity=building_id,
+        )
+
+        if batcher is not None:
+            self.client = None
+            self.write_api = None
+            return
+
         if not INFLUX_AVAILABLE:
             self.logger.warning("influxdb_client not available, writes disabled")
             self.client = None
@@ -85,6 +134,8 @@ class BuildingInfluxWriter:
 
     def _should_write(self) -> bool:
         """Circuit breaker guard — returns False to skip writes when InfluxDB is down."""
+        if self._batcher is not None:
+            return self._batcher.accepting()
         if not self.write_api:
             return False
 
@@ -130,6 +181,41 @@ class BuildingInfluxWriter:
             self.logger.warning(f"InfluxDB reconnect failed: {e}")
             return False
 
+    def _write(self, record, on_written=None, wait: bool = False) -> None:
+        """
+        Write a point or list of points, recording latency and batch size.
+
+        on_written is called once the points are stored - right away, or
+        after the shared batcher's flush when one is used. With wait=True a
+        batched write is flushed immediately and raises if it fails.
+        """
+        if self._batcher is not None:
+            if wait:
+                if not self._batcher.write_now(record):
+                    raise RuntimeError("shared write failed")
+                if on_written:
+                    on_written()
+                return
+            if not self._batcher.submit(record, on_written):
+                raise RuntimeError("shared write queue full")
+            return
+        size = len(record) if isinstance(record, list) else 1
+        with self._write_latency.time(writer='building'):
+            self.write_api.write(bucket=self.bucket, org=self.org, record=record)
+        self._write_batch_size.observe(size, writer='building')
+        if on_written:
+            on_written()
+
+    def _mark_coverage(self, timestamp: datetime) -> None:
+        """Record a successful building_system write in the coverage index (non-critical)."""
+        try:
+            if self._coverage is None:
+                self._coverage = CoverageIndex.load(self.building_id, "building_system")
+            self._coverage.mark(timestamp, live=True)
+            self._coverage.save()
+        except Exception as e:
+            self.logger.debug(f"Coverage index update failed: {e}")
+
     def write_analog_signals(self, values: dict, timestamp: datetime = None) -> bool:
         """
         Write analog signal values to InfluxDB.
@@ -156,7 +242,7 @@ class BuildingInfluxWriter:
                 if value is not None and isinstance(value, (int, float)):
                     point.field(field_name, round(float(value), 4))
 
-            self.write_api.write(bucket=self.bucket, org=self.org, record=point)
+            self._write(point, on_written=lambda: self._mark_coverage(timestamp))
             self._consecutive_failures = 0
             self._circuit_open_time = None
             return True
@@ -173,7 +259,7 @@ class BuildingInfluxWriter:
             return False
 
     def write_alarms(self, alarms: list, timestamp: datetime = None) -> bool:
-        """Write alarm snapshot to InfluxDB."""
+        """Write alarm status counts to InfluxDB."""
         if not self._should_write() or not alarms:
             return False
 
@@ -195,7 +281,7 @@ class BuildingInfluxWriter:
             for status, count in by_status.items():
                 point.field(f"count_{status.lower()}", count)
 
-            self.write_api.write(bucket=self.bucket, org=self.org, record=point)
+            self._write(point)
             self._consecutive_failures = 0
             self._circuit_open_time = None
             return True
@@ -211,14 +297,277 @@ class BuildingInfluxWriter:
             self.logger.error(f"InfluxDB alarm write failed: {e}")
             return False
 
+    def write_alarm_events(self, events: list) -> bool:
+        """
+        Write alarm state changes (AlarmTracker events) to building_alarm_events.
+
+        One point per event, tagged with the alarm id and event kind, so the
+        same alarm changing twice in one fetch keeps both events.
+        """
+        if not self._should_write() or not events:
+            return False
+
+        try:
+            points = []
+            for event in events:
+                point = Point("building_alarm_events") \
+                    .tag("building_id", self.building_id) \
+                    .tag("alarm_id", event.alarm_id) \
+                    .tag("event", event.event) \
+                    .field("status", event.status) \
+                    .field("previous_status", event.previous_status) \
+                    .field("name", event.name) \
+                    .field("text", event.text) \
+                    .field("priority", event.priority) \
+                    .time(event.timestamp, WritePrecision.S)
+                if event.duration_seconds is not None:
+                    point.field("duration_seconds", round(event.duration_seconds, 1))
+                points.append(point)
+
+            # Wait for the shared flush: the caller rolls the tracker back on failure
+            self._write(points, wait=True)
+            self._consecutive_failures = 0
+            self._circuit_open_time = None
+            return True
+
+        except Exception as e:
+            self._consecutive_failures += 1
+            if self._consecutive_failures == self._circuit_breaker_threshold:
+                self._circuit_open_time = time.monotonic()
+                self.logger.warning(
+                    f"Circuit breaker OPEN after {self._consecutive_failures} failures — "
+                    f"skipping writes for {self._circuit_cooldown}s"
+                )
+            self.logger.error(f"InfluxDB alarm event write failed: {e}")
+            return False
+
     def close(self):
         if self.client:
             self.client.close()
 
 
+class SharedWriteBatcher:
+    """
+    One InfluxDB connection and write queue shared by every building polled
+    from this process.
+
+    Buildings queue their points with submit(); a background thread writes
+    the queue every WRITE_FLUSH_SECONDS (or as soon as a batch fills) through
+    PointBatchWriter, so N buildings polling at nearby offsets cost one write
+    request instead of N. Same circuit breaker semantics as
+    BuildingInfluxWriter: after repeated failed flushes new points are
+    refused for the cooldown, then a reconnect is attempted.
+    """
+
+    def __init__(self, url: str, token: str, org: str, bucket: str, logger=None,
+                 settings: dict = None, flush_seconds: float = WRITE_FLUSH_SECONDS,
+                 batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+                 max_pending: int = MAX_PENDING_POINTS):
+        self.logger = logger or logging.getLogger(__name__)
+        self.bucket = bucket
+        self.org = org
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+
+        influx_settings = settings or {}
+        self._write_timeout_ms = influx_settings.get('write_timeout_ms', 5000)
+        self._circuit_breaker_threshold = influx_settings.get('circuit_breaker_threshold', 3)
+        self._circuit_cooldown = influx_settings.get('circuit_breaker_cooldown_seconds', 60)
+        self._consecutive_failures = 0
+        self._circuit_open_time = None
+
+        self._url = url
+        self._token = token
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._rows = []                  # (points, on_written, on_failed) in submit order
+        self._pending_points = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+        metrics = get_registry()
+        self._write_latency = metrics.histogram(
+            'homeside_influx_write_seconds', 'InfluxDB write latency')
+        self._write_batch_size = metrics.histogram(
+            'homeside_influx_write_points', 'Points per InfluxDB write call', buckets=SIZE_BUCKETS)
+        metrics.gauge(
+            'homeside_influx_circuit_open', '1 while the InfluxDB circuit breaker is open'
+        ).set_function(
+            lambda: int(self._consecutive_failures >= self._circuit_breaker_threshold),
+            writer='building', entity='shared',
+        )
+
+        self.client = None
+        self.write_api = None
+        if not INFLUX_AVAILABLE:
+            self.logger.warning("influxdb_client not available, writes disabled")
+        else:
+            try:
+                self.client = InfluxDBClient(url=url, token=token, org=org,
+                                             timeout=self._write_timeout_ms)
+                self.write_api = self.client.write_api(write_options=SYNCHRONOUS)
+                self.logger.info(f"InfluxDB connected: {url} (shared write queue)")
+            except Exception as e:
+                self.logger.error(f"InfluxDB connection failed: {e}")
+
+        self._thread = threading.Thread(target=self._run, name='influx-batcher', daemon=True)
+        self._thread.start()
+
+    def accepting(self) -> bool:
+        """Circuit breaker guard — False while InfluxDB is considered down."""
+        if not self.write_api:
+            return False
+
+        if self._consecutive_failures < self._circuit_breaker_threshold:
+            return True
+
+        if self._circuit_open_time is None:
+            self._circuit_open_time = time.monotonic()
+
+        if time.monotonic() - self._circuit_open_time < self._circuit_cooldown:
+            return False
+
+        if self._reconnect():
+            return True
+        self._circuit_open_time = time.monotonic()
+        return False
+
+    def _reconnect(self) -> bool:
+        """Close old client, create fresh one, health check."""
+        self.logger.info("Attempting InfluxDB reconnect...")
+        try:
+            with self._flush_lock:
+                if self.client:
+                    try:
+                        self.client.close()
+                    except Exception:
+                        pass
+                self.client = InfluxDBClient(
+                    url=self._url, token=self._token, org=self.org,
+                    timeout=self._write_timeout_ms
+                )
+                self.write_api = self.client.write_api(write_options=SYNCHRONOUS)
+            health = self.client.health()
+            if health.status == "pass":
+                self._consecutive_failures = 0
+                self._circuit_open_time = None
+                self.logger.info("InfluxDB reconnected successfully")
+                return True
+            self.logger.warning(f"InfluxDB reconnect health check failed: {health.status}")
+            return False
+        except Exception as e:
+            self.logger.warning(f"InfluxDB reconnect failed: {e}")
+            return False
+
+    def submit(self, record, on_written=None, on_failed=None) -> bool:
+        """
+        Queue a point or list of points (one row). on_written / on_failed is
+        called from the flush thread once the row is stored / its write failed.
+
+        Returns:
+            False if the queue is full and the row was dropped
+        """
+        points = record if isinstance(record, list) else [record]
+        with self._lock:
+            if self._pending_points + len(points) > self.max_pending:
+                return False
+            self._rows.append((points, on_written, on_failed))
+            self._pending_points += len(points)
+            full = self._pending_points >= self.batch_size
+        if full:
+            self._wake.set()
+        return True
+
+    def write_now(self, record, timeout: float = 30.0) -> bool:
+        """
+        Queue a row, flush right away and wait for the result (for writes
+        whose caller must know they were stored, e.g. alarm events).
+
+        Returns:
+            True if the row was stored within timeout
+        """
+        done = threading.Event()
+        result = []
+
+        def finished(ok):
+            result.append(ok)
+            done.set()
+
+        if not self.submit(record, lambda: finished(True), lambda: finished(False)):
+            return False
+        self._wake.set()
+        return done.wait(timeout) and result[0]
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.error(f"Shared write flush failed: {e}")
+
+    def flush(self) -> None:
+        """Write everything queued so far."""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows, self._pending_points = self._rows, [], 0
+            if not rows:
+                return
+
+            failed = set()
+
+            def on_error(failed_rows, error):
+                # Rows are copied by the writer: match on the (shared) point objects
+                failed.update(id(point) for row in failed_rows for point in row)
+                self.logger.error(f"InfluxDB write failed ({len(failed_rows)} row(s)): {error}")
+
+            writer = PointBatchWriter(self.write_api, self.bucket, self.org,
+                                      batch_size=self.batch_size, on_error=on_error)
+            for points, _, _ in rows:
+                writer.add(*points)
+            writer.flush()
+
+            self._write_latency.observe(writer.write_seconds, writer='building')
+            self._write_batch_size.observe(writer.points_written, writer='building')
+
+            if writer.rows_written:
+                self._consecutive_failures = 0
+                self._circuit_open_time = None
+            else:
+                self._consecutive_failures += 1
+                if self._consecutive_failures == self._circuit_breaker_threshold:
+                    self._circuit_open_time = time.monotonic()
+                    self.logger.warning(
+                        f"Circuit breaker OPEN after {self._consecutive_failures} failures — "
+                        f"skipping writes for {self._circuit_cooldown}s"
+                    )
+
+        for points, on_written, on_failed in rows:
+            callback = on_failed if any(id(point) in failed for point in points) else on_written
+            if callback:
+                try:
+                    callback()
+                except Exception as e:
+                    self.logger.debug(f"Post-write callback failed: {e}")
+
+    def close(self) -> None:
+        """Stop the flush thread, write what is left and close the connection."""
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=30)
+        if self.write_api:
+            self.flush()
+        if self.client:
+            self.client.close()
+
+
 def fetch_and_write(client: ArrigoAPI, analog_fetch: dict,
                     influx: BuildingInfluxWriter, config: dict,
-                    logger, dry_run: bool = False) -> dict:
+                    logger, dry_run: bool = False,
+                    alarm_tracker: AlarmTracker = None) -> dict:
     """
     Single fetch iteration: get current values from Arrigo, write to InfluxDB.
 
@@ -229,30 +578,28 @@ def fetch_and_write(client: ArrigoAPI, analog_fetch: dict,
         config: Building config dict
         logger: Logger instance
         dry_run: If True, skip InfluxDB writes
+        alarm_tracker: Alarm state for this building (alarms are skipped without one)
 
     Returns:
         Dict of fetched values if successful, empty dict on failure
     """
     timestamp = datetime.now(timezone.utc)
 
-    # Fetch current analog values
-    if not client.discover_signals():
-        logger.warning("Failed to discover signals")
+    # Fetch current values for the configured signals only
+    current = client.get_current_values(
+        [fetch_info['signal_id'] for fetch_info in analog_fetch.values()])
+    if not current:
+        logger.warning("Failed to fetch current values")
         return {}
 
     # Map fetched values to field names
     values = {}
     missing = []
     for signal_name, fetch_info in analog_fetch.items():
-        signal_id = fetch_info['signal_id']
         field_name = fetch_info['field_name']
-
-        if signal_id in client.signal_map:
-            raw_value = client.signal_map[signal_id].get('current_value')
-            if raw_value is not None:
-                values[field_name] = raw_value
-            else:
-                missing.append(field_name)
+        raw_value = current.get(fetch_info['signal_id'])
+        if raw_value is not None:
+            values[field_name] = raw_value
         else:
             missing.append(field_name)
 
@@ -273,22 +620,76 @@ def fetch_and_write(client: ArrigoAPI, analog_fetch: dict,
             logger.error("Failed to write to InfluxDB")
             return {}
 
-    # Fetch and write alarms if enabled
+    # Fetch and write alarm state changes if enabled
     alarm_config = config.get('alarm_monitoring', {})
-    if alarm_config.get('enabled') and influx:
+    if alarm_config.get('enabled') and influx and alarm_tracker:
         try:
-            alarms = client.get_alarms(first=100)
-            if alarms:
-                influx.write_alarms(alarms, timestamp)
-                active = sum(1 for a in alarms if a.get('status') == 'ALARMED')
-                if active > 0:
-                    logger.warning(f"{active} active alarms")
+            poll_alarms(client, influx, alarm_tracker, alarm_config, logger, timestamp)
         except Exception as e:
             logger.warning(f"Alarm fetch failed: {e}")
 
     return values
 
 
+def poll_alarms(client: ArrigoAPI, influx: BuildingInfluxWriter, tracker: AlarmTracker,
+                alarm_config: dict, logger, timestamp: datetime) -> list:
+    """
+    Fetch the alarm list when it may have changed and write the transitions.
+
+    A small per-status count query runs every poll; the full list is only
+    fetched when those counts change or every alarm_monitoring
+    poll_interval_minutes, whichever comes first.
+
+    Returns:
+        AlarmEvents written (empty if nothing was fetched or changed)
+    """
+    counts = client.get_alarm_counts()
+    interval = alarm_config.get('poll_interval_minutes', DEFAULT_FULL_FETCH_MINUTES)
+    if not tracker.due(timestamp, counts, interval):
+        return []
+
+    alarms = client.get_alarms(first=ALARM_FETCH_LIMIT, strict=True)
+    if alarms is None:
+        logger.warning("Alarm list fetch failed")
+        return []
+
+    # Only a list that is known to be complete may clear alarms: a full page
+    # can hide older alarms, and an empty one may be a glitch unless the
+    # counts confirm it
+    complete = len(alarms) < ALARM_FETCH_LIMIT and (
+        bool(alarms) or (counts is not None and not any(counts.values())))
+    events = tracker.update(alarms, timestamp, complete=complete, counts=counts)
+
+    if alarms:
+        influx.write_alarms(alarms, timestamp)
+    if events:
+        if not influx.write_alarm_events(events):
+            tracker.rollback()
+            return []
+        for event in events:
+            duration = (f" after {event.duration_seconds / 60:.0f} min"
+                        if event.duration_seconds is not None else "")
+            text = f" ({event.text})" if event.text else ""
+            logger.info(f"Alarm {event.event}: {event.name or event.alarm_id}{text}{duration}")
+    tracker.save()
+
+    active = tracker.active_count()
+    if active > 0:
+        logger.warning(f"{active} active alarms")
+    return events
+
+
+def report_unknown_signals(client: ArrigoAPI, analog_fetch: dict, logger) -> None:
+    """Warn about configured signals that are missing from the cached catalog."""
+    if not client.signal_map:
+        return
+    unknown = [name for name, info in analog_fetch.items()
+               if info['signal_id'] not in client.signal_map]
+    if unknown:
+        logger.warning(f"{len(unknown)} configured signal(s) not in Arrigo catalog: "
+                       f"{', '.join(unknown[:10])}")
+
+
 def calculate_sleep(interval_minutes: int, poll_offset: int = 0) -> float:
     """
     Calculate seconds to sleep to align with clock boundaries + per-process offset.
@@ -306,14 +707,515 @@ def calculate_sleep(interval_minutes: int, poll_offset: int = 0) -> float:
     return sleep_seconds
 
 
+def load_influx_settings() -> dict:
+    """InfluxDB circuit breaker settings from settings.json ("influxdb" section)."""
+    for settings_path in ['settings.json', '/app/settings.json']:
+        if os.path.exists(settings_path):
+            try:
+                with open(settings_path) as f:
+                    return json.load(f).get('influxdb', {})
+            except Exception:
+                pass
+    return {}
+
+
+def list_building_ids() -> list:
+    """Building IDs with a config in buildings/ (excluding *_signals.json metadata)."""
+    if not os.path.isdir(BUILDINGS_DIR):
+        return []
+    return sorted(filename[:-len('.json')] for filename in os.listdir(BUILDINGS_DIR)
+                  if filename.endswith('.json') and not filename.endswith('_signals.json'))
+
+
+class BuildingPoller:
+    """
+    Poll loop for one building: fetch/write, Seq events, failure handling,
+    catalog refresh, the daily/72h energy pipelines and live config reload.
+
+    Used for the single --building process and, one thread per building,
+    for --buildings mode.
+    """
+
+    def __init__(self, building_id: str, args, logger, influx_settings: dict = None,
+                 batcher: SharedWriteBatcher = None, username: str = None,
+                 password: str = None, poll_offset: int = 0, schedule_id: str = None):
+        """
+        Args:
+            building_id: Building ID (matches buildings/<id>.json)
+            args: Parsed CLI arguments (InfluxDB target, --dry-run, --verbose)
+            logger: Logger for this building
+            influx_settings: Circuit breaker settings for a private writer
+            batcher: Shared write queue (None = own InfluxDB connection)
+            username / password: Arrigo credentials
+            poll_offset: Seconds after each aligned interval boundary to poll
+            schedule_id: Id in the orchestrator's poll schedule (None = env var)
+        """
+        self.building_id = building_id
+        self.args = args
+        self.logger = logger
+        self.influx_settings = influx_settings or {}
+        self.batcher = batcher
+        self.username = username
+        self.password = password
+        self.poll_offset = poll_offset
+        self.schedule_id = schedule_id
+
+        self.config = None
+        self.friendly_name = building_id
+        self.interval_minutes = 5
+        self.analog_fetch = {}
+        self.digital_fetch = {}
+        self.client = None
+        self.influx = None
+        self.seq = None
+        self.alarm_tracker = None
+        self.connected = False
+        self.catalog_checked_at = None
+
+        self.iteration = 0
+        self.consecutive_failures = 0
+        self.first_failure_time = None
+        self.last_pipeline_date = None       # Swedish date string of last energy separation run
+        self.last_recalibration_time = None  # datetime of last k recalibration
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+        metrics = get_registry()
+        self._poll_duration = metrics.histogram(
+            'homeside_poll_iteration_seconds', 'Duration of one fetch/write poll iteration')
+        self._poll_failures = metrics.counter(
+            'homeside_poll_failures_total', 'Poll iterations that produced no data')
+
+    def prepare(self) -> bool:
+        """Load config, signals and writers (False on a config error)."""
+        self.config = load_building_config(self.building_id)
+        if not self.config:
+            self.logger.error(f"Building config not found: {self.building_id}")
+            return False
+
+        self.building_id = self.config['building_id']
+        self.friendly_name = self.config.get('friendly_name') or self.building_id
+        host = self.config.get('connection', {}).get('host')
+        self.interval_minutes = self.config.get('poll_interval_minutes', 5)
+
+        if not host:
+            self.logger.error("No host in building config")
+            return False
+
+        if not self.username or not self.password:
+            self.logger.error("Credentials required. Use --username/--password or "
+                              "ARRIGO_USERNAME/ARRIGO_PASSWORD env vars")
+            return False
+
+        self.analog_fetch, self.digital_fetch = get_fetch_signals(self.config)
+        if not self.analog_fetch:
+            self.logger.error("No signals configured for fetching")
+            return False
+
+        # Initialize Seq structured logging
+        if SEQ_AVAILABLE:
+            self.seq = SeqLogger(
+                client_id=self.building_id,
+                friendly_name=self.friendly_name,
+                username=self.username,
+                seq_url=os.getenv('SEQ_URL'),
+                seq_api_key=os.getenv('SEQ_API_KEY'),
+                component='BuildingFetcher',
+                display_name_source='friendly_name',
+            )
+
+        self.logger.info(f"Building Fetcher: {self.friendly_name} | host={host} | "
+                         f"signals={len(self.analog_fetch)} analog, {len(self.digital_fetch)} digital | "
+                         f"interval={self.interval_minutes}min")
+
+        self.client = ArrigoAPI(
+            host=host,
+            username=self.username,
+            password=self.password,
+            logger=self.logger,
+            verbose=self.args.verbose,
+        )
+
+        self.alarm_tracker = AlarmTracker.load(self.building_id)
+
+        if not self.args.dry_run:
+            self.influx = BuildingInfluxWriter(
+                url=self.args.influx_url,
+                token=self.args.influx_token,
+                org=self.args.influx_org,
+                bucket=self.args.influx_bucket,
+                building_id=self.building_id,
+                logger=self.logger,
+                settings=self.influx_settings,
+                batcher=self.batcher,
+            )
+        return True
+
+    def connect(self) -> bool:
+        """Authenticate and load the signal catalog (False if login failed)."""
+        if not self.client.login():
+            self.logger.error("Authentication failed")
+            if self.seq:
+                self.seq.log_error("Authentication failed", properties={
+                    'EventType': 'AuthFailed', 'Host': self.client.host})
+            return False
+
+        # Signal catalog (names/units) is cached on disk; polls only fetch configured
+        # values. Start from the cached catalog and refresh it in the background.
+        if self.client.load_catalog():
+            self.logger.info(f"Loaded cached signal catalog ({len(self.client.signal_map)} signals)")
+            report_unknown_signals(self.client, self.analog_fetch, self.logger)
+        elif self.client.refresh_catalog_if_stale(background=False):
+            report_unknown_signals(self.client, self.analog_fetch, self.logger)
+        self.catalog_checked_at = self.client.catalog_refreshed_at
+        self.client.refresh_catalog_if_stale()
+        self.connected = True
+        return True
+
+    def log_started(self) -> None:
+        if self.seq and self.seq.enabled:
+            self.seq.log(
+                f"[{self.friendly_name}] Building fetcher started | "
+                f"{len(self.analog_fetch)} signals | {self.interval_minutes}min interval",
+                level='Information',
+                properties={
+                    'EventType': 'FetcherStarted',
+                    'Host': self.client.host,
+                    'AnalogSignals': len(self.analog_fetch),
+                    'DigitalSignals': len(self.digital_fetch),
+                    'IntervalMinutes': self.interval_minutes,
+                }
+            )
+
+    def fetch_once(self) -> dict:
+        """Single fetch/write (--once)."""
+        return fetch_and_write(self.client, self.analog_fetch, self.influx, self.config,
+                               self.logger, dry_run=self.args.dry_run,
+                               alarm_tracker=self.alarm_tracker)
+
+    def poll(self) -> dict:
+        """One loop iteration. Returns the fetched values (empty dict on failure)."""
+        self.iteration += 1
+        now = datetime.now(timezone.utc)
+        iteration_start = time.monotonic()
+        values = {}
+
+        try:
+            values = fetch_and_write(self.client, self.analog_fetch, self.influx,
+                                     self.config, self.logger,
+                                     alarm_tracker=self.alarm_tracker)
+
+            if values:
+                self.consecutive_failures = 0
+                self.first_failure_time = None
+                self._log_collected(values)
+            else:
+                self._handle_failure(now)
+
+        except Exception as e:
+            self.consecutive_failures += 1
+            self._poll_failures.inc(kind='building')
+            self.logger.error(f"Unexpected error in fetch loop: {e}",
+                              exc_info=self.args.verbose)
+            if self.seq:
+                self.seq.log_error("Unexpected error in fetch loop",
+                                   error=e,
+                                   properties={'EventType': 'FetchLoopError'})
+
+        # Refresh the signal catalog in the background when it gets old
+        if self.client.catalog_refreshed_at != self.catalog_checked_at:
+            self.catalog_checked_at = self.client.catalog_refreshed_at
+            report_unknown_signals(self.client, self.analog_fetch, self.logger)
+        self.client.refresh_catalog_if_stale()
+
+        self._run_pipelines(now)
+
+        # Re-read interval from building config (live reload — no restart needed)
+        refreshed_config = load_building_config(self.building_id)
+        if refreshed_config:
+            new_interval = refreshed_config.get('poll_interval_minutes', 5)
+            if new_interval != self.interval_minutes:
+                self.logger.info(f"Poll interval changed: {self.interval_minutes} → {new_interval} min")
+                self.interval_minutes = new_interval
+            self.config = refreshed_config  # Also refresh config for energy separation
+
+        elapsed = time.monotonic() - iteration_start
+        self.latencies.append(elapsed)
+        self._poll_duration.observe(elapsed, kind='building', entity=self.building_id)
+        return values
+
+    def _log_collected(self, values: dict) -> None:
+        if not self.seq:
+            return
+
+        # Build Seq properties from fetched values
+        props = {
+            'EventType': 'BuildingDataCollected',
+            'Iteration': self.iteration,
+            'SignalCount': len(values),
+            'TotalConfigured': len(self.analog_fetch),
+        }
+        # Include key values as structured properties
+        for field_name, value in values.items():
+            if isinstance(value, (int, float)):
+                pascal_key = ''.join(
+                    word.capitalize() for word in field_name.split('_'))
+                props[pascal_key] = round(float(value), 2)
+
+        # Build concise message with key readings
+        msg_parts = [f"#{self.iteration}"]
+        key_readings = {
+            'outdoor_temp_fvc': ('Out', '°C'),
+            'dh_power_total': ('DH', 'kW'),
+            'dh_primary_supply': ('Sup', '°C'),
+            'dh_primary_return': ('Ret', '°C'),
+        }
+        for field, (label, unit) in key_readings.items():
+            if field in values:
+                msg_parts.append(f"{label}={values[field]:.1f}{unit}")
+
+        msg_parts.append(f"{len(values)}/{len(self.analog_fetch)} signals")
+
+        self.seq.log(
+            f"[{self.friendly_name}] {' | '.join(msg_parts)}",
+            level='Information',
+            properties=props,
+        )
+
+    def _handle_failure(self, now: datetime) -> None:
+        self.consecutive_failures += 1
+        self._poll_failures.inc(kind='building')
+        if self.first_failure_time is None:
+            self.first_failure_time = now
+
+        # Try re-authenticating on failure
+        if self.consecutive_failures >= 2:
+            self.logger.warning("Multiple failures, re-authenticating...")
+            self.client.login()
+
+        # Escalate to error after 2 hours of failures
+        failure_duration = (now - self.first_failure_time).total_seconds() / 60
+        if not self.seq:
+            return
+        if failure_duration > 120:
+            self.seq.log_error(
+                f"Persistent failure for {failure_duration:.0f} min",
+                properties={
+                    'EventType': 'PersistentFailure',
+                    'FailureMinutes': round(failure_duration),
+                    'ConsecutiveFailures': self.consecutive_failures,
+                })
+        else:
+            self.seq.log_warning(
+                f"Fetch failed (attempt {self.consecutive_failures})",
+                properties={
+                    'EventType': 'FetchFailed',
+                    'ConsecutiveFailures': self.consecutive_failures,
+                })
+
+    def _run_pipelines(self, now: datetime) -> None:
+        """Energy separation pipeline triggers."""
+        now_swedish = datetime.now(SWEDISH_TZ)
+        today_str = now_swedish.strftime('%Y-%m-%d')
+        current_hour = now_swedish.hour
+        args = self.args
+
+        # Daily at 08:00 Swedish time: run energy separation
+        if (current_hour >= 8 and self.last_pipeline_date != today_str
+                and self.consecutive_failures == 0):
+            self.last_pipeline_date = today_str
+            self.logger.info("Running daily energy separation pipeline...")
+            from heating_energy_calibrator import run_energy_separation
+            run_energy_separation(
+                entity_id=self.building_id, entity_type="building",
+                influx_url=args.influx_url, influx_token=args.influx_token,
+                influx_org=args.influx_org, influx_bucket=args.influx_bucket,
+                config=self.config, logger=self.logger, seq=self.seq,
+            )
+
+        # Every 72 hours: run k-value recalibration
+        if self.last_recalibration_time is None:
+            self.last_recalibration_time = now  # Don't run on first iteration
+        elif (now - self.last_recalibration_time).total_seconds() >= 72 * 3600:
+            self.last_recalibration_time = now
+            self.logger.info("Running 72h k-value recalibration...")
+            from k_recalibrator import recalibrate_entity
+            result = recalibrate_entity(
+                entity_id=self.building_id, entity_type="building",
+                influx_url=args.influx_url, influx_token=args.influx_token,
+                influx_org=args.influx_org, influx_bucket=args.influx_bucket,
+                days=30,
+            )
+            if result:
+                self.logger.info(f"K recalibration: k={result.k_value:.4f} ({result.days_used} days, {result.confidence:.0%})")
+                if self.seq:
+                    self.seq.log(
+                        f"[{self.building_id}] K recalibrated: k={result.k_value:.4f}",
+                        level='Information',
+                        properties={'EventType': 'KRecalibration', 'KValue': round(result.k_value, 4),
+                                    'DaysUsed': result.days_used, 'Confidence': round(result.confidence, 2)},
+                    )
+            else:
+                self.logger.info("K recalibration: insufficient data")
+
+    def next_sleep(self) -> float:
+        """Seconds until the next aligned interval + offset (picks up a rebalanced offset)."""
+        new_offset = read_poll_offset(self.poll_offset, schedule_id=self.schedule_id)
+        if new_offset != self.poll_offset:
+            self.logger.info(f"Poll offset changed: {self.poll_offset}s -> {new_offset}s")
+            self.poll_offset = new_offset
+        return calculate_sleep(self.interval_minutes, self.poll_offset)
+
+    def latency_summary(self) -> str:
+        if not self.latencies:
+            return "no polls yet"
+        recent = sorted(self.latencies)
+        mean = sum(recent) / len(recent)
+        return (f"last {self.latencies[-1]:.2f}s, mean {mean:.2f}s, max {recent[-1]:.2f}s "
+                f"({len(recent)} polls, {self.consecutive_failures} failing)")
+
+    def close(self) -> None:
+        if self.influx:
+            self.influx.close()
+        if self.seq:
+            self.seq.close()
+
+
+def _poll_forever(poller: BuildingPoller, stop: threading.Event) -> None:
+    """Thread body for one building in --buildings mode."""
+    logger = poller.logger
+    try:
+        if poller.connect():
+            poller.log_started()
+    except Exception as e:
+        logger.error(f"Connect failed: {e}", exc_info=poller.args.verbose)
+
+    if poller.poll_offset > 0:
+        logger.info(f"Startup delay: {poller.poll_offset}s (staggered poll offset)")
+        if stop.wait(poller.poll_offset):
+            return
+
+    while not stop.is_set():
+        try:
+            if poller.connected or poller.connect():
+                poller.poll()
+        except Exception as e:
+            # A failing building must never take the other buildings' threads down
+            logger.error(f"Poll loop error: {e}", exc_info=poller.args.verbose)
+        stop.wait(poller.next_sleep())
+
+
+def run_buildings(building_ids: list, args, logger) -> int:
+    """
+    Poll several buildings from one process: one thread per building (so a
+    slow Arrigo host only delays its own building), each keeping its own
+    clock alignment and poll offset, all writing through one shared
+    InfluxDB write queue.
+
+    Returns:
+        Process exit code
+    """
+    batcher = None
+    if not args.dry_run:
+        batcher = SharedWriteBatcher(
+            url=args.influx_url,
+            token=args.influx_token,
+            org=args.influx_org,
+            bucket=args.influx_bucket,
+            logger=logger,
+            settings=load_influx_settings(),
+        )
+
+    # Spread the buildings across the shortest poll interval unless the
+    # orchestrator's schedule file assigns offsets
+    intervals = [(load_building_config(b) or {}).get('poll_interval_minutes', 5) for b in building_ids]
+    scheduler = PollScheduler(min(intervals) * 60)
+    scheduler.assign(building_ids)
+
+    pollers = []
+    for building_id in building_ids:
+        username = (os.getenv(f"BUILDING_{building_id}_USERNAME") or args.username
+                    or os.getenv('ARRIGO_USERNAME'))
+        password = (os.getenv(f"BUILDING_{building_id}_PASSWORD") or args.password
+                    or os.getenv('ARRIGO_PASSWORD'))
+        poller = BuildingPoller(
+            building_id, args, logging.getLogger(f'building_fetcher.{building_id}'),
+            batcher=batcher, username=username, password=password,
+            poll_offset=read_poll_offset(scheduler.offsets.get(building_id, 0),
+                                         schedule_id=building_id),
+            schedule_id=building_id,
+        )
+        if poller.prepare():
+            pollers.append(poller)
+        else:
+            logger.error(f"Skipping {building_id}")
+
+    if not pollers:
+        if batcher:
+            batcher.close()
+        return 1
+
+    logger.info(f"Polling {len(pollers)} building(s): " + ', '.join(
+        f"{p.building_id} (+{p.poll_offset}s)" for p in pollers))
+
+    # ── Single fetch mode ────────────────────────────────────────
+    if args.once:
+        def once(poller):
+            return poller.connect() and bool(poller.fetch_once())
+
+        with ThreadPoolExecutor(max_workers=len(pollers)) as executor:
+            results = list(executor.map(once, pollers))
+        for poller in pollers:
+            poller.close()
+        if batcher:
+            batcher.close()
+        return 0 if all(results) else 1
+
+    # ── Continuous loop ──────────────────────────────────────────
+    start_metrics_server(int(os.getenv('METRICS_PORT', '0')))
+    stop = threading.Event()
+    threads = []
+    for poller in pollers:
+        thread = threading.Thread(target=_poll_forever, args=(poller, stop),
+                                  name=f'poll-{poller.building_id}', daemon=True)
+        thread.start()
+        threads.append(thread)
+
+    try:
+        while not stop.wait(LATENCY_REPORT_SECONDS):
+            logger.info("Poll latency per building:")
+            for poller in pollers:
+                logger.info(f"  {poller.building_id:30s} {poller.latency_summary()}")
+    except KeyboardInterrupt:
+        logger.info(f"Stopping {len(pollers)} building fetcher(s)...")
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=30)
+        for poller in pollers:
+            poller.close()
+        if batcher:
+            batcher.close()
+    return 0
+
+
+def _stop_on_sigterm(signum, _frame):
+    """SIGTERM (orchestrator stop) -> KeyboardInterrupt, so finally blocks and atexit hooks run."""
+    raise KeyboardInterrupt
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Commercial building data fetcher',
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
 
-    parser.add_argument('--building', required=True,
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--building',
                         help='Building ID (matches buildings/<id>.json)')
+    target.add_argument('--buildings', nargs='+', metavar='ID',
+                        help='Poll several buildings concurrently from one process')
+    target.add_argument('--all-buildings', action='store_true',
+                        help='Poll every building in buildings/ from one process')
     parser.add_argument('--username', help='Override Arrigo username (or ARRIGO_USERNAME env)')
     parser.add_argument('--password', help='Override Arrigo password (or ARRIGO_PASSWORD env)')
     parser.add_argument('--once', action='store_true', help='Fetch once and exit (no loop)')
@@ -327,292 +1229,66 @@ def main():
     parser.add_argument('--influx-bucket', default=os.getenv('INFLUXDB_BUCKET', 'heating'))
 
     args = parser.parse_args()
+    multi = not args.building
+
+    signal.signal(signal.SIGTERM, _stop_on_sigterm)
 
     # Setup logging
     log_level = logging.DEBUG if args.verbose else logging.INFO
     logging.basicConfig(
         level=log_level,
-        format='%(asctime)s [%(levelname)s] %(message)s',
+        format='%(asctime)s [%(levelname)s] %(name)s: %(message)s' if multi
+        else '%(asctime)s [%(levelname)s] %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S',
     )
     logger = logging.getLogger('building_fetcher')
 
-    # Load building config
-    config = load_building_config(args.building)
-    if not config:
-        logger.error(f"Building config not found: {args.building}")
-        sys.exit(1)
-
-    building_id = config['building_id']
-    friendly_name = config.get('friendly_name') or building_id
-    connection = config.get('connection', {})
-    host = connection.get('host')
-    interval_minutes = config.get('poll_interval_minutes', 5)
-
-    if not host:
-        logger.error("No host in building config")
-        sys.exit(1)
-
-    # Resolve credentials
-    username = args.username or os.getenv('ARRIGO_USERNAME')
-    password = args.password or os.getenv('ARRIGO_PASSWORD')
-
-    if not username or not password:
-        logger.error("Credentials required. Use --username/--password or "
-                     "ARRIGO_USERNAME/ARRIGO_PASSWORD env vars")
-        sys.exit(1)
-
-    # Get fetch signal map
-    analog_fetch, digital_fetch = get_fetch_signals(config)
-    if not analog_fetch:
-        logger.error("No signals configured for fetching")
-        sys.exit(1)
-
-    # Initialize Seq structured logging
-    seq = None
-    if SEQ_AVAILABLE:
-        seq = SeqLogger(
-            client_id=building_id,
-            friendly_name=friendly_name,
-            username=username,
-            seq_url=os.getenv('SEQ_URL'),
-            seq_api_key=os.getenv('SEQ_API_KEY'),
-            component='BuildingFetcher',
-            display_name_source='friendly_name',
-        )
-
-    logger.info(f"Building Fetcher: {friendly_name} | host={host} | "
-                f"signals={len(analog_fetch)} analog, {len(digital_fetch)} digital | "
-                f"interval={interval_minutes}min")
-
-    # Initialize Arrigo API client
-    client = ArrigoAPI(
-        host=host,
-        username=username,
-        password=password,
-        logger=logger,
-        verbose=args.verbose,
+    if multi:
+        building_ids = list_building_ids() if args.all_buildings else args.buildings
+        if not building_ids:
+            logger.error("No buildings to poll")
+            sys.exit(1)
+        sys.exit(run_buildings(building_ids, args, logger))
+
+    poller = BuildingPoller(
+        args.building, args, logger,
+        influx_settings=load_influx_settings(),
+        username=args.username or os.getenv('ARRIGO_USERNAME'),
+        password=args.password or os.getenv('ARRIGO_PASSWORD'),
+        poll_offset=int(os.getenv('POLL_OFFSET_SECONDS', '0')),
     )
-
-    # Authenticate
-    if not client.login():
-        logger.error("Authentication failed")
-        if seq:
-            seq.log_error("Authentication failed", properties={
-                'EventType': 'AuthFailed', 'Host': host})
+    if not poller.prepare() or not poller.connect():
         sys.exit(1)
 
-    # Load settings for InfluxDB circuit breaker config
-    influx_settings = {}
-    for settings_path in ['settings.json', '/app/settings.json']:
-        if os.path.exists(settings_path):
-            try:
-                with open(settings_path) as f:
-                    influx_settings = json.load(f).get('influxdb', {})
-                break
-            except Exception:
-                pass
-
-    # Initialize InfluxDB writer
-    influx = None
-    if not args.dry_run:
-        influx = BuildingInfluxWriter(
-            url=args.influx_url,
-            token=args.influx_token,
-            org=args.influx_org,
-            bucket=args.influx_bucket,
-            building_id=building_id,
-            logger=logger,
-            settings=influx_settings,
-        )
-
     # ── Single fetch mode ────────────────────────────────────────
     if args.once:
-        values = fetch_and_write(client, analog_fetch, influx, config,
-                                 logger, dry_run=args.dry_run)
-        if influx:
-            influx.close()
+        values = poller.fetch_once()
+        if poller.influx:
+            poller.influx.close()
         sys.exit(0 if values else 1)
 
     # ── Continuous loop ──────────────────────────────────────────
-    if seq and seq.enabled:
-        seq.log(
-            f"[{friendly_name}] Building fetcher started | "
-            f"{len(analog_fetch)} signals | {interval_minutes}min interval",
-            level='Information',
-            properties={
-                'EventType': 'FetcherStarted',
-                'Host': host,
-                'AnalogSignals': len(analog_fetch),
-                'DigitalSignals': len(digital_fetch),
-                'IntervalMinutes': interval_minutes,
-            }
-        )
-
-    # Stagger startup so processes don't all hit InfluxDB at the same time
-    poll_offset = int(os.getenv('POLL_OFFSET_SECONDS', '0'))
-    if poll_offset > 0:
-        logger.info(f"Startup delay: {poll_offset}s (staggered poll offset)")
-        time.sleep(poll_offset)
+    poller.log_started()
 
-    iteration = 0
-    consecutive_failures = 0
-    first_failure_time = None
+    # Metrics endpoint (scraped by the orchestrator, disabled when METRICS_PORT unset)
+    start_metrics_server(int(os.getenv('METRICS_PORT', '0')))
 
-    # Energy separation pipeline tracking
-    from zoneinfo import ZoneInfo
-    SWEDISH_TZ = ZoneInfo('Europe/Stockholm')
-    last_pipeline_date = None  # Swedish date string of last energy separation run
-    last_recalibration_time = None  # datetime of last k recalibration
+    # Stagger startup so processes don't all hit InfluxDB at the same time
+    if poller.poll_offset > 0:
+        logger.info(f"Startup delay: {poller.poll_offset}s (staggered poll offset)")
+        time.sleep(poller.poll_offset)
 
     try:
         while True:
-            iteration += 1
-            now = datetime.now(timezone.utc)
-
-            try:
-                values = fetch_and_write(client, analog_fetch, influx,
-                                         config, logger)
-
-                if values:
-                    consecutive_failures = 0
-                    first_failure_time = None
-
-                    # Build Seq properties from fetched values
-                    props = {
-                        'EventType': 'BuildingDataCollected',
-                        'Iteration': iteration,
-                        'SignalCount': len(values),
-                        'TotalConfigured': len(analog_fetch),
-                    }
-                    # Include key values as structured properties
-                    for field_name, value in values.items():
-                        if isinstance(value, (int, float)):
-                            pascal_key = ''.join(
-                                word.capitalize() for word in field_name.split('_'))
-                            props[pascal_key] = round(float(value), 2)
-
-                    # Build concise message with key readings
-                    msg_parts = [f"#{iteration}"]
-                    key_readings = {
-                        'outdoor_temp_fvc': ('Out', '°C'),
-                        'dh_power_total': ('DH', 'kW'),
-                        'dh_primary_supply': ('Sup', '°C'),
-                        'dh_primary_return': ('Ret', '°C'),
-                    }
-                    for field, (label, unit) in key_readings.items():
-                        if field in values:
-                            msg_parts.append(f"{label}={values[field]:.1f}{unit}")
-
-                    msg_parts.append(f"{len(values)}/{len(analog_fetch)} signals")
-
-                    if seq:
-                        seq.log(
-                            f"[{friendly_name}] {' | '.join(msg_parts)}",
-                            level='Information',
-                            properties=props,
-                        )
-
-                else:
-                    consecutive_failures += 1
-                    if first_failure_time is None:
-                        first_failure_time = now
-
-                    # Try re-authenticating on failure
-                    if consecutive_failures >= 2:
-                        logger.warning("Multiple failures, re-authenticating...")
-                        client.login()
-
-                    # Escalate to error after 2 hours of failures
-                    failure_duration = (now - first_failure_time).total_seconds() / 60
-                    if failure_duration > 120:
-                        if seq:
-                            seq.log_error(
-                                f"Persistent failure for {failure_duration:.0f} min",
-                                properties={
-                                    'EventType': 'PersistentFailure',
-                                    'FailureMinutes': round(failure_duration),
-                                    'ConsecutiveFailures': consecutive_failures,
-                                })
-                    else:
-                        if seq:
-                            seq.log_warning(
-                                f"Fetch failed (attempt {consecutive_failures})",
-                                properties={
-                                    'EventType': 'FetchFailed',
-                                    'ConsecutiveFailures': consecutive_failures,
-                                })
-
-            except Exception as e:
-                consecutive_failures += 1
-                logger.error(f"Unexpected error in fetch loop: {e}",
-                             exc_info=args.verbose)
-                if seq:
-                    seq.log_error("Unexpected error in fetch loop",
-                                  error=e,
-                                  properties={'EventType': 'FetchLoopError'})
-
-            # ── Energy separation pipeline triggers ──────────────────
-            now_swedish = datetime.now(SWEDISH_TZ)
-            today_str = now_swedish.strftime('%Y-%m-%d')
-            current_hour = now_swedish.hour
-
-            # Daily at 08:00 Swedish time: run energy separation
-            if (current_hour >= 8 and last_pipeline_date != today_str
-                    and consecutive_failures == 0):
-                last_pipeline_date = today_str
-                logger.info("Running daily energy separation pipeline...")
-                from heating_energy_calibrator import run_energy_separation
-                run_energy_separation(
-                    entity_id=building_id, entity_type="building",
-                    influx_url=args.influx_url, influx_token=args.influx_token,
-                    influx_org=args.influx_org, influx_bucket=args.influx_bucket,
-                    config=config, logger=logger, seq=seq,
-                )
-
-            # Every 72 hours: run k-value recalibration
-            if last_recalibration_time is None:
-                last_recalibration_time = now  # Don't run on first iteration
-            elif (now - last_recalibration_time).total_seconds() >= 72 * 3600:
-                last_recalibration_time = now
-                logger.info("Running 72h k-value recalibration...")
-                from k_recalibrator import recalibrate_entity
-                result = recalibrate_entity(
-                    entity_id=building_id, entity_type="building",
-                    influx_url=args.influx_url, influx_token=args.influx_token,
-                    influx_org=args.influx_org, influx_bucket=args.influx_bucket,
-                    days=30,
-                )
-                if result:
-                    logger.info(f"K recalibration: k={result.k_value:.4f} ({result.days_used} days, {result.confidence:.0%})")
-                    if seq:
-                        seq.log(
-                            f"[{building_id}] K recalibrated: k={result.k_value:.4f}",
-                            level='Information',
-                            properties={'EventType': 'KRecalibration', 'KValue': round(result.k_value, 4),
-                                        'DaysUsed': result.days_used, 'Confidence': round(result.confidence, 2)},
-                        )
-                else:
-                    logger.info("K recalibration: insufficient data")
-
-            # Re-read interval from building config (live reload — no restart needed)
-            refreshed_config = load_building_config(args.building)
-            if refreshed_config:
-                new_interval = refreshed_config.get('poll_interval_minutes', 5)
-                if new_interval != interval_minutes:
-                    logger.info(f"Poll interval changed: {interval_minutes} → {new_interval} min")
-                    interval_minutes = new_interval
-                config = refreshed_config  # Also refresh config for energy separation
+            poller.poll()
 
             # Sleep until next aligned interval + per-process offset
-            sleep_seconds = calculate_sleep(interval_minutes, poll_offset)
-            time.sleep(sleep_seconds)
+            time.sleep(poller.next_sleep())
 
     except KeyboardInterrupt:
-        logger.info(f"Stopping {friendly_name} fetcher...")
+        logger.info(f"Stopping {poller.friendly_name} fetcher...")
     finally:
-        if influx:
-            influx.close()
+        poller.close()
 
 
 if __name__ == "__main__":
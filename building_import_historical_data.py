@@ -26,6 +26,7 @@ from datetime import datetime, timezone, timedelta
 from collections import defaultdict
 
 from arrigo_api import ArrigoAPI, load_building_config, get_fetch_signals
+from coverage_index import CoverageIndex
 
 try:
     from influxdb_client import InfluxDBClient, Point, WritePrecision
@@ -204,6 +205,7 @@ def main():
     BATCH_SIZE = 500
     points = []
     written = 0
+    written_times = []
 
     for time_str, fields in sorted(points_by_time.items()):
         try:
@@ -220,6 +222,7 @@ def main():
                 point.field(field_name, round(float(value), 4))
 
         points.append(point)
+        written_times.append(ts)
 
         if len(points) >= BATCH_SIZE:
             write_api.write(bucket=args.influx_bucket, org=args.influx_org,
@@ -236,6 +239,13 @@ def main():
 
     influx_client.close()
 
+    try:
+        coverage = CoverageIndex.load(building_id, "building_system")
+        coverage.mark_many(written_times)
+        coverage.save()
+    except Exception as e:
+        logger.warning(f"Coverage index update failed: {e}")
+
     logger.info(f"Import complete: {written} points written to "
                 f"building_system (building_id={building_id})")
 
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Config Registry
+In-memory index of house profiles (profiles/*.json) and building configs
+(buildings/*.json), shared by the energy importer, the orchestrator, the
+fetchers and the web GUI.
+
+Callers used to scan and parse every JSON file themselves on each lookup.
+The registry keeps one parsed entry per file and refreshes incrementally:
+a refresh (at most every REGISTRY_REFRESH_SECONDS) stats the files and only
+re-parses those whose mtime or size changed. Lookups by id, meter id,
+HomeSide client id or friendly name are dict lookups.
+
+Meter ids come from the environment (HOUSE_<id>_METER_IDS,
+BUILDING_<id>_METER_IDS) or, for buildings, from the config's meter_ids.
+
+Usage:
+    registry = get_config_registry()
+    entry = registry.find_by_meter('735999255020057000')
+    if entry:
+        print(entry.kind, entry.entity_id, entry.friendly_name, entry.path)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from customer_profile import get_building_meter_ids, get_meter_ids_from_env
+
+
+REGISTRY_REFRESH_SECONDS = float(os.getenv('REGISTRY_REFRESH_SECONDS', '5'))
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ConfigEntry:
+    """One profile or building config file."""
+    entity_id: str              # customer_id / building_id (file name if missing)
+    kind: str                   # house / building
+    path: str
+    friendly_name: str          # entity_id if not set
+    meter_ids: List[str] = field(default_factory=list)
+    data: Dict[str, Any] = field(default_factory=dict, repr=False)   # parsed JSON (don't modify)
+
+
+def _is_config_file(filename: str) -> bool:
+    return filename.endswith('.json') and '_signals.json' not in filename
+
+
+class ConfigRegistry:
+    """Index of the profile and building config files in two directories."""
+
+    def __init__(self, profiles_dir: str = 'profiles', buildings_dir: str = 'buildings',
+                 refresh_seconds: float = REGISTRY_REFRESH_SECONDS):
+        self.profiles_dir = profiles_dir
+        self.buildings_dir = buildings_dir
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._last_refresh: Optional[float] = None
+        # path -> ((mtime_ns, size), entry or None if unreadable)
+        self._files: Dict[str, Tuple[Tuple[int, int], Optional[ConfigEntry]]] = {}
+        self._by_id: Dict[Tuple[str, str], ConfigEntry] = {}
+        self._by_meter: Dict[str, ConfigEntry] = {}
+        self._by_name: Dict[str, List[ConfigEntry]] = {}
+
+    # ── Refresh ──────────────────────────────────────────────────────
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Bring the index up to date with the directories.
+
+        Skipped if the last refresh was less than refresh_seconds ago
+        (unless force). Returns True if any file was added, changed or removed.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if (not force and self._last_refresh is not None
+                    and now - self._last_refresh < self.refresh_seconds):
+                return False
+            self._last_refresh = now
+
+            seen = set()
+            changed = False
+            for kind, directory in (('house', self.profiles_dir), ('building', self.buildings_dir)):
+                try:
+                    with os.scandir(directory) as it:
+                        files = [e for e in it if _is_config_file(e.name)]
+                except OSError:
+                    continue
+                for dir_entry in files:
+                    try:
+                        st = dir_entry.stat()
+                    except OSError:
+                        continue
+                    path = dir_entry.path
+                    seen.add(path)
+                    stamp = (st.st_mtime_ns, st.st_size)
+                    known = self._files.get(path)
+                    if known is not None and known[0] == stamp:
+                        continue
+                    self._files[path] = (stamp, self._parse(kind, path))
+                    changed = True
+
+            for path in [p for p in self._files if p not in seen]:
+                del self._files[path]
+                changed = True
+
+            if changed:
+                self._rebuild()
+            return changed
+
+    def _parse(self, kind: str, path: str) -> Optional[ConfigEntry]:
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading {kind} config {os.path.basename(path)}: {e}")
+            return None
+
+        stem = os.path.basename(path)[:-len('.json')]
+        if kind == 'house':
+            entity_id = data.get('customer_id') or stem
+            meter_ids = get_meter_ids_from_env(entity_id)
+        else:
+            entity_id = data.get('building_id') or stem
+            meter_ids = get_building_meter_ids(entity_id, data=data)
+        return ConfigEntry(
+            entity_id=entity_id,
+            kind=kind,
+            path=path,
+            friendly_name=data.get('friendly_name') or entity_id,
+            meter_ids=meter_ids,
+            data=data,
+        )
+
+    def _rebuild(self) -> None:
+        """Recompute the lookup dicts (houses first, then buildings, by path)."""
+        by_id, by_meter, by_name = {}, {}, {}
+        entries = sorted((e for _, e in self._files.values() if e is not None),
+                         key=lambda e: (e.kind != 'house', e.path))
+        for entry in entries:
+            by_id.setdefault((entry.kind, entry.entity_id), entry)
+            by_name.setdefault(entry.friendly_name.lower(), []).append(entry)
+            for meter_id in entry.meter_ids:
+                known = by_meter.get(meter_id)
+                if known is not None:
+                    logger.warning(
+                        f"Duplicate meter_id {meter_id}: "
+                        f"already mapped to {known.entity_id}, "
+                        f"ignoring mapping to {entry.entity_id}"
+                    )
+                    continue
+                by_meter[meter_id] = entry
+        self._by_id, self._by_meter, self._by_name = by_id, by_meter, by_name
+
+    # ── Lookups ──────────────────────────────────────────────────────
+
+    def entries(self, kind: Optional[str] = None) -> List[ConfigEntry]:
+        """All readable configs (optionally of one kind), houses first, sorted by path."""
+        self.refresh()
+        return [e for e in self._by_id.values() if kind is None or e.kind == kind]
+
+    def get(self, entity_id: str, kind: Optional[str] = None) -> Optional[ConfigEntry]:
+        """Config for a customer_id / building_id (house wins if kind is None)."""
+        self.refresh()
+        if kind is not None:
+            return self._by_id.get((kind, entity_id))
+        return self._by_id.get(('house', entity_id)) or self._by_id.get(('building', entity_id))
+
+    def find_by_meter(self, meter_id: str) -> Optional[ConfigEntry]:
+        """Config an energy meter is mapped to."""
+        self.refresh()
+        return self._by_meter.get(str(meter_id).strip())
+
+    def find_by_client_id(self, client_id: str) -> Optional[ConfigEntry]:
+        """
+        House profile for a HomeSide client id (".../HEM_FJV_149/HEM_FJV_Villa_149"):
+        the last path segment, else the one before it, as customer_id.
+        """
+        self.refresh()
+        parts = client_id.split('/')
+        for customer_id in parts[-1:] + parts[-2:-1]:
+            entry = self._by_id.get(('house', customer_id))
+            if entry is not None:
+                return entry
+        return None
+
+    def find_by_name(self, friendly_name: str) -> List[ConfigEntry]:
+        """Configs with this friendly name (case-insensitive)."""
+        self.refresh()
+        return list(self._by_name.get(friendly_name.lower(), []))
+
+    def meter_mapping(self) -> Dict[str, dict]:
+        """meter_id -> {"id", "type", "friendly_name"} (see build_meter_mapping)."""
+        self.refresh()
+        return {
+            meter_id: {"id": e.entity_id, "type": e.kind, "friendly_name": e.friendly_name}
+            for meter_id, e in self._by_meter.items()
+        }
+
+
+_registries: Dict[Tuple[str, str], ConfigRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_config_registry(profiles_dir: str = 'profiles', buildings_dir: str = 'buildings') -> ConfigRegistry:
+    """The process-wide registry for a pair of directories."""
+    key = (os.path.abspath(profiles_dir), os.path.abspath(buildings_dir))
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = ConfigRegistry(profiles_dir, buildings_dir)
+        return registry
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Coverage Index
+Persistent bitmap of which 5-minute slots hold data, per (entity, measurement).
+
+Writers (InfluxDBWriter, BuildingInfluxWriter, the gap fillers) mark the slots
+they write; gap detection and the AI assistant's check_data_gaps scan the
+bitmap in memory instead of querying InfluxDB. An index only answers for the
+period it has been tracking (tracked_since onwards) - for older ranges it is
+seeded once from InfluxDB with a single aggregateWindow(count) query.
+
+File: <COVERAGE_DIR>/<entity_id>/<measurement>.json
+    {
+      "entity_id": "HEM_FJV_Villa_149",
+      "measurement": "heating_system",
+      "slot_seconds": 300,
+      "base_slot": 5928480,          # slot number (epoch // slot_seconds) of bit 0
+      "tracked_since_slot": 5928480,
+      "updated_at": "2026-10-18T10:00:00+00:00",
+      "bitmap": "<base64 zlib>"      # bit i set = slot base_slot + i has data
+    }
+
+90 days of 5-minute slots is ~3 KB uncompressed.
+
+Usage:
+    index = CoverageIndex.load('HEM_FJV_Villa_149', 'heating_system')
+    index.mark(timestamp, live=True)
+    index.save()
+    gaps = index.gaps(start, end, expected_interval_minutes=5)
+"""
+
+import base64
+import json
+import os
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+COVERAGE_DIR = os.getenv(
+    'COVERAGE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles', 'coverage'))
+SLOT_SECONDS = 300          # 5-minute slots
+RETENTION_DAYS = 400        # slots older than this are dropped on save
+
+
+def coverage_path(entity_id: str, measurement: str, directory: str = None) -> str:
+    """Path of the index file for an entity/measurement."""
+    return os.path.join(directory or COVERAGE_DIR, entity_id, f"{measurement}.json")
+
+
+class CoverageIndex:
+    """Bitmap of covered time slots for one (entity, measurement)."""
+
+    def __init__(self, entity_id: str, measurement: str, directory: str = None,
+                 slot_seconds: int = SLOT_SECONDS):
+        self.entity_id = entity_id
+        self.measurement = measurement
+        self.path = coverage_path(entity_id, measurement, directory)
+        self.slot_seconds = slot_seconds
+        self.base_slot: Optional[int] = None          # multiple of 8, slot of bit 0
+        self.tracked_since_slot: Optional[int] = None
+        self.bits = bytearray()
+        self.cleared: List[Tuple[int, int]] = []    # slot ranges cleared since last save
+        self.dirty = False
+
+    # ── Persistence ──────────────────────────────────────────────────
+
+    @classmethod
+    def load(cls, entity_id: str, measurement: str, directory: str = None,
+             slot_seconds: int = SLOT_SECONDS) -> 'CoverageIndex':
+        """Load the index from disk (empty index if missing or unreadable)."""
+        index = cls(entity_id, measurement, directory, slot_seconds)
+        data = index._read_file()
+        if data:
+            index.base_slot = data['base_slot']
+            index.tracked_since_slot = data['tracked_since_slot']
+            index.bits = data['bits']
+        return index
+
+    def _read_file(self) -> Optional[dict]:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            if data.get('slot_seconds') != self.slot_seconds:
+                return None
+            return {
+                'base_slot': data['base_slot'],
+                'tracked_since_slot': data.get('tracked_since_slot'),
+                'bits': bytearray(zlib.decompress(base64.b64decode(data['bitmap']))),
+            }
+        except (OSError, ValueError, KeyError, zlib.error):
+            return None
+
+    def save(self) -> None:
+        """
+        Merge with the file on disk (bitwise OR) and write it atomically.
+
+        Several processes can update the same index (fetcher + startup gap
+        filler), so merging keeps slots marked by the other writer. Ranges
+        cleared since the last save stay cleared.
+        """
+        on_disk = self._read_file()
+        if on_disk:
+            self._merge(on_disk['base_slot'], on_disk['bits'], on_disk['tracked_since_slot'])
+            for first, last in self.cleared:
+                self._clear_slots(first, last)
+        self.cleared = []
+        self._trim()
+        if self.base_slot is None:
+            return
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        data = {
+            'entity_id': self.entity_id,
+            'measurement': self.measurement,
+            'slot_seconds': self.slot_seconds,
+            'base_slot': self.base_slot,
+            'tracked_since_slot': self.tracked_since_slot,
+            'updated_at': datetime.now(timezone.utc).isoformat(),
+            'bitmap': base64.b64encode(zlib.compress(bytes(self.bits))).decode('ascii'),
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.write('\n')
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def _merge(self, base_slot: int, bits: bytearray, tracked_since_slot: Optional[int]) -> None:
+        if bits:
+            self._ensure(base_slot)
+            self._ensure(base_slot + len(bits) * 8 - 1)
+            offset = (base_slot - self.base_slot) // 8
+            for i, byte in enumerate(bits):
+                if byte:
+                    self.bits[offset + i] |= byte
+        if tracked_since_slot is not None:
+            self._track_from_slot(tracked_since_slot)
+
+    def _trim(self) -> None:
+        if self.base_slot is None:
+            return
+        cutoff = self._slot(datetime.now(timezone.utc) - timedelta(days=RETENTION_DAYS))
+        drop = (cutoff - self.base_slot) // 8
+        if drop > 0:
+            del self.bits[:drop]
+            self.base_slot += drop * 8
+            if self.tracked_since_slot is not None and self.tracked_since_slot < self.base_slot:
+                self.tracked_since_slot = self.base_slot
+
+    # ── Marking ──────────────────────────────────────────────────────
+
+    def _slot(self, ts: datetime) -> int:
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        return int(ts.timestamp()) // self.slot_seconds
+
+    def _slot_time(self, slot: int) -> datetime:
+        return datetime.fromtimestamp(slot * self.slot_seconds, timezone.utc)
+
+    def _ensure(self, slot: int) -> None:
+        """Grow the bitmap so it covers slot."""
+        if self.base_slot is None:
+            self.base_slot = slot - slot % 8
+            self.bits = bytearray(1)
+        if slot < self.base_slot:
+            new_base = slot - slot % 8
+            self.bits[0:0] = bytes((self.base_slot - new_base) // 8)
+            self.base_slot = new_base
+        needed = (slot - self.base_slot) // 8 + 1
+        if needed > len(self.bits):
+            self.bits.extend(bytes(needed - len(self.bits)))
+
+    def _track_from_slot(self, slot: int) -> None:
+        if self.tracked_since_slot is None or slot < self.tracked_since_slot:
+            self.tracked_since_slot = slot
+
+    def mark(self, ts: datetime, live: bool = False) -> None:
+        """
+        Record that ts has data.
+
+        Only sets the bit: historical writes (imports, gap fills) must not
+        make the index claim it tracked the time before them. A live write
+        (live=True) starts tracking from ts if the index isn't tracking yet.
+        """
+        slot = self._slot(ts)
+        self._ensure(slot)
+        offset = slot - self.base_slot
+        self.bits[offset >> 3] |= 1 << (offset & 7)
+        if live and self.tracked_since_slot is None:
+            self.tracked_since_slot = slot
+        self.dirty = True
+
+    def mark_many(self, timestamps: Iterable[datetime]) -> None:
+        """Record historical timestamps (bits only, see mark)."""
+        for ts in timestamps:
+            self.mark(ts)
+
+    def _clear_slots(self, first: int, last: int) -> None:
+        if self.base_slot is None:
+            return
+        first = max(first, self.base_slot)
+        last = min(last, self.base_slot + len(self.bits) * 8 - 1)
+        for slot in range(first, last + 1):
+            offset = slot - self.base_slot
+            self.bits[offset >> 3] &= ~(1 << (offset & 7)) & 0xFF
+
+    def clear(self, start_time: datetime, end_time: datetime) -> None:
+        """Record that [start_time, end_time) no longer has data (after a delete)."""
+        first = self._slot(start_time)
+        last = self._slot(end_time - timedelta(microseconds=1))
+        self._clear_slots(first, last)
+        self.cleared.append((first, last))
+        self.dirty = True
+
+    def track_from(self, ts: datetime) -> None:
+        """Declare the index authoritative from ts (after seeding that range)."""
+        slot = self._slot(ts)
+        self._ensure(slot)
+        self._track_from_slot(slot)
+        self.dirty = True
+
+    # ── Queries ──────────────────────────────────────────────────────
+
+    def covers(self, start_time: datetime) -> bool:
+        """True if the index has been tracking since start_time."""
+        return self.tracked_since_slot is not None and self.tracked_since_slot <= self._slot(start_time)
+
+    def _runs(self, start_time: datetime, end_time: datetime) -> Iterator[Tuple[int, int]]:
+        """(first_slot, last_slot) of each run of covered slots in [start_time, end_time)."""
+        if self.base_slot is None:
+            return
+        first = max(self._slot(start_time), self.base_slot)
+        last = min(self._slot(end_time - timedelta(microseconds=1)),
+                   self.base_slot + len(self.bits) * 8 - 1)
+        if first > last:
+            return
+        bits = self.bits
+        base = self.base_slot
+        run_start = None
+        for byte_index in range((first - base) >> 3, ((last - base) >> 3) + 1):
+            byte = bits[byte_index]
+            slot0 = base + (byte_index << 3)
+            if byte == 0xFF and first <= slot0 and slot0 + 7 <= last:
+                if run_start is None:
+                    run_start = slot0
+                continue
+            if byte == 0 and run_start is None:
+                continue
+            for bit in range(8):
+                slot = slot0 + bit
+                if slot < first or slot > last:
+                    continue
+                if byte & (1 << bit):
+                    if run_start is None:
+                        run_start = slot
+                elif run_start is not None:
+                    yield run_start, slot - 1
+                    run_start = None
+        if run_start is not None:
+            yield run_start, last
+
+    def count(self, start_time: datetime, end_time: datetime) -> int:
+        """Number of covered slots in [start_time, end_time)."""
+        return sum(run_end - run_start + 1 for run_start, run_end in self._runs(start_time, end_time))
+
+    def gaps(self, start_time: datetime, end_time: datetime,
+             expected_interval_minutes: int = 5) -> List[Tuple[datetime, datetime]]:
+        """
+        Gap intervals in [start_time, end_time): stretches between covered
+        slots longer than 2x the expected interval (same semantics as
+        gap_filler.find_gaps_flux, at slot resolution).
+        """
+        threshold = expected_interval_minutes * 2 * 60
+        gaps = []
+        prev_ts = None
+        for run_start, run_end in self._runs(start_time, end_time):
+            ts = self._slot_time(run_start)
+            if prev_ts is None:
+                prev_ts = start_time
+                ts = max(ts, start_time)
+            if (ts - prev_ts).total_seconds() > threshold:
+                gaps.append((prev_ts, ts))
+            prev_ts = self._slot_time(run_end)
+        if prev_ts is None:
+            return [(start_time, end_time)]
+        if (end_time - prev_ts).total_seconds() > threshold:
+            gaps.append((prev_ts, end_time))
+        return gaps
+
+    # ── Seeding ──────────────────────────────────────────────────────
+
+    def seed_from_influx(self, query_api, bucket: str, org: str,
+                         start_time: datetime, end_time: datetime,
+                         tag_key: str, fields: List[str] = None) -> int:
+        """
+        Mark every slot in [start_time, end_time) that has data in InfluxDB,
+        then track from start_time. One row per non-empty slot is returned.
+
+        Returns:
+            Number of slots marked
+        """
+        field_filter = ''
+        if fields:
+            predicate = ' or '.join(f'r["_field"] == "{f}"' for f in fields)
+            field_filter = f'|> filter(fn: (r) => {predicate})'
+
+        query = f'''
+            from(bucket: "{bucket}")
+            |> range(start: {start_time.isoformat()}, stop: {end_time.isoformat()})
+            |> filter(fn: (r) => r["_measurement"] == "{self.measurement}")
+            |> filter(fn: (r) => r["{tag_key}"] == "{self.entity_id}")
+            {field_filter}
+            |> keep(columns: ["_time"])
+            |> map(fn: (r) => ({{r with _value: 1}}))
+            |> group()
+            |> aggregateWindow(every: {self.slot_seconds}s, fn: count, createEmpty: false, timeSrc: "_start")
+        '''
+        tables = query_api.query(query, org=org)
+
+        marked = 0
+        for table in tables:
+            for record in table.records:
+                ts = record.get_time()
+                if ts is not None and (record.get_value() or 0) > 0:
+                    self.mark(ts)
+                    marked += 1
+        self.track_from(start_time)
+        return marked
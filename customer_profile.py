@@ -10,15 +10,41 @@ Each customer has a JSON file in the profiles/ directory containing:
 
 All customer-specific variables are centralized here for maintainability
 and future GUI integration.
+
+Persistence: save() writes atomically (temp file + rename) under a lock
+file. Each write bumps the profile's revision; if another process (e.g. the
+web GUI) wrote since this profile was loaded, only the fields changed here
+are applied on top of the file, so neither side's edits are lost.
+
+The fetcher calls defer_profile_saves() at startup: save() then only marks
+the profile dirty and flush_profiles() writes each dirty profile once per
+iteration (or once PROFILE_FLUSH_SECONDS have passed), skipping writes
+that wouldn't change the file.
 """
 
+import copy
 import json
 import os
 import logging
+import time
 from datetime import datetime
 from typing import Optional, Dict, Any
 from dataclasses import dataclass, field, asdict
 
+try:
+    import fcntl
+except ImportError:  # not on Windows; saves are then atomic but unlocked
+    fcntl = None
+
+from metrics import get_registry
+
+PROFILE_FLUSH_SECONDS = float(os.getenv('PROFILE_FLUSH_SECONDS', '300'))
+
+# Deferred saves (see defer_profile_saves): max delay, and dirty profiles by id()
+_flush_delay: Optional[float] = None
+_dirty_profiles: Dict[int, "CustomerProfile"] = {}
+_MISSING = object()
+
 
 @dataclass
 class BuildingConfig:
@@ -209,6 +235,7 @@ class CustomerProfile:
         profile.save()
     """
     schema_version: int = 1
+    revision: int = 0  # bumped on every write, for merging concurrent edits
     customer_id: str = ""
     friendly_name: str = ""
     meter_ids: list = field(default_factory=list)  # Energy meter IDs mapped to this house
@@ -224,6 +251,8 @@ class CustomerProfile:
 
     _profiles_dir: str = field(default="profiles", repr=False)
     _logger: logging.Logger = field(default=None, repr=False)
+    _saved: Optional[Dict[str, Any]] = field(default=None, repr=False)   # file contents as of load/last write
+    _dirty_since: Optional[float] = field(default=None, repr=False)      # monotonic time of first deferred save()
 
     def __post_init__(self):
         if self._logger is None:
@@ -257,6 +286,7 @@ class CustomerProfile:
         profile = cls._from_dict(data)
         profile._profiles_dir = profiles_dir
         profile._logger = logger
+        profile._saved = profile._serialize()
 
         logger.info(f"Loaded customer profile: {profile.friendly_name} ({customer_id})")
         return profile
@@ -264,14 +294,17 @@ class CustomerProfile:
     @classmethod
     def load_by_path(cls, filepath: str) -> "CustomerProfile":
         """Load a customer profile from a specific file path."""
-        logger = logging.getLogger(__name__)
-
         with open(filepath, 'r') as f:
             data = json.load(f)
+        return cls.from_data(data, filepath)
 
-        profile = cls._from_dict(data)
+    @classmethod
+    def from_data(cls, data: Dict[str, Any], filepath: str) -> "CustomerProfile":
+        """Profile from the already parsed contents of filepath (data is not modified)."""
+        profile = cls._from_dict(copy.deepcopy(data))
         profile._profiles_dir = os.path.dirname(filepath)
-        profile._logger = logger
+        profile._logger = logging.getLogger(__name__)
+        profile._saved = profile._serialize()
 
         return profile
 
@@ -295,6 +328,7 @@ class CustomerProfile:
 
         return cls(
             schema_version=data.get("schema_version", 1),
+            revision=data.get("revision", 0),
             customer_id=customer_id,
             friendly_name=data.get("friendly_name", ""),
             meter_ids=meter_ids,
@@ -309,12 +343,121 @@ class CustomerProfile:
             variable_overrides=data.get("variable_overrides", {})
         )
 
+    @property
+    def path(self) -> str:
+        return os.path.join(self._profiles_dir, f"{self.customer_id}.json")
+
     def save(self) -> None:
-        """Save the profile back to JSON file."""
-        filepath = os.path.join(self._profiles_dir, f"{self.customer_id}.json")
+        """
+        Save the profile back to its JSON file.
+
+        Writes immediately, unless defer_profile_saves() is active in this
+        process: then the profile is only marked dirty and written by
+        flush_profiles() (or here, once it has been dirty for the deferral
+        delay).
+        """
+        get_registry().counter(
+            'homeside_profile_saves_total', 'CustomerProfile.save() calls'
+        ).inc(customer_id=self.customer_id)
+
+        if _flush_delay is None:
+            self.flush()
+            return
 
+        now = time.monotonic()
+        if self._dirty_since is None:
+            self._dirty_since = now
+        _dirty_profiles[id(self)] = self
+        if now - self._dirty_since >= _flush_delay:
+            self.flush()
+
+    def flush(self) -> bool:
+        """
+        Write the profile if it differs from what was last loaded/written.
+
+        Atomic (temp file + os.replace) and locked against other writers.
+        If the file's revision moved on since this profile was read, the
+        fields changed here are merged into the file's contents (this
+        profile's value wins where both changed a field) and the fields
+        changed elsewhere are taken over into this profile.
+
+        Returns:
+            True if the file was written
+        """
+        ours = self._serialize()
+        if ours == self._saved:
+            self._mark_clean()
+            return False
+
+        filepath = self.path
+        lock = open(f"{filepath}.lock", 'a') if fcntl else None
+        try:
+            if lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+
+            try:
+                with open(filepath, 'r') as f:
+                    on_disk = json.load(f)
+            except (OSError, ValueError):
+                on_disk = None
+
+            data = ours
+            disk_revision = on_disk.get("revision", 0) if on_disk else 0
+            if on_disk and disk_revision != self.revision and self._saved is not None:
+                data = _merge_changes(on_disk, self._saved, ours)
+                self._adopt(data)
+                get_registry().counter(
+                    'homeside_profile_merges_total', 'Profile writes merged with a newer file revision'
+                ).inc(customer_id=self.customer_id)
+                self._logger.info(
+                    f"Merged customer profile {self.customer_id} with revision {disk_revision} on disk"
+                )
+
+            self.revision = max(self.revision, disk_revision) + 1
+            data["revision"] = self.revision
+
+            tmp_path = f"{filepath}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, filepath)
+        finally:
+            if lock:
+                lock.close()
+
+        self._saved = self._serialize()
+        self._mark_clean()
+        get_registry().counter(
+            'homeside_profile_flushes_total', 'CustomerProfile writes to disk'
+        ).inc(customer_id=self.customer_id)
+        self._logger.info(f"Saved customer profile: {self.customer_id}")
+        return True
+
+    def reload_sections(self, *sections: str) -> None:
+        """
+        Take over sections (e.g. "energy_separation") from the file, as
+        written by another profile object or process, keeping this
+        profile's other (possibly unsaved) changes.
+        """
+        fresh = CustomerProfile.load_by_path(self.path)
+        saved = fresh._serialize()
+        for name in sections:
+            setattr(self, name, getattr(fresh, name))
+            # The file already has these values: not a change to write back
+            if self._saved is not None:
+                if name in saved:
+                    self._saved[name] = saved[name]
+                else:
+                    self._saved.pop(name, None)
+
+    def _mark_clean(self) -> None:
+        _dirty_profiles.pop(id(self), None)
+        self._dirty_since = None
+
+    def _serialize(self) -> Dict[str, Any]:
+        """Profile as written to JSON."""
         data = {
             "schema_version": self.schema_version,
+            "revision": self.revision,
             "customer_id": self.customer_id,
             "friendly_name": self.friendly_name,
             "meter_ids": self.meter_ids,
@@ -337,15 +480,22 @@ class CustomerProfile:
         if data["cost"] == asdict(CostConfig()):
             del data["cost"]
 
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        return data
 
-        self._logger.info(f"Saved customer profile: {self.customer_id}")
+    def _adopt(self, data: Dict[str, Any]) -> None:
+        """Take over the sections of merged file contents that differ from this profile."""
+        merged = CustomerProfile._from_dict(copy.deepcopy(data))
+        for name in ("friendly_name", "building", "comfort", "cost", "heating_system", "learned",
+                     "energy_separation", "heat_curve_control", "thermal_test", "variable_overrides"):
+            value = getattr(merged, name)
+            if value != getattr(self, name):
+                setattr(self, name, value)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert profile to dictionary (for GUI/API)."""
         result = {
             "schema_version": self.schema_version,
+            "revision": self.revision,
             "customer_id": self.customer_id,
             "friendly_name": self.friendly_name,
             "meter_ids": self.meter_ids,
@@ -462,6 +612,44 @@ class CustomerProfile:
         }
 
 
+def _merge_changes(theirs: Dict[str, Any], base: Dict[str, Any], ours: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply the changes from base to ours onto theirs (nested dicts, ours wins on conflicts)."""
+    result = dict(theirs)
+    for key in set(base) | set(ours):
+        before = base.get(key, _MISSING)
+        after = ours.get(key, _MISSING)
+        if before == after:
+            continue
+        current = result.get(key, _MISSING)
+        if isinstance(before, dict) and isinstance(after, dict) and isinstance(current, dict):
+            result[key] = _merge_changes(current, before, after)
+        elif after is _MISSING:
+            result.pop(key, None)
+        else:
+            result[key] = after
+    return result
+
+
+def defer_profile_saves(max_delay_seconds: float = PROFILE_FLUSH_SECONDS) -> None:
+    """
+    Coalesce CustomerProfile.save() calls in this process: profiles are
+    written by flush_profiles(), or by save() once dirty for max_delay_seconds.
+    """
+    global _flush_delay
+    _flush_delay = max_delay_seconds
+
+
+def flush_profiles() -> int:
+    """Write all profiles with deferred saves. Returns the number written."""
+    written = 0
+    for profile in list(_dirty_profiles.values()):
+        try:
+            written += profile.flush()
+        except Exception as e:
+            profile._logger.error(f"Failed to save customer profile {profile.customer_id}: {e}")
+    return written
+
+
 def find_profile_for_client_id(client_id: str, profiles_dir: str = "profiles") -> Optional[CustomerProfile]:
     """
     Find a profile that matches a HomeSide client ID.
@@ -476,24 +664,18 @@ def find_profile_for_client_id(client_id: str, profiles_dir: str = "profiles") -
     Returns:
         CustomerProfile if found, None otherwise
     """
-    logger = logging.getLogger(__name__)
-
-    # Extract customer_id from full path (last segment)
-    parts = client_id.split("/")
-    possible_ids = [parts[-1]] if parts else []
+    from config_registry import get_config_registry
 
-    # Also try second-to-last if available
-    if len(parts) >= 2:
-        possible_ids.append(parts[-2])
+    logger = logging.getLogger(__name__)
 
-    # Check for matching profile file
-    for cust_id in possible_ids:
-        filepath = os.path.join(profiles_dir, f"{cust_id}.json")
-        if os.path.exists(filepath):
-            try:
-                return CustomerProfile.load(cust_id, profiles_dir)
-            except Exception as e:
-                logger.error(f"Failed to load profile {cust_id}: {e}")
+    entry = get_config_registry(profiles_dir).find_by_client_id(client_id)
+    if entry is not None:
+        cust_id = os.path.basename(entry.path)[:-len('.json')]
+        try:
+            return CustomerProfile.load(cust_id, profiles_dir)
+        except Exception as e:
+            logger.error(f"Failed to load profile {cust_id}: {e}")
+            return None
 
     logger.warning(f"No profile found for client_id: {client_id}")
     return None
@@ -513,12 +695,14 @@ def get_meter_ids_from_env(customer_id: str) -> list:
     return []
 
 
-def get_building_meter_ids(building_id: str, buildings_dir: str = "buildings") -> list:
+def get_building_meter_ids(building_id: str, buildings_dir: str = "buildings",
+                           data: Optional[Dict[str, Any]] = None) -> list:
     """
     Read meter_ids for a building.
 
     Checks BUILDING_<building_id>_METER_IDS env var first, then falls back
-    to the meter_ids field in the building's JSON config.
+    to the meter_ids field in the building's JSON config (or in data, if
+    the config has already been parsed).
 
     Returns:
         List of meter ID strings, or empty list if not configured.
@@ -530,17 +714,18 @@ def get_building_meter_ids(building_id: str, buildings_dir: str = "buildings") -
         return [m.strip() for m in value.split(",") if m.strip()]
 
     # Fall back to JSON config
-    filepath = os.path.join(buildings_dir, f"{building_id}.json")
-    if os.path.exists(filepath):
+    if data is None:
+        filepath = os.path.join(buildings_dir, f"{building_id}.json")
+        if not os.path.exists(filepath):
+            return []
         try:
             with open(filepath, 'r') as f:
                 data = json.load(f)
-            meter_ids = data.get('meter_ids', [])
-            return [str(m).strip() for m in meter_ids if str(m).strip()]
         except Exception:
-            pass
+            return []
 
-    return []
+    meter_ids = data.get('meter_ids', [])
+    return [str(m).strip() for m in meter_ids if str(m).strip()]
 
 
 def build_meter_mapping(profiles_dir: str = "profiles", buildings_dir: str = "buildings") -> Dict[str, dict]:
@@ -548,6 +733,7 @@ def build_meter_mapping(profiles_dir: str = "profiles", buildings_dir: str = "bu
     Build a mapping of meter_id -> entity info from all profiles and buildings.
 
     Used by the energy importer to look up which house/building a meter belongs to.
+    Served from the shared config registry (files are only re-read when changed).
 
     Args:
         profiles_dir: Directory containing house profile JSON files
@@ -557,70 +743,13 @@ def build_meter_mapping(profiles_dir: str = "profiles", buildings_dir: str = "bu
         Dictionary mapping meter_id to {"id": entity_id, "type": "house"|"building",
                                          "friendly_name": name}
     """
-    logger = logging.getLogger(__name__)
-    mapping = {}
+    from config_registry import get_config_registry
 
-    def _add_meter(meter_id: str, entity_id: str, entity_type: str, friendly_name: str):
-        meter_id = str(meter_id).strip()
-        if not meter_id:
-            return
-        if meter_id in mapping:
-            logger.warning(
-                f"Duplicate meter_id {meter_id}: "
-                f"already mapped to {mapping[meter_id]['id']}, "
-                f"ignoring mapping to {entity_id}"
-            )
-        else:
-            mapping[meter_id] = {
-                "id": entity_id,
-                "type": entity_type,
-                "friendly_name": friendly_name
-            }
-
-    # Scan house profiles
-    if os.path.exists(profiles_dir):
-        for filename in os.listdir(profiles_dir):
-            if not filename.endswith('.json') or '_signals.json' in filename:
-                continue
-
-            try:
-                filepath = os.path.join(profiles_dir, filename)
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
-
-                customer_id = data.get('customer_id', '')
-                friendly_name = data.get('friendly_name', customer_id)
-                meter_ids = get_meter_ids_from_env(customer_id)
-
-                for mid in meter_ids:
-                    _add_meter(mid, customer_id, "house", friendly_name)
-
-            except Exception as e:
-                logger.error(f"Error loading profile {filename}: {e}")
-    else:
+    logger = logging.getLogger(__name__)
+    if not os.path.exists(profiles_dir):
         logger.warning(f"Profiles directory not found: {profiles_dir}")
 
-    # Scan building configs
-    if os.path.exists(buildings_dir):
-        for filename in os.listdir(buildings_dir):
-            if not filename.endswith('.json') or '_signals.json' in filename:
-                continue
-
-            try:
-                filepath = os.path.join(buildings_dir, filename)
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
-
-                building_id = data.get('building_id', filename.replace('.json', ''))
-                friendly_name = data.get('friendly_name', building_id)
-                meter_ids = get_building_meter_ids(building_id, buildings_dir)
-
-                for mid in meter_ids:
-                    _add_meter(mid, building_id, "building", friendly_name)
-
-            except Exception as e:
-                logger.error(f"Error loading building config {filename}: {e}")
-
+    mapping = get_config_registry(profiles_dir, buildings_dir).meter_mapping()
     logger.info(f"Built meter mapping: {len(mapping)} meter(s) across profiles and buildings")
     return mapping
 
@@ -636,6 +765,7 @@ def find_customer_by_meter_id(meter_id: str, profiles_dir: str = "profiles") ->
     Returns:
         customer_id if found, None otherwise
     """
-    mapping = build_meter_mapping(profiles_dir)
-    entry = mapping.get(str(meter_id).strip())
-    return entry['id'] if entry else None
+    from config_registry import get_config_registry
+
+    entry = get_config_registry(profiles_dir).find_by_meter(meter_id)
+    return entry.entity_id if entry else None
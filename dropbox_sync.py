@@ -24,13 +24,12 @@ Usage:
     manager.sync_meters_to_dropbox()  # After profile changes or imports
 """
 
-import json
 import logging
 import os
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional
 
-from customer_profile import get_meter_ids_from_env, get_building_meter_ids
+from config_registry import get_config_registry
 from dropbox_client import DropboxClient, create_client_from_env
 
 logger = logging.getLogger(__name__)
@@ -53,6 +52,7 @@ class MeterRequestManager:
         self,
         dropbox_client: Optional[DropboxClient] = None,
         profiles_dir: str = 'profiles',
+        buildings_dir: str = 'buildings',
         influx_url: Optional[str] = None,
         influx_token: Optional[str] = None,
         influx_org: str = 'homeside',
@@ -64,6 +64,7 @@ class MeterRequestManager:
         Args:
             dropbox_client: DropboxClient instance (auto-created from env if None)
             profiles_dir: Directory containing customer profiles
+            buildings_dir: Directory containing building configs
             influx_url: InfluxDB URL for querying last import dates
             influx_token: InfluxDB token
             influx_org: InfluxDB organization
@@ -71,6 +72,7 @@ class MeterRequestManager:
         """
         self.dropbox = dropbox_client or create_client_from_env()
         self.profiles_dir = profiles_dir
+        self.buildings_dir = buildings_dir
 
         # InfluxDB settings for querying last import dates
         self.influx_url = influx_url or os.getenv('INFLUXDB_URL', 'http://localhost:8086')
@@ -105,58 +107,19 @@ class MeterRequestManager:
         Returns:
             List of profile dicts with meter_ids
         """
-        profiles = []
-
-        # Scan house profiles
-        if os.path.exists(self.profiles_dir):
-            for filename in os.listdir(self.profiles_dir):
-                if not filename.endswith('.json') or '_signals.json' in filename:
-                    continue
-
-                filepath = os.path.join(self.profiles_dir, filename)
-                try:
-                    with open(filepath, 'r') as f:
-                        data = json.load(f)
-
-                    customer_id = data.get('customer_id', '')
-                    meter_ids = get_meter_ids_from_env(customer_id)
-                    if meter_ids:
-                        profiles.append({
-                            'customer_id': customer_id,
-                            'friendly_name': data.get('friendly_name', ''),
-                            'meter_ids': meter_ids,
-                            'energy_data_start_date': data.get('energy_data_start_date')
-                        })
-                except Exception as e:
-                    logger.error(f"Error loading profile {filename}: {e}")
-        else:
+        if not os.path.exists(self.profiles_dir):
             logger.warning(f"Profiles directory not found: {self.profiles_dir}")
 
-        # Scan building configs
-        buildings_dir = 'buildings'
-        if os.path.exists(buildings_dir):
-            for filename in os.listdir(buildings_dir):
-                if not filename.endswith('.json') or '_signals.json' in filename:
-                    continue
-
-                filepath = os.path.join(buildings_dir, filename)
-                try:
-                    with open(filepath, 'r') as f:
-                        data = json.load(f)
-
-                    building_id = data.get('building_id', filename.replace('.json', ''))
-                    meter_ids = get_building_meter_ids(building_id, buildings_dir)
-                    if meter_ids:
-                        profiles.append({
-                            'customer_id': building_id,
-                            'friendly_name': data.get('friendly_name', ''),
-                            'meter_ids': meter_ids,
-                            'energy_data_start_date': data.get('energy_data_start_date')
-                        })
-                except Exception as e:
-                    logger.error(f"Error loading building config {filename}: {e}")
-
-        return profiles
+        return [
+            {
+                'customer_id': entry.entity_id,
+                'friendly_name': entry.friendly_name,
+                'meter_ids': entry.meter_ids,
+                'energy_data_start_date': entry.data.get('energy_data_start_date')
+            }
+            for entry in get_config_registry(self.profiles_dir, self.buildings_dir).entries()
+            if entry.meter_ids
+        ]
 
     def get_last_import_date(self, meter_id: str) -> Optional[datetime]:
         """
@@ -338,6 +301,7 @@ def main():
 
     parser = argparse.ArgumentParser(description='Sync meter requests to Dropbox')
     parser.add_argument('--profiles-dir', default='profiles', help='Profiles directory')
+    parser.add_argument('--buildings-dir', default='buildings', help='Building configs directory')
     parser.add_argument('--dry-run', action='store_true', help='Show what would be synced')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
     args = parser.parse_args()
@@ -348,7 +312,7 @@ def main():
         format='%(asctime)s - %(levelname)s - %(message)s'
     )
 
-    manager = MeterRequestManager(profiles_dir=args.profiles_dir)
+    manager = MeterRequestManager(profiles_dir=args.profiles_dir, buildings_dir=args.buildings_dir)
 
     try:
         if args.dry_run:
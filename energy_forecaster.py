@@ -16,17 +16,51 @@ Where k is calibrated from historical data (typically 0.05-0.15 kW/°C).
 Example: k=0.0685, indoor=22°C, effective_outdoor=-5°C
     power = 0.0685 × (22 - (-5)) = 0.0685 × 27 = 1.85 kW
     energy/day = 1.85 × 24 = 44.4 kWh
+
+Uncertainty bands: generate_forecast(scenarios=N) also runs N perturbed
+scenarios (temperature error growing with lead time, cloud cover ±2 octas)
+side by side through the thermal-mass loop and attaches p10/p90 bands and a
+free-heat probability to each point. Sun position is computed once per hour
+for all scenarios, so the ensemble costs a fraction of N single runs.
+
+Incremental updates: the weather terms (wind, humidity, sun position) of
+the last forecast are reused while the weather forecast is unchanged, and
+update_energy_forecast() picks out the points that moved by more than
+INCREMENTAL_TOLERANCE so only those are rewritten.
+
+Benchmark:
+    python3 energy_forecaster.py --bench
 """
 
+import argparse
+import math
+import random
+import time
+from statistics import NormalDist
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Optional
-from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Tuple
+from dataclasses import dataclass, field, fields
 from zoneinfo import ZoneInfo
 
-from energy_models.weather_energy_model import WeatherConditions, SimpleWeatherModel
+from energy_models.weather_energy_model import SimpleWeatherModel, WeatherTerms, weather_terms
 
 SWEDISH_TZ = ZoneInfo('Europe/Stockholm')
 
+# Ensemble (scenario) forecast
+ENSEMBLE_SCENARIOS = 50
+ENSEMBLE_TEMP_SIGMA = 0.5               # °C forecast error at lead time 0
+ENSEMBLE_TEMP_SIGMA_PER_HOUR = 0.04     # growth per lead hour (~3.4 °C at 72h)
+ENSEMBLE_CLOUD_SIGMA = 1.0              # octas (95% within ±2 octas)
+ENSEMBLE_ERROR_CORRELATION = 0.9        # hour-to-hour persistence of forecast errors
+ENSEMBLE_LOW_PERCENTILE = 10
+ENSEMBLE_HIGH_PERCENTILE = 90
+
+INCREMENTAL_TOLERANCE = 0.01            # relative (min 0.01 absolute) per field; smaller changes aren't rewritten
+
+# Standard normal quantiles; sampling from this table with random.choices is
+# much cheaper than one random.gauss() call per scenario and hour
+_NORMAL_QUANTILES = [NormalDist().inv_cdf((i + 0.5) / 1024) for i in range(1024)]
+
 
 @dataclass
 class EnergyForecastPoint:
@@ -46,6 +80,15 @@ class EnergyForecastPoint:
     cloud_cover: Optional[float] = None
     humidity: Optional[float] = None
 
+    # Ensemble bands (generate_forecast with scenarios > 0), None otherwise
+    heating_energy_kwh_p10: Optional[float] = None
+    heating_energy_kwh_p90: Optional[float] = None
+    effective_temp_p10: Optional[float] = None
+    effective_temp_p90: Optional[float] = None
+    free_heat_probability: Optional[float] = None  # share of scenarios with eff >= target
+    cumulative_energy_kwh_p10: Optional[float] = None  # energy from the first point through this one
+    cumulative_energy_kwh_p90: Optional[float] = None
+
     @property
     def timestamp_swedish(self) -> str:
         if self.timestamp.tzinfo is None:
@@ -74,6 +117,63 @@ class EnergyForecastSummary:
     avg_outdoor_temp: float
     min_outdoor_temp: float
     hours: int
+    total_energy_kwh_p10: Optional[float] = None  # ensemble range of the total
+    total_energy_kwh_p90: Optional[float] = None
+
+
+@dataclass
+class ForecastHours:
+    """
+    Weather forecast hours parsed into columns (as reported, before the
+    model defaults for missing values are applied).
+    """
+    timestamps: List[datetime] = field(default_factory=list)
+    outdoor: List[float] = field(default_factory=list)
+    lead_times: List[float] = field(default_factory=list)
+    wind_speeds: List[Optional[float]] = field(default_factory=list)
+    humidities: List[Optional[float]] = field(default_factory=list)
+    cloud_covers: List[Optional[float]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def parse(cls, weather_forecast: List[Dict], logger=None) -> 'ForecastHours':
+        """Parse SMHI forecast dicts, skipping points without time or temperature."""
+        hours = cls()
+        for wp in weather_forecast:
+            try:
+                time_str = wp.get('time')
+                if not time_str:
+                    continue
+                timestamp = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
+                outdoor_temp = wp.get('temp')
+                if outdoor_temp is None:
+                    continue
+                outdoor_temp = float(outdoor_temp)
+                lead_time = float(wp.get('hour', 0.0))
+            except Exception as e:
+                if logger:
+                    logger.warning(f"Error processing forecast point: {e}")
+                continue
+            hours.timestamps.append(timestamp)
+            hours.outdoor.append(outdoor_temp)
+            hours.lead_times.append(lead_time)
+            hours.wind_speeds.append(wp.get('wind_speed', 0.0))
+            hours.humidities.append(wp.get('humidity', 80.0))      # Default to typical Nordic humidity
+            hours.cloud_covers.append(wp.get('cloud_cover', 4.0))  # Default to partly cloudy
+        return hours
+
+    def weather_terms(self, latitude: float, longitude: float) -> WeatherTerms:
+        """Weather terms for these hours at one location (shared by all houses there)."""
+        return weather_terms(
+            self.timestamps,
+            [w or 0.0 for w in self.wind_speeds],
+            [h or 80.0 for h in self.humidities],
+            [c or 4.0 for c in self.cloud_covers],
+            latitude,
+            longitude,
+        )
 
 
 class EnergyForecaster:
@@ -145,6 +245,9 @@ class EnergyForecaster:
         else:
             self.weather_model = SimpleWeatherModel()
 
+        # (key, terms) of the last forecast, reused while the weather is unchanged
+        self._terms_cache: Optional[Tuple[tuple, WeatherTerms]] = None
+
     @classmethod
     def from_profile(cls, profile, latitude: float, longitude: float, logger=None) -> 'EnergyForecaster':
         """
@@ -180,7 +283,8 @@ class EnergyForecaster:
     def generate_forecast(
         self,
         weather_forecast: List[Dict],
-        current_indoor_temp: Optional[float] = None
+        current_indoor_temp: Optional[float] = None,
+        scenarios: int = 0
     ) -> List[EnergyForecastPoint]:
         """
         Generate hourly energy forecast from weather forecast.
@@ -190,6 +294,8 @@ class EnergyForecaster:
                 [{'time': str, 'temp': float, 'hour': float,
                   'wind_speed': float, 'humidity': float, 'cloud_cover': float}, ...]
             current_indoor_temp: Current indoor temp (defaults to target)
+            scenarios: Number of perturbed scenarios for uncertainty bands
+                (0 = deterministic forecast only)
 
         Returns:
             List of EnergyForecastPoint for each forecast hour
@@ -197,96 +303,183 @@ class EnergyForecaster:
         if not weather_forecast:
             return []
 
+        hours = ForecastHours.parse(weather_forecast, self.logger)
+        key = (tuple(hours.timestamps), tuple(hours.wind_speeds), tuple(hours.humidities),
+               tuple(hours.cloud_covers), self.latitude, self.longitude)
+        if self._terms_cache is not None and self._terms_cache[0] == key:
+            terms = self._terms_cache[1]
+        else:
+            terms = hours.weather_terms(self.latitude, self.longitude)
+            self._terms_cache = (key, terms)
+        return self.forecast_from_terms(hours, terms, current_indoor_temp, scenarios)
+
+    def forecast_from_terms(
+        self,
+        hours: 'ForecastHours',
+        terms: WeatherTerms,
+        current_indoor_temp: Optional[float] = None,
+        scenarios: int = 0
+    ) -> List[EnergyForecastPoint]:
+        """
+        Energy forecast from a parsed weather forecast and its weather terms.
+
+        generate_forecast() for one house; the fleet forecaster computes the
+        terms once per location and calls this for every house there.
+        """
         T_indoor = current_indoor_temp or self.target_indoor_temp
-        target = self.target_indoor_temp
+        start_indoor = T_indoor
+        k_wind = self.weather_model.wind_coefficient
+        k_humidity = self.weather_model.humidity_coefficient
+        k_solar = self.weather_model.solar_coefficient
         forecast_points = []
+        # Per point: (temp sigma, solar change per octa of cloud, cloud cover)
+        perturbations = []
         dt = 1.0  # hours per step
 
-        for wp in weather_forecast:
-            try:
-                # Parse timestamp
-                time_str = wp.get('time')
-                if not time_str:
-                    continue
-
-                timestamp = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
-
-                # Get weather parameters
-                outdoor_temp = wp.get('temp')
-                if outdoor_temp is None:
-                    continue
+        for i, outdoor_temp in enumerate(hours.outdoor):
+            if terms.solar_intensity[i] is None:
+                continue
+            wind_effect = k_wind * terms.sqrt_wind[i]
+            humidity_effect = k_humidity * terms.humidity_excess[i]
+            solar_effect = k_solar * terms.solar_intensity[i]
+            effective_temp = outdoor_temp - wind_effect - humidity_effect + solar_effect
+
+            heating_energy, T_indoor = self._thermal_step(T_indoor, effective_temp, dt)
+            heating_power = heating_energy / dt
+            lead_time = hours.lead_times[i]
+
+            forecast_points.append(EnergyForecastPoint(
+                timestamp=hours.timestamps[i],
+                outdoor_temp=outdoor_temp,
+                effective_temp=effective_temp,
+                wind_effect=-wind_effect,
+                solar_effect=solar_effect,
+                humidity_effect=-humidity_effect,
+                heating_power_kw=round(heating_power, 3),
+                heating_energy_kwh=round(heating_energy, 3),
+                lead_time_hours=round(lead_time, 1),
+                wind_speed=hours.wind_speeds[i],
+                cloud_cover=hours.cloud_covers[i],
+                humidity=hours.humidities[i]
+            ))
+            perturbations.append((
+                ENSEMBLE_TEMP_SIGMA + ENSEMBLE_TEMP_SIGMA_PER_HOUR * max(0.0, lead_time),
+                self._solar_per_octa(terms.sun_elevation[i]),
+                hours.cloud_covers[i] or 4.0,
+            ))
+
+        if scenarios > 0 and forecast_points:
+            self._add_ensemble_bands(forecast_points, perturbations, start_indoor, scenarios, dt)
 
-                wind_speed = wp.get('wind_speed', 0.0)
-                humidity = wp.get('humidity', 80.0)  # Default to typical Nordic humidity
-                cloud_cover = wp.get('cloud_cover', 4.0)  # Default to partly cloudy
-                lead_time = wp.get('hour', 0.0)
-
-                # Calculate effective outdoor temperature
-                conditions = WeatherConditions(
-                    temperature=outdoor_temp,
-                    wind_speed=wind_speed or 0.0,
-                    humidity=humidity or 80.0,
-                    cloud_cover=cloud_cover or 4.0,
-                    latitude=self.latitude,
-                    longitude=self.longitude,
-                    timestamp=timestamp
-                )
+        return forecast_points
 
-                eff_result = self.weather_model.effective_temperature(conditions)
-                effective_temp = eff_result.effective_temp
-
-                # Thermal mass simulation:
-                # Heat loss to outdoors: Q_loss = k × (T_indoor - T_eff) × dt
-                # Thermostat heating: compensates loss to maintain target,
-                # but can't remove heat (no cooling)
-                heat_loss = self.heat_loss_k * (T_indoor - effective_temp) * dt  # kWh
-
-                if heat_loss > 0 and T_indoor <= target:
-                    # Below or at target: heating system compensates all losses
-                    heating_energy = heat_loss
-                    # T_indoor stays at target (thermostat maintains it)
-                    T_indoor = target
-                elif heat_loss > 0 and T_indoor > target:
-                    # Above target: thermostat off, building cools naturally
-                    heating_energy = 0.0
-                    T_indoor -= heat_loss / self.thermal_capacity
-                    # If cooling brings us below target, partial heating kicks in
-                    if T_indoor < target:
-                        # Heating covers the deficit below target
-                        deficit = (target - T_indoor) * self.thermal_capacity  # kWh
-                        heating_energy = deficit
-                        T_indoor = target
-                else:
-                    # Effective temp >= indoor: building gains heat, no heating needed
-                    heating_energy = 0.0
-                    # Building warms from environment (capped: won't exceed eff temp)
-                    heat_gain = -heat_loss  # positive kWh
-                    T_indoor += heat_gain / self.thermal_capacity
-                    T_indoor = min(T_indoor, effective_temp)
-
-                heating_power = heating_energy / dt
-
-                forecast_points.append(EnergyForecastPoint(
-                    timestamp=timestamp,
-                    outdoor_temp=outdoor_temp,
-                    effective_temp=effective_temp,
-                    wind_effect=eff_result.wind_effect,
-                    solar_effect=eff_result.solar_effect,
-                    humidity_effect=eff_result.humidity_effect,
-                    heating_power_kw=round(heating_power, 3),
-                    heating_energy_kwh=round(heating_energy, 3),
-                    lead_time_hours=round(lead_time, 1),
-                    wind_speed=wind_speed,
-                    cloud_cover=cloud_cover,
-                    humidity=humidity
-                ))
+    def _thermal_step(self, T_indoor: float, effective_temp: float, dt: float = 1.0) -> tuple:
+        """
+        One step of the thermal mass simulation.
 
-            except Exception as e:
-                if self.logger:
-                    self.logger.warning(f"Error processing forecast point: {e}")
-                continue
+        Returns:
+            (heating_energy_kwh, new_T_indoor)
+        """
+        target = self.target_indoor_temp
 
-        return forecast_points
+        # Heat loss to outdoors: Q_loss = k × (T_indoor - T_eff) × dt
+        # Thermostat heating: compensates loss to maintain target,
+        # but can't remove heat (no cooling)
+        heat_loss = self.heat_loss_k * (T_indoor - effective_temp) * dt  # kWh
+
+        if heat_loss > 0 and T_indoor <= target:
+            # Below or at target: heating system compensates all losses
+            # T_indoor stays at target (thermostat maintains it)
+            return heat_loss, target
+
+        if heat_loss > 0:
+            # Above target: thermostat off, building cools naturally
+            T_indoor -= heat_loss / self.thermal_capacity
+            # If cooling brings us below target, partial heating kicks in
+            if T_indoor < target:
+                # Heating covers the deficit below target
+                deficit = (target - T_indoor) * self.thermal_capacity  # kWh
+                return deficit, target
+            return 0.0, T_indoor
+
+        # Effective temp >= indoor: building gains heat, no heating needed
+        # Building warms from environment (capped: won't exceed eff temp)
+        heat_gain = -heat_loss  # positive kWh
+        return 0.0, min(T_indoor + heat_gain / self.thermal_capacity, effective_temp)
+
+    def _solar_per_octa(self, sun_elevation: Optional[float]) -> float:
+        """
+        Change in solar effect per octa of cloud cover, as computed by
+        SimpleWeatherModel for this sun elevation (None = cloud-only estimate).
+        """
+        k_solar = self.weather_model.solar_coefficient
+        if sun_elevation is None:
+            return -k_solar * 0.5 / 8.0
+        if sun_elevation <= 0:
+            return 0.0
+        return -k_solar * math.sin(math.radians(sun_elevation)) * 0.9 / 8.0
+
+    def _add_ensemble_bands(
+        self,
+        points: List[EnergyForecastPoint],
+        perturbations: List[tuple],
+        start_indoor: float,
+        scenarios: int,
+        dt: float
+    ) -> None:
+        """
+        Run `scenarios` perturbed copies of the forecast through the thermal
+        mass loop, hour by hour for all scenarios at once, and store p10/p90
+        bands on the points.
+
+        Temperature and cloud errors are AR(1) processes per scenario, so a
+        scenario that runs cold stays cold for a while (errors persist like
+        real forecast errors). The sun position is reused from the
+        deterministic run; each scenario only shifts the effective
+        temperature. Seeded from the first timestamp, so bands are stable
+        when the same forecast is recomputed.
+        """
+        rng = random.Random(int(points[0].timestamp.timestamp()))
+        choices = rng.choices
+        rho = ENSEMBLE_ERROR_CORRELATION
+        innovation = math.sqrt(1.0 - rho * rho)
+        target = self.target_indoor_temp
+        step = self._thermal_step
+        low = ENSEMBLE_LOW_PERCENTILE
+        high = ENSEMBLE_HIGH_PERCENTILE
+
+        temp_errors = choices(_NORMAL_QUANTILES, k=scenarios)
+        cloud_errors = choices(_NORMAL_QUANTILES, k=scenarios)
+        indoor = [start_indoor] * scenarios
+        totals = [0.0] * scenarios
+
+        for point, (temp_sigma, solar_per_octa, cloud) in zip(points, perturbations):
+            effective = []
+            for i in range(scenarios):
+                cloud_i = min(8.0, max(0.0, cloud + ENSEMBLE_CLOUD_SIGMA * cloud_errors[i]))
+                effective.append(point.effective_temp
+                                 + temp_sigma * temp_errors[i]
+                                 + solar_per_octa * (cloud_i - cloud))
+            steps = [step(t, e, dt) for t, e in zip(indoor, effective)]
+            indoor = [t for _, t in steps]
+            totals = [total + e for total, (e, _) in zip(totals, steps)]
+            energy = sorted(e for e, _ in steps)
+            cumulative = sorted(totals)
+            free_heat = sum(1 for e in effective if e >= target)
+            effective.sort()
+
+            point.heating_energy_kwh_p10 = round(_percentile(energy, low), 3)
+            point.heating_energy_kwh_p90 = round(_percentile(energy, high), 3)
+            point.effective_temp_p10 = round(_percentile(effective, low), 2)
+            point.effective_temp_p90 = round(_percentile(effective, high), 2)
+            point.free_heat_probability = round(free_heat / scenarios, 2)
+            point.cumulative_energy_kwh_p10 = round(_percentile(cumulative, low), 1)
+            point.cumulative_energy_kwh_p90 = round(_percentile(cumulative, high), 1)
+
+            temp_errors = [rho * z + innovation * n
+                           for z, n in zip(temp_errors, choices(_NORMAL_QUANTILES, k=scenarios))]
+            cloud_errors = [rho * z + innovation * n
+                            for z, n in zip(cloud_errors, choices(_NORMAL_QUANTILES, k=scenarios))]
 
     def get_summary(
         self,
@@ -322,7 +515,9 @@ class EnergyForecaster:
             peak_power_kw=round(max(powers), 2),
             avg_outdoor_temp=round(sum(outdoor_temps) / len(outdoor_temps), 1),
             min_outdoor_temp=round(min(outdoor_temps), 1),
-            hours=len(points)
+            hours=len(points),
+            total_energy_kwh_p10=points[-1].cumulative_energy_kwh_p10,
+            total_energy_kwh_p90=points[-1].cumulative_energy_kwh_p90
         )
 
     def get_daily_totals(
@@ -344,6 +539,52 @@ class EnergyForecaster:
         return {k: round(v, 1) for k, v in daily.items()}
 
 
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of an ascending list."""
+    position = (len(sorted_values) - 1) * pct / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def update_energy_forecast(
+    written: List[EnergyForecastPoint],
+    points: List[EnergyForecastPoint],
+    tolerance: float = INCREMENTAL_TOLERANCE
+) -> Optional[List[EnergyForecastPoint]]:
+    """
+    Fold a newer forecast for the same hours into the points last written.
+
+    Points with any value (lead time aside) moved by more than tolerance
+    (relative, at least tolerance absolute - the cumulative fields grow
+    large) replace their entry in written; the rest stay, so written keeps
+    matching what is stored and small changes can't drift. Replacements are
+    the newer points, so their lead_time_hours is relative to the newer
+    forecast (energy_forecast rows have no generation tag to keep).
+
+    Returns:
+        The replaced points (to write), or None if the hours differ or
+        bands appeared/disappeared and the forecast has to be rewritten
+    """
+    if [p.timestamp for p in points] != [p.timestamp for p in written]:
+        return None
+
+    names = [f.name for f in fields(EnergyForecastPoint) if f.name not in ('timestamp', 'lead_time_hours')]
+    changed = []
+    for i, (old, new) in enumerate(zip(written, points)):
+        moved = False
+        for name in names:
+            a, b = getattr(old, name), getattr(new, name)
+            if (a is None) != (b is None):
+                return None
+            if a is not None and abs(b - a) > tolerance * max(1.0, abs(a)):
+                moved = True
+        if moved:
+            written[i] = new
+            changed.append(new)
+    return changed
+
+
 def format_energy_forecast(
     forecast_points: List[EnergyForecastPoint],
     summary_24h: Optional[EnergyForecastSummary] = None,
@@ -357,6 +598,10 @@ def format_energy_forecast(
         lines.append(f"   Avg power: {summary_24h.avg_power_kw:.2f} kW, Peak: {summary_24h.peak_power_kw:.2f} kW")
         lines.append(f"   Outdoor: avg {summary_24h.avg_outdoor_temp:.1f}°C, min {summary_24h.min_outdoor_temp:.1f}°C")
 
+    if summary_24h and summary_24h.total_energy_kwh_p10 is not None:
+        lines.append(f"   Range (p10-p90): {summary_24h.total_energy_kwh_p10:.1f}-"
+                     f"{summary_24h.total_energy_kwh_p90:.1f} kWh")
+
     if summary_72h:
         lines.append(f"⚡ Energy Forecast (72h): {summary_72h.total_energy_kwh:.1f} kWh")
 
@@ -366,7 +611,8 @@ def format_energy_forecast(
 def _detect_free_heat_windows(
     points: List[EnergyForecastPoint],
     target_indoor_temp: float,
-    min_duration_hours: float = 2.0
+    min_duration_hours: float = 2.0,
+    min_probability: Optional[float] = None
 ) -> List[FreeHeatWindow]:
     """
     Detect continuous periods where effective_temp >= target_indoor_temp.
@@ -378,6 +624,9 @@ def _detect_free_heat_windows(
         points: Hourly energy forecast points (from EnergyForecaster.generate_forecast)
         target_indoor_temp: Target indoor temperature (°C)
         min_duration_hours: Minimum window duration to include (hours)
+        min_probability: If set, an hour counts when at least this share of
+            ensemble scenarios is free heat (points without bands fall back
+            to the deterministic effective_temp)
 
     Returns:
         List of FreeHeatWindow, sorted by start time
@@ -392,7 +641,11 @@ def _detect_free_heat_windows(
     current_group = []
 
     for point in points:
-        if point.effective_temp >= target_indoor_temp:
+        if min_probability is not None and point.free_heat_probability is not None:
+            free = point.free_heat_probability >= min_probability
+        else:
+            free = point.effective_temp >= target_indoor_temp
+        if free:
             current_group.append(point)
         else:
             if current_group:
@@ -423,3 +676,64 @@ def _detect_free_heat_windows(
         ))
 
     return result
+
+
+def bench_energy_forecaster(horizons=(72, 240), scenarios: int = ENSEMBLE_SCENARIOS, runs: int = 5) -> None:
+    """Time a deterministic forecast against one with ensemble bands."""
+    rng = random.Random(1)
+    forecaster = EnergyForecaster(heat_loss_k=0.0685, target_indoor_temp=21.0)
+    now = datetime(2026, 3, 20, 6, 0, tzinfo=timezone.utc)
+
+    for hours in horizons:
+        weather_forecast = [{
+            'time': (now + timedelta(hours=h + 1)).isoformat().replace('+00:00', 'Z'),
+            'temp': round(2 + 6 * math.sin(2 * math.pi * (h - 8) / 24) + rng.gauss(0, 1), 1),
+            'hour': h + 1,
+            'wind_speed': round(abs(rng.gauss(4, 2)), 1),
+            'humidity': round(rng.uniform(60, 95)),
+            'cloud_cover': rng.randint(1, 8),
+        } for h in range(hours)]
+
+        start = time.perf_counter()
+        for _ in range(runs):
+            forecaster._terms_cache = None
+            forecaster.generate_forecast(weather_forecast, current_indoor_temp=21.0)
+        single = (time.perf_counter() - start) / runs
+
+        start = time.perf_counter()
+        for _ in range(runs):
+            forecaster._terms_cache = None
+            points = forecaster.generate_forecast(weather_forecast, current_indoor_temp=21.0,
+                                                  scenarios=scenarios)
+        ensemble = (time.perf_counter() - start) / runs
+
+        # Incremental: same weather, only the indoor reading moves
+        written = list(points)
+        rewritten = 0
+        start = time.perf_counter()
+        for run in range(runs):
+            update = forecaster.generate_forecast(weather_forecast, current_indoor_temp=21.0 + 0.1 * (run + 1),
+                                                  scenarios=scenarios)
+            rewritten += len(update_energy_forecast(written, update))
+        incremental = (time.perf_counter() - start) / runs
+
+        summary = forecaster.get_summary(points, hours=hours)
+        print(f"{hours}h horizon, {scenarios} scenarios: total {summary.total_energy_kwh:.1f} kWh "
+              f"(p10-p90 {summary.total_energy_kwh_p10:.1f}-{summary.total_energy_kwh_p90:.1f})")
+        print(f"  single run: {single * 1000:7.2f} ms")
+        print(f"  ensemble:   {ensemble * 1000:7.2f} ms ({ensemble / single:.1f}x single run, "
+              f"vs {scenarios}x for {scenarios} separate runs)")
+        print(f"  indoor-only update: {incremental * 1000:7.2f} ms, "
+              f"{rewritten // runs} of {len(points)} points rewritten per update")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Energy forecaster')
+    parser.add_argument('--bench', action='store_true',
+                        help='Benchmark deterministic vs ensemble forecast for 72h and 240h horizons')
+    parser.add_argument('--scenarios', type=int, default=ENSEMBLE_SCENARIOS)
+    args = parser.parse_args()
+    if args.bench:
+        bench_energy_forecaster(scenarios=args.scenarios)
+    else:
+        parser.print_help()
@@ -16,7 +16,7 @@ import math
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Protocol
+from typing import List, Optional, Protocol, Sequence
 
 from astral import LocationInfo
 from astral.sun import sun, elevation
@@ -163,6 +163,47 @@ class SimpleWeatherModel(WeatherEnergyModel):
             solar_intensity=solar_intensity,
         )
 
+    def effective_temperatures(
+        self,
+        timestamps: Sequence[datetime],
+        temperatures: Sequence[float],
+        wind_speeds: Sequence[Optional[float]],
+        humidities: Sequence[Optional[float]],
+        cloud_covers: Sequence[Optional[float]],
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+    ) -> List[Optional[float]]:
+        """
+        Effective temperature for a whole forecast in one pass (columns of
+        equal length, one location).
+
+        Same formula and defaults as effective_temperature(), without the
+        per-point breakdown; the location is set up once instead of per point.
+        Entries that effective_temperature() could not compute (missing
+        temperature or cloud cover) are None.
+        """
+        terms = weather_terms(timestamps, wind_speeds, humidities, cloud_covers, latitude, longitude)
+        return self.effective_from_terms(temperatures, terms)
+
+    def effective_from_terms(
+        self,
+        temperatures: Sequence[Optional[float]],
+        terms: 'WeatherTerms',
+    ) -> List[Optional[float]]:
+        """
+        Effective temperature per hour from precomputed weather_terms(), so
+        several models (e.g. one per house) can share one sun-position pass.
+        """
+        k_wind = self.wind_coefficient
+        k_humidity = self.humidity_coefficient
+        k_solar = self.solar_coefficient
+        return [
+            temp - k_wind * wind - k_humidity * humidity + k_solar * solar
+            if temp is not None and solar is not None else None
+            for temp, wind, humidity, solar in zip(
+                temperatures, terms.sqrt_wind, terms.humidity_excess, terms.solar_intensity)
+        ]
+
     def _calculate_solar_effect(self, conditions: WeatherConditions) -> tuple[float, Optional[float], Optional[float]]:
         """
         Calculate solar heating effect.
@@ -217,6 +258,76 @@ class SimpleWeatherModel(WeatherEnergyModel):
             return solar_effect, None, solar_intensity
 
 
+@dataclass
+class WeatherTerms:
+    """
+    Coefficient-free weather terms per forecast hour for one location.
+
+    For any SimpleWeatherModel:
+        effective = temp - k_wind × sqrt_wind - k_humidity × humidity_excess
+                    + k_solar × solar_intensity
+    Entries are None where the hour has no cloud cover.
+    """
+    sqrt_wind: List[Optional[float]]
+    humidity_excess: List[Optional[float]]
+    solar_intensity: List[Optional[float]]
+    sun_elevation: List[Optional[float]]    # None without location / if astral failed
+
+
+def weather_terms(
+    timestamps: Sequence[datetime],
+    wind_speeds: Sequence[Optional[float]],
+    humidities: Sequence[Optional[float]],
+    cloud_covers: Sequence[Optional[float]],
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+) -> WeatherTerms:
+    """
+    Weather terms for a forecast (same defaults as
+    SimpleWeatherModel.effective_temperature: wind 3.0 m/s, humidity 60%).
+
+    The sun position is computed once per hour here, however many models
+    evaluate the terms afterwards.
+    """
+    observer = None
+    if latitude is not None and longitude is not None:
+        try:
+            observer = LocationInfo(latitude=latitude, longitude=longitude).observer
+        except Exception:
+            observer = False    # per-hour fallback, as in _calculate_solar_effect
+
+    terms = WeatherTerms([], [], [], [])
+    for ts, wind, humidity, cloud in zip(timestamps, wind_speeds, humidities, cloud_covers):
+        if cloud is None:
+            for column in (terms.sqrt_wind, terms.humidity_excess, terms.solar_intensity, terms.sun_elevation):
+                column.append(None)
+            continue
+        wind = 3.0 if wind is None else wind
+        humidity = 60.0 if humidity is None else humidity
+        cloud_fraction = cloud / 8.0
+
+        sun_elev = None
+        if observer is None:
+            intensity = (1.0 - cloud_fraction) * 0.5     # assume mid-day average
+        else:
+            try:
+                sun_elev = elevation(observer, ts) if observer else None
+            except Exception:
+                sun_elev = None
+            if sun_elev is None:
+                intensity = (1.0 - cloud_fraction) * 0.5
+            elif sun_elev <= 0:
+                intensity = 0.0
+            else:
+                intensity = math.sin(math.radians(sun_elev)) * (1.0 - cloud_fraction * 0.9)
+
+        terms.sqrt_wind.append(math.sqrt(max(0, wind)))
+        terms.humidity_excess.append(max(0, humidity - 50))
+        terms.solar_intensity.append(intensity)
+        terms.sun_elevation.append(sun_elev)
+    return terms
+
+
 class CalibratedWeatherModel(SimpleWeatherModel):
     """
     Weather model with coefficients calibrated to a specific building.
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Fleet Energy Forecaster
+
+Energy forecasts for every calibrated house in one job, instead of one
+EnergyForecaster per house process.
+
+Houses are grouped by location cell (coordinates rounded to 3 decimals, the
+same key as the shared SMHI forecast cache). For each cell the weather
+forecast is read once and its weather terms (wind, humidity, sun position)
+are computed once; every house's heat-loss model is then evaluated against
+those terms (houses × hours). All houses are written in a single bulk
+InfluxDB write, together with the fleet totals (energy_forecast_fleet) that
+get_energy_forecast_all() reads directly.
+
+With FLEET_ENERGY_FORECAST=true the orchestrator runs this job every
+weather.forecast_interval_minutes and the house fetchers stop computing
+their own energy forecast (they read the fleet result back for free-heat
+detection).
+
+Usage:
+    python fleet_energy_forecaster.py                  # forecast and write
+    python fleet_energy_forecaster.py --dry-run        # forecast, print summary only
+    python fleet_energy_forecaster.py --bench          # fleet pass vs per-house runs
+
+Environment:
+    INFLUXDB_URL, INFLUXDB_TOKEN, INFLUXDB_ORG, INFLUXDB_BUCKET
+    LATITUDE, LONGITUDE        — house location (as for HSF_Fetcher)
+    FLEET_ENERGY_FORECAST      — true: fleet job replaces per-house forecasts
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from config_registry import get_config_registry
+from customer_profile import CustomerProfile
+from energy_forecaster import ENSEMBLE_SCENARIOS, EnergyForecaster, EnergyForecastPoint, ForecastHours
+
+logger = logging.getLogger(__name__)
+
+FLEET_ENERGY_FORECAST = os.getenv('FLEET_ENERGY_FORECAST', 'false').lower() == 'true'
+PROFILES_DIR = "profiles"
+SETTINGS_FILE = "settings.json"
+DEFAULT_LATITUDE = 58.41
+DEFAULT_LONGITUDE = 15.62
+INDOOR_LOOKBACK_HOURS = 2       # latest room_temperature younger than this seeds the simulation
+
+
+def location_cell(latitude: float, longitude: float) -> str:
+    """Location cell key (same rounding as the shared weather forecast cache)."""
+    return f"{latitude:.3f},{longitude:.3f}"
+
+
+@dataclass
+class FleetHouse:
+    """One calibrated house in the fleet forecast."""
+    house_id: str
+    forecaster: EnergyForecaster
+    current_indoor_temp: Optional[float] = None
+
+    @property
+    def cell(self) -> str:
+        return location_cell(self.forecaster.latitude, self.forecaster.longitude)
+
+
+def load_fleet(profiles_dir: str = PROFILES_DIR, latitude: float = DEFAULT_LATITUDE,
+               longitude: float = DEFAULT_LONGITUDE) -> List[FleetHouse]:
+    """Every house profile with a calibrated heat_loss_k (from the shared config registry)."""
+    houses = []
+    for entry in get_config_registry(profiles_dir).entries('house'):
+        if not (entry.data.get('energy_separation') or {}).get('heat_loss_k'):
+            continue
+        try:
+            profile = CustomerProfile.from_data(entry.data, entry.path)
+        except Exception as e:
+            logger.warning(f"Failed to load {os.path.basename(entry.path)}: {e}")
+            continue
+        if not profile.customer_id:
+            continue
+        forecaster = EnergyForecaster.from_profile(profile, latitude=latitude, longitude=longitude)
+        houses.append(FleetHouse(house_id=profile.customer_id, forecaster=forecaster))
+    return houses
+
+
+def group_by_cell(houses: List[FleetHouse]) -> Dict[str, List[FleetHouse]]:
+    """Houses grouped by location cell."""
+    cells: Dict[str, List[FleetHouse]] = {}
+    for house in houses:
+        cells.setdefault(house.cell, []).append(house)
+    return cells
+
+
+def forecast_cell(houses: List[FleetHouse], weather_forecast: List[Dict],
+                  scenarios: int = 0) -> Dict[str, List[EnergyForecastPoint]]:
+    """
+    Energy forecast for all houses of one location cell.
+
+    The forecast is parsed and its weather terms computed once (at the first
+    house's coordinates); each house then only evaluates its own
+    coefficients and thermal mass over the shared terms.
+
+    Returns:
+        house_id -> forecast points (same values as the house's own
+        EnergyForecaster.generate_forecast)
+    """
+    if not houses or not weather_forecast:
+        return {}
+    hours = ForecastHours.parse(weather_forecast, logger)
+    first = houses[0].forecaster
+    terms = hours.weather_terms(first.latitude, first.longitude)
+    return {
+        house.house_id: house.forecaster.forecast_from_terms(
+            hours, terms, house.current_indoor_temp, scenarios)
+        for house in houses
+    }
+
+
+def read_latest_indoor_temps(influx, house_ids: List[str]) -> Dict[str, float]:
+    """Latest room_temperature per house (one query for the whole fleet)."""
+    wanted = set(house_ids)
+    query = f'''
+        from(bucket: "{influx.bucket}")
+        |> range(start: -{INDOOR_LOOKBACK_HOURS}h)
+        |> filter(fn: (r) => r["_measurement"] == "heating_system")
+        |> filter(fn: (r) => r["_field"] == "room_temperature")
+        |> last()
+    '''
+    temps = {}
+    try:
+        for table in influx.client.query_api().query(query, org=influx.org):
+            for record in table.records:
+                house_id = record.values.get('house_id')
+                if house_id in wanted and record.get_value() is not None:
+                    temps[house_id] = float(record.get_value())
+    except Exception as e:
+        logger.warning(f"Failed to read indoor temperatures: {e}")
+    return temps
+
+
+def fetch_cell_forecast(influx, latitude: float, longitude: float, hours_ahead: int) -> Optional[List[Dict]]:
+    """Shared forecast cache for the cell, falling back to SMHI (and filling the cache)."""
+    forecast = influx.read_shared_weather_forecast(latitude, longitude) if influx else None
+    if forecast:
+        return forecast
+
+    from smhi_weather import SMHIWeather
+    forecast = SMHIWeather(latitude, longitude, logger).get_forecast(hours_ahead=hours_ahead)
+    if forecast and influx:
+        influx.delete_old_shared_weather_forecasts()
+        influx.write_shared_weather_forecast(forecast, latitude, longitude)
+    return forecast
+
+
+def run_fleet_forecast(influx, houses: List[FleetHouse], hours_ahead: int = 72,
+                       scenarios: int = ENSEMBLE_SCENARIOS,
+                       dry_run: bool = False) -> Dict[str, List[EnergyForecastPoint]]:
+    """
+    Forecast every house and write the result in one bulk write.
+
+    Returns:
+        house_id -> forecast points
+    """
+    if influx:
+        indoor = read_latest_indoor_temps(influx, [h.house_id for h in houses])
+        for house in houses:
+            house.current_indoor_temp = indoor.get(house.house_id)
+
+    forecasts: Dict[str, List[EnergyForecastPoint]] = {}
+    for cell, cell_houses in group_by_cell(houses).items():
+        first = cell_houses[0].forecaster
+        weather_forecast = fetch_cell_forecast(influx, first.latitude, first.longitude, hours_ahead)
+        if not weather_forecast:
+            logger.warning(f"No weather forecast for cell {cell}, skipping {len(cell_houses)} house(s)")
+            continue
+        forecasts.update(forecast_cell(cell_houses, weather_forecast, scenarios))
+        logger.info(f"Cell {cell}: {len(cell_houses)} house(s) x {len(weather_forecast)} hours")
+
+    forecasts = {house_id: points for house_id, points in forecasts.items() if points}
+    if dry_run or not influx or not forecasts:
+        return forecasts
+
+    influx.delete_future_fleet_energy_forecasts(list(forecasts))
+    influx.write_fleet_energy_forecast(forecasts)
+    return forecasts
+
+
+def bench_fleet_forecaster(houses: int = 200, hours: int = 72, scenarios: int = 0) -> None:
+    """Time one fleet pass against a generate_forecast call per house (one cell)."""
+    import math
+    import random
+
+    rng = random.Random(1)
+    now = datetime(2026, 3, 20, 6, 0, tzinfo=timezone.utc)
+    weather_forecast = [{
+        'time': (now + timedelta(hours=h + 1)).isoformat().replace('+00:00', 'Z'),
+        'temp': round(2 + 6 * math.sin(2 * math.pi * (h - 8) / 24) + rng.gauss(0, 1), 1),
+        'hour': h + 1,
+        'wind_speed': round(abs(rng.gauss(4, 2)), 1),
+        'humidity': round(rng.uniform(60, 95)),
+        'cloud_cover': rng.randint(1, 8),
+    } for h in range(hours)]
+    fleet = [FleetHouse(
+        house_id=f"bench_{i}",
+        forecaster=EnergyForecaster(
+            heat_loss_k=rng.uniform(0.04, 0.15),
+            target_indoor_temp=rng.choice([20.0, 21.0, 22.0]),
+            solar_coefficient_ml2=rng.uniform(5, 30),
+            wind_coefficient_ml2=rng.uniform(0.1, 0.6),
+            solar_confidence_ml2=rng.uniform(0, 1),
+            thermal_time_constant=rng.uniform(40, 120),
+        ),
+        current_indoor_temp=rng.uniform(19, 23),
+    ) for i in range(houses)]
+
+    start = time.perf_counter()
+    separate = {h.house_id: h.forecaster.generate_forecast(weather_forecast, h.current_indoor_temp, scenarios)
+                for h in fleet}
+    separate_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = forecast_cell(fleet, weather_forecast, scenarios)
+    batched_time = time.perf_counter() - start
+
+    same = all(separate[h] == batched[h] for h in separate)
+    total = sum(p.heating_energy_kwh for points in batched.values() for p in points)
+    print(f"{houses} houses x {hours}h, {scenarios} scenarios: fleet total {total:.0f} kWh, "
+          f"matches per-house forecasts: {same}")
+    print(f"  per house: {separate_time * 1000:8.1f} ms")
+    print(f"  fleet:     {batched_time * 1000:8.1f} ms ({separate_time / batched_time:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Energy forecast for all calibrated houses')
+    parser.add_argument('--dry-run', action='store_true', help='Forecast without writing to InfluxDB')
+    parser.add_argument('--scenarios', type=int, default=ENSEMBLE_SCENARIOS,
+                        help=f'Ensemble scenarios per house (default: {ENSEMBLE_SCENARIOS})')
+    parser.add_argument('--bench', action='store_true', help='Benchmark fleet pass vs per-house forecasts')
+    parser.add_argument('--houses', type=int, default=200, help='Houses for --bench')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.bench:
+        bench_fleet_forecaster(houses=args.houses)
+        return
+
+    hours_ahead = 72
+    try:
+        with open(SETTINGS_FILE) as f:
+            hours_ahead = json.load(f).get('weather', {}).get('forecast_hours', 72)
+    except (OSError, ValueError):
+        pass
+
+    latitude = float(os.getenv('LATITUDE', DEFAULT_LATITUDE))
+    longitude = float(os.getenv('LONGITUDE', DEFAULT_LONGITUDE))
+    houses = load_fleet(PROFILES_DIR, latitude, longitude)
+    if not houses:
+        print("No calibrated houses found")
+        return
+
+    influx_token = os.environ.get('INFLUXDB_TOKEN')
+    if not influx_token and not args.dry_run:
+        print("Error: INFLUXDB_TOKEN environment variable required")
+        sys.exit(1)
+
+    influx = None
+    if influx_token:
+        from influx_writer import InfluxDBWriter
+        influx = InfluxDBWriter(
+            url=os.environ.get('INFLUXDB_URL', 'http://localhost:8086'),
+            token=influx_token,
+            org=os.environ.get('INFLUXDB_ORG', 'homeside'),
+            bucket=os.environ.get('INFLUXDB_BUCKET', 'heating'),
+            house_id='fleet',
+            logger=logger,
+        )
+
+    start = time.perf_counter()
+    forecasts = run_fleet_forecast(influx, houses, hours_ahead=hours_ahead,
+                                   scenarios=args.scenarios, dry_run=args.dry_run)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{'='*60}")
+    print(f"Fleet Energy Forecast: {len(forecasts)}/{len(houses)} house(s) in {elapsed:.1f}s"
+          f"{' (dry run)' if args.dry_run else ''}")
+    for house_id, points in sorted(forecasts.items()):
+        total_24h = sum(p.heating_energy_kwh for p in points[:24])
+        print(f"  {house_id}: {total_24h:.1f} kWh next 24h")
+
+
+if __name__ == "__main__":
+    main()
@@ -22,7 +22,9 @@ import json
 import os
 import sys
 import argparse
-import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
@@ -37,12 +39,23 @@ try:
 except ImportError:
     INFLUX_AVAILABLE = False
 
-from import_historical_data import ArrigoHistoricalClient
+from coverage_index import CoverageIndex
+from import_historical_data import ArrigoHistoricalClient, PointBatchWriter, DEFAULT_WRITE_BATCH_SIZE
 from smhi_weather import SMHIWeather
+from weather_store import (STATION_MEASUREMENT, current_station, link_point,
+                           read_entity_weather, station_point)
 
 # Swedish timezone
 SWEDISH_TZ = ZoneInfo('Europe/Stockholm')
 
+# Bootstrap history fetching (ArrigoBootstrapper phase 1)
+BOOTSTRAP_FETCH_CONCURRENCY = 6     # max parallel Arrigo history requests
+BOOTSTRAP_WINDOW_DAYS = 15          # per-signal time window fetched per request
+BOOTSTRAP_FETCH_RETRIES = 3         # attempts per (signal, window) before it counts as failed
+BOOTSTRAP_CHUNK_DAYS = 7            # days fetched, checked and written per streaming step
+BOOTSTRAP_CHECKPOINT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                        'bootstrap_checkpoints')
+
 
 class DummyLogger:
     """Minimal logger for standalone script use."""
@@ -52,6 +65,184 @@ class DummyLogger:
     def debug(self, msg): pass
 
 
+def _utc(ts: datetime) -> datetime:
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts
+
+
+def gaps_from_timestamps(
+    timestamps,
+    start_time: datetime,
+    end_time: datetime,
+    gap_threshold: timedelta
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Gap intervals from raw timestamps (fallback when the data is already local).
+
+    Works on sorted epoch seconds with a single pairwise pass, so it stays
+    linear and allocation-light for large ranges.
+
+    Returns:
+        List of (gap_start, gap_end) tuples, where gap_start/gap_end are the
+        surrounding data points (or the range bounds at the edges)
+    """
+    epochs = sorted({ts.timestamp() for ts in timestamps})
+    if not epochs:
+        return [(start_time, end_time)]
+
+    threshold = gap_threshold.total_seconds()
+    bounds = [start_time.timestamp()] + epochs + [end_time.timestamp()]
+    gaps = []
+    for i, (prev, cur) in enumerate(zip(bounds, bounds[1:])):
+        if cur - prev > threshold:
+            gap_start = start_time if i == 0 else datetime.fromtimestamp(prev, timezone.utc)
+            gap_end = end_time if i == len(bounds) - 2 else datetime.fromtimestamp(cur, timezone.utc)
+            gaps.append((gap_start, gap_end))
+    return gaps
+
+
+def find_gaps_flux(
+    query_api,
+    bucket: str,
+    org: str,
+    start_time: datetime,
+    end_time: datetime,
+    measurement: str,
+    tag_key: str,
+    tag_value: str,
+    fields: List[str] = None,
+    expected_interval_minutes: int = 5
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Find gaps server-side: Flux computes elapsed() between consecutive
+    timestamps and only the gap rows plus first/last timestamps come back.
+
+    A gap is any stretch longer than 2x the expected interval, including the
+    stretches between the range bounds and the first/last point - the same
+    semantics as gaps_from_timestamps().
+
+    Args:
+        query_api: influxdb_client query API
+        bucket / org: Query target
+        start_time / end_time: Range to check
+        measurement: Measurement to check
+        tag_key / tag_value: Entity filter (e.g. house_id / building_id)
+        fields: Fields whose timestamps count as data (None = any field)
+        expected_interval_minutes: Expected data interval
+
+    Returns:
+        List of (gap_start, gap_end) tuples
+
+    Raises:
+        Exception from the query API (callers fall back to raw timestamps)
+    """
+    threshold_seconds = expected_interval_minutes * 2 * 60
+    field_filter = ''
+    if fields:
+        predicate = ' or '.join(f'r["_field"] == "{f}"' for f in fields)
+        field_filter = f'|> filter(fn: (r) => {predicate})'
+
+    query = f'''
+        data = from(bucket: "{bucket}")
+            |> range(start: {start_time.isoformat()}, stop: {end_time.isoformat()})
+            |> filter(fn: (r) => r["_measurement"] == "{measurement}")
+            |> filter(fn: (r) => r["{tag_key}"] == "{tag_value}")
+            {field_filter}
+            |> keep(columns: ["_time"])
+            |> group()
+            |> unique(column: "_time")
+            |> sort(columns: ["_time"])
+
+        data
+            |> elapsed(unit: 1s, columnName: "gap_seconds")
+            |> filter(fn: (r) => r.gap_seconds > {threshold_seconds})
+            |> yield(name: "gaps")
+
+        data |> first(column: "_time") |> yield(name: "first")
+        data |> last(column: "_time") |> yield(name: "last")
+    '''
+
+    tables = query_api.query(query, org=org)
+
+    interior = []
+    first_ts = last_ts = None
+    for table in tables:
+        for record in table.records:
+            ts = record.get_time()
+            if ts is None:
+                continue
+            ts = _utc(ts)
+            result = record.values.get('result')
+            if result == 'gaps':
+                interior.append((ts - timedelta(seconds=int(record.values['gap_seconds'])), ts))
+            elif result == 'first':
+                first_ts = ts
+            elif result == 'last':
+                last_ts = ts
+
+    if first_ts is None:
+        # No data at all - entire range is a gap
+        return [(start_time, end_time)]
+
+    threshold = timedelta(seconds=threshold_seconds)
+    gaps = []
+    if first_ts - start_time > threshold:
+        gaps.append((start_time, first_ts))
+    gaps.extend(sorted(interior))
+    if end_time - last_ts > threshold:
+        gaps.append((last_ts, end_time))
+    return gaps
+
+
+def coverage_gaps(
+    query_api,
+    bucket: str,
+    org: str,
+    start_time: datetime,
+    end_time: datetime,
+    measurement: str,
+    tag_key: str,
+    tag_value: str,
+    fields: List[str] = None,
+    expected_interval_minutes: int = 5
+) -> Optional[List[Tuple[datetime, datetime]]]:
+    """
+    Gaps from the on-disk coverage index, seeding it from InfluxDB first if it
+    has not been tracking since start_time. Returns None if the index can't
+    answer (caller falls back to find_gaps_flux).
+    """
+    try:
+        index = CoverageIndex.load(tag_value, measurement)
+        if not index.covers(start_time):
+            index.seed_from_influx(query_api, bucket, org, start_time, end_time, tag_key, fields)
+            index.save()
+        return index.gaps(start_time, end_time, expected_interval_minutes)
+    except Exception as e:
+        print(f"Coverage index unavailable for {tag_value}/{measurement} ({e})")
+        return None
+
+
+def clear_coverage(entity_id: str, measurement: str, start_time: datetime, end_time: datetime) -> None:
+    """Unmark a deleted range in the coverage index (non-critical)."""
+    try:
+        index = CoverageIndex.load(entity_id, measurement)
+        index.clear(start_time, end_time)
+        index.save()
+    except Exception as e:
+        print(f"Coverage index update failed for {entity_id}/{measurement}: {e}")
+
+
+def record_coverage(entity_id: str, measurement: str, timestamps: List[datetime]) -> None:
+    """Mark freshly written timestamps in the coverage index (non-critical)."""
+    if not timestamps:
+        return
+    try:
+        index = CoverageIndex.load(entity_id, measurement)
+        index.mark_many(timestamps)
+        index.save()
+    except Exception as e:
+        print(f"Coverage index update failed for {entity_id}/{measurement}: {e}")
+
+
 class GapDetector:
     """Detects gaps in InfluxDB data."""
 
@@ -84,7 +275,23 @@ class GapDetector:
         Returns:
             List of (gap_start, gap_end) tuples
         """
-        # Query all timestamps in the range - just get one field to reduce data
+        fields = ["room_temperature", "outdoor_temperature"]
+        gaps = coverage_gaps(
+            self.query_api, self.bucket, self.org, start_time, end_time,
+            measurement, "house_id", self.house_id, fields, expected_interval_minutes
+        )
+        if gaps is not None:
+            return gaps
+
+        try:
+            return find_gaps_flux(
+                self.query_api, self.bucket, self.org, start_time, end_time,
+                measurement, "house_id", self.house_id, fields, expected_interval_minutes
+            )
+        except Exception as e:
+            print(f"Server-side gap detection failed ({e}), falling back to raw timestamps")
+
+        # Fallback: pull every timestamp and scan locally
         query = f'''
             from(bucket: "{self.bucket}")
             |> range(start: {start_time.isoformat()}, stop: {end_time.isoformat()})
@@ -96,41 +303,10 @@ class GapDetector:
 
         try:
             tables = self.query_api.query(query, org=self.org)
-
-            timestamps = []
-            for table in tables:
-                for record in table.records:
-                    ts = record.get_time()
-                    if ts:
-                        if ts.tzinfo is None:
-                            ts = ts.replace(tzinfo=timezone.utc)
-                        timestamps.append(ts)
-
-            # Sort and deduplicate
-            timestamps = sorted(set(timestamps))
-
-            if not timestamps:
-                # No data at all - entire range is a gap
-                return [(start_time, end_time)]
-
-            gaps = []
-            gap_threshold = timedelta(minutes=expected_interval_minutes * 2)
-
-            # Check gap at start
-            if timestamps[0] - start_time > gap_threshold:
-                gaps.append((start_time, timestamps[0]))
-
-            # Check gaps between points
-            for i in range(1, len(timestamps)):
-                delta = timestamps[i] - timestamps[i-1]
-                if delta > gap_threshold:
-                    gaps.append((timestamps[i-1], timestamps[i]))
-
-            # Check gap at end
-            if end_time - timestamps[-1] > gap_threshold:
-                gaps.append((timestamps[-1], end_time))
-
-            return gaps
+            timestamps = [_utc(record.get_time()) for table in tables
+                          for record in table.records if record.get_time()]
+            return gaps_from_timestamps(timestamps, start_time, end_time,
+                                        timedelta(minutes=expected_interval_minutes * 2))
 
         except Exception as e:
             print(f"Error detecting gaps: {e}")
@@ -200,7 +376,8 @@ class GapFiller:
         arrigo_username: str,
         arrigo_password: str,
         arrigo_host: str = None,
-        verbose: bool = False
+        verbose: bool = False,
+        write_batch_size: int = DEFAULT_WRITE_BATCH_SIZE
     ):
         self.influx_url = influx_url
         self.influx_token = influx_token
@@ -212,6 +389,7 @@ class GapFiller:
         self.arrigo_password = arrigo_password
         self.arrigo_host = arrigo_host
         self.verbose = verbose
+        self.write_batch_size = write_batch_size
 
         self.detector = None
         self.arrigo_client = None
@@ -359,6 +537,15 @@ class GapFiller:
 
         write_api = self.write_client.write_api(write_options=SYNCHRONOUS)
 
+        def report_error(rows, error):
+            if writer.rows_failed <= 5:
+                print(f"  Error writing point: {error}")
+
+        # Both points for a timestamp are queued together and flushed in batches
+        writer = PointBatchWriter(write_api, self.influx_bucket, self.influx_org,
+                                  batch_size=self.write_batch_size, on_error=report_error)
+        written_times = []
+
         for ts, fields in sorted(filtered_data.items()):
             # Check if we should skip this timestamp
             if skip_existing and ts in existing_data:
@@ -394,8 +581,6 @@ class GapFiller:
                     if 'return_temp' in fields:
                         thermal_point.field("return_temp", round(float(fields['return_temp']), 2))
 
-                    write_api.write(bucket=self.influx_bucket, org=self.influx_org, record=thermal_point)
-
                     # Write to heating_system
                     heating_point = Point("heating_system") \
                         .tag("house_id", self.house_id) \
@@ -404,7 +589,8 @@ class GapFiller:
                     for field, value in fields.items():
                         heating_point.field(field, round(float(value), 2))
 
-                    write_api.write(bucket=self.influx_bucket, org=self.influx_org, record=heating_point)
+                    writer.add(thermal_point, heating_point)
+                    written_times.append(ts)
 
                 written += 1
 
@@ -413,6 +599,15 @@ class GapFiller:
                 if errors <= 5:
                     print(f"  Error writing {ts}: {e}")
 
+        if not dry_run:
+            writer.flush()
+            written -= writer.rows_failed
+            errors += writer.rows_failed
+            print(f"  {writer.points_written} points in {writer.requests} write requests "
+                  f"({writer.points_per_second:,.0f} points/s)")
+            if not writer.rows_failed:
+                record_coverage(self.house_id, "heating_system", written_times)
+
         action = "Would write" if dry_run else "Wrote"
         print(f"\n  {action}: {written}, Skipped: {skipped}, Errors: {errors}")
 
@@ -501,54 +696,8 @@ class WeatherGapFiller:
         expected_interval_minutes: int = 5
     ) -> List[Tuple[datetime, datetime]]:
         """Detect gaps in weather observation data."""
-        query = f'''
-            from(bucket: "{self.influx_bucket}")
-            |> range(start: {start_time.isoformat()}, stop: {end_time.isoformat()})
-            |> filter(fn: (r) => r["_measurement"] == "weather_observation")
-            |> filter(fn: (r) => r["house_id"] == "{self.house_id}")
-            |> filter(fn: (r) => r["_field"] == "temperature")
-            |> keep(columns: ["_time"])
-        '''
-
-        try:
-            tables = self.query_api.query(query, org=self.influx_org)
-
-            timestamps = []
-            for table in tables:
-                for record in table.records:
-                    ts = record.get_time()
-                    if ts:
-                        if ts.tzinfo is None:
-                            ts = ts.replace(tzinfo=timezone.utc)
-                        timestamps.append(ts)
-
-            timestamps = sorted(set(timestamps))
-
-            if not timestamps:
-                return [(start_time, end_time)]
-
-            gaps = []
-            gap_threshold = timedelta(minutes=expected_interval_minutes * 2)
-
-            # Check gap at start
-            if timestamps[0] - start_time > gap_threshold:
-                gaps.append((start_time, timestamps[0]))
-
-            # Check gaps between points
-            for i in range(len(timestamps) - 1):
-                delta = timestamps[i + 1] - timestamps[i]
-                if delta > gap_threshold:
-                    gaps.append((timestamps[i], timestamps[i + 1]))
-
-            # Check gap at end
-            if end_time - timestamps[-1] > gap_threshold:
-                gaps.append((timestamps[-1], end_time))
-
-            return gaps
-
-        except Exception as e:
-            print(f"Error detecting weather gaps: {e}")
-            return []
+        return self._detect_weather_gaps_for(self.house_id, start_time, end_time,
+                                             expected_interval_minutes)
 
     def fill_weather_gaps(
         self,
@@ -561,33 +710,56 @@ class WeatherGapFiller:
         """
         Detect and fill weather observation gaps using SMHI historical data.
 
-        Weather data is the same for all houses sharing a location (same SMHI
-        station). When all_house_ids is provided, SMHI is fetched once and
-        gaps are filled for every house_id. Without it, only self.house_id
-        is filled.
+        Weather is stored once per SMHI station (weather_store), so gaps are
+        detected and filled on the nearest station's series and each house
+        in all_house_ids (default: self.house_id) is linked to that station.
 
         Returns:
             Tuple of (written, skipped, errors)
         """
         house_ids = all_house_ids or [self.house_id]
 
-        # Detect gaps per house and collect union of all gap periods
-        per_house_gaps = {}
-        all_gap_periods = []
-        for hid in house_ids:
-            gaps = self._detect_weather_gaps_for(hid, start_time, end_time, expected_interval_minutes)
-            per_house_gaps[hid] = gaps
-            all_gap_periods.extend(gaps)
-
-        if not all_gap_periods:
-            return 0, 0, 0
-
-        # Fetch SMHI once for the full range
         smhi = SMHIWeather(
             latitude=self.latitude,
             longitude=self.longitude,
             logger=self.logger
         )
+        station = smhi._find_nearest_station(SMHIWeather.PARAM_TEMP)
+        if not station:
+            print("  Weather: No SMHI station found")
+            return 0, 0, 0
+        station_id = str(station.id)
+
+        # Link houses that are not (yet) on this station
+        links = []
+        for hid in house_ids:
+            try:
+                linked = current_station(self.query_api, self.influx_bucket, self.influx_org, hid)
+            except Exception as e:
+                print(f"  Weather [{hid}]: could not read station link: {e}")
+                linked = None
+            if linked != station_id:
+                links.append(link_point(hid, station_id, station.distance_km, start_time))
+        if links and not dry_run:
+            try:
+                self.write_api.write(bucket=self.influx_bucket, org=self.influx_org, record=links)
+            except Exception as e:
+                print(f"  Weather: station link write error: {e}")
+        if links:
+            action = "Would link" if dry_run else "Linked"
+            print(f"  Weather: {action} {len(links)} house(s) to station {station.name} ({station_id})")
+
+        gaps = self.detect_station_gaps(station_id, start_time, end_time, expected_interval_minutes)
+        if not gaps:
+            print(f"  Weather [{station.name}]: no gaps")
+            return 0, 0, 0
+
+        total_gap_minutes = sum(
+            (gap_end - gap_start).total_seconds() / 60
+            for gap_start, gap_end in gaps
+        )
+
+        # Fetch SMHI once for the full range
         observations = smhi.get_historical_observations(start_time, end_time)
 
         if not observations:
@@ -596,73 +768,80 @@ class WeatherGapFiller:
 
         print(f"  Weather: Retrieved {len(observations)} observations from SMHI")
 
-        total_written = 0
-        total_skipped = 0
-        total_errors = 0
+        # Filter observations to those within the station's gaps
+        gap_observations = []
+        for obs in observations:
+            ts = obs['timestamp']
+            for gap_start, gap_end in gaps:
+                if gap_start <= ts <= gap_end:
+                    gap_observations.append(obs)
+                    break
 
-        for hid in house_ids:
-            gaps = per_house_gaps[hid]
-            if not gaps:
-                print(f"  Weather [{hid}]: no gaps")
-                continue
+        if not gap_observations:
+            print(f"  Weather [{station.name}]: {len(gaps)} gap(s) ({total_gap_minutes:.0f} min), 0 observations match")
+            return 0, 0, 0
 
-            total_gap_minutes = sum(
-                (gap_end - gap_start).total_seconds() / 60
-                for gap_start, gap_end in gaps
-            )
+        written = 0
+        errors = 0
+        writer = PointBatchWriter(self.write_api, self.influx_bucket, self.influx_org,
+                                  on_error=lambda rows, e: print(f"  Weather write error [{station.name}]: {e}"))
 
-            # Filter observations to those within this house's gaps
-            gap_observations = []
-            for obs in observations:
-                ts = obs['timestamp']
-                for gap_start, gap_end in gaps:
-                    if gap_start <= ts <= gap_end:
-                        gap_observations.append(obs)
-                        break
+        for obs in gap_observations:
+            try:
+                if dry_run:
+                    written += 1
+                    continue
 
-            if not gap_observations:
-                print(f"  Weather [{hid}]: {len(gaps)} gap(s) ({total_gap_minutes:.0f} min), 0 observations match")
-                continue
+                writer.add(station_point(
+                    {**obs, 'station_id': obs.get('station_id', station_id)},
+                    source="gap_fill"
+                ))
+                written += 1
 
-            written = 0
-            errors = 0
+            except Exception as e:
+                errors += 1
+                if errors <= 3:
+                    print(f"  Weather write error [{station.name}]: {e}")
 
-            for obs in gap_observations:
-                try:
-                    if dry_run:
-                        written += 1
-                        continue
-
-                    point = Point("weather_observation") \
-                        .tag("house_id", hid) \
-                        .tag("station_name", obs.get('station_name', 'unknown')) \
-                        .tag("station_id", str(obs.get('station_id', 0))) \
-                        .tag("source", "gap_fill") \
-                        .field("temperature", round(float(obs['temperature']), 2)) \
-                        .time(obs['timestamp'])
-
-                    if obs.get('wind_speed') is not None:
-                        point.field("wind_speed", round(float(obs['wind_speed']), 2))
-                    if obs.get('humidity') is not None:
-                        point.field("humidity", round(float(obs['humidity']), 2))
-                    if obs.get('distance_km') is not None:
-                        point.field("distance_km", round(float(obs['distance_km']), 2))
-
-                    self.write_api.write(bucket=self.influx_bucket, org=self.influx_org, record=point)
-                    written += 1
+        if not dry_run:
+            writer.flush()
+            written -= writer.rows_failed
+            errors += writer.rows_failed
+            if not writer.rows_failed:
+                record_coverage(station_id, STATION_MEASUREMENT,
+                                [obs['timestamp'] for obs in gap_observations])
 
-                except Exception as e:
-                    errors += 1
-                    if errors <= 3:
-                        print(f"  Weather write error [{hid}]: {e}")
+        action = "Would write" if dry_run else "Wrote"
+        print(f"  Weather [{station.name}]: {action} {written} ({total_gap_minutes:.0f} min gaps, "
+              f"shared by {len(house_ids)} house(s)), Errors: {errors}")
 
-            action = "Would write" if dry_run else "Wrote"
-            print(f"  Weather [{hid}]: {action} {written} ({total_gap_minutes:.0f} min gaps), Errors: {errors}")
+        return written, 0, errors
 
-            total_written += written
-            total_errors += errors
+    def detect_station_gaps(
+        self,
+        station_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        expected_interval_minutes: int = 5
+    ) -> List[Tuple[datetime, datetime]]:
+        """Detect gaps in a station's shared weather series."""
+        gaps = coverage_gaps(
+            self.query_api, self.influx_bucket, self.influx_org, start_time, end_time,
+            STATION_MEASUREMENT, "station_id", station_id, ["temperature"],
+            expected_interval_minutes
+        )
+        if gaps is not None:
+            return gaps
 
-        return total_written, total_skipped, total_errors
+        try:
+            return find_gaps_flux(
+                self.query_api, self.influx_bucket, self.influx_org, start_time, end_time,
+                STATION_MEASUREMENT, "station_id", station_id, ["temperature"],
+                expected_interval_minutes
+            )
+        except Exception as e:
+            print(f"Error detecting weather gaps for station {station_id}: {e}")
+            return []
 
     def _detect_weather_gaps_for(
         self,
@@ -671,7 +850,35 @@ class WeatherGapFiller:
         end_time: datetime,
         expected_interval_minutes: int = 5
     ) -> List[Tuple[datetime, datetime]]:
-        """Detect weather gaps for a specific house_id."""
+        """
+        Detect weather gaps for a specific house_id: on its linked station's
+        series, or on the legacy per-house measurement if it has no link yet.
+        """
+        try:
+            station_id = current_station(self.query_api, self.influx_bucket, self.influx_org, house_id)
+        except Exception:
+            station_id = None
+        if station_id:
+            return self.detect_station_gaps(station_id, start_time, end_time, expected_interval_minutes)
+
+        gaps = coverage_gaps(
+            self.query_api, self.influx_bucket, self.influx_org, start_time, end_time,
+            "weather_observation", "house_id", house_id, ["temperature"],
+            expected_interval_minutes
+        )
+        if gaps is not None:
+            return gaps
+
+        try:
+            return find_gaps_flux(
+                self.query_api, self.influx_bucket, self.influx_org, start_time, end_time,
+                "weather_observation", "house_id", house_id, ["temperature"],
+                expected_interval_minutes
+            )
+        except Exception as e:
+            print(f"Server-side weather gap detection failed for {house_id} ({e}), "
+                  f"falling back to raw timestamps")
+
         query = f'''
             from(bucket: "{self.influx_bucket}")
             |> range(start: {start_time.isoformat()}, stop: {end_time.isoformat()})
@@ -683,36 +890,10 @@ class WeatherGapFiller:
 
         try:
             tables = self.query_api.query(query, org=self.influx_org)
-
-            timestamps = []
-            for table in tables:
-                for record in table.records:
-                    ts = record.get_time()
-                    if ts:
-                        if ts.tzinfo is None:
-                            ts = ts.replace(tzinfo=timezone.utc)
-                        timestamps.append(ts)
-
-            timestamps = sorted(set(timestamps))
-
-            if not timestamps:
-                return [(start_time, end_time)]
-
-            gaps = []
-            gap_threshold = timedelta(minutes=expected_interval_minutes * 2)
-
-            if timestamps[0] - start_time > gap_threshold:
-                gaps.append((start_time, timestamps[0]))
-
-            for i in range(len(timestamps) - 1):
-                delta = timestamps[i + 1] - timestamps[i]
-                if delta > gap_threshold:
-                    gaps.append((timestamps[i], timestamps[i + 1]))
-
-            if end_time - timestamps[-1] > gap_threshold:
-                gaps.append((timestamps[-1], end_time))
-
-            return gaps
+            timestamps = [_utc(record.get_time()) for table in tables
+                          for record in table.records if record.get_time()]
+            return gaps_from_timestamps(timestamps, start_time, end_time,
+                                        timedelta(minutes=expected_interval_minutes * 2))
 
         except Exception as e:
             print(f"Error detecting weather gaps for {house_id}: {e}")
@@ -739,7 +920,7 @@ def backfill_effective_temp(
     Backfill effective_temp for heating_system records that are missing it.
 
     Queries heating_system records (pivoted) in the time range, finds records
-    where effective_temp is None/missing, looks up weather_observation data,
+    where effective_temp is None/missing, looks up the house's station weather,
     and calculates effective_temp via SimpleWeatherModel.
 
     InfluxDB upsert: writing a Point with the same measurement + tags + timestamp
@@ -793,31 +974,19 @@ def backfill_effective_temp(
         if not missing_records:
             return 0
 
-        # Step 2: Query weather_observation for the same range, build time-indexed lookup
-        weather_query = f'''
-            from(bucket: "{influx_bucket}")
-            |> range(start: {start_time.isoformat()}, stop: {end_time.isoformat()})
-            |> filter(fn: (r) => r["_measurement"] == "weather_observation")
-            |> filter(fn: (r) => r["house_id"] == "{house_id}")
-            |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
-            |> sort(columns: ["_time"])
-        '''
-
-        weather_tables = query_api.query(weather_query, org=influx_org)
+        # Step 2: Station weather for the same range, build time-indexed lookup
+        weather_rows = read_entity_weather(query_api, influx_bucket, influx_org, house_id,
+                                           start_time, end_time)
 
         # Build lookup dict keyed by 15-min rounded ISO string
         weather_by_time = {}
-        for table in weather_tables:
-            for record in table.records:
-                ts = record.get_time()
-                if ts:
-                    if ts.tzinfo is None:
-                        ts = ts.replace(tzinfo=timezone.utc)
-                    rounded = ts.replace(minute=(ts.minute // 15) * 15, second=0, microsecond=0)
-                    weather_by_time[rounded.isoformat()] = {
-                        'wind_speed': record.values.get('wind_speed') or 3.0,
-                        'humidity': record.values.get('humidity') or 60.0,
-                    }
+        for row in weather_rows:
+            ts = row['timestamp']
+            rounded = ts.replace(minute=(ts.minute // 15) * 15, second=0, microsecond=0)
+            weather_by_time[rounded.isoformat()] = {
+                'wind_speed': row.get('wind_speed') or 3.0,
+                'humidity': row.get('humidity') or 60.0,
+            }
 
         # Step 3: Build weather model with ML2 coefficients if available
         model_kwargs = {}
@@ -964,19 +1133,120 @@ def run_daily_gap_fill(
     return result
 
 
+class AdaptiveLimiter:
+    """
+    Concurrency limit that adapts to server health (AIMD).
+
+    Starts at `initial`, grows by one after `limit` consecutive successes
+    (up to `maximum`), and halves on every error (down to 1).
+    """
+
+    def __init__(self, maximum: int, initial: int = None):
+        self.maximum = max(1, maximum)
+        self.limit = min(self.maximum, initial or self.maximum)
+        self._active = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self._active >= self.limit:
+                self._cond.wait()
+            self._active += 1
+
+    def release(self, success: bool):
+        with self._cond:
+            self._active -= 1
+            if success:
+                self._successes += 1
+                if self._successes >= self.limit and self.limit < self.maximum:
+                    self.limit += 1
+                    self._successes = 0
+            else:
+                self.limit = max(1, self.limit // 2)
+                self._successes = 0
+            self._cond.notify_all()
+
+
+class SignalAccumulator:
+    """
+    Running statistics for one signal (Welford), so sanity checks and signal
+    metadata don't need every fetched point in memory.
+    """
+
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max', 'out_of_range')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.out_of_range = 0
+
+    def add(self, value: float, bounds: Tuple[float, float] = None):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if bounds and (value < bounds[0] or value > bounds[1]):
+            self.out_of_range += 1
+
+    def merge(self, other: 'SignalAccumulator'):
+        """Combine with another accumulator (Chan et al. parallel update)."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            for slot in self.__slots__:
+                setattr(self, slot, getattr(other, slot))
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.out_of_range += other.out_of_range
+
+    @property
+    def stddev(self) -> float:
+        """Sample standard deviation (same as statistics.stdev)."""
+        return (self.m2 / (self.count - 1)) ** 0.5 if self.count > 1 else 0.0
+
+    def to_dict(self) -> dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SignalAccumulator':
+        acc = cls()
+        for slot in cls.__slots__:
+            setattr(acc, slot, data.get(slot, getattr(acc, slot)))
+        return acc
+
+
 class ArrigoBootstrapper:
     """
     Bootstraps a new building with 5-min historical Arrigo data.
 
     Full pipeline:
-      Phase 1: Fetch 5-min Arrigo data (per-signal to stay under 50k limit)
+      Phase 1: Fetch 5-min Arrigo data (per signal and time window, in parallel),
+               streamed in BOOTSTRAP_CHUNK_DAYS chunks
       Phase 2: Fetch SMHI weather history (~4 months via latest-months)
       Phase 3: Copy energy_meter data from source house
-      Phase 4: Sanity checks (stale signals, coverage, range)
-      Phase 5: Write to InfluxDB (heating_system, thermal_history, weather, energy)
+               (phases 2 + 3 run concurrently with the Arrigo stream)
+      Phase 4: Sanity checks (stale signals, coverage, range) - first chunk
+               before writing, whole period at the end
+      Phase 5: Write to InfluxDB (heating_system + thermal_history per chunk,
+               then weather and energy)
       Phase 6: Run calibration pipeline on learning period (days - backtest_days)
       Phase 7: Backtest predictions on the last backtest_days
 
+    Progress is checkpointed to bootstrap_checkpoints/<id>.json after every
+    chunk and stage, so an interrupted bootstrap can continue with --resume.
+
     Supports both houses (house_id tag) and buildings (building_id tag),
     auto-detected from the buildings/ directory.
     """
@@ -1006,7 +1276,8 @@ class ArrigoBootstrapper:
         resolution: int = 5,
         arrigo_host: str = None,
         verbose: bool = False,
-        backtest_days: int = 10
+        backtest_days: int = 10,
+        fetch_concurrency: int = BOOTSTRAP_FETCH_CONCURRENCY
     ):
         self.influx_url = influx_url
         self.influx_token = influx_token
@@ -1023,6 +1294,7 @@ class ArrigoBootstrapper:
         self.arrigo_host = arrigo_host
         self.verbose = verbose
         self.backtest_days = backtest_days
+        self.fetch_concurrency = fetch_concurrency
 
         # Auto-detect entity type: if config exists in buildings/, it's a building
         self.entity_type = "building" if os.path.exists(os.path.join("buildings", f"{house_id}.json")) else "house"
@@ -1072,11 +1344,16 @@ class ArrigoBootstrapper:
                 timeout=5_000
             )
 
-    def _fetch_signal_history(self, signal_id, field_name, start_time, end_time, resolution_seconds):
+    def _fetch_signal_history(self, signal_id, field_name, start_time, end_time, resolution_seconds,
+                              errors=None):
         """
         Fetch history for a single signal via GraphQL.
         Uses cursor pagination if >50k points.
 
+        Args:
+            errors: Optional list; an error description is appended if the
+                fetch stopped early (points fetched so far are still returned)
+
         Returns list of (timestamp, value) tuples.
         """
         query = '''
@@ -1126,6 +1403,8 @@ class ArrigoBootstrapper:
 
                 if response.status_code != 200:
                     print(f"    ERROR: GraphQL returned {response.status_code} for {field_name}")
+                    if errors is not None:
+                        errors.append(f"HTTP {response.status_code}")
                     break
 
                 result = response.json()
@@ -1142,9 +1421,13 @@ class ArrigoBootstrapper:
                         result = response.json()
                         if 'errors' in result:
                             print(f"    ERROR: {result['errors']}")
+                            if errors is not None:
+                                errors.append(str(result['errors']))
                             break
                     else:
                         print(f"    ERROR: {result['errors']}")
+                        if errors is not None:
+                            errors.append(str(result['errors']))
                         break
 
                 history = result.get('data', {}).get('analogsHistory', {})
@@ -1174,32 +1457,56 @@ class ArrigoBootstrapper:
 
             except Exception as e:
                 print(f"    ERROR fetching {field_name}: {e}")
+                if errors is not None:
+                    errors.append(str(e))
                 break
 
         return all_points
 
-    def _phase1_fetch_arrigo(self, start_time, end_time):
-        """Phase 1: Fetch 5-min Arrigo data, one signal at a time."""
-        print(f"\n{'='*60}")
-        print("Phase 1: Fetch Arrigo historical data")
-        print(f"{'='*60}")
-        print(f"  Resolution: {self.resolution} min")
-        print(f"  Time range: {start_time.date()} to {end_time.date()}")
-        print(f"  Signals: {len(self.arrigo_client.signal_map)}")
+    def _phase1_fetch_arrigo(self, start_time, end_time, announce=True):
+        """
+        Phase 1: Fetch 5-min Arrigo data (per signal, in parallel when enabled).
+
+        Args:
+            announce: Print the phase banner and per-signal lines (off when
+                called once per streaming chunk)
+
+        Returns:
+            (data_by_time, signal_stats, failed) - failed lists the
+            (field_name, window_start, window_end) requests that still
+            errored after BOOTSTRAP_FETCH_RETRIES (their data is incomplete)
+        """
+        if announce:
+            print(f"\n{'='*60}")
+            print("Phase 1: Fetch Arrigo historical data")
+            print(f"{'='*60}")
+            print(f"  Resolution: {self.resolution} min")
+            print(f"  Time range: {start_time.date()} to {end_time.date()}")
+            print(f"  Signals: {len(self.arrigo_client.signal_map)}")
+
+        if self.fetch_concurrency > 1:
+            return self._phase1_fetch_parallel(start_time, end_time, announce=announce)
 
         resolution_seconds = self.resolution * 60
         data_by_time = {}  # timestamp -> {field: value}
         signal_stats = {}
+        failed = []
 
         for signal_id, info in self.arrigo_client.signal_map.items():
             field_name = info['field_name']
-            print(f"  Fetching {field_name}...", end=' ', flush=True)
+            if announce:
+                print(f"  Fetching {field_name}...", end=' ', flush=True)
 
+            errors = []
             points = self._fetch_signal_history(
-                signal_id, field_name, start_time, end_time, resolution_seconds
+                signal_id, field_name, start_time, end_time, resolution_seconds,
+                errors=errors
             )
+            if errors:
+                failed.append((field_name, start_time, end_time))
 
-            print(f"{len(points)} points")
+            if announce:
+                print(f"{len(points)} points")
             signal_stats[field_name] = len(points)
 
             for ts, value in points:
@@ -1208,17 +1515,141 @@ class ArrigoBootstrapper:
                 data_by_time[ts][field_name] = value
 
         # Summary
-        print(f"\n  Total unique timestamps: {len(data_by_time)}")
-        mem_estimate = len(data_by_time) * len(signal_stats) * 16 / 1024 / 1024
-        print(f"  Estimated memory: ~{mem_estimate:.1f} MB")
+        if announce:
+            print(f"\n  Total unique timestamps: {len(data_by_time)}")
+            mem_estimate = len(data_by_time) * len(signal_stats) * 16 / 1024 / 1024
+            print(f"  Estimated memory: ~{mem_estimate:.1f} MB")
+
+        return data_by_time, signal_stats, failed
+
+    def _history_windows(self, start_time, end_time, resolution_seconds, days=BOOTSTRAP_WINDOW_DAYS):
+        """Split [start, end] into windows aligned to the resolution grid from start."""
+        window = timedelta(seconds=max(1, int(days * 86400 // resolution_seconds))
+                           * resolution_seconds)
+        windows = []
+        window_start = start_time
+        while window_start < end_time:
+            window_end = min(window_start + window, end_time)
+            windows.append((window_start, window_end))
+            window_start = window_end
+        return windows or [(start_time, end_time)]
+
+    def _phase1_fetch_parallel(self, start_time, end_time, announce=True):
+        """
+        Phase 1 with bounded, adaptive concurrency across signals and time windows.
 
-        return data_by_time, signal_stats
+        Each (signal, window) is fetched as its own request; failed requests are
+        retried while the limiter halves concurrency. Results are merged in
+        signal/window order and de-duplicated per timestamp, so data_by_time
+        and signal_stats match the sequential path. Requests still failing
+        after BOOTSTRAP_FETCH_RETRIES are returned as failed.
+        """
+        resolution_seconds = self.resolution * 60
+        signals = [(signal_id, info['field_name'])
+                   for signal_id, info in self.arrigo_client.signal_map.items()]
+        windows = self._history_windows(start_time, end_time, resolution_seconds)
+        tasks = [(s, w) for s in range(len(signals)) for w in range(len(windows))]
+
+        # Let the shared session keep one connection per worker
+        from requests.adapters import HTTPAdapter
+        self.arrigo_client.arrigo_session.mount(
+            'https://', HTTPAdapter(pool_connections=1, pool_maxsize=self.fetch_concurrency))
+
+        limiter = AdaptiveLimiter(self.fetch_concurrency)
+        results = {}
+        failed_tasks = set()
+        progress = {'done': 0, 'points': 0, 'errors': 0, 'last_report': 0.0}
+        progress_lock = threading.Lock()
+        started = time.monotonic()
+
+        if announce:
+            print(f"  Windows: {len(windows)} x {BOOTSTRAP_WINDOW_DAYS} days, "
+                  f"{len(tasks)} requests, concurrency up to {self.fetch_concurrency}")
+
+        def fetch(task):
+            signal_index, window_index = task
+            signal_id, field_name = signals[signal_index]
+            window_start, window_end = windows[window_index]
+            points = []
+            for attempt in range(1, BOOTSTRAP_FETCH_RETRIES + 1):
+                errors = []
+                limiter.acquire()
+                try:
+                    points = self._fetch_signal_history(
+                        signal_id, field_name, window_start, window_end,
+                        resolution_seconds, errors=errors)
+                finally:
+                    limiter.release(success=not errors)
+                if not errors:
+                    break
+                with progress_lock:
+                    progress['errors'] += 1
+                if attempt < BOOTSTRAP_FETCH_RETRIES:
+                    self.log(f"{field_name} window {window_index + 1}: retry {attempt} "
+                             f"(concurrency now {limiter.limit})")
+                    time.sleep(2 ** attempt)
+                else:
+                    with progress_lock:
+                        failed_tasks.add(task)
+            results[task] = points
+
+            with progress_lock:
+                progress['done'] += 1
+                progress['points'] += len(points)
+                now = time.monotonic()
+                if announce and (now - progress['last_report'] >= 5 or progress['done'] == len(tasks)):
+                    progress['last_report'] = now
+                    elapsed = max(now - started, 1e-6)
+                    print(f"  [{progress['done']:4d}/{len(tasks)}] "
+                          f"{100 * progress['done'] / len(tasks):3.0f}% | "
+                          f"{progress['points']:,} pts | {progress['points'] / elapsed:,.0f} pts/s | "
+                          f"concurrency {limiter.limit} | errors {progress['errors']}", flush=True)
+
+        with ThreadPoolExecutor(max_workers=self.fetch_concurrency) as executor:
+            list(executor.map(fetch, tasks))
+
+        # Merge in sequential order
+        data_by_time = {}  # timestamp -> {field: value}
+        signal_stats = {}
+        for signal_index, (signal_id, field_name) in enumerate(signals):
+            seen = set()
+            count = 0
+            for window_index in range(len(windows)):
+                for ts, value in results.get((signal_index, window_index), []):
+                    if ts in seen:
+                        continue  # Window boundaries are inclusive on both ends
+                    seen.add(ts)
+                    count += 1
+                    if ts not in data_by_time:
+                        data_by_time[ts] = {}
+                    data_by_time[ts][field_name] = value
+            signal_stats[field_name] = count
+
+        failed = [(signals[s][1],) + windows[w] for s, w in sorted(failed_tasks)]
+
+        elapsed = time.monotonic() - started
+        total_points = sum(signal_stats.values())
+        if announce:
+            print(f"\n  Fetched {total_points:,} points in {elapsed:.1f}s "
+                  f"({total_points / max(elapsed, 1e-6):,.0f} pts/s, {progress['errors']} retried errors)")
+            print(f"  Total unique timestamps: {len(data_by_time)}")
+            mem_estimate = len(data_by_time) * len(signal_stats) * 16 / 1024 / 1024
+            print(f"  Estimated memory: ~{mem_estimate:.1f} MB")
+            if failed:
+                print(f"  WARNING: {len(failed)} requests failed after {BOOTSTRAP_FETCH_RETRIES} attempts")
+
+        return data_by_time, signal_stats, failed
+
+    def _phase2_fetch_weather(self, start_time, end_time, out=print):
+        """
+        Phase 2: Fetch SMHI weather history for the bootstrap period.
 
-    def _phase2_fetch_weather(self, start_time, end_time):
-        """Phase 2: Fetch SMHI weather history for the bootstrap period."""
-        print(f"\n{'='*60}")
-        print("Phase 2: Fetch SMHI weather history")
-        print(f"{'='*60}")
+        Args:
+            out: Line printer (a buffer when run alongside the Arrigo fetch)
+        """
+        out(f"\n{'='*60}")
+        out("Phase 2: Fetch SMHI weather history")
+        out(f"{'='*60}")
 
         smhi = SMHIWeather(
             latitude=self.latitude,
@@ -1229,27 +1660,32 @@ class ArrigoBootstrapper:
         observations = smhi.get_historical_observations(start_time, end_time)
 
         if observations:
-            print(f"  Retrieved {len(observations)} hourly observations from SMHI")
+            out(f"  Retrieved {len(observations)} hourly observations from SMHI")
             first_ts = observations[0]['timestamp']
             last_ts = observations[-1]['timestamp']
             days_covered = (last_ts - first_ts).days
-            print(f"  Coverage: {first_ts.date()} to {last_ts.date()} ({days_covered} days)")
+            out(f"  Coverage: {first_ts.date()} to {last_ts.date()} ({days_covered} days)")
             station = observations[0].get('station_name', 'unknown')
-            print(f"  Station: {station}")
+            out(f"  Station: {station}")
         else:
-            print("  WARNING: No SMHI historical data available")
-            print("  (SMHI latest-months covers ~4 months back)")
+            out("  WARNING: No SMHI historical data available")
+            out("  (SMHI latest-months covers ~4 months back)")
 
         return observations
 
-    def _phase3_copy_energy(self, start_time, end_time):
-        """Phase 3: Copy energy_meter data from source house/building."""
-        print(f"\n{'='*60}")
-        print(f"Phase 3: Copy energy_meter data from {self.source_house_id}")
-        print(f"{'='*60}")
+    def _phase3_copy_energy(self, start_time, end_time, out=print):
+        """
+        Phase 3: Copy energy_meter data from source house/building.
+
+        Args:
+            out: Line printer (a buffer when run alongside the Arrigo fetch)
+        """
+        out(f"\n{'='*60}")
+        out(f"Phase 3: Copy energy_meter data from {self.source_house_id}")
+        out(f"{'='*60}")
 
         if not self.source_house_id:
-            print("  Skipped (no --source-house-id)")
+            out("  Skipped (no --source-house-id)")
             return []
 
         self._init_influx()
@@ -1291,21 +1727,41 @@ class ArrigoBootstrapper:
                             'meter_id': meter_id
                         })
 
-            print(f"  Found {len(records)} energy_meter records from source")
+            out(f"  Found {len(records)} energy_meter records from source")
             if records:
                 first_ts = records[0]['timestamp']
                 last_ts = records[-1]['timestamp']
-                print(f"  Date range: {first_ts.date()} to {last_ts.date()}")
+                out(f"  Date range: {first_ts.date()} to {last_ts.date()}")
             return records
 
         except Exception as e:
-            print(f"  ERROR: Failed to query source energy data: {e}")
+            out(f"  ERROR: Failed to query source energy data: {e}")
             return []
 
-    def _phase4_sanity_check(self, data_by_time, signal_stats, weather_data, energy_data):
-        """Phase 4: Validate data quality before writing."""
+    def _accumulate(self, data_by_time, stats=None):
+        """Fold fetched points into per-signal accumulators (new dict if stats is None)."""
+        stats = {} if stats is None else stats
+        for fields in data_by_time.values():
+            for field_name, value in fields.items():
+                acc = stats.get(field_name)
+                if acc is None:
+                    acc = stats[field_name] = SignalAccumulator()
+                acc.add(value, self.RANGE_CHECKS.get(field_name))
+        return stats
+
+    def _phase4_sanity_check(self, stats, weather_data, energy_data, expected_slots=None,
+                             title="Phase 4: Sanity checks"):
+        """
+        Phase 4: Validate data quality.
+
+        Args:
+            stats: field_name -> SignalAccumulator
+            weather_data / energy_data: Fetched records, or None to skip that check
+            expected_slots: Expected points per signal (default: whole bootstrap period)
+            title: Banner text
+        """
         print(f"\n{'='*60}")
-        print("Phase 4: Sanity checks")
+        print(title)
         print(f"{'='*60}")
 
         issues = []
@@ -1315,13 +1771,12 @@ class ArrigoBootstrapper:
         # Setpoints and constants are expected to be stable - only warn, don't flag
         non_varying_signals = {'target_temp_setpoint', 'supply_setpoint', 'outdoor_temp_24h_avg'}
         print("\n  Stale signal detection:")
-        for field_name in sorted(signal_stats):
-            values = [data_by_time[ts][field_name]
-                      for ts in data_by_time if field_name in data_by_time[ts]]
-            if len(values) < 10:
+        for field_name in sorted(stats):
+            acc = stats[field_name]
+            if acc.count < 10:
                 continue
-            stddev = statistics.stdev(values) if len(values) > 1 else 0
-            mean_val = statistics.mean(values)
+            stddev = acc.stddev
+            mean_val = acc.mean
             status = "OK"
             if stddev < 0.01 and mean_val != 0:
                 if field_name in non_varying_signals or 'setpoint' in field_name.lower():
@@ -1338,9 +1793,10 @@ class ArrigoBootstrapper:
         # Check 2: Data coverage (only core signals are critical)
         print("\n  Data coverage:")
         from import_historical_data import CORE_SIGNALS
-        expected_slots = self.days * 24 * (60 // self.resolution)
-        for field_name in sorted(signal_stats):
-            count = signal_stats[field_name]
+        if expected_slots is None:
+            expected_slots = self.days * 24 * (60 // self.resolution)
+        for field_name in sorted(stats):
+            count = stats[field_name].count
             coverage = count / expected_slots * 100 if expected_slots > 0 else 0
             status = "OK" if coverage > 50 else "LOW"
             is_core = field_name in CORE_SIGNALS
@@ -1353,14 +1809,12 @@ class ArrigoBootstrapper:
         # Check 3: Range checks
         print("\n  Range checks:")
         for field_name, (lo, hi) in self.RANGE_CHECKS.items():
-            values = [data_by_time[ts][field_name]
-                      for ts in data_by_time if field_name in data_by_time[ts]]
-            if not values:
+            acc = stats.get(field_name)
+            if not acc or not acc.count:
                 continue
-            min_val = min(values)
-            max_val = max(values)
-            out_of_range = sum(1 for v in values if v < lo or v > hi)
-            pct_oor = out_of_range / len(values) * 100
+            min_val = acc.min
+            max_val = acc.max
+            pct_oor = acc.out_of_range / acc.count * 100
             status = "OK" if pct_oor < 5 else "WARN"
             if pct_oor > 20:
                 issues.append(f"Signal '{field_name}' has {pct_oor:.0f}% out of range [{lo}, {hi}]")
@@ -1370,19 +1824,21 @@ class ArrigoBootstrapper:
         print("\n  Core signals:")
         from import_historical_data import CORE_SIGNALS
         for sig in CORE_SIGNALS:
-            present = sig in signal_stats and signal_stats[sig] > 0
+            present = sig in stats and stats[sig].count > 0
             status = "OK" if present else "MISSING"
             if not present:
                 issues.append(f"Core signal '{sig}' is missing")
             print(f"    {sig:30s} [{status}]")
 
         # Check 5: Weather and energy data
-        print(f"\n  Weather data: {len(weather_data)} observations")
-        if not weather_data:
-            warnings.append("No weather history (effective temp will use defaults)")
-        print(f"  Energy meter data: {len(energy_data)} records")
-        if not energy_data:
-            warnings.append("No energy meter data (calibration needs manual energy import)")
+        if weather_data is not None:
+            print(f"\n  Weather data: {len(weather_data)} observations")
+            if not weather_data:
+                warnings.append("No weather history (effective temp will use defaults)")
+        if energy_data is not None:
+            print(f"  Energy meter data: {len(energy_data)} records")
+            if not energy_data:
+                warnings.append("No energy meter data (calibration needs manual energy import)")
 
         # Summary
         print(f"\n  {'='*40}")
@@ -1413,38 +1869,7 @@ class ArrigoBootstrapper:
                         house_ids.add(filename.replace('.json', ''))
         return sorted(house_ids)
 
-    def _get_existing_weather_timestamps(self, house_id, start_time, end_time):
-        """Query existing weather_observation timestamps for a house."""
-        self._init_influx()
-        query_api = self.influx_client.query_api()
-
-        query = f'''
-            from(bucket: "{self.influx_bucket}")
-            |> range(start: {start_time.isoformat()}, stop: {end_time.isoformat()})
-            |> filter(fn: (r) => r["_measurement"] == "weather_observation")
-            |> filter(fn: (r) => r["house_id"] == "{house_id}")
-            |> filter(fn: (r) => r["_field"] == "temperature")
-            |> keep(columns: ["_time"])
-        '''
-
-        try:
-            tables = query_api.query(query, org=self.influx_org)
-            timestamps = set()
-            for table in tables:
-                for record in table.records:
-                    ts = record.get_time()
-                    if ts:
-                        if ts.tzinfo is None:
-                            ts = ts.replace(tzinfo=timezone.utc)
-                        # Round to nearest hour for comparison (SMHI data is hourly)
-                        ts = ts.replace(minute=0, second=0, microsecond=0)
-                        timestamps.add(ts)
-            return timestamps
-        except Exception as e:
-            self.log(f"Failed to query existing weather for {house_id}: {e}")
-            return set()
-
-    def _save_signal_metadata(self, data_by_time, signal_stats):
+    def _save_signal_metadata(self, stats):
         """Save signal discovery and quality metadata to a JSON file.
 
         Creates a file like buildings/TE236_HEM_Kontor.json but for villa profiles,
@@ -1463,20 +1888,19 @@ class ArrigoBootstrapper:
             unit = info.get('unit', '')
             current_value = info.get('current_value')
 
-            # Compute quality stats from fetched data
-            values = [data_by_time[ts][field_name]
-                      for ts in data_by_time if field_name in data_by_time[ts]]
-            count = signal_stats.get(field_name, 0)
+            # Quality stats from the accumulated fetch
+            acc = stats.get(field_name) or SignalAccumulator()
+            count = acc.count
             coverage_pct = round(count / expected_slots * 100, 1) if expected_slots > 0 else 0
 
-            if len(values) > 1:
-                stddev = round(statistics.stdev(values), 4)
-                mean_val = round(statistics.mean(values), 2)
-                min_val = round(min(values), 2)
-                max_val = round(max(values), 2)
-            elif len(values) == 1:
+            if count > 1:
+                stddev = round(acc.stddev, 4)
+                mean_val = round(acc.mean, 2)
+                min_val = round(acc.min, 2)
+                max_val = round(acc.max, 2)
+            elif count == 1:
                 stddev = 0.0
-                mean_val = round(values[0], 2)
+                mean_val = round(acc.mean, 2)
                 min_val = mean_val
                 max_val = mean_val
             else:
@@ -1551,47 +1975,32 @@ class ArrigoBootstrapper:
         summary_parts = [f"{count} {status}" for status, count in sorted(status_counts.items())]
         print(f"  Signal summary: {', '.join(summary_parts)}")
 
-    def _phase5_write_influx(self, data_by_time, weather_data, energy_data, dry_run=False):
-        """Phase 5: Write all data to InfluxDB in batches.
-
-        Weather data is written for ALL buildings (shared station) with
-        deduplication: only timestamps not already present are written.
-        Uses self.influx_tag (house_id or building_id) based on entity type.
-        """
+    def _phase5_print_plan(self, heating_rows, weather_data, energy_data):
+        """Phase 5 (dry run): show what would be written."""
         print(f"\n{'='*60}")
-        print(f"Phase 5: Write to InfluxDB{' (DRY RUN)' if dry_run else ''}")
+        print("Phase 5: Write to InfluxDB (DRY RUN)")
         print(f"{'='*60}")
         print(f"  Entity: {self.house_id} (tag: {self.influx_tag})")
 
-        total_heating = sum(1 for ts in data_by_time
-                            if 'room_temperature' in data_by_time[ts]
-                            and 'outdoor_temperature' in data_by_time[ts])
-
-        # Determine weather write plan (all houses, deduped)
-        all_house_ids = self._get_all_house_ids()
-        weather_ts_set = {obs['timestamp'].replace(minute=0, second=0, microsecond=0)
-                          for obs in weather_data} if weather_data else set()
-
-        if dry_run:
-            self._init_influx()
-            print(f"  Would write {total_heating} heating_system + thermal_history points for {self.house_id}")
-            print(f"  Would write {len(energy_data)} energy_meter points for {self.house_id}")
-            print(f"\n  Weather dedup check ({len(weather_data)} SMHI observations, {len(all_house_ids)} buildings):")
-            for hid in all_house_ids:
-                if weather_data:
-                    start_ts = min(weather_ts_set)
-                    end_ts = max(weather_ts_set) + timedelta(hours=1)
-                    existing = self._get_existing_weather_timestamps(hid, start_ts, end_ts)
-                    new_count = len(weather_ts_set - existing)
-                    print(f"    {hid:40s} {len(existing):>5} existing, {new_count:>5} new")
-                else:
-                    print(f"    {hid:40s} (no weather data to write)")
-            return
-
         self._init_influx()
 
-        # Delete existing heating/thermal/energy data for bootstrap entity only
-        # (NOT weather - we handle that with dedup below)
+        print(f"  Would write {heating_rows} heating_system + thermal_history points for {self.house_id}")
+        print(f"  Would write {len(energy_data)} energy_meter points for {self.house_id}")
+        if weather_data:
+            station_id = str(weather_data[0].get('station_id', 0))
+            links = self._weather_links_needed(station_id)
+            print(f"  Would write {len(weather_data)} {STATION_MEASUREMENT} points "
+                  f"(station {station_id}, shared by all linked houses)")
+            if links:
+                print(f"  Would link to station {station_id}: {', '.join(hid for hid, _ in links)}")
+        else:
+            print("  No weather data to write")
+
+    def _delete_existing_bootstrap_data(self):
+        """
+        Delete existing heating/thermal/energy data for the bootstrap entity
+        (NOT weather - the station series is shared and rewrites overwrite).
+        """
         delete_api = self.influx_client.delete_api()
         now = datetime.now(timezone.utc)
         start_delete = now - timedelta(days=self.days + 1)
@@ -1601,20 +2010,22 @@ class ArrigoBootstrapper:
             try:
                 delete_api.delete(start_delete, now, predicate,
                                   bucket=self.influx_bucket, org=self.influx_org)
+                clear_coverage(self.house_id, measurement, start_delete, now)
                 self.log(f"Deleted existing {measurement} for {self.house_id}")
             except Exception as e:
                 self.log(f"Delete {measurement} (may not exist): {e}")
 
-        write_api = self.influx_client.write_api(write_options=SYNCHRONOUS)
-        batch_size = 500
-
-        # === Write heating_system + thermal_history (bootstrap entity only) ===
-        print(f"  Writing heating_system + thermal_history...", end=' ', flush=True)
+    def _write_heating_points(self, write_api, data_by_time, batch_size=500):
+        """Write heating_system + thermal_history for one chunk; returns rows written."""
+        rows = 0
         points = []
+        written_times = []
         for ts in sorted(data_by_time.keys()):
             fields = data_by_time[ts]
             if 'room_temperature' not in fields or 'outdoor_temperature' not in fields:
                 continue
+            rows += 1
+            written_times.append(ts)
 
             hp = Point("heating_system").tag(self.influx_tag, self.house_id).time(ts, WritePrecision.S)
             for field, value in fields.items():
@@ -1635,70 +2046,110 @@ class ArrigoBootstrapper:
                 points = []
         if points:
             write_api.write(bucket=self.influx_bucket, org=self.influx_org, record=points)
-        print(f"{total_heating} points")
+        record_coverage(self.house_id, "heating_system", written_times)
+        return rows
 
-        # === Write weather for ALL buildings (deduped per house) ===
-        if weather_data:
-            print(f"  Writing weather_observation (all buildings, deduped):")
-            start_ts = min(weather_ts_set)
-            end_ts = max(weather_ts_set) + timedelta(hours=1)
+    def _write_weather(self, write_api, weather_data, batch_size=500):
+        """
+        Write the SMHI observations once to the shared station series and link
+        this entity (plus any house/building without a station yet) to it.
+        """
+        station_id = str(weather_data[0].get('station_id', 0))
+        print(f"  Writing {STATION_MEASUREMENT} (station {station_id})...", end=' ', flush=True)
+        points = []
+        for obs in weather_data:
+            points.append(station_point({**obs, 'station_id': obs.get('station_id', station_id)},
+                                        source="bootstrap"))
+            if len(points) >= batch_size:
+                write_api.write(bucket=self.influx_bucket, org=self.influx_org, record=points)
+                points = []
+        if points:
+            write_api.write(bucket=self.influx_bucket, org=self.influx_org, record=points)
+        record_coverage(station_id, STATION_MEASUREMENT, [obs['timestamp'] for obs in weather_data])
+        print(f"{len(weather_data)} observations")
+
+        links = self._weather_links_needed(station_id)
+        if links:
+            first_ts = min(obs['timestamp'] for obs in weather_data)
+            write_api.write(bucket=self.influx_bucket, org=self.influx_org, record=[
+                link_point(hid, station_id, weather_data[0].get('distance_km'), first_ts, tag_key=tag_key)
+                for hid, tag_key in links
+            ])
+            print(f"  Linked to station {station_id}: {', '.join(hid for hid, _ in links)}")
+
+    def _weather_links_needed(self, station_id):
+        """
+        (entity_id, tag_key) pairs that need a weather_station_link: the
+        bootstrap entity unless already on this station, and every other
+        house/building that has no station link at all.
+        """
+        query_api = self.influx_client.query_api()
+        entity_ids = self._get_all_house_ids()
+        needed = []
+        for hid in entity_ids:
+            tag_key = "building_id" if os.path.exists(os.path.join("buildings", f"{hid}.json")) else "house_id"
+            try:
+                linked = current_station(query_api, self.influx_bucket, self.influx_org, hid, tag_key)
+            except Exception as e:
+                self.log(f"Station link lookup failed for {hid}: {e}")
+                continue
+            if linked is None or (hid == self.house_id and linked != station_id):
+                needed.append((hid, tag_key))
+        if self.house_id not in entity_ids:
+            needed.append((self.house_id, self.influx_tag))
+        return needed
+
+    def _write_energy(self, write_api, energy_data, batch_size=500):
+        """Write energy_meter records for the bootstrap entity."""
+        print(f"  Writing energy_meter...", end=' ', flush=True)
+        points = []
+        for record in energy_data:
+            p = Point("energy_meter") \
+                .tag(self.influx_tag, self.house_id) \
+                .tag("meter_id", record.get('meter_id', '')) \
+                .time(record['timestamp'])
+            for field, value in record['fields'].items():
+                p.field(field, float(value))
+            points.append(p)
 
-            for hid in all_house_ids:
-                existing_ts = self._get_existing_weather_timestamps(hid, start_ts, end_ts)
-                new_obs = [obs for obs in weather_data
-                           if obs['timestamp'].replace(minute=0, second=0, microsecond=0)
-                           not in existing_ts]
+            if len(points) >= batch_size:
+                write_api.write(bucket=self.influx_bucket, org=self.influx_org, record=points)
+                points = []
+        if points:
+            write_api.write(bucket=self.influx_bucket, org=self.influx_org, record=points)
+        print(f"{len(energy_data)} points")
 
-                if not new_obs:
-                    print(f"    {hid}: 0 new (all {len(existing_ts)} already exist)")
-                    continue
+    # ── Checkpoints ──────────────────────────────────────────────────
 
-                points = []
-                for obs in new_obs:
-                    p = Point("weather_observation") \
-                        .tag("house_id", hid) \
-                        .tag("station_name", obs.get('station_name', 'unknown')) \
-                        .tag("station_id", str(obs.get('station_id', 0))) \
-                        .tag("source", "bootstrap") \
-                        .field("temperature", round(float(obs['temperature']), 2)) \
-                        .time(obs['timestamp'])
-
-                    if obs.get('wind_speed') is not None:
-                        p.field("wind_speed", round(float(obs['wind_speed']), 2))
-                    if obs.get('humidity') is not None:
-                        p.field("humidity", round(float(obs['humidity']), 2))
-                    if obs.get('distance_km') is not None:
-                        p.field("distance_km", round(float(obs['distance_km']), 2))
-                    points.append(p)
-
-                    if len(points) >= batch_size:
-                        write_api.write(bucket=self.influx_bucket, org=self.influx_org, record=points)
-                        points = []
-                if points:
-                    write_api.write(bucket=self.influx_bucket, org=self.influx_org, record=points)
-                print(f"    {hid}: {len(new_obs)} new (skipped {len(existing_ts)} existing)")
-
-        # === Write energy_meter (bootstrap entity only) ===
-        if energy_data:
-            print(f"  Writing energy_meter...", end=' ', flush=True)
-            points = []
-            for record in energy_data:
-                p = Point("energy_meter") \
-                    .tag(self.influx_tag, self.house_id) \
-                    .tag("meter_id", record.get('meter_id', '')) \
-                    .time(record['timestamp'])
-                for field, value in record['fields'].items():
-                    p.field(field, float(value))
-                points.append(p)
-
-                if len(points) >= batch_size:
-                    write_api.write(bucket=self.influx_bucket, org=self.influx_org, record=points)
-                    points = []
-            if points:
-                write_api.write(bucket=self.influx_bucket, org=self.influx_org, record=points)
-            print(f"{len(energy_data)} points")
+    def _checkpoint_path(self):
+        return os.path.join(BOOTSTRAP_CHECKPOINT_DIR, f"{self.house_id}.json")
 
-        print(f"  Done!")
+    def _load_checkpoint(self) -> Optional[dict]:
+        """Checkpoint for this entity if it matches the current days/resolution."""
+        path = self._checkpoint_path()
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"  WARNING: Ignoring unreadable checkpoint {path}: {e}")
+            return None
+        if checkpoint.get('days') != self.days or checkpoint.get('resolution') != self.resolution:
+            print(f"  WARNING: Checkpoint {path} is for days={checkpoint.get('days')}, "
+                  f"resolution={checkpoint.get('resolution')}; ignoring it")
+            return None
+        return checkpoint
+
+    def _save_checkpoint(self, checkpoint: dict):
+        """Atomically persist progress (write temp file + rename)."""
+        os.makedirs(BOOTSTRAP_CHECKPOINT_DIR, exist_ok=True)
+        checkpoint['updated_at'] = datetime.now(timezone.utc).isoformat()
+        path = self._checkpoint_path()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f, indent=2, default=str)
+        os.replace(tmp_path, path)
 
     def _phase6_calibrate(self):
         """Phase 6: Run energy separation + k recalibration.
@@ -1984,8 +2435,18 @@ class ArrigoBootstrapper:
         except Exception as e:
             print(f"  Could not load profiles for comparison: {e}")
 
-    def run(self, dry_run=False, no_calibrate=False):
-        """Execute the full bootstrap pipeline."""
+    def run(self, dry_run=False, no_calibrate=False, resume=False):
+        """
+        Execute the full bootstrap pipeline.
+
+        Arrigo history is streamed in BOOTSTRAP_CHUNK_DAYS chunks: each chunk is
+        fetched, written and folded into running statistics before the next one
+        is requested, and progress is checkpointed after every chunk. A chunk
+        with requests still failing after BOOTSTRAP_FETCH_RETRIES is not
+        written; it is recorded in the checkpoint's failed_chunks and the run
+        stops before phase 4 so that a resume=True run fetches it again. With
+        resume=True an interrupted run continues after the last completed chunk.
+        """
         print("=" * 60)
         print(f"Bootstrap: {self.house_id}")
         print(f"Entity type: {self.entity_type} (tag: {self.influx_tag})")
@@ -1998,56 +2459,199 @@ class ArrigoBootstrapper:
         if not self._init_arrigo():
             return False
 
-        # Calculate time range
-        end_time = datetime.now(timezone.utc)
-        start_time = end_time - timedelta(days=self.days)
+        checkpoint = self._load_checkpoint() if resume and not dry_run else None
+        if checkpoint and checkpoint.get('completed'):
+            print(f"\nCheckpoint {self._checkpoint_path()} says this bootstrap already completed "
+                  f"({checkpoint.get('updated_at')}). Remove it to bootstrap again.")
+            return True
 
-        # Phase 1: Fetch Arrigo data
-        data_by_time, signal_stats = self._phase1_fetch_arrigo(start_time, end_time)
-        if not data_by_time:
-            print("ERROR: No data from Arrigo. Aborting.")
-            return False
+        if checkpoint:
+            start_time = datetime.fromisoformat(checkpoint['start_time'])
+            end_time = datetime.fromisoformat(checkpoint['end_time'])
+            completed_until = datetime.fromisoformat(checkpoint['completed_until'])
+            stats = {name: SignalAccumulator.from_dict(d)
+                     for name, d in checkpoint.get('signal_stats', {}).items()}
+            print(f"\nResuming from checkpoint: {completed_until.isoformat()} "
+                  f"({checkpoint.get('heating_points', 0)} heating points already written)")
+        else:
+            # Calculate time range
+            end_time = datetime.now(timezone.utc)
+            start_time = end_time - timedelta(days=self.days)
+            completed_until = start_time
+            stats = {}
+            checkpoint = {
+                'house_id': self.house_id,
+                'start_time': start_time.isoformat(),
+                'end_time': end_time.isoformat(),
+                'days': self.days,
+                'resolution': self.resolution,
+                'completed_until': completed_until.isoformat(),
+                'signal_stats': {},
+                'heating_points': 0,
+                'failed_chunks': [],
+                'stages_done': [],
+                'completed': False,
+            }
+        fresh_run = completed_until <= start_time
 
-        # Phase 2: Fetch weather history
-        weather_data = self._phase2_fetch_weather(start_time, end_time)
+        # Phases 2 + 3 only touch SMHI and the source house, so run them
+        # alongside the Arrigo stream and print their output once joined
+        self._init_influx()
+        weather_out, energy_out = [], []
+        side_executor = ThreadPoolExecutor(max_workers=2)
+        weather_future = side_executor.submit(
+            self._phase2_fetch_weather, start_time, end_time, weather_out.append)
+        energy_future = side_executor.submit(
+            self._phase3_copy_energy, start_time, end_time, energy_out.append)
+
+        # Phase 1 + 5 (heating): stream Arrigo history chunk by chunk
+        print(f"\n{'='*60}")
+        print("Phase 1: Fetch Arrigo historical data (streaming)")
+        print(f"{'='*60}")
+        print(f"  Resolution: {self.resolution} min")
+        print(f"  Time range: {start_time.date()} to {end_time.date()}")
+        print(f"  Signals: {len(self.arrigo_client.signal_map)}")
 
-        # Phase 3: Copy energy_meter data
-        energy_data = self._phase3_copy_energy(start_time, end_time)
+        resolution_seconds = self.resolution * 60
+        chunks = self._history_windows(start_time, end_time, resolution_seconds,
+                                       days=BOOTSTRAP_CHUNK_DAYS)
+        print(f"  Chunks: {len(chunks)} x {BOOTSTRAP_CHUNK_DAYS} days")
+
+        write_api = None if dry_run else self.influx_client.write_api(write_options=SYNCHRONOUS)
+        heating_rows = checkpoint.get('heating_points', 0)
+        failed_chunks = set(checkpoint.get('failed_chunks', []))   # chunk_start isoformats
+        if failed_chunks:
+            print(f"  Retrying {len(failed_chunks)} chunk(s) that failed last time")
+        deleted = checkpoint.get('deleted', not fresh_run)
+        started = time.monotonic()
+
+        for index, (chunk_start, chunk_end) in enumerate(chunks, 1):
+            chunk_key = chunk_start.isoformat()
+            if chunk_end <= completed_until and chunk_key not in failed_chunks:
+                continue
 
-        # Phase 4: Sanity checks
-        passed = self._phase4_sanity_check(data_by_time, signal_stats, weather_data, energy_data)
-        if not passed and not dry_run:
-            print("\nSanity checks found critical issues.")
-            response = input("Continue anyway? [y/N]: ").strip().lower()
-            if response != 'y':
-                print("Aborted.")
-                return False
-        elif not passed:
-            print("\n(Sanity issues found - continuing dry run to show write plan)")
+            data_by_time, _, failed = self._phase1_fetch_arrigo(chunk_start, chunk_end, announce=False)
+            if index < len(chunks):
+                # Chunks are half-open; the boundary sample belongs to the next one
+                data_by_time.pop(chunk_end, None)
+
+            if failed:
+                # Incomplete chunk: keep it out of the data and the stats, retry on resume
+                failed_chunks.add(chunk_key)
+                fields = sorted({field_name for field_name, _, _ in failed})
+                print(f"  [{index:3d}/{len(chunks)}] {chunk_start.date()} to {chunk_end.date()}: "
+                      f"FAILED ({len(failed)} requests: {', '.join(fields)}), not written", flush=True)
+                if chunk_end > completed_until:
+                    completed_until = chunk_end
+                if not dry_run:
+                    checkpoint['completed_until'] = completed_until.isoformat()
+                    checkpoint['failed_chunks'] = sorted(failed_chunks)
+                    self._save_checkpoint(checkpoint)
+                continue
+            failed_chunks.discard(chunk_key)
+
+            if not deleted and not stats and data_by_time:
+                # Validate the first chunk before anything is deleted or written
+                chunk_slots = int((chunk_end - chunk_start).total_seconds() // resolution_seconds)
+                passed = self._phase4_sanity_check(
+                    self._accumulate(data_by_time), None, None, expected_slots=chunk_slots,
+                    title=f"Phase 4: Sanity checks (first chunk, {chunk_start.date()} to {chunk_end.date()})")
+                if not passed and not dry_run:
+                    print("\nSanity checks found critical issues.")
+                    response = input("Continue anyway? [y/N]: ").strip().lower()
+                    if response != 'y':
+                        print("Aborted.")
+                        side_executor.shutdown(wait=False, cancel_futures=True)
+                        return False
+                elif not passed:
+                    print("\n(Sanity issues found - continuing dry run to show write plan)")
+
+            chunk_rows = 0
+            if not dry_run and data_by_time:
+                if not deleted:
+                    self._delete_existing_bootstrap_data()
+                    deleted = checkpoint['deleted'] = True
+                chunk_rows = self._write_heating_points(write_api, data_by_time)
+            else:
+                chunk_rows = sum(1 for fields in data_by_time.values()
+                                 if 'room_temperature' in fields and 'outdoor_temperature' in fields)
+            heating_rows += chunk_rows
+            self._accumulate(data_by_time, stats)
+
+            elapsed = max(time.monotonic() - started, 1e-6)
+            print(f"  [{index:3d}/{len(chunks)}] {chunk_start.date()} to {chunk_end.date()}: "
+                  f"{len(data_by_time):,} timestamps, {chunk_rows:,} heating rows "
+                  f"| total {heating_rows:,} | {elapsed:.0f}s", flush=True)
+
+            if chunk_end > completed_until:
+                completed_until = chunk_end
+            if not dry_run:
+                checkpoint['completed_until'] = completed_until.isoformat()
+                checkpoint['failed_chunks'] = sorted(failed_chunks)
+                checkpoint['signal_stats'] = {name: acc.to_dict() for name, acc in stats.items()}
+                checkpoint['heating_points'] = heating_rows
+                self._save_checkpoint(checkpoint)
+
+        weather_data = weather_future.result()
+        energy_data = energy_future.result()
+        side_executor.shutdown()
+        for line in weather_out + energy_out:
+            print(line)
+
+        if failed_chunks:
+            print(f"\nERROR: {len(failed_chunks)} chunk(s) could not be fetched completely "
+                  f"({', '.join(sorted(failed_chunks))}).")
+            if not dry_run:
+                print(f"Run again with --resume to retry them (checkpoint: {self._checkpoint_path()}).")
+            return False
 
-        # Save signal discovery metadata (always, even on dry-run)
-        self._save_signal_metadata(data_by_time, signal_stats)
+        if not stats:
+            print("ERROR: No data from Arrigo. Aborting.")
+            return False
+
+        # Phase 4: Sanity checks over the whole period
+        self._phase4_sanity_check(stats, weather_data, energy_data)
 
-        # Phase 5: Write to InfluxDB
-        self._phase5_write_influx(data_by_time, weather_data, energy_data, dry_run=dry_run)
+        # Save signal discovery metadata (always, even on dry-run)
+        self._save_signal_metadata(stats)
 
+        # Phase 5: Write weather + energy (heating was streamed above)
         if dry_run:
+            self._phase5_print_plan(heating_rows, weather_data, energy_data)
             print("\nDry run complete. No data written.")
             return True
 
+        print(f"\n{'='*60}")
+        print("Phase 5: Write to InfluxDB")
+        print(f"{'='*60}")
+        print(f"  heating_system + thermal_history: {heating_rows} points (streamed)")
+        if 'weather' not in checkpoint['stages_done']:
+            if weather_data:
+                self._write_weather(write_api, weather_data)
+            checkpoint['stages_done'].append('weather')
+            self._save_checkpoint(checkpoint)
+        if 'energy' not in checkpoint['stages_done']:
+            if energy_data:
+                self._write_energy(write_api, energy_data)
+            checkpoint['stages_done'].append('energy')
+            self._save_checkpoint(checkpoint)
+        print(f"  Done!")
+
         # Phase 6: Run calibration (on learning period only)
         if no_calibrate:
             print("\nSkipping calibration (--no-calibrate)")
-            return True
+        else:
+            used_k, recal_result = self._phase6_calibrate()
 
-        used_k, recal_result = self._phase6_calibrate()
+            # Phase 7: Backtest predictions on reserved days
+            if self.backtest_days > 0:
+                self._phase7_backtest_predictions()
 
-        # Phase 7: Backtest predictions on reserved days
-        if self.backtest_days > 0:
-            self._phase7_backtest_predictions()
+            # Print comparison
+            self._print_comparison(used_k, recal_result)
 
-        # Print comparison
-        self._print_comparison(used_k, recal_result)
+        checkpoint['completed'] = True
+        self._save_checkpoint(checkpoint)
 
         print("\nBootstrap complete!")
         return True
@@ -2206,6 +2810,79 @@ def _get_all_entity_ids():
     return sorted(ids)
 
 
+def bench_write_batching(args):
+    """
+    Compare per-point writes (the old fill_time_range path) with batched
+    writes for a synthetic refill of args.bench_writes days.
+
+    Writes to a throwaway <house_id>_write_bench tag and deletes it afterwards.
+    """
+    days = args.bench_writes
+    house_id = f"{args.house_id or 'gap_filler'}_write_bench"
+    end_time = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    start_time = end_time - timedelta(days=days)
+    step = timedelta(minutes=args.interval)
+
+    print("=" * 60)
+    print(f"Write benchmark: {days}-day refill at {args.interval} min ({house_id})")
+    print("=" * 60)
+
+    def rows():
+        ts = start_time
+        i = 0
+        while ts < end_time:
+            room = 21 + (i % 24) / 24
+            outdoor = 2 - (i % 48) / 12
+            thermal = Point("thermal_history").tag("house_id", house_id) \
+                .field("room_temperature", room).field("outdoor_temperature", outdoor) \
+                .time(ts, WritePrecision.S)
+            heating = Point("heating_system").tag("house_id", house_id) \
+                .field("room_temperature", room).field("outdoor_temperature", outdoor) \
+                .field("supply_temp", 35.0).time(ts, WritePrecision.S)
+            yield thermal, heating
+            ts += step
+            i += 1
+
+    client = InfluxDBClient(url=args.influx_url, token=args.influx_token, org=args.influx_org, timeout=30_000)
+    write_api = client.write_api(write_options=SYNCHRONOUS)
+
+    def cleanup():
+        for measurement in ['thermal_history', 'heating_system']:
+            client.delete_api().delete(
+                start_time - timedelta(hours=1), end_time + timedelta(hours=1),
+                f'_measurement="{measurement}" AND house_id="{house_id}"',
+                bucket=args.influx_bucket, org=args.influx_org)
+
+    try:
+        # Before: one synchronous request per point
+        started = time.monotonic()
+        points = 0
+        for thermal, heating in rows():
+            write_api.write(bucket=args.influx_bucket, org=args.influx_org, record=thermal)
+            write_api.write(bucket=args.influx_bucket, org=args.influx_org, record=heating)
+            points += 2
+        per_point = time.monotonic() - started
+        print(f"  Per-point: {points} points, {points} requests, {per_point:.1f}s "
+              f"({points / max(per_point, 1e-6):,.0f} points/s)")
+        cleanup()
+
+        # After: PointBatchWriter
+        started = time.monotonic()
+        writer = PointBatchWriter(write_api, args.influx_bucket, args.influx_org,
+                                  batch_size=args.write_batch_size)
+        for thermal, heating in rows():
+            writer.add(thermal, heating)
+        writer.flush()
+        batched = time.monotonic() - started
+        print(f"  Batched:   {writer.points_written} points, {writer.requests} requests, {batched:.1f}s "
+              f"({writer.points_written / max(batched, 1e-6):,.0f} points/s, "
+              f"batch size {writer.batch_size})")
+        print(f"  Speedup:   {per_point / max(batched, 1e-6):.1f}x")
+    finally:
+        cleanup()
+        client.close()
+
+
 def run_bootstrap(args):
     """Run the bootstrap pipeline from CLI args."""
     print("=" * 60)
@@ -2226,13 +2903,15 @@ def run_bootstrap(args):
         days=args.days,
         resolution=args.resolution,
         verbose=args.verbose,
-        backtest_days=args.backtest_days
+        backtest_days=args.backtest_days,
+        fetch_concurrency=args.fetch_concurrency
     )
 
     try:
         success = bootstrapper.run(
             dry_run=args.dry_run,
-            no_calibrate=args.no_calibrate
+            no_calibrate=args.no_calibrate,
+            resume=args.resume
         )
         if not success:
             sys.exit(1)
@@ -2275,6 +2954,11 @@ Examples:
     python3 gap_filler.py --bootstrap --username FC... --password "..." \\
         --house-id HEM_FJV_Villa_149_TEST --source-house-id HEM_FJV_Villa_149 \\
         --lat 56.67 --lon 12.86 --days 90 --no-calibrate
+
+    # Resume an interrupted bootstrap from its last completed chunk
+    python3 gap_filler.py --bootstrap --username FC... --password "..." \\
+        --house-id HEM_FJV_Villa_149_TEST --source-house-id HEM_FJV_Villa_149 \\
+        --lat 56.67 --lon 12.86 --days 90 --resume
         """
     )
 
@@ -2295,6 +2979,11 @@ Examples:
                         help='Skip calibration after bootstrap (data import only)')
     parser.add_argument('--backtest-days', type=int, default=10,
                         help='Days to reserve for prediction backtest (default: 10)')
+    parser.add_argument('--fetch-concurrency', type=int, default=BOOTSTRAP_FETCH_CONCURRENCY,
+                        help='Max parallel Arrigo history requests in bootstrap, 1 = sequential '
+                             f'(default: {BOOTSTRAP_FETCH_CONCURRENCY})')
+    parser.add_argument('--resume', action='store_true',
+                        help=f'Continue an interrupted bootstrap from {BOOTSTRAP_CHECKPOINT_DIR}/<id>.json')
 
     # Time range options
     parser.add_argument('--from-midnight', action='store_true',
@@ -2321,6 +3010,10 @@ Examples:
     parser.add_argument('--dry-run', action='store_true', help='Show what would be done')
     parser.add_argument('--detect-only', action='store_true', help='Only detect gaps, do not fill')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
+    parser.add_argument('--write-batch-size', type=int, default=DEFAULT_WRITE_BATCH_SIZE,
+                        help=f'Points per InfluxDB write request (default: {DEFAULT_WRITE_BATCH_SIZE})')
+    parser.add_argument('--bench-writes', type=int, metavar='DAYS',
+                        help='Benchmark per-point vs batched writes for a synthetic DAYS-day refill and exit')
     # Read default interval from settings.json
     default_interval = 5
     try:
@@ -2343,6 +3036,10 @@ Examples:
         run_bootstrap(args)
         return
 
+    if args.bench_writes:
+        bench_write_batching(args)
+        return
+
     # Determine time range
     now = datetime.now(SWEDISH_TZ)
 
@@ -2402,7 +3099,8 @@ Examples:
             house_id=house_id,
             arrigo_username=args.username,
             arrigo_password=args.password,
-            verbose=args.verbose
+            verbose=args.verbose,
+            write_batch_size=args.write_batch_size
         )
 
         if args.detect_only:
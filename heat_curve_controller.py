@@ -5,8 +5,9 @@ Manages dynamic adjustment of the heating curve based on weather forecasts
 to optimize energy usage while maintaining indoor comfort.
 """
 
+from bisect import bisect_left
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Optional, List, Tuple
+from typing import Dict, Optional, List, Sequence, Tuple
 import json
 
 
@@ -173,6 +174,58 @@ class HeatCurveController:
 
         return baseline_supply, current_supply
 
+    def get_supply_curves(self) -> Tuple[Optional[Dict[int, float]], Optional[Dict[int, float]]]:
+        """
+        Read the baseline and current curves once, for evaluating many outdoor
+        temperatures with interpolate_curve_many() (get_supply_temps_for_outdoor
+        reads both on every call).
+
+        Returns:
+            (baseline_curve, current_curve); baseline falls back to current,
+            both None if the current curve can't be read
+        """
+        current_curve = self.read_current_curve()
+        if not current_curve:
+            return None, None
+        baseline_curve = self.influx.read_heat_curve_baseline() if self.influx else None
+        return baseline_curve or current_curve, current_curve
+
+    @staticmethod
+    def interpolate_curve_many(
+        outdoor_temps: Sequence[Optional[float]],
+        curve_values: Dict[int, float]
+    ) -> List[Optional[float]]:
+        """
+        Supply temperature for each outdoor temperature (same rules as
+        _interpolate_curve: clamped at the ends, linear in between).
+        None entries stay None; all None if the curve is empty.
+        """
+        points = sorted(
+            (CURVE_OUTDOOR_TEMPS[num], supply)
+            for num, supply in (curve_values or {}).items()
+            if num in CURVE_OUTDOOR_TEMPS
+        )
+        if not points:
+            return [None] * len(outdoor_temps)
+
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
+        last = len(xs) - 1
+
+        result = []
+        for t in outdoor_temps:
+            if t is None:
+                result.append(None)
+            elif t <= xs[0]:
+                result.append(ys[0])
+            elif t >= xs[last]:
+                result.append(ys[last])
+            else:
+                i = bisect_left(xs, t)
+                x1, y1 = xs[i - 1], ys[i - 1]
+                result.append(y1 + (t - x1) / (xs[i] - x1) * (ys[i] - y1))
+        return result
+
     def _interpolate_curve(
         self,
         outdoor_temp: float,
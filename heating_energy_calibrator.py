@@ -33,6 +33,7 @@ from influxdb_client.client.write_api import SYNCHRONOUS
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from energy_models import get_weather_model
 from energy_models.weather_energy_model import WeatherConditions
+from weather_store import read_entity_weather
 
 SWEDISH_TZ = ZoneInfo('Europe/Stockholm')
 
@@ -276,28 +277,18 @@ class HeatingEnergyCalibrator:
         return results, duplicates
 
     def fetch_weather_data(self, house_id: str, start_date: str = "2025-12-01") -> Dict[str, Dict]:
-        """Fetch weather observation data."""
-        # Use regex anchors for exact match to avoid matching multiple houses
-        query = f'''
-            from(bucket: "{self.influx_bucket}")
-            |> range(start: {start_date})
-            |> filter(fn: (r) => r["_measurement"] == "weather_observation")
-            |> filter(fn: (r) => r["{self.entity_tag}"] == "{house_id}")
-            |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
-            |> sort(columns: ["_time"])
-        '''
-
-        tables = self.query_api.query(query, org=self.influx_org)
+        """Fetch weather observation data (station series joined via the house's link)."""
+        rows = read_entity_weather(self.query_api, self.influx_bucket, self.influx_org,
+                                   house_id, start_date, tag_key=self.entity_tag)
 
         weather_by_time = {}
-        for table in tables:
-            for record in table.records:
-                ts = record.get_time()
-                rounded = ts.replace(minute=(ts.minute // 15) * 15, second=0, microsecond=0)
-                weather_by_time[rounded.isoformat()] = {
-                    'wind_speed': record.values.get('wind_speed') or 3.0,
-                    'humidity': record.values.get('humidity') or 60.0,
-                }
+        for row in rows:
+            ts = row['timestamp']
+            rounded = ts.replace(minute=(ts.minute // 15) * 15, second=0, microsecond=0)
+            weather_by_time[rounded.isoformat()] = {
+                'wind_speed': row.get('wind_speed') or 3.0,
+                'humidity': row.get('humidity') or 60.0,
+            }
 
         return weather_by_time
 
@@ -35,6 +35,7 @@ from influxdb_client.client.write_api import SYNCHRONOUS
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from energy_models import get_weather_model
 from energy_models.weather_energy_model import WeatherConditions
+from weather_store import read_entity_weather
 
 SWEDISH_TZ = ZoneInfo('Europe/Stockholm')
 
@@ -137,29 +138,20 @@ class HeatingEnergyEstimator:
         return results
 
     def fetch_weather_data(self, house_id: str, days: int = 7) -> Dict[str, Dict]:
-        """Fetch weather observation data (wind, humidity) from InfluxDB."""
-        query = f'''
-            from(bucket: "{self.influx_bucket}")
-            |> range(start: -{days}d)
-            |> filter(fn: (r) => r["_measurement"] == "weather_observation")
-            |> filter(fn: (r) => r["house_id"] == "{house_id}")
-            |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
-            |> sort(columns: ["_time"])
-        '''
-
-        tables = self.query_api.query(query, org=self.influx_org)
+        """Fetch weather observation data (wind, humidity) from the house's station series."""
+        rows = read_entity_weather(self.query_api, self.influx_bucket, self.influx_org,
+                                   house_id, f"-{days}d", fields=['wind_speed', 'humidity'])
 
         # Index by rounded timestamp for joining
         weather_by_time = {}
-        for table in tables:
-            for record in table.records:
-                ts = record.get_time()
-                # Round to nearest 15 minutes for joining
-                rounded = ts.replace(minute=(ts.minute // 15) * 15, second=0, microsecond=0)
-                weather_by_time[rounded.isoformat()] = {
-                    'wind_speed': record.values.get('wind_speed', 3.0),
-                    'humidity': record.values.get('humidity', 60.0),
-                }
+        for row in rows:
+            ts = row['timestamp']
+            # Round to nearest 15 minutes for joining
+            rounded = ts.replace(minute=(ts.minute // 15) * 15, second=0, microsecond=0)
+            weather_by_time[rounded.isoformat()] = {
+                'wind_speed': row['wind_speed'] if row['wind_speed'] is not None else 3.0,
+                'humidity': row['humidity'] if row['humidity'] is not None else 60.0,
+            }
 
         print(f"Fetched {len(weather_by_time)} weather observations")
         return weather_by_time
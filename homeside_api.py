@@ -10,6 +10,8 @@ import json
 import os
 from datetime import datetime, timezone
 
+from metrics import get_registry, instrument_session, record_request_error
+
 
 def load_variables_config(config_path='variables_config.json'):
     """
@@ -112,6 +114,11 @@ class HomeSideAPI:
             'Content-Type': 'application/json',
             'Authorization': session_token
         })
+        instrument_session(self.session, 'homeside')
+        self._pending_wait = get_registry().histogram(
+            'homeside_pending_wait_seconds',
+            'Time spent re-polling getducvariables while values are Pending'
+        )
 
     def refresh_session_token(self):
         """Refresh the session token using direct API authentication"""
@@ -373,6 +380,8 @@ class HomeSideAPI:
                             print(f"✓ All {self.var_count} targets found after {elapsed}s!")
                         break
 
+                self._pending_wait.observe(elapsed)
+
                 # Final count
                 var_count = len(data.get('variables', []))
                 pending_count = sum(1 for v in data.get('variables', []) if v.get('type') == 'Pending' or v.get('value') is None)
@@ -418,6 +427,7 @@ class HomeSideAPI:
             return None
 
         except requests.exceptions.RequestException as e:
+            record_request_error('homeside', e)
             # Timeouts are normal behavior when API is slow - log as info, not warning
             if 'timed out' in str(e).lower():
                 self.logger.info(f"API timeout (normal behavior): {str(e)}")
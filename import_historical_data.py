@@ -21,11 +21,14 @@ import os
 import sys
 import json
 import argparse
+import time
 import requests
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+from coverage_index import CoverageIndex
+
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -84,6 +87,10 @@ SIGNAL_PATTERN_MAPPING = {
 # Core signals needed for thermal analysis
 CORE_SIGNALS = ["outdoor_temperature", "room_temperature", "supply_temp", "return_temp"]
 
+# InfluxDB write batching (import_data and gap_filler.GapFiller)
+DEFAULT_WRITE_BATCH_SIZE = int(os.getenv('INFLUX_WRITE_BATCH_SIZE', '5000'))  # points per request
+WRITE_RETRIES = 3  # attempts per batch before it is bisected
+
 
 class ArrigoHistoricalClient:
     """
@@ -763,6 +770,95 @@ class ArrigoHistoricalClient:
         # Default: return cleaned signal name
         return signal_name.lower().replace(' ', '_').replace(',', '')
 
+class PointBatchWriter:
+    """
+    Accumulates InfluxDB points and writes them in batches.
+
+    Points are added per row (e.g. the thermal_history + heating_system pair
+    for one timestamp). Transient failures (timeouts, 5xx, 429) are retried
+    with backoff; a batch InfluxDB rejects (4xx) is bisected down to the rows
+    that actually fail so the rest are still written.
+    """
+
+    def __init__(self, write_api, bucket: str, org: str,
+                 batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+                 retries: int = WRITE_RETRIES, on_error=None):
+        """
+        Args:
+            write_api: Synchronous influxdb_client write API
+            bucket / org: Write target
+            batch_size: Points per write request
+            retries: Attempts per batch before bisecting it
+            on_error: Callback(rows, exception) for rows that could not be written
+        """
+        self.write_api = write_api
+        self.bucket = bucket
+        self.org = org
+        self.batch_size = max(1, batch_size)
+        self.retries = max(1, retries)
+        self.on_error = on_error
+
+        self._rows: List[list] = []
+        self._pending_points = 0
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.points_written = 0
+        self.requests = 0
+        self.write_seconds = 0.0
+
+    def add(self, *points) -> None:
+        """Queue one row of points; flushes when the batch is full."""
+        self._rows.append(list(points))
+        self._pending_points += len(points)
+        if self._pending_points >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write everything queued so far."""
+        rows, self._rows, self._pending_points = self._rows, [], 0
+        if rows:
+            self._write_rows(rows)
+
+    def _write_rows(self, rows: List[list]) -> None:
+        record = [p for row in rows for p in row]
+        error = None
+        rejected = False
+        for attempt in range(1, self.retries + 1):
+            started = time.monotonic()
+            try:
+                self.requests += 1
+                self.write_api.write(bucket=self.bucket, org=self.org, record=record)
+                self.write_seconds += time.monotonic() - started
+                self.rows_written += len(rows)
+                self.points_written += len(record)
+                return
+            except Exception as e:
+                self.write_seconds += time.monotonic() - started
+                error = e
+                status = getattr(e, 'status', None)
+                if isinstance(status, int) and 400 <= status < 500 and status != 429:
+                    rejected = True
+                    break  # Rejected data - retrying the same batch won't help
+                if attempt < self.retries:
+                    time.sleep(2 ** (attempt - 1))
+
+        if rejected and len(rows) > 1:
+            # Partial failure: split so the good rows still get written
+            mid = len(rows) // 2
+            self._write_rows(rows[:mid])
+            self._write_rows(rows[mid:])
+            return
+
+        # Rejected row, or InfluxDB still unavailable after retries
+        self.rows_failed += len(rows)
+        if self.on_error:
+            self.on_error(rows, error)
+
+    @property
+    def points_per_second(self) -> float:
+        return self.points_written / self.write_seconds if self.write_seconds > 0 else 0.0
+
+
 class InfluxDBImporter:
     """Imports historical data to InfluxDB."""
 
@@ -772,7 +868,8 @@ class InfluxDBImporter:
         token: str,
         org: str,
         bucket: str,
-        house_id: str
+        house_id: str,
+        write_batch_size: int = DEFAULT_WRITE_BATCH_SIZE
     ):
         if not INFLUX_AVAILABLE:
             raise ImportError("influxdb_client not installed")
@@ -782,6 +879,7 @@ class InfluxDBImporter:
         self.bucket = bucket
         self.org = org
         self.house_id = house_id
+        self.write_batch_size = write_batch_size
 
     def import_data(self, data: List[Dict], dry_run: bool = False) -> Tuple[int, int]:
         """
@@ -813,9 +911,17 @@ class InfluxDBImporter:
 
         success_count = 0
         error_count = 0
+        written_times = []
+
+        def report_error(rows, error):
+            if writer.rows_failed <= 5:
+                print(f"  Error writing point: {error}")
+
+        writer = PointBatchWriter(self.write_api, self.bucket, self.org,
+                                  batch_size=self.write_batch_size, on_error=report_error)
 
         # Write to both thermal_history and heating_system measurements
-        for timestamp, fields in data_by_time.items():
+        for timestamp, fields in sorted(data_by_time.items()):
             try:
                 # Only import if we have the core fields for thermal analysis
                 if 'room_temperature' in fields and 'outdoor_temperature' in fields:
@@ -832,8 +938,6 @@ class InfluxDBImporter:
                         if 'return_temp' in fields:
                             thermal_point.field("return_temp", round(float(fields['return_temp']), 2))
 
-                        self.write_api.write(bucket=self.bucket, org=self.org, record=thermal_point)
-
                         # Also write to heating_system for dashboards
                         heating_point = Point("heating_system") \
                             .tag("house_id", self.house_id) \
@@ -842,7 +946,8 @@ class InfluxDBImporter:
                         for field, value in fields.items():
                             heating_point.field(field, round(float(value), 2))
 
-                        self.write_api.write(bucket=self.bucket, org=self.org, record=heating_point)
+                        writer.add(thermal_point, heating_point)
+                        written_times.append(timestamp)
 
                     success_count += 1
 
@@ -851,9 +956,27 @@ class InfluxDBImporter:
                 if error_count <= 5:
                     print(f"  Error writing point: {e}")
 
+        if not dry_run:
+            writer.flush()
+            success_count -= writer.rows_failed
+            error_count += writer.rows_failed
+            print(f"  {writer.points_written} points in {writer.requests} requests "
+                  f"({writer.points_per_second:,.0f} points/s)")
+            if written_times and not writer.rows_failed:
+                self._record_coverage(written_times)
+
         print(f"  Imported: {success_count}, Errors: {error_count}")
         return success_count, error_count
 
+    def _record_coverage(self, timestamps: List[datetime]) -> None:
+        """Mark written timestamps in the heating_system coverage index (non-critical)."""
+        try:
+            index = CoverageIndex.load(self.house_id, "heating_system")
+            index.mark_many(timestamps)
+            index.save()
+        except Exception as e:
+            print(f"  Coverage index update failed: {e}")
+
     def close(self):
         """Close InfluxDB connection."""
         self.client.close()
@@ -891,6 +1014,8 @@ Examples:
     parser.add_argument('--influx-org', default='homeside', help='InfluxDB organization')
     parser.add_argument('--influx-bucket', default='heating', help='InfluxDB bucket')
     parser.add_argument('--house-id', help='House ID for InfluxDB tags (auto-detected if not specified)')
+    parser.add_argument('--write-batch-size', type=int, default=DEFAULT_WRITE_BATCH_SIZE,
+                        help=f'Points per InfluxDB write request (default: {DEFAULT_WRITE_BATCH_SIZE})')
 
     # Operation modes
     parser.add_argument('--dry-run', action='store_true', help='Show what would be imported without writing')
@@ -988,7 +1113,8 @@ Examples:
                 token=args.influx_token,
                 org=args.influx_org,
                 bucket=args.influx_bucket,
-                house_id=house_id
+                house_id=house_id,
+                write_batch_size=args.write_batch_size
             )
 
             success, errors = importer.import_data(data, dry_run=args.dry_run)
@@ -10,9 +10,46 @@ import time
 from influxdb_client import InfluxDBClient, Point, WritePrecision
 from influxdb_client.client.write_api import SYNCHRONOUS
 from influxdb_client.client.delete_api import DeleteApi
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
 
+from coverage_index import CoverageIndex
+from weather_store import STATION_MEASUREMENT, station_point, link_point
+from metrics import get_registry, SIZE_BUCKETS
+
+
+ENERGY_FORECAST_BAND_FIELDS = (
+    'heating_energy_kwh_p10', 'heating_energy_kwh_p90',
+    'effective_temp_p10', 'effective_temp_p90',
+    'free_heat_probability',
+)
+
+
+def _energy_forecast_point(house_id: str, fp) -> Point:
+    """energy_forecast row for one EnergyForecastPoint."""
+    point = Point("energy_forecast") \
+        .tag("house_id", house_id) \
+        .field("heating_power_kw", round(float(fp.heating_power_kw), 3)) \
+        .field("heating_energy_kwh", round(float(fp.heating_energy_kwh), 3)) \
+        .field("outdoor_temp", round(float(fp.outdoor_temp), 1)) \
+        .field("effective_temp", round(float(fp.effective_temp), 1)) \
+        .field("wind_effect", round(float(fp.wind_effect), 2)) \
+        .field("solar_effect", round(float(fp.solar_effect), 2)) \
+        .field("lead_time_hours", round(float(fp.lead_time_hours), 1)) \
+        .time(fp.timestamp, WritePrecision.S)
+
+    # Ensemble bands as extra fields on the same row (no extra series)
+    for name in ENERGY_FORECAST_BAND_FIELDS:
+        value = getattr(fp, name, None)
+        if value is not None:
+            point.field(name, float(value))
+    return point
+
+
+def _escape_tag(value: str) -> str:
+    """Escape a tag key/value for line protocol."""
+    return str(value).replace('\\', '\\\\').replace(',', '\\,').replace('=', '\\=').replace(' ', '\\ ')
+
 
 class InfluxDBWriter:
     """
@@ -57,6 +94,8 @@ class InfluxDBWriter:
         self.seq_logger = seq_logger
         self._consecutive_failures = 0
         self._circuit_open_time = None   # When circuit breaker opened
+        self._coverage = {}              # (entity, measurement) -> CoverageIndex
+        self._weather_station = None     # station_id of the last weather link written
 
         # Circuit breaker settings (from settings.json "influxdb" section)
         influx_settings = settings or {}
@@ -70,6 +109,16 @@ class InfluxDBWriter:
         self._org = org
         self._bucket = bucket
 
+        # Write latency / batch size / circuit breaker metrics
+        metrics = get_registry()
+        self._write_latency = metrics.histogram(
+            'homeside_influx_write_seconds', 'InfluxDB write latency')
+        self._write_batch_size = metrics.histogram(
+            'homeside_influx_write_points', 'Points per InfluxDB write call', buckets=SIZE_BUCKETS)
+        metrics.gauge(
+            'homeside_influx_circuit_open', '1 while the InfluxDB circuit breaker is open'
+        ).set_function(self._circuit_is_open, writer='house', entity=house_id)
+
         if not self.enabled:
             self.logger.info("InfluxDB writing disabled")
             self.client = None
@@ -148,6 +197,37 @@ class InfluxDBWriter:
             self._consecutive_failures = 0
             self._circuit_open_time = None
 
+    def _circuit_is_open(self) -> int:
+        """1 if writes are currently being skipped by the circuit breaker."""
+        return int(self._consecutive_failures >= self._circuit_breaker_threshold)
+
+    def _write(self, record, write_precision: str = None) -> None:
+        """
+        Write a point or list of points, recording latency and batch size.
+
+        write_precision is only needed for line-protocol strings (Points
+        carry their own precision).
+        """
+        size = len(record) if isinstance(record, list) else 1
+        kwargs = {'write_precision': write_precision} if write_precision else {}
+        with self._write_latency.time(writer='house'):
+            self.write_api.write(bucket=self.bucket, org=self.org, record=record, **kwargs)
+        self._write_batch_size.observe(size, writer='house')
+
+    def _mark_coverage(self, measurement: str, timestamp, entity_id: str = None) -> None:
+        """Record a successful write in the on-disk coverage index (non-critical)."""
+        entity_id = entity_id or self.house_id
+        try:
+            if isinstance(timestamp, str):
+                timestamp = datetime.fromisoformat(timestamp)
+            index = self._coverage.get((entity_id, measurement))
+            if index is None:
+                index = self._coverage[(entity_id, measurement)] = CoverageIndex.load(entity_id, measurement)
+            index.mark(timestamp, live=True)
+            index.save()
+        except Exception as e:
+            self.logger.debug(f"Coverage index update failed for {measurement}: {e}")
+
     def _should_write(self) -> bool:
         """
         Circuit breaker guard — call at the top of every write/delete method.
@@ -316,8 +396,9 @@ class InfluxDBWriter:
                 point.field("curve_control_mode", int(data['curve_control_mode']))
 
             # Write to InfluxDB
-            self.write_api.write(bucket=self.bucket, org=self.org, record=point)
+            self._write(point)
             self._log_influx_success()
+            self._mark_coverage("heating_system", data.get('timestamp', datetime.utcnow()))
             return True
 
         except Exception as e:
@@ -367,7 +448,7 @@ class InfluxDBWriter:
             if 'avg_cloud_cover' in forecast and forecast['avg_cloud_cover'] is not None:
                 point.field("avg_cloud_cover", round(float(forecast['avg_cloud_cover']), 2))
 
-            self.write_api.write(bucket=self.bucket, org=self.org, record=point)
+            self._write(point)
             return True
 
         except Exception as e:
@@ -443,7 +524,7 @@ class InfluxDBWriter:
                 points.append(point)
 
             if points:
-                self.write_api.write(bucket=self.bucket, org=self.org, record=points)
+                self._write(points)
                 self.logger.info(f"Wrote {len(points)} weather forecast points to InfluxDB")
                 return True
 
@@ -530,17 +611,22 @@ class InfluxDBWriter:
                 .field("current_indoor", round(float(decision.get('current_indoor', 0)), 2)) \
                 .time(datetime.utcnow(), WritePrecision.S)
 
-            self.write_api.write(bucket=self.bucket, org=self.org, record=point)
+            self._write(point)
             return True
 
         except Exception as e:
             self.logger.error(f"Failed to write control decision to InfluxDB: {str(e)}")
             return False
 
-    def write_weather_observation(self, observation: Dict) -> bool:
+    def write_weather_observation(self, observation: Dict, shared: bool = False) -> bool:
         """
         Write current weather observation to InfluxDB.
 
+        The observation goes to the station-keyed series (weather_store), and
+        this house gets a weather_station_link point when it starts using the
+        station. Observations without a station_id fall back to the legacy
+        per-house weather_observation measurement.
+
         Args:
             observation: Dictionary with observation data
                 {
@@ -552,6 +638,8 @@ class InfluxDBWriter:
                     'humidity': float (optional),
                     'timestamp': datetime
                 }
+            shared: Observation came from the shared cache, so the station
+                series already has it - only link this house to the station
 
         Returns:
             True if write succeeded, False otherwise
@@ -560,21 +648,37 @@ class InfluxDBWriter:
             return False
 
         try:
-            point = Point("weather_observation") \
-                .tag("house_id", self.house_id) \
-                .tag("station_name", observation.get('station_name', 'unknown')) \
-                .tag("station_id", str(observation.get('station_id', 0))) \
-                .field("temperature", round(float(observation['temperature']), 2)) \
-                .field("distance_km", round(float(observation.get('distance_km', 0)), 2)) \
-                .time(observation.get('timestamp', datetime.utcnow()), WritePrecision.S)
+            timestamp = observation.get('timestamp') or datetime.now(timezone.utc)
+            station_id = observation.get('station_id')
 
-            # Optional fields
-            if 'wind_speed' in observation and observation['wind_speed'] is not None:
-                point.field("wind_speed", round(float(observation['wind_speed']), 2))
-            if 'humidity' in observation and observation['humidity'] is not None:
-                point.field("humidity", round(float(observation['humidity']), 2))
+            if station_id is None:
+                point = Point("weather_observation") \
+                    .tag("house_id", self.house_id) \
+                    .tag("station_name", observation.get('station_name', 'unknown')) \
+                    .tag("station_id", "0") \
+                    .field("temperature", round(float(observation['temperature']), 2)) \
+                    .field("distance_km", round(float(observation.get('distance_km', 0)), 2)) \
+                    .time(timestamp, WritePrecision.S)
+
+                # Optional fields
+                if 'wind_speed' in observation and observation['wind_speed'] is not None:
+                    point.field("wind_speed", round(float(observation['wind_speed']), 2))
+                if 'humidity' in observation and observation['humidity'] is not None:
+                    point.field("humidity", round(float(observation['humidity']), 2))
 
-            self.write_api.write(bucket=self.bucket, org=self.org, record=point)
+                self._write(point)
+                self._mark_coverage("weather_observation", timestamp)
+                return True
+
+            station_id = str(station_id)
+            points = [] if shared else [station_point(observation)]
+            if self._weather_station != station_id:
+                points.append(link_point(self.house_id, station_id,
+                                         observation.get('distance_km'), timestamp))
+            if points:
+                self._write(points)
+            self._weather_station = station_id
+            self._mark_coverage(STATION_MEASUREMENT, timestamp, entity_id=station_id)
             return True
 
         except Exception as e:
@@ -606,7 +710,7 @@ class InfluxDBWriter:
                 .field("learning_period_hours", int(learning_period_hours)) \
                 .time(datetime.utcnow(), WritePrecision.S)
 
-            self.write_api.write(bucket=self.bucket, org=self.org, record=point)
+            self._write(point)
             return True
 
         except Exception as e:
@@ -637,7 +741,7 @@ class InfluxDBWriter:
             for index, value in curve_values.items():
                 point.field(f"y_{index}", round(float(value), 2))
 
-            self.write_api.write(bucket=self.bucket, org=self.org, record=point)
+            self._write(point)
             self.logger.info(f"Stored heat curve baseline: {len(curve_values)} points")
             return True
 
@@ -730,7 +834,7 @@ class InfluxDBWriter:
             for index, value in adjusted_points.items():
                 point.field(f"point_{index}", round(float(value), 2))
 
-            self.write_api.write(bucket=self.bucket, org=self.org, record=point)
+            self._write(point)
             self.logger.info(f"Logged heat curve {action}: {len(adjusted_points)} points, delta={delta}")
             return True
 
@@ -783,7 +887,7 @@ class InfluxDBWriter:
             if 'return_temp' in data and data['return_temp'] is not None:
                 point.field("return_temp", round(float(data['return_temp']), 2))
 
-            self.write_api.write(bucket=self.bucket, org=self.org, record=point)
+            self._write(point)
             return True
 
         except Exception as e:
@@ -820,7 +924,8 @@ class InfluxDBWriter:
 
         try:
             # Use current time as the "forecast generation time" tag
-            forecast_time = datetime.now(timezone.utc).isoformat()
+            now = datetime.now(timezone.utc)
+            forecast_time = now.isoformat()
 
             points = []
             for data in forecast_data:
@@ -838,12 +943,13 @@ class InfluxDBWriter:
                     .tag("forecast_time", forecast_time) \
                     .field("value", round(float(value), 2)) \
                     .field("lead_time_hours", round(float(lead_time_hours), 1)) \
+                    .field("generated_at", int(now.timestamp())) \
                     .time(timestamp, WritePrecision.S)
 
                 points.append(point)
 
             if points:
-                self.write_api.write(bucket=self.bucket, org=self.org, record=points)
+                self._write(points)
                 self.logger.info(f"Wrote {len(points)} forecast points to InfluxDB (with lead_time_hours)")
                 return True
 
@@ -853,6 +959,61 @@ class InfluxDBWriter:
             self.logger.error(f"Failed to write forecast points: {str(e)}")
             return False
 
+    def write_forecast_columns(self, columns, changed: Optional[Dict[str, List[bool]]] = None) -> bool:
+        """
+        Write a TemperatureForecaster.generate_forecast_columns() result.
+
+        Same series as write_forecast_points(), but the line protocol is
+        built straight from the columns instead of via one dict and one
+        Point per value. The forecast_time tag is columns.generated_at, so
+        rewriting points of the same columns overwrites them; the
+        generated_at field (epoch seconds) is when the value itself was
+        predicted, which differs for hours refreshed by update_from().
+
+        Args:
+            columns: ForecastColumns (timestamps, lead_time_hours, outdoor,
+                supply_baseline, supply_ml, indoor)
+            changed: Optional forecast_type -> per-hour flags from
+                ForecastColumns.update_from(); only flagged points are written
+
+        Returns:
+            True if write succeeded (or nothing had changed), False otherwise
+        """
+        if not self._should_write() or not len(columns):
+            return False
+
+        try:
+            forecast_time = columns.generated_at.isoformat()
+            tags = f"house_id={_escape_tag(self.house_id)},forecast_time={_escape_tag(forecast_time)}"
+
+            generated = [int(ts.timestamp()) for ts in
+                         (columns.hour_generated_at or [columns.generated_at] * len(columns))]
+
+            lines = []
+            for forecast_type, name in columns.SERIES:
+                prefix = f"temperature_forecast,{tags},forecast_type={forecast_type} value="
+                flags = changed[forecast_type] if changed is not None else None
+                for i, value in enumerate(getattr(columns, name)):
+                    if value is None or (flags is not None and not flags[i]):
+                        continue
+                    lines.append(
+                        f"{prefix}{round(float(value), 2)!r},"
+                        f"lead_time_hours={round(float(columns.lead_time_hours[i]), 1)!r},"
+                        f"generated_at={generated[i]}i "
+                        f"{int(columns.timestamps[i].timestamp())}"
+                    )
+
+            if lines:
+                self._write(lines, write_precision=WritePrecision.S)
+                self.logger.info(f"Wrote {len(lines)} forecast points to InfluxDB (with lead_time_hours)")
+                return True
+
+            return changed is not None
+
+        except Exception as e:
+            self.logger.error(f"Failed to write forecast points: {str(e)}")
+            return False
+
     def write_learned_parameters(self, profile_data: Dict) -> bool:
         """
         Write learned parameters history to InfluxDB.
@@ -890,7 +1051,7 @@ class InfluxDBWriter:
             for hour, bias in hourly_bias.items():
                 point = point.field(f"bias_{hour}", bias)
 
-            self.write_api.write(bucket=self.bucket, org=self.org, record=point)
+            self._write(point)
             self.logger.debug("Wrote learned parameters to InfluxDB")
             return True
 
@@ -937,7 +1098,7 @@ class InfluxDBWriter:
                 .field("outdoor", round(float(outdoor), 1)) \
                 .time(datetime.now(timezone.utc), WritePrecision.S)
 
-            self.write_api.write(bucket=self.bucket, org=self.org, record=point)
+            self._write(point)
             self.logger.debug(f"Wrote forecast accuracy: predicted={predicted:.1f}, actual={actual:.1f}, error={error:.2f}")
             return True
 
@@ -957,6 +1118,7 @@ class InfluxDBWriter:
                 - heating_energy_kwh: Predicted energy for this hour
                 - outdoor_temp, effective_temp, wind_effect, solar_effect
                 - lead_time_hours: Hours from forecast generation
+                - ensemble bands, when present (ENERGY_FORECAST_BAND_FIELDS)
 
         Returns:
             True if write succeeded, False otherwise
@@ -965,23 +1127,10 @@ class InfluxDBWriter:
             return False
 
         try:
-            points = []
-            for fp in forecast_points:
-                point = Point("energy_forecast") \
-                    .tag("house_id", self.house_id) \
-                    .field("heating_power_kw", round(float(fp.heating_power_kw), 3)) \
-                    .field("heating_energy_kwh", round(float(fp.heating_energy_kwh), 3)) \
-                    .field("outdoor_temp", round(float(fp.outdoor_temp), 1)) \
-                    .field("effective_temp", round(float(fp.effective_temp), 1)) \
-                    .field("wind_effect", round(float(fp.wind_effect), 2)) \
-                    .field("solar_effect", round(float(fp.solar_effect), 2)) \
-                    .field("lead_time_hours", round(float(fp.lead_time_hours), 1)) \
-                    .time(fp.timestamp, WritePrecision.S)
-
-                points.append(point)
+            points = [_energy_forecast_point(self.house_id, fp) for fp in forecast_points]
 
             if points:
-                self.write_api.write(bucket=self.bucket, org=self.org, record=points)
+                self._write(points)
                 self.logger.info(f"Wrote {len(points)} energy forecast points to InfluxDB")
                 return True
 
@@ -991,6 +1140,111 @@ class InfluxDBWriter:
             self.logger.error(f"Failed to write energy forecast: {str(e)}")
             return False
 
+    def write_fleet_energy_forecast(self, forecasts: Dict[str, list]) -> bool:
+        """
+        Write energy forecasts for many houses in one bulk write.
+
+        Besides the per-house energy_forecast rows, writes one
+        energy_forecast_fleet row per hour with the fleet totals, which
+        get_energy_forecast_all() reads instead of summing every house.
+        Fleet rows carry generated_at (epoch seconds) so readers can tell
+        the latest run from leftovers.
+
+        Args:
+            forecasts: house_id -> list of EnergyForecastPoint
+
+        Returns:
+            True if write succeeded, False otherwise
+        """
+        if not self._should_write() or not forecasts:
+            return False
+
+        try:
+            generated_at = int(datetime.now(timezone.utc).timestamp())
+            points = []
+            totals = {}  # timestamp -> [energy, power, outdoor_sum, houses, lead_time]
+            for house_id, forecast_points in forecasts.items():
+                for fp in forecast_points:
+                    points.append(_energy_forecast_point(house_id, fp))
+                    total = totals.setdefault(fp.timestamp, [0.0, 0.0, 0.0, 0, fp.lead_time_hours])
+                    total[0] += fp.heating_energy_kwh
+                    total[1] += fp.heating_power_kw
+                    total[2] += fp.outdoor_temp
+                    total[3] += 1
+
+            for timestamp, (energy, power, outdoor_sum, houses, lead_time) in totals.items():
+                points.append(
+                    Point("energy_forecast_fleet")
+                    .field("heating_energy_kwh", round(energy, 3))
+                    .field("heating_power_kw", round(power, 3))
+                    .field("outdoor_temp", round(outdoor_sum / houses, 1))
+                    .field("house_count", houses)
+                    .field("lead_time_hours", round(float(lead_time), 1))
+                    .field("generated_at", generated_at)
+                    .time(timestamp, WritePrecision.S)
+                )
+
+            if points:
+                self._write(points)
+                self.logger.info(f"Wrote {len(points)} fleet energy forecast points "
+                                 f"for {len(forecasts)} house(s) to InfluxDB")
+                return True
+
+            return False
+
+        except Exception as e:
+            self.logger.error(f"Failed to write fleet energy forecast: {str(e)}")
+            return False
+
+    def read_energy_forecast_points(self, hours: int = 72) -> list:
+        """
+        Read this house's future energy forecast back as EnergyForecastPoints
+        (written by the fleet forecaster when FLEET_ENERGY_FORECAST is on).
+
+        Returns:
+            List of EnergyForecastPoint sorted by time (empty on failure)
+        """
+        if not self.enabled:
+            return []
+
+        try:
+            from energy_forecaster import EnergyForecastPoint
+
+            query = f'''
+                from(bucket: "{self.bucket}")
+                |> range(start: now(), stop: {hours}h)
+                |> filter(fn: (r) => r["_measurement"] == "energy_forecast")
+                |> filter(fn: (r) => r["house_id"] == "{self.house_id}")
+                |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
+                |> sort(columns: ["_time"])
+            '''
+            points = []
+            for table in self.client.query_api().query(query, org=self.org):
+                for record in table.records:
+                    values = record.values
+                    timestamp = record.get_time()
+                    if timestamp is None or values.get('effective_temp') is None:
+                        continue
+                    if timestamp.tzinfo is None:
+                        timestamp = timestamp.replace(tzinfo=timezone.utc)
+                    points.append(EnergyForecastPoint(
+                        timestamp=timestamp,
+                        outdoor_temp=values.get('outdoor_temp') or 0.0,
+                        effective_temp=values['effective_temp'],
+                        wind_effect=values.get('wind_effect') or 0.0,
+                        solar_effect=values.get('solar_effect') or 0.0,
+                        humidity_effect=0.0,
+                        heating_power_kw=values.get('heating_power_kw') or 0.0,
+                        heating_energy_kwh=values.get('heating_energy_kwh') or 0.0,
+                        lead_time_hours=values.get('lead_time_hours') or 0.0,
+                        **{name: values.get(name) for name in ENERGY_FORECAST_BAND_FIELDS},
+                    ))
+            return points
+
+        except Exception as e:
+            self.logger.error(f"Failed to read energy forecast: {str(e)}")
+            return []
+
     def delete_future_forecasts(self) -> bool:
         """
         Delete future temperature forecast points (keep history, update future).
@@ -1027,10 +1281,13 @@ class InfluxDBWriter:
             self.logger.error(f"Failed to delete future forecasts: {str(e)}")
             return False
 
-    def delete_future_energy_forecasts(self) -> bool:
+    def delete_future_energy_forecasts(self, house_id: str = None) -> bool:
         """
         Delete future energy forecast points (keep history, update future).
 
+        Args:
+            house_id: House to delete for (default: this writer's house)
+
         Returns:
             True if delete succeeded, False otherwise
         """
@@ -1043,7 +1300,7 @@ class InfluxDBWriter:
             start = datetime.now(timezone.utc)
             stop = datetime.now(timezone.utc) + timedelta(days=7)
 
-            predicate = f'_measurement="energy_forecast" AND house_id="{self.house_id}"'
+            predicate = f'_measurement="energy_forecast" AND house_id="{house_id or self.house_id}"'
 
             delete_api.delete(
                 start=start,
@@ -1059,6 +1316,46 @@ class InfluxDBWriter:
             self.logger.error(f"Failed to delete energy forecasts: {str(e)}")
             return False
 
+    def delete_future_fleet_energy_forecasts(self, house_ids: List[str]) -> bool:
+        """
+        Delete future energy forecast points of the given houses and the
+        fleet totals (before a fleet forecast write). Houses left out of the
+        run (e.g. no weather forecast for their cell) keep their forecast.
+
+        Args:
+            house_ids: Houses about to be written
+
+        Returns:
+            True if delete succeeded, False otherwise
+        """
+        if not self._should_write():
+            return False
+
+        try:
+            delete_api = self.client.delete_api()
+
+            start = datetime.now(timezone.utc)
+            stop = datetime.now(timezone.utc) + timedelta(days=7)
+
+            # No OR/IN in delete predicates: one delete per house
+            predicates = [f'_measurement="energy_forecast" AND house_id="{house_id}"'
+                          for house_id in house_ids]
+            predicates.append('_measurement="energy_forecast_fleet"')
+            for predicate in predicates:
+                delete_api.delete(
+                    start=start,
+                    stop=stop,
+                    predicate=predicate,
+                    bucket=self.bucket,
+                    org=self.org
+                )
+
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Failed to delete fleet energy forecasts: {str(e)}")
+            return False
+
     def read_thermal_history(self, days: int = 7) -> list:
         """
         Read thermal history data from InfluxDB.
@@ -1245,7 +1542,7 @@ class InfluxDBWriter:
                 points.append(point)
 
             if points:
-                self.write_api.write(bucket=self.bucket, org=self.org, record=points)
+                self._write(points)
                 self.logger.info(f"Wrote {len(points)} shared weather forecast points (location: {location_key})")
                 return True
 
@@ -1364,12 +1661,15 @@ class InfluxDBWriter:
                 .field("distance_km", round(float(observation.get('distance_km', 0)), 2)) \
                 .time(observation.get('timestamp', datetime.now(timezone.utc)), WritePrecision.S)
 
+            if observation.get('station_id') is not None:
+                point.field("station_id", str(observation['station_id']))
+
             if observation.get('wind_speed') is not None:
                 point.field("wind_speed", round(float(observation['wind_speed']), 2))
             if observation.get('humidity') is not None:
                 point.field("humidity", round(float(observation['humidity']), 2))
 
-            self.write_api.write(bucket=self.bucket, org=self.org, record=point)
+            self._write(point)
             return True
 
         except Exception as e:
@@ -1423,6 +1723,8 @@ class InfluxDBWriter:
                         observation['wind_speed'] = values['wind_speed']
                     if values.get('humidity') is not None:
                         observation['humidity'] = values['humidity']
+                    if values.get('station_id') is not None:
+                        observation['station_id'] = values['station_id']
 
                     self.logger.info(f"Using shared weather observation: {observation['temperature']:.1f}°C from {observation['station_name']}")
                     return observation
@@ -1512,7 +1814,7 @@ class InfluxDBWriter:
                 .field("peak_sun_elevation", round(float(event_data.get('peak_sun_elevation', 0)), 1)) \
                 .time(timestamp, WritePrecision.S)
 
-            self.write_api.write(bucket=self.bucket, org=self.org, record=point)
+            self._write(point)
             self.logger.info(
                 f"Wrote solar event: {event_data.get('duration_minutes', 0):.0f}min, "
                 f"coeff={event_data.get('implied_solar_coefficient_ml2', 0):.1f}"
@@ -1554,7 +1856,7 @@ class InfluxDBWriter:
                 .field("total_solar_events", int(coefficients.get('total_solar_events', 0))) \
                 .time(datetime.now(timezone.utc), WritePrecision.S)
 
-            self.write_api.write(bucket=self.bucket, org=self.org, record=point)
+            self._write(point)
             self.logger.info(
                 f"Wrote ML2 coefficients: solar={coefficients.get('solar_coefficient_ml2', 0):.1f}, "
                 f"confidence={coefficients.get('solar_confidence_ml2', 0):.0%}"
@@ -1596,7 +1898,7 @@ class InfluxDBWriter:
                 .field("total_transitions", int(timing.get('total_transitions', 0))) \
                 .time(datetime.now(timezone.utc), WritePrecision.S)
 
-            self.write_api.write(bucket=self.bucket, org=self.org, record=point)
+            self._write(point)
             self.logger.info(
                 f"Wrote ML2 thermal timing: heat_up={timing.get('heat_up_lag_minutes_ml2', 60):.0f}min, "
                 f"cool_down={timing.get('cool_down_lag_minutes_ml2', 90):.0f}min"
@@ -1639,7 +1941,7 @@ class InfluxDBWriter:
                 .field("confidence", round(float(warning.get('confidence', 0)), 2)) \
                 .time(timestamp, WritePrecision.S)
 
-            self.write_api.write(bucket=self.bucket, org=self.org, record=point)
+            self._write(point)
             self.logger.info(
                 f"Wrote solar early warning: +{warning.get('outdoor_rise', 0):.1f}°C rise, "
                 f"lead_time={warning.get('estimated_lead_time_minutes', 60):.0f}min"
@@ -1679,7 +1981,7 @@ class InfluxDBWriter:
                 .field("confidence", round(float(lag.get('confidence', 0)), 2)) \
                 .time(datetime.now(timezone.utc), WritePrecision.S)
 
-            self.write_api.write(bucket=self.bucket, org=self.org, record=point)
+            self._write(point)
             self.logger.debug(
                 f"Wrote thermal lag: {lag.get('type', 'unknown')} {lag.get('lag_minutes', 0):.0f}min"
             )
@@ -1745,6 +2047,59 @@ class InfluxDBWriter:
             self.logger.error(f"Failed to read solar events: {str(e)}")
             return []
 
+    def read_thermal_lag_series(self, days: int = 30, step_minutes: int = 5) -> Tuple[list, list, list]:
+        """
+        Read effective outdoor and indoor temperature for thermal lag correlation.
+
+        Args:
+            days: Number of days of history to read
+            step_minutes: Aggregation window (mean per window)
+
+        Returns:
+            (timestamps, effective_temps, indoor_temps) - epoch seconds and °C,
+            sorted by time. effective_temp falls back to outdoor_temperature
+            for rows written before it was recorded.
+        """
+        if not self.enabled:
+            return [], [], []
+
+        try:
+            query_api = self.client.query_api()
+
+            query = f'''
+                from(bucket: "{self.bucket}")
+                |> range(start: -{days}d)
+                |> filter(fn: (r) => r["_measurement"] == "heating_system")
+                |> filter(fn: (r) => r["house_id"] == "{self.house_id}")
+                |> filter(fn: (r) => r["_field"] == "room_temperature" or r["_field"] == "effective_temp" or r["_field"] == "outdoor_temperature")
+                |> aggregateWindow(every: {step_minutes}m, fn: mean, createEmpty: false)
+                |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
+                |> sort(columns: ["_time"])
+            '''
+
+            tables = query_api.query(query, org=self.org)
+
+            rows = {}
+            for table in tables:
+                for record in table.records:
+                    timestamp = record.get_time()
+                    indoor = record.values.get('room_temperature')
+                    effective = record.values.get('effective_temp')
+                    if effective is None:
+                        effective = record.values.get('outdoor_temperature')
+                    if timestamp and indoor is not None and effective is not None:
+                        rows[timestamp.timestamp()] = (float(effective), float(indoor))
+
+            timestamps = sorted(rows)
+            self.logger.info(f"Read {len(timestamps)} thermal lag samples from InfluxDB")
+            return (timestamps,
+                    [rows[ts][0] for ts in timestamps],
+                    [rows[ts][1] for ts in timestamps])
+
+        except Exception as e:
+            self.logger.error(f"Failed to read thermal lag series: {str(e)}")
+            return [], [], []
+
     def close(self):
         """Close InfluxDB client connection"""
         if self.client:
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Metrics Module
+Lightweight in-process metrics registry (counters, gauges, histograms) with a
+Prometheus text-format HTTP endpoint.
+
+Usage:
+    from metrics import get_registry, start_metrics_server
+
+    metrics = get_registry()
+    polls = metrics.counter('homeside_polls_total', 'Completed poll iterations')
+    latency = metrics.histogram('homeside_http_request_seconds', 'HTTP request latency')
+
+    polls.inc()
+    latency.observe(0.42, service='smhi')
+    with latency.time(service='homeside'):
+        ...
+
+    # Serve /metrics (no-op when port is 0)
+    start_metrics_server(int(os.getenv('METRICS_PORT', '0')))
+
+Metrics are collected whether or not the server is started, so instrumentation
+is always safe to call. The orchestrator scrapes each child's endpoint and
+re-exports the samples with an `instance` label (see aggregate_metrics_text).
+"""
+
+import math
+import re
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# Default latency buckets in seconds (HTTP calls, InfluxDB writes, poll iterations)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Buckets for point/row counts (InfluxDB batch sizes)
+SIZE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, 10000)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value the way Prometheus expects."""
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels) + '}'
+
+
+def _label_key(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class _Metric:
+    """Base class: one metric family, keyed by label set."""
+
+    type_name = 'untyped'
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {self.type_name}']
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    type_name = 'counter'
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f'{self.name}{_format_labels(k)} {_format_value(v)}' for k, v in items]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, optionally computed on scrape."""
+
+    type_name = 'gauge'
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self._values: Dict[tuple, float] = {}
+        self._functions: Dict[tuple, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, fn: Callable[[], float], **labels):
+        """Evaluate fn() at scrape time instead of storing a value."""
+        with self._lock:
+            self._functions[_label_key(labels)] = fn
+
+    def remove(self, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values.pop(key, None)
+            self._functions.pop(key, None)
+
+    def value(self, **labels) -> Optional[float]:
+        key = _label_key(labels)
+        if key in self._functions:
+            return float(self._functions[key]())
+        return self._values.get(key)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+            functions = list(self._functions.items())
+        for key, fn in functions:
+            try:
+                items.append((key, float(fn())))
+            except Exception:
+                continue
+        return [f'{self.name}{_format_labels(k)} {_format_value(v)}' for k, v in items]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram with sum and count."""
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, help_text: str, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [bucket counts..., sum, count]
+        self._values: Dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = [0] * len(self.buckets) + [0.0, 0]
+                self._values[key] = state
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Context manager that observes the elapsed wall time in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        state = self._values.get(_label_key(labels))
+        return state[-1] if state else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        lines = []
+        for key, state in items:
+            for i, bound in enumerate(self.buckets):
+                bucket_key = key + (('le', _format_value(float(bound))),)
+                lines.append(f'{self.name}_bucket{_format_labels(bucket_key)} {state[i]}')
+            inf_key = key + (('le', '+Inf'),)
+            lines.append(f'{self.name}_bucket{_format_labels(inf_key)} {state[-1]}')
+            lines.append(f'{self.name}_sum{_format_labels(key)} {_format_value(state[-2])}')
+            lines.append(f'{self.name}_count{_format_labels(key)} {state[-1]}')
+        return lines
+
+
+class MetricsRegistry:
+    """Holds metric families by name; get-or-create so modules can share them."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, help_text: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, help_text, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.type_name}")
+            return metric
+
+    def counter(self, name: str, help_text: str = '') -> Counter:
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str = '') -> Gauge:
+        return self._get_or_create(Gauge, name, help_text)
+
+    def histogram(self, name: str, help_text: str = '',
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, buckets=buckets)
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            samples = metric.samples()
+            if not samples:
+                continue
+            lines.extend(metric.header())
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+
+# ---------------------------------------------------------------------------
+#  Shared helpers
+# ---------------------------------------------------------------------------
+_default_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """Get the process-wide registry."""
+    return _default_registry
+
+
+def instrument_session(session, service: str, registry: MetricsRegistry = None):
+    """
+    Record request latency for every response on a requests.Session.
+
+    Adds a response hook that observes homeside_http_request_seconds with
+    service/method/status labels (time to response headers).
+    """
+    registry = registry or _default_registry
+    latency = registry.histogram(
+        'homeside_http_request_seconds', 'Outbound HTTP request latency by service')
+
+    def _hook(response, *args, **kwargs):
+        try:
+            latency.observe(
+                response.elapsed.total_seconds(),
+                service=service,
+                method=response.request.method,
+                status=str(response.status_code),
+            )
+        except Exception:
+            pass
+        return response
+
+    session.hooks.setdefault('response', []).append(_hook)
+    return session
+
+
+def record_request_error(service: str, error: Exception, registry: MetricsRegistry = None):
+    """Count a failed outbound request (timeouts and connection errors have no response)."""
+    registry = registry or _default_registry
+    registry.counter(
+        'homeside_http_request_errors_total', 'Outbound HTTP requests that raised'
+    ).inc(service=service, error=type(error).__name__)
+
+
+# ---------------------------------------------------------------------------
+#  HTTP endpoint
+# ---------------------------------------------------------------------------
+def start_metrics_server(port: int, registry: MetricsRegistry = None,
+                         render: Callable[[], str] = None,
+                         host: str = '0.0.0.0') -> Optional[ThreadingHTTPServer]:
+    """
+    Serve GET /metrics from a daemon thread.
+
+    Args:
+        port: TCP port (0 or None disables the server)
+        registry: Registry to render (default: process-wide registry)
+        render: Optional callable returning the full response body (used by the
+            orchestrator to append its children's metrics)
+        host: Bind address
+
+    Returns:
+        The server instance, or None if disabled or the port is unavailable
+    """
+    if not port:
+        return None
+    registry = registry or _default_registry
+    render = render or registry.render
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/metrics', '/'):
+                self.send_response(404)
+                self.end_headers()
+                return
+            try:
+                body = render().encode('utf-8')
+            except Exception as e:
+                body = f'# metrics render failed: {e}\n'.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass  # Scrapes every 15-60 s would flood stdout
+
+    try:
+        server = ThreadingHTTPServer((host, port), _Handler)
+    except OSError as e:
+        print(f"⚠ Metrics endpoint disabled (port {port}: {e})")
+        return None
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True)
+    thread.start()
+    print(f"✓ Metrics endpoint: http://{host}:{port}/metrics")
+    return server
+
+
+# ---------------------------------------------------------------------------
+#  Aggregation (orchestrator)
+# ---------------------------------------------------------------------------
+_SAMPLE_RE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{.*\})?\s+(\S+)(\s+\S+)?$')
+
+
+def scrape(url: str, timeout: float = 2.0) -> Optional[str]:
+    """Fetch a metrics page, returning None on any failure."""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return response.read().decode('utf-8')
+    except Exception:
+        return None
+
+
+def aggregate_metrics_text(pages: Dict[str, Tuple[str, Dict[str, str]]]) -> str:
+    """
+    Merge several Prometheus text pages into one, adding per-page labels.
+
+    Args:
+        pages: {source_name: (page_text, extra_labels)} — extra_labels are
+            injected into every sample (e.g. {'instance': 'HEM_FJV_Villa_149'})
+
+    Returns:
+        Combined page with one HELP/TYPE header per metric family
+    """
+    headers: Dict[str, List[str]] = {}
+    samples: Dict[str, List[str]] = {}
+
+    for text, extra in pages.values():
+        family = None
+        extra_str = ','.join(f'{k}="{_escape(v)}"' for k, v in sorted(extra.items()))
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            if line.startswith('# HELP ') or line.startswith('# TYPE '):
+                family = line.split()[2]
+                headers.setdefault(family, [])
+                if len(headers[family]) < 2 and line not in headers[family]:
+                    headers[family].append(line)
+                continue
+            if line.startswith('#'):
+                continue
+            match = _SAMPLE_RE.match(line)
+            if not match:
+                continue
+            name, labels, value = match.group(1), match.group(2), match.group(3)
+            if labels:
+                merged = labels[:-1] + (',' if extra_str else '') + extra_str + '}'
+            else:
+                merged = '{' + extra_str + '}' if extra_str else ''
+            key = family if family and name.startswith(family) else name
+            samples.setdefault(key, []).append(f'{name}{merged} {value}')
+
+    lines = []
+    for family, family_samples in samples.items():
+        lines.extend(headers.get(family, []))
+        lines.extend(family_samples)
+    return '\n'.join(lines) + '\n'
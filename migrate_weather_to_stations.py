@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+One-time migration script: per-house weather_observation -> station series
+
+Weather used to be written once per house, so every house near the same SMHI
+station stored its own copy of the station's observations. This collapses
+those copies into the shared weather_station_observation series (one row
+per station and timestamp) and writes a weather_station_link point for each
+house whenever its station changed. See weather_store.py.
+
+Readers already merge in legacy rows, so the migration can run at any time;
+--delete-legacy removes the per-house copies once they are migrated.
+
+Usage:
+    python migrate_weather_to_stations.py [--days 400] [--house-id ID] [--dry-run] [--delete-legacy]
+"""
+
+import os
+import sys
+import argparse
+from datetime import datetime, timedelta, timezone
+from dotenv import load_dotenv
+from influxdb_client import InfluxDBClient
+from influxdb_client.client.write_api import SYNCHRONOUS
+
+from import_historical_data import PointBatchWriter
+from weather_store import LEGACY_MEASUREMENT, link_point, station_point
+
+WEATHER_FIELDS = ('temperature', 'wind_speed', 'humidity')
+
+
+def list_legacy_houses(query_api, bucket: str, org: str, days: int) -> list:
+    """house_id values that have legacy weather_observation rows."""
+    query = f'''
+        from(bucket: "{bucket}")
+        |> range(start: -{days}d)
+        |> filter(fn: (r) => r["_measurement"] == "{LEGACY_MEASUREMENT}")
+        |> filter(fn: (r) => r["_field"] == "temperature")
+        |> keep(columns: ["house_id"])
+        |> group()
+        |> distinct(column: "house_id")
+    '''
+    houses = set()
+    for table in query_api.query(query, org=org):
+        for record in table.records:
+            if record.get_value():
+                houses.add(record.get_value())
+    return sorted(houses)
+
+
+def read_legacy_rows(query_api, bucket: str, org: str, house_id: str, days: int) -> list:
+    """
+    Legacy rows for one house, one per timestamp, sorted by time.
+
+    Returns:
+        List of dicts (timestamp, station_id, station_name, distance_km,
+        temperature, wind_speed, humidity, fields)
+    """
+    query = f'''
+        from(bucket: "{bucket}")
+        |> range(start: -{days}d)
+        |> filter(fn: (r) => r["_measurement"] == "{LEGACY_MEASUREMENT}")
+        |> filter(fn: (r) => r["house_id"] == "{house_id}")
+        |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")
+    '''
+    by_time = {}
+    for table in query_api.query(query, org=org):
+        for record in table.records:
+            ts = record.get_time()
+            if ts is None or record.values.get('temperature') is None:
+                continue
+            if ts.tzinfo is None:
+                ts = ts.replace(tzinfo=timezone.utc)
+            values = record.values
+            fields = sum(1 for key in (*WEATHER_FIELDS, 'distance_km') if values.get(key) is not None)
+            # Rows with different tag sets (e.g. source) pivot into separate tables
+            row = by_time.setdefault(ts, {'timestamp': ts, 'fields': 0})
+            row['fields'] += fields
+            for key in (*WEATHER_FIELDS, 'distance_km', 'station_id', 'station_name'):
+                if row.get(key) is None and values.get(key) is not None:
+                    row[key] = values[key]
+    return [by_time[ts] for ts in sorted(by_time)]
+
+
+def plan_migration(rows_by_house: dict) -> tuple:
+    """
+    Collapse per-house rows into station rows and link changes.
+
+    Returns:
+        (station_rows, links, unmapped) - station_rows keyed by
+        (station_id, timestamp); links as (house_id, station_id, distance_km,
+        since); unmapped as {house_id: rows without a station_id}
+    """
+    station_rows = {}
+    links = []
+    unmapped = {}
+    for house_id, rows in rows_by_house.items():
+        current = None
+        for row in rows:
+            station_id = str(row.get('station_id') or '0')
+            if station_id == '0':
+                unmapped[house_id] = unmapped.get(house_id, 0) + 1
+                continue
+            key = (station_id, row['timestamp'])
+            existing = station_rows.get(key)
+            if existing is None:
+                station_rows[key] = {**row, 'station_id': station_id}
+            else:
+                for field in WEATHER_FIELDS:
+                    if existing.get(field) is None and row.get(field) is not None:
+                        existing[field] = row[field]
+            if station_id != current:
+                links.append((house_id, station_id, row.get('distance_km'), row['timestamp']))
+                current = station_id
+    return station_rows, links, unmapped
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Collapse per-house weather_observation into shared station series'
+    )
+    parser.add_argument(
+        '--days', type=int, default=400,
+        help='Number of days to look back (default: 400)'
+    )
+    parser.add_argument(
+        '--house-id', type=str, default=None,
+        help='Only migrate this house (default: every house with legacy weather)'
+    )
+    parser.add_argument(
+        '--dry-run', action='store_true',
+        help='Show what would be migrated without writing'
+    )
+    parser.add_argument(
+        '--delete-legacy', action='store_true',
+        help='Delete the migrated per-house weather_observation rows'
+    )
+    args = parser.parse_args()
+
+    # Load environment variables
+    load_dotenv()
+
+    influx_url = os.getenv('INFLUXDB_URL', 'http://localhost:8086')
+    influx_token = os.getenv('INFLUXDB_TOKEN')
+    influx_org = os.getenv('INFLUXDB_ORG')
+    influx_bucket = os.getenv('INFLUXDB_BUCKET')
+
+    if not influx_token or not influx_org or not influx_bucket:
+        print("ERROR: INFLUXDB_TOKEN, INFLUXDB_ORG and INFLUXDB_BUCKET must be set in .env")
+        sys.exit(1)
+
+    print("=" * 60)
+    print("Weather Observation -> Station Series Migration")
+    print("=" * 60)
+    print(f"InfluxDB URL: {influx_url}")
+    print(f"Days to migrate: {args.days}")
+    print(f"Dry run: {args.dry_run}")
+    print()
+
+    client = InfluxDBClient(url=influx_url, token=influx_token, org=influx_org, timeout=60_000)
+    query_api = client.query_api()
+
+    house_ids = [args.house_id] if args.house_id else list_legacy_houses(
+        query_api, influx_bucket, influx_org, args.days)
+    if not house_ids:
+        print("No legacy weather_observation data found")
+        client.close()
+        sys.exit(0)
+
+    rows_by_house = {}
+    legacy_rows = 0
+    legacy_values = 0
+    for house_id in house_ids:
+        rows = read_legacy_rows(query_api, influx_bucket, influx_org, house_id, args.days)
+        rows_by_house[house_id] = rows
+        legacy_rows += len(rows)
+        legacy_values += sum(row['fields'] for row in rows)
+        print(f"  {house_id:40s} {len(rows):>7} rows")
+
+    station_rows, links, unmapped = plan_migration(rows_by_house)
+    station_values = sum(sum(1 for f in WEATHER_FIELDS if row.get(f) is not None)
+                         for row in station_rows.values())
+    link_values = sum(2 if distance is not None else 1 for _, _, distance, _ in links)
+    stations = sorted({station_id for station_id, _ in station_rows})
+
+    saved = legacy_values - station_values - link_values
+    print()
+    print(f"Legacy:  {legacy_rows} rows / {legacy_values} field values across {len(house_ids)} house(s)")
+    print(f"Station: {len(station_rows)} rows / {station_values} field values across "
+          f"{len(stations)} station(s), plus {len(links)} link point(s)")
+    if legacy_values:
+        print(f"Saved:   {saved} field values ({100.0 * saved / legacy_values:.0f}%)")
+    for house_id, count in sorted(unmapped.items()):
+        print(f"  {house_id}: {count} row(s) without station_id stay in {LEGACY_MEASUREMENT}")
+
+    if args.dry_run:
+        print("\n[DRY RUN] Nothing written")
+        client.close()
+        print("\nDone!")
+        return
+
+    write_api = client.write_api(write_options=SYNCHRONOUS)
+    writer = PointBatchWriter(write_api, influx_bucket, influx_org,
+                              on_error=lambda rows, e: print(f"  Write error: {e}"))
+    for row in station_rows.values():
+        writer.add(station_point(row, source="migrated"))
+    for house_id, station_id, distance_km, since in links:
+        writer.add(link_point(house_id, station_id, distance_km, since))
+    writer.flush()
+    print(f"\nWrote {writer.points_written} points ({writer.rows_failed} failed)")
+
+    if args.delete_legacy:
+        if writer.rows_failed:
+            print("Not deleting legacy rows: some writes failed")
+        else:
+            delete_api = client.delete_api()
+            stop = datetime.now(timezone.utc)
+            start = stop - timedelta(days=args.days)
+            for house_id in house_ids:
+                if house_id in unmapped:
+                    print(f"  {house_id}: kept (has rows without station_id)")
+                    continue
+                delete_api.delete(start, stop,
+                                  f'_measurement="{LEGACY_MEASUREMENT}" AND house_id="{house_id}"',
+                                  bucket=influx_bucket, org=influx_org)
+                print(f"  {house_id}: legacy rows deleted")
+
+    client.close()
+    print("\nDone!")
+
+
+if __name__ == "__main__":
+    main()
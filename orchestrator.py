@@ -14,6 +14,31 @@ Environment variables:
         HOUSE_<customer_id>_USERNAME / HOUSE_<customer_id>_PASSWORD
     Per-building credentials:
         BUILDING_<building_id>_USERNAME / BUILDING_<building_id>_PASSWORD
+
+    Poll scheduling:
+        Children are spread evenly across the poll interval (settings.json
+        data_collection.heating_data_interval_minutes), weighted by observed
+        iteration time when metrics are enabled. Offsets are published in
+        poll_schedule.json and re-read by children before every sleep, so
+        adds/removals rebalance the schedule without restarts.
+
+    Process start-up:
+        ZYGOTE_ENABLED            — fork children from a preloaded zygote (default true)
+    The zygote imports the fetcher modules once; children are forked from it
+    and share those pages copy-on-write. Falls back to a plain exec per child
+    if the zygote is disabled or unavailable.
+
+    Fleet energy forecast:
+        FLEET_ENERGY_FORECAST     — run fleet_energy_forecaster.py every
+                                    weather.forecast_interval_minutes (default false)
+    One job forecasts every calibrated house; house fetchers then skip their
+    own energy forecast.
+
+    Metrics (optional):
+        METRICS_PORT              — orchestrator /metrics port (0 = disabled)
+        METRICS_CHILD_PORT_BASE   — first port handed to children (default METRICS_PORT + 1)
+    The orchestrator's /metrics page includes every child's metrics with an
+    `instance` label, so a single scrape target covers the whole container.
 """
 
 import json
@@ -21,11 +46,18 @@ import os
 import signal
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
+from config_registry import get_config_registry
+from metrics import aggregate_metrics_text, get_registry, scrape, start_metrics_server
+from poll_schedule import PollScheduler, SCHEDULE_FILE_ENV, SCHEDULE_ID_ENV
+from zygote import Zygote, ZygoteError, ZygoteProcess, process_memory_kb
+
 
 # ---------------------------------------------------------------------------
 #  Constants
@@ -34,16 +66,24 @@ SCAN_INTERVAL = 60          # seconds between directory rescans
 PROFILES_DIR = "profiles"
 BUILDINGS_DIR = "buildings"
 OFFBOARDED_FILE = "offboarded.json"
+SETTINGS_FILE = "settings.json"
+POLL_SCHEDULE_FILE = "poll_schedule.json"
+REBALANCE_INTERVAL = 3600   # seconds between duration-weighted rebalances
 RESTART_BACKOFF_BASE = 10   # seconds — doubles on each consecutive crash
 RESTART_BACKOFF_MAX = 300   # cap at 5 minutes
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_CHILD_PORT_BASE = int(os.getenv("METRICS_CHILD_PORT_BASE", str(METRICS_PORT + 1)))
+METRICS_SCRAPE_TIMEOUT = 2.0  # seconds per child scrape
+METRICS_SCRAPE_DEADLINE = 5.0  # seconds for scraping all children (scraped concurrently)
+METRICS_SCRAPE_WORKERS = 16
+ZYGOTE_ENABLED = os.getenv("ZYGOTE_ENABLED", "true").lower() == "true" and hasattr(os, "fork")
+FLEET_ENERGY_FORECAST = os.getenv("FLEET_ENERGY_FORECAST", "false").lower() == "true"
+FLEET_FORECAST_SCRIPT = "fleet_energy_forecaster.py"
 
 
 # ---------------------------------------------------------------------------
 #  Data classes
 # ---------------------------------------------------------------------------
-POLL_OFFSET_STEP = 10          # seconds between each child's poll offset
-
-
 @dataclass
 class Child:
     config_path: str            # e.g. "profiles/HEM_FJV_Villa_149.json"
@@ -51,7 +91,8 @@ class Child:
     friendly_name: str
     kind: str                   # "house" or "building"
     poll_offset: int = 0        # seconds to stagger poll start
-    process: subprocess.Popen | None = None
+    metrics_port: int = 0       # child's /metrics port (0 = disabled)
+    process: subprocess.Popen | ZygoteProcess | None = None
     consecutive_crashes: int = 0
     last_start: float = 0.0
     backoff_until: float = 0.0
@@ -79,10 +120,49 @@ def _env_key(prefix: str, config_id: str, suffix: str) -> str:
     return f"{prefix}_{config_id}_{suffix}"
 
 
+def poll_interval_seconds() -> int:
+    """House poll interval from settings.json (the same value HSF_Fetcher uses)."""
+    data = load_json(SETTINGS_FILE) if os.path.exists(SETTINGS_FILE) else None
+    minutes = (data or {}).get("data_collection", {}).get("heating_data_interval_minutes", 5)
+    return int(minutes) * 60
+
+
+def fleet_forecast_interval_seconds() -> int:
+    """Fleet energy forecast cadence (settings.json weather.forecast_interval_minutes)."""
+    data = load_json(SETTINGS_FILE) if os.path.exists(SETTINGS_FILE) else None
+    minutes = (data or {}).get("weather", {}).get("forecast_interval_minutes", 60)
+    return int(minutes) * 60
+
+
 # ---------------------------------------------------------------------------
 #  Subprocess management
 # ---------------------------------------------------------------------------
-def build_house_env(config_id: str, friendly_name: str, poll_offset: int = 0) -> dict:
+_zygote: Zygote | None = None
+_fleet_forecast: subprocess.Popen | None = None
+# Guards adding/removing children (the metrics server thread reads the dict)
+_children_lock = threading.Lock()
+
+
+def ensure_zygote() -> None:
+    """Start (or restart after a crash) the preloading zygote if enabled."""
+    global _zygote
+    if not ZYGOTE_ENABLED or (_zygote is not None and _zygote.alive()):
+        return
+    if _zygote is not None:
+        log(f"Zygote exited (rc={_zygote.process.returncode}), restarting")
+    zygote = Zygote()
+    try:
+        zygote.start()
+    except (ZygoteError, OSError) as e:
+        log(f"Zygote unavailable, children will be started with exec: {e}")
+        _zygote = None
+        return
+    _zygote = zygote
+    log(f"Zygote ready (pid {zygote.process.pid}, preload {zygote.preload_seconds:.2f}s)")
+
+
+def build_house_env(config_id: str, friendly_name: str, poll_offset: int = 0,
+                    metrics_port: int = 0) -> dict:
     """Return an env dict for a private-home fetcher subprocess."""
     env = os.environ.copy()
     env["HOMESIDE_USERNAME"] = os.getenv(_env_key("HOUSE", config_id, "USERNAME"), "")
@@ -93,30 +173,44 @@ def build_house_env(config_id: str, friendly_name: str, poll_offset: int = 0) ->
     env["POLL_INTERVAL_MINUTES"] = os.getenv("POLL_INTERVAL_MINUTES", "5")
     env["INFLUXDB_ENABLED"] = os.getenv("INFLUXDB_ENABLED", "true")
     env["POLL_OFFSET_SECONDS"] = str(poll_offset)
+    env["METRICS_PORT"] = str(metrics_port)
     return env
 
 
-def build_building_env(config_id: str, poll_offset: int = 0) -> dict:
+def build_building_env(config_id: str, poll_offset: int = 0, metrics_port: int = 0) -> dict:
     """Return an env dict for a commercial-building fetcher subprocess."""
     env = os.environ.copy()
     env["ARRIGO_USERNAME"] = os.getenv(_env_key("BUILDING", config_id, "USERNAME"), "")
     env["ARRIGO_PASSWORD"] = os.getenv(_env_key("BUILDING", config_id, "PASSWORD"), "")
     env["POLL_OFFSET_SECONDS"] = str(poll_offset)
+    env["METRICS_PORT"] = str(metrics_port)
     return env
 
 
 def spawn_child(child: Child) -> None:
     """Start (or restart) the subprocess for *child*."""
     if child.kind == "house":
-        env = build_house_env(child.config_id, child.friendly_name, child.poll_offset)
+        env = build_house_env(child.config_id, child.friendly_name, child.poll_offset,
+                              child.metrics_port)
         cmd = [sys.executable, "-u", "HSF_Fetcher.py"]
     else:
-        env = build_building_env(child.config_id, child.poll_offset)
+        env = build_building_env(child.config_id, child.poll_offset, child.metrics_port)
         cmd = [sys.executable, "-u", "building_fetcher.py",
                "--building", child.config_id]
+    env[SCHEDULE_FILE_ENV] = os.path.abspath(POLL_SCHEDULE_FILE)
+    env[SCHEDULE_ID_ENV] = child.config_id
 
-    child.process = subprocess.Popen(cmd, env=env)
+    child.process = None
+    if _zygote is not None:
+        try:
+            child.process = _zygote.spawn(cmd[2:], env)
+        except ZygoteError as e:
+            log(f"Zygote spawn failed for '{child.friendly_name}' ({e}), using exec")
+    if child.process is None:
+        child.process = subprocess.Popen(cmd, env=env)
     child.last_start = time.monotonic()
+    _metrics.counter("homeside_orchestrator_spawns_total", "Child processes started").inc(
+        kind=child.kind)
     log(f"Spawned {child.kind} '{child.friendly_name}' (pid {child.process.pid}, offset {child.poll_offset}s)")
 
 
@@ -135,52 +229,140 @@ def stop_child(child: Child, timeout: float = 10.0) -> None:
         child.process.wait(timeout=5)
 
 
+# ---------------------------------------------------------------------------
+#  Metrics
+# ---------------------------------------------------------------------------
+_metrics = get_registry()
+
+
+def allocate_metrics_port(children: dict[str, Child]) -> int:
+    """Lowest free child metrics port, or 0 when metrics are disabled."""
+    if not METRICS_PORT:
+        return 0
+    used = {c.metrics_port for c in children.values()}
+    port = METRICS_CHILD_PORT_BASE
+    while port in used:
+        port += 1
+    return port
+
+
+def update_child_gauges(children: dict[str, Child]) -> None:
+    """Refresh per-kind child counts and per-child liveness."""
+    up = _metrics.gauge("homeside_orchestrator_child_up", "1 if the child process is running")
+    count = _metrics.gauge("homeside_orchestrator_children", "Managed child processes")
+    memory = _metrics.gauge("homeside_orchestrator_child_memory_bytes",
+                            "Child resident (rss) and proportional shared (pss) memory")
+    by_kind: dict[str, int] = {"house": 0, "building": 0}
+    for child in children.values():
+        by_kind[child.kind] = by_kind.get(child.kind, 0) + 1
+        running = child.process is not None and child.process.poll() is None
+        up.set(1 if running else 0, instance=child.config_id, kind=child.kind)
+        usage = process_memory_kb(child.process.pid) if running else {}
+        for key, kb in usage.items():
+            memory.set(kb * 1024, instance=child.config_id, kind=child.kind, type=key.lower())
+    for kind, n in by_kind.items():
+        count.set(n, kind=kind)
+
+
+def scrape_children(children: dict[str, Child]) -> dict[str, tuple[Child, str | None]]:
+    """
+    Scrape every child's /metrics concurrently within METRICS_SCRAPE_DEADLINE.
+
+    Takes a snapshot of children under _children_lock (the metrics server
+    thread calls this while reconcile() changes the dict).
+
+    Returns:
+        config_id -> (child, page text or None if the scrape failed or timed out)
+    """
+    with _children_lock:
+        targets = [child for child in children.values() if child.metrics_port]
+    if not targets:
+        return {}
+
+    executor = ThreadPoolExecutor(max_workers=min(METRICS_SCRAPE_WORKERS, len(targets)))
+    futures = {
+        executor.submit(scrape, f"http://127.0.0.1:{child.metrics_port}/metrics",
+                        timeout=METRICS_SCRAPE_TIMEOUT): child
+        for child in targets
+    }
+    done, _ = wait(futures, timeout=METRICS_SCRAPE_DEADLINE)
+    executor.shutdown(wait=False, cancel_futures=True)
+    return {
+        child.config_id: (child, future.result() if future in done else None)
+        for future, child in futures.items()
+    }
+
+
+def observed_iteration_seconds(children: dict[str, Child]) -> dict[str, float]:
+    """Mean poll iteration time per child, scraped from its /metrics (empty if disabled)."""
+    durations: dict[str, float] = {}
+    for child, text in scrape_children(children).values():
+        if not text:
+            continue
+        total = count = 0.0
+        for line in text.splitlines():
+            if line.startswith("homeside_poll_iteration_seconds_sum"):
+                total += float(line.rsplit(" ", 1)[1])
+            elif line.startswith("homeside_poll_iteration_seconds_count"):
+                count += float(line.rsplit(" ", 1)[1])
+        if count:
+            durations[child.config_id] = total / count
+    return durations
+
+
+def render_metrics(children: dict[str, Child]) -> str:
+    """Orchestrator metrics followed by every child's metrics (labelled by instance)."""
+    pages = {"orchestrator": (_metrics.render(), {})}
+    scrape_up = _metrics.gauge("homeside_orchestrator_scrape_up",
+                               "1 if the last scrape of the child's metrics succeeded")
+    for child, text in scrape_children(children).values():
+        scrape_up.set(1 if text else 0, instance=child.config_id, kind=child.kind)
+        if text:
+            pages[child.config_id] = (text, {"instance": child.config_id, "kind": child.kind})
+    # Re-render own page so scrape_up reflects this scrape
+    pages["orchestrator"] = (_metrics.render(), {})
+    return aggregate_metrics_text(pages)
+
+
 # ---------------------------------------------------------------------------
 #  Directory scanning
 # ---------------------------------------------------------------------------
 def scan_configs() -> dict[str, dict]:
     """
     Return a dict keyed by config_id with metadata for every valid config.
+    Files are indexed by the config registry and only re-parsed when changed.
     """
     found: dict[str, dict] = {}
+    registry = get_config_registry(PROFILES_DIR, BUILDINGS_DIR)
 
     # --- Private homes (profiles/*.json) ---
-    profiles = Path(PROFILES_DIR)
-    if profiles.is_dir():
-        for p in sorted(profiles.glob("HEM_FJV_Villa_*.json")):
-            if "_signals.json" in p.name:
-                continue
-            data = load_json(str(p))
-            if not data:
-                continue
-            cid = data.get("customer_id", p.stem)
-            env_user = os.getenv(_env_key("HOUSE", cid, "USERNAME"), "")
-            if not env_user:
-                log(f"Skipping {p.name}: no HOUSE_{cid}_USERNAME in env")
-                continue
-            found[cid] = {
-                "path": str(p),
-                "kind": "house",
-                "friendly_name": data.get("friendly_name", cid),
-            }
+    for entry in registry.entries("house"):
+        name = Path(entry.path).name
+        if not name.startswith("HEM_FJV_Villa_"):
+            continue
+        cid = entry.entity_id
+        env_user = os.getenv(_env_key("HOUSE", cid, "USERNAME"), "")
+        if not env_user:
+            log(f"Skipping {name}: no HOUSE_{cid}_USERNAME in env")
+            continue
+        found[cid] = {
+            "path": entry.path,
+            "kind": "house",
+            "friendly_name": entry.friendly_name,
+        }
 
     # --- Commercial buildings (buildings/*.json) ---
-    buildings = Path(BUILDINGS_DIR)
-    if buildings.is_dir():
-        for p in sorted(buildings.glob("*.json")):
-            data = load_json(str(p))
-            if not data:
-                continue
-            bid = data.get("building_id", p.stem)
-            env_user = os.getenv(_env_key("BUILDING", bid, "USERNAME"), "")
-            if not env_user:
-                log(f"Skipping {p.name}: no BUILDING_{bid}_USERNAME in env")
-                continue
-            found[bid] = {
-                "path": str(p),
-                "kind": "building",
-                "friendly_name": data.get("friendly_name", bid),
-            }
+    for entry in registry.entries("building"):
+        bid = entry.entity_id
+        env_user = os.getenv(_env_key("BUILDING", bid, "USERNAME"), "")
+        if not env_user:
+            log(f"Skipping {Path(entry.path).name}: no BUILDING_{bid}_USERNAME in env")
+            continue
+        found[bid] = {
+            "path": entry.path,
+            "kind": "building",
+            "friendly_name": entry.friendly_name,
+        }
 
     return found
 
@@ -188,7 +370,25 @@ def scan_configs() -> dict[str, dict]:
 # ---------------------------------------------------------------------------
 #  Reconciliation loop
 # ---------------------------------------------------------------------------
-def reconcile(children: dict[str, Child], configs: dict[str, dict]) -> None:
+def apply_schedule(children: dict[str, Child], scheduler: PollScheduler,
+                   weights: dict[str, float] | None = None) -> None:
+    """Recompute poll slots, publish them, and update each child's offset."""
+    changed = scheduler.assign(children.keys(), weights)
+    if not changed:
+        return
+    for cid, offset in changed.items():
+        children[cid].poll_offset = offset
+    try:
+        scheduler.write()
+    except OSError as e:
+        log(f"Failed to write {scheduler.path}: {e}")
+    log(f"Poll schedule: {len(children)} child(ren) over {scheduler.interval_seconds}s, "
+        f"{len(changed)} slot(s) updated"
+        + (" (duration-weighted)" if weights else ""))
+
+
+def reconcile(children: dict[str, Child], configs: dict[str, dict],
+              scheduler: PollScheduler) -> None:
     """
     Compare running children against discovered configs.
     Start new, stop removed, restart changed.
@@ -196,9 +396,22 @@ def reconcile(children: dict[str, Child], configs: dict[str, dict]) -> None:
     current_ids = set(children.keys())
     desired_ids = set(configs.keys())
 
-    # --- New configs → spawn (with staggered poll offsets) ---
-    # Assign offsets based on total child count to spread writes in time
-    next_offset = len(children) * POLL_OFFSET_STEP
+    # --- Removed configs → stop (frees their poll slot and metrics port) ---
+    for cid in current_ids - desired_ids:
+        stop_child(children[cid])
+        log(f"Removed '{children[cid].friendly_name}'")
+        _metrics.gauge("homeside_orchestrator_child_up").remove(
+            instance=cid, kind=children[cid].kind)
+        _metrics.gauge("homeside_orchestrator_scrape_up").remove(
+            instance=cid, kind=children[cid].kind)
+        for key in ("rss", "pss"):
+            _metrics.gauge("homeside_orchestrator_child_memory_bytes").remove(
+                instance=cid, kind=children[cid].kind, type=key)
+        with _children_lock:
+            del children[cid]
+
+    # --- New configs → register, reschedule, then spawn ---
+    new_children = []
     for cid in sorted(desired_ids - current_ids):
         cfg = configs[cid]
         child = Child(
@@ -206,17 +419,20 @@ def reconcile(children: dict[str, Child], configs: dict[str, dict]) -> None:
             config_id=cid,
             friendly_name=cfg["friendly_name"],
             kind=cfg["kind"],
-            poll_offset=next_offset,
+            metrics_port=allocate_metrics_port(children),
         )
-        spawn_child(child)
-        children[cid] = child
-        next_offset += POLL_OFFSET_STEP
+        with _children_lock:
+            children[cid] = child
+        new_children.append(child)
 
-    # --- Removed configs → stop ---
-    for cid in current_ids - desired_ids:
-        stop_child(children[cid])
-        log(f"Removed '{children[cid].friendly_name}'")
-        del children[cid]
+    # Spread all children across the interval; running children pick up
+    # their new offset from the schedule file before their next sleep
+    if scheduler.set_interval(poll_interval_seconds()):
+        log(f"Poll interval changed to {scheduler.interval_seconds}s, rebalancing")
+    apply_schedule(children, scheduler)
+
+    for child in new_children:
+        spawn_child(child)
 
 
 def check_crashed(children: dict[str, Child]) -> None:
@@ -234,6 +450,8 @@ def check_crashed(children: dict[str, Child]) -> None:
             continue  # still in backoff
 
         child.consecutive_crashes += 1
+        _metrics.counter("homeside_orchestrator_crashes_total", "Unexpected child exits").inc(
+            instance=child.config_id, kind=child.kind)
         backoff = min(RESTART_BACKOFF_BASE * (2 ** (child.consecutive_crashes - 1)),
                       RESTART_BACKOFF_MAX)
         log(f"'{child.friendly_name}' exited (rc={rc}), "
@@ -247,6 +465,32 @@ def check_crashed(children: dict[str, Child]) -> None:
         spawn_child(child)
 
 
+# ---------------------------------------------------------------------------
+#  Fleet energy forecast
+# ---------------------------------------------------------------------------
+def run_fleet_forecast() -> bool:
+    """
+    Start the fleet energy forecast job unless the previous run is still
+    going. Returns True if a run was started.
+    """
+    global _fleet_forecast
+    if _fleet_forecast is not None:
+        rc = _fleet_forecast.poll()
+        if rc is None:
+            log("Fleet energy forecast still running, skipping this interval")
+            return False
+        if rc != 0:
+            log(f"Fleet energy forecast exited with rc={rc}")
+    try:
+        _fleet_forecast = subprocess.Popen([sys.executable, FLEET_FORECAST_SCRIPT])
+    except OSError as e:
+        log(f"Failed to start fleet energy forecast: {e}")
+        _fleet_forecast = None
+        return False
+    log(f"Fleet energy forecast started (pid {_fleet_forecast.pid})")
+    return True
+
+
 # ---------------------------------------------------------------------------
 #  Scheduled purge of offboarded entities
 # ---------------------------------------------------------------------------
@@ -344,6 +588,13 @@ def main() -> None:
 
     log("Orchestrator starting")
     log(f"Scanning {PROFILES_DIR}/ and {BUILDINGS_DIR}/ every {SCAN_INTERVAL}s")
+    start_metrics_server(METRICS_PORT, render=lambda: render_metrics(children))
+    scan_duration = _metrics.histogram("homeside_orchestrator_scan_seconds",
+                                       "Duration of config rescan + reconcile")
+
+    ensure_zygote()
+    scheduler = PollScheduler(poll_interval_seconds(), path=POLL_SCHEDULE_FILE)
+    last_rebalance = time.monotonic()
 
     # Initial scan and spawn
     configs = scan_configs()
@@ -352,12 +603,17 @@ def main() -> None:
     else:
         log(f"Found {len(configs)} config(s): "
             + ", ".join(f"{v['friendly_name']} ({k})" for k, v in configs.items()))
-    reconcile(children, configs)
+    reconcile(children, configs, scheduler)
+    update_child_gauges(children)
 
     # Run purge check on startup
     last_purge_date = datetime.now(timezone.utc).date()
     check_purge_schedule()
 
+    last_fleet_forecast = None
+    if FLEET_ENERGY_FORECAST:
+        log(f"Fleet energy forecast every {fleet_forecast_interval_seconds() // 60} min")
+
     # Main loop
     try:
         while not shutdown:
@@ -365,12 +621,30 @@ def main() -> None:
             if shutdown:
                 break
 
+            ensure_zygote()
+
             # Rescan directories
-            configs = scan_configs()
-            reconcile(children, configs)
+            with scan_duration.time():
+                configs = scan_configs()
+                reconcile(children, configs, scheduler)
+
+            # Periodically re-weight slots by observed iteration duration
+            if METRICS_PORT and time.monotonic() - last_rebalance >= REBALANCE_INTERVAL:
+                last_rebalance = time.monotonic()
+                weights = observed_iteration_seconds(children)
+                if weights:
+                    apply_schedule(children, scheduler, weights)
 
             # Check for crashed processes
             check_crashed(children)
+            update_child_gauges(children)
+
+            # Fleet energy forecast (replaces per-house forecasts)
+            if FLEET_ENERGY_FORECAST and (
+                    last_fleet_forecast is None
+                    or time.monotonic() - last_fleet_forecast >= fleet_forecast_interval_seconds()):
+                if run_fleet_forecast():
+                    last_fleet_forecast = time.monotonic()
 
             # Daily purge check for offboarded entities
             today = datetime.now(timezone.utc).date()
@@ -385,6 +659,10 @@ def main() -> None:
     log(f"Stopping {len(children)} child process(es)")
     for child in children.values():
         stop_child(child)
+    if _zygote is not None:
+        _zygote.stop()
+    if _fleet_forecast is not None and _fleet_forecast.poll() is None:
+        _fleet_forecast.terminate()
     log("Orchestrator exiting")
 
 
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Poll Schedule
+Spreads fetcher poll offsets evenly across the poll interval.
+
+The orchestrator owns a PollScheduler that assigns every child a slot inside
+the interval (optionally weighted by each child's observed iteration time) and
+writes the result to a small JSON file. Children re-read their offset from that
+file before every sleep, so slots can be reassigned on add/remove without
+restarting anyone.
+
+Schedule file format:
+    {
+      "interval_seconds": 300,
+      "updated_at": "2026-02-13T10:00:00+00:00",
+      "offsets": {"HEM_FJV_Villa_149": 0, "TE236_HEM_Kontor": 150}
+    }
+
+Child usage:
+    poll_offset = read_poll_offset(default=poll_offset)
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+
+
+SCHEDULE_FILE_ENV = 'POLL_SCHEDULE_FILE'
+SCHEDULE_ID_ENV = 'POLL_SCHEDULE_ID'
+MIN_WEIGHT_SECONDS = 1.0   # floor so instant/unknown children still get a slot
+
+
+class PollScheduler:
+    """Assigns each child an offset (seconds) within the poll interval."""
+
+    def __init__(self, interval_seconds: int, path: str = None):
+        """
+        Args:
+            interval_seconds: Poll interval the offsets are spread across
+            path: Schedule file to write (None = don't persist)
+        """
+        self.interval_seconds = interval_seconds
+        self.path = path
+        self.offsets: Dict[str, int] = {}
+        self.weights: Dict[str, float] = {}   # last weights given to assign()
+        self._order: list = []
+
+    def assign(self, child_ids: Iterable[str], weights: Dict[str, float] = None) -> Dict[str, int]:
+        """
+        Recompute offsets for the current set of children.
+
+        Existing children keep their relative order and new ones are appended,
+        so an add/remove shifts each slot by at most one slot width. With
+        weights (observed iteration seconds) every child gets a slot whose
+        width is proportional to its weight; otherwise slots are equal.
+        A call without weights reuses the last ones given, so add/remove and
+        interval changes don't undo a duration-weighted rebalance.
+
+        Returns:
+            Dict of child_id -> offset for children whose offset changed
+        """
+        ids = set(child_ids)
+        self._order = [cid for cid in self._order if cid in ids]
+        self._order.extend(sorted(ids - set(self._order)))
+
+        n = len(self._order)
+        if n == 0:
+            changed = {}
+            self.offsets = {}
+            return changed
+
+        if weights is not None:
+            self.weights = dict(weights)
+        weights = self.weights
+        if weights:
+            known = [w for w in weights.values() if w and w > 0]
+            default = sum(known) / len(known) if known else MIN_WEIGHT_SECONDS
+            slot_weights = [max(weights.get(cid) or default, MIN_WEIGHT_SECONDS)
+                            for cid in self._order]
+        else:
+            slot_weights = [1.0] * n
+        total = sum(slot_weights)
+
+        new_offsets = {}
+        cumulative = 0.0
+        for cid, weight in zip(self._order, slot_weights):
+            new_offsets[cid] = int(cumulative / total * self.interval_seconds)
+            cumulative += weight
+
+        changed = {cid: off for cid, off in new_offsets.items()
+                   if self.offsets.get(cid) != off}
+        self.offsets = new_offsets
+        return changed
+
+    def set_interval(self, interval_seconds: int) -> bool:
+        """Change the interval; returns True if it differs (caller should reassign)."""
+        if interval_seconds == self.interval_seconds:
+            return False
+        self.interval_seconds = interval_seconds
+        return True
+
+    def write(self) -> None:
+        """Atomically write the schedule file (write temp + rename)."""
+        if not self.path:
+            return
+        data = {
+            'interval_seconds': self.interval_seconds,
+            'updated_at': datetime.now(timezone.utc).isoformat(),
+            'offsets': self.offsets,
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.write('\n')
+        os.replace(tmp_path, self.path)
+
+
+def read_poll_offset(default: int = 0, schedule_id: str = None, path: str = None) -> int:
+    """
+    Read this process's current offset from the orchestrator's schedule file.
+
+    Args:
+        default: Offset to use when there is no schedule or no entry
+        schedule_id: Child id (defaults to POLL_SCHEDULE_ID env var)
+        path: Schedule file (defaults to POLL_SCHEDULE_FILE env var)
+
+    Returns:
+        Offset in seconds
+    """
+    path = path or os.getenv(SCHEDULE_FILE_ENV)
+    schedule_id = schedule_id or os.getenv(SCHEDULE_ID_ENV)
+    if not path or not schedule_id:
+        return default
+    try:
+        with open(path) as f:
+            offset: Optional[int] = json.load(f).get('offsets', {}).get(schedule_id)
+    except (OSError, ValueError):
+        return default
+    return int(offset) if offset is not None else default
@@ -42,8 +42,11 @@ import json
 import os
 import sys
 import argparse
+import shutil
 from datetime import datetime, timedelta, timezone
 
+from coverage_index import COVERAGE_DIR
+
 
 # Project root (where this script lives)
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
@@ -429,6 +432,10 @@ def _run_hard_remove(entity_id, entity_type, artifacts,
             print(f"  Failed to delete InfluxDB data (continuing)")
     except Exception as e:
         print(f"  InfluxDB deletion error (continuing): {e}")
+    coverage_dir = os.path.join(COVERAGE_DIR, entity_id)
+    if os.path.isdir(coverage_dir):
+        shutil.rmtree(coverage_dir)
+        print(f"  Deleted coverage index: {coverage_dir}")
 
     # Step 2: Delete config JSON
     step += 1
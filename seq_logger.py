@@ -14,14 +14,35 @@ Usage:
 
     # Log consolidated data collection event
     seq.log_data_collection(iteration=1, heating_data={...}, forecast={...}, ...)
+
+    # Flush queued events before exit (also done automatically at interpreter exit)
+    seq.close()
+
+Events are shipped asynchronously: log() only appends to a bounded in-memory
+queue and a background thread POSTs batches to Seq in CLEF format over a reused
+HTTP session. When the queue is full the oldest events are dropped (counted in
+get_stats()), so a slow or unreachable Seq never blocks the caller.
 """
 
+import atexit
+import json
 import os
+import threading
+import time
 import requests
+from collections import deque
 from datetime import datetime, timezone
 from typing import Dict, Optional, Any
 
 
+# Async shipping defaults (overridable via env vars)
+DEFAULT_QUEUE_SIZE = 1000        # max events held in memory before dropping oldest
+DEFAULT_BATCH_SIZE = 100         # max events per POST
+DEFAULT_FLUSH_INTERVAL = 2.0     # seconds between background flushes
+DEFAULT_SHUTDOWN_TIMEOUT = 5.0   # seconds to wait for the queue to drain on close()
+REQUEST_TIMEOUT = 5              # seconds per HTTP request
+
+
 class SeqLogger:
     """
     Centralized Seq logger with automatic client_id tagging.
@@ -46,7 +67,11 @@ class SeqLogger:
         seq_url: str = None,
         seq_api_key: str = None,
         component: str = 'Fetcher',
-        display_name_source: str = 'friendly_name'
+        display_name_source: str = 'friendly_name',
+        async_mode: bool = None,
+        queue_size: int = None,
+        batch_size: int = None,
+        flush_interval: float = None
     ):
         """
         Initialize Seq logger.
@@ -60,6 +85,13 @@ class SeqLogger:
             component: Component name for log categorization
             display_name_source: Which name to show in log messages:
                 'friendly_name' (default), 'client_id', or 'username'
+            async_mode: Ship events from a background thread (default True,
+                SEQ_ASYNC=false to send synchronously)
+            queue_size: Max queued events before the oldest are dropped
+                (defaults to SEQ_QUEUE_SIZE env var or 1000)
+            batch_size: Max events per POST (defaults to SEQ_BATCH_SIZE or 100)
+            flush_interval: Seconds between background flushes
+                (defaults to SEQ_FLUSH_INTERVAL or 2.0)
         """
         self.client_id = client_id or 'unknown'
         self.friendly_name = friendly_name
@@ -78,6 +110,31 @@ class SeqLogger:
         # Set display name based on preference
         self._update_display_name()
 
+        # Async shipping state
+        if async_mode is None:
+            async_mode = os.getenv('SEQ_ASYNC', 'true').lower() != 'false'
+        self.async_mode = async_mode
+        self.queue_size = queue_size or int(os.getenv('SEQ_QUEUE_SIZE', DEFAULT_QUEUE_SIZE))
+        self.batch_size = batch_size or int(os.getenv('SEQ_BATCH_SIZE', DEFAULT_BATCH_SIZE))
+        self.flush_interval = flush_interval or float(
+            os.getenv('SEQ_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL))
+
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._session = None
+        self._worker = None
+        self._worker_pid = None
+        self._closed = False
+        self._atexit_registered = False
+        self._in_flight = 0
+        self._stats = {
+            'enqueued': 0,
+            'dropped': 0,
+            'sent': 0,
+            'failed': 0,
+            'batches': 0,
+        }
+
     def _update_display_name(self):
         """Update the display name based on current settings."""
         if self.display_name_source == self.DISPLAY_FRIENDLY_NAME and self.friendly_name:
@@ -126,7 +183,7 @@ class SeqLogger:
         properties: Dict[str, Any] = None
     ) -> bool:
         """
-        Send a log event to Seq.
+        Queue a log event for Seq (sent synchronously if async_mode is off).
 
         Args:
             message: Log message template
@@ -134,7 +191,7 @@ class SeqLogger:
             properties: Additional structured properties
 
         Returns:
-            True if sent successfully, False otherwise
+            True if queued (or sent, in sync mode), False otherwise
         """
         if not self.seq_url:
             return False
@@ -154,35 +211,143 @@ class SeqLogger:
         if properties:
             props.update(properties)
 
-        # Build Seq event
-        event = {
-            'Timestamp': datetime.now(timezone.utc).isoformat(),
-            'Level': level,
-            'MessageTemplate': message,
-            'Properties': props
-        }
-
-        payload = {'Events': [event]}
-
+        # Build CLEF event (properties are top-level, reserved names use '@')
+        event = {key: value for key, value in props.items() if not key.startswith('@')}
+        event['@t'] = datetime.now(timezone.utc).isoformat()
+        event['@l'] = level
+        event['@mt'] = message
+
+        if not self.async_mode:
+            return self._post_events([event])
+
+        return self._enqueue(event)
+
+    # ------------------------------------------------------------------
+    #  Background shipping
+    # ------------------------------------------------------------------
+
+    def _enqueue(self, event: Dict[str, Any]) -> bool:
+        """Queue an event for the background shipper (never blocks on I/O)."""
+        with self._cond:
+            if self._closed:
+                return False
+            if len(self._queue) >= self.queue_size:
+                # Drop-oldest: newest events are the most useful when catching up
+                self._queue.popleft()
+                self._stats['dropped'] += 1
+            self._queue.append(event)
+            self._stats['enqueued'] += 1
+            self._ensure_worker()
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify()
+        return True
+
+    def _ensure_worker(self):
+        """Start the shipper thread (again after fork, threads don't survive it)."""
+        if self._worker is not None and self._worker_pid == os.getpid() and self._worker.is_alive():
+            return
+        self._worker_pid = os.getpid()
+        self._session = None
+        self._worker = threading.Thread(
+            target=self._run_worker,
+            name=f"seq-shipper-{self.client_id_short}",
+            daemon=True
+        )
+        self._worker.start()
+        if not self._atexit_registered:
+            atexit.register(self.close)
+            self._atexit_registered = True
+
+    def _run_worker(self):
+        """Drain the queue in batches until closed."""
+        while True:
+            with self._cond:
+                if not self._queue and not self._closed:
+                    self._cond.wait(self.flush_interval)
+                if not self._queue:
+                    if self._closed:
+                        return
+                    continue
+                batch = [self._queue.popleft()
+                         for _ in range(min(self.batch_size, len(self._queue)))]
+                self._in_flight = len(batch)
+
+            self._post_events(batch)
+
+            with self._cond:
+                self._in_flight = 0
+                self._cond.notify_all()
+
+    def _events_url(self) -> str:
+        """Build the Seq raw ingestion URL (CLEF)."""
+        url = self.seq_url.rstrip('/')
+        if '/api' in url:
+            url = url.replace('/api', '')
+        return f"{url}/api/events/raw?clef"
+
+    def _post_events(self, events: list) -> bool:
+        """POST a batch of CLEF events as newline-delimited JSON."""
         try:
-            # Build Seq raw events URL
-            url = self.seq_url.rstrip('/')
-            if '/api' in url:
-                url = url.replace('/api', '')
-            url = f"{url}/api/events/raw"
-
-            headers = {'Content-Type': 'application/json'}
-            if self.seq_api_key:
-                headers['X-Seq-ApiKey'] = self.seq_api_key
-
-            response = requests.post(url, json=payload, headers=headers, timeout=5)
+            if self._session is None:
+                self._session = requests.Session()
+                self._session.headers['Content-Type'] = 'application/vnd.serilog.clef'
+                if self.seq_api_key:
+                    self._session.headers['X-Seq-ApiKey'] = self.seq_api_key
+
+            body = '\n'.join(json.dumps(e, default=str) for e in events)
+            response = self._session.post(
+                self._events_url(), data=body.encode('utf-8'), timeout=REQUEST_TIMEOUT
+            )
             response.raise_for_status()
+            self._stats['sent'] += len(events)
+            self._stats['batches'] += 1
             return True
 
         except Exception:
             # Silently fail - don't break execution if Seq is unavailable
+            self._stats['failed'] += len(events)
             return False
 
+    def flush(self, timeout: float = DEFAULT_SHUTDOWN_TIMEOUT) -> bool:
+        """
+        Wait until all queued events have been shipped.
+
+        Returns:
+            True if the queue drained within timeout
+        """
+        if not self.async_mode or self._worker is None or self._worker_pid != os.getpid():
+            return not self._queue
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._cond.notify()
+            while self._queue or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float = DEFAULT_SHUTDOWN_TIMEOUT):
+        """Flush queued events and stop the shipper thread. Safe to call twice."""
+        if self._closed:
+            return
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._worker is not None and self._worker_pid == os.getpid():
+            self._worker.join(timeout=1.0)
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return shipping counters (enqueued, dropped, sent, failed, batches, queued)."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats['queued'] = len(self._queue)
+        return stats
+
     def log_data_collection(
         self,
         iteration: int,
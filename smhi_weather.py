@@ -16,6 +16,8 @@ from dataclasses import dataclass
 from astral import LocationInfo
 from astral.sun import sun
 
+from metrics import instrument_session
+
 
 @dataclass
 class WeatherStation:
@@ -96,6 +98,9 @@ class SMHIWeather:
         self._nearest_station: Optional[WeatherStation] = None
         self._station_cached_at: Optional[datetime] = None
 
+        # Reused HTTP session (keep-alive + request latency metrics)
+        self.session = instrument_session(requests.Session(), 'smhi')
+
     # =========================================================================
     # OBSERVATION METHODS (SMHI Metobs API)
     # =========================================================================
@@ -146,7 +151,7 @@ class SMHIWeather:
 
         try:
             url = f"{self.METOBS_BASE}/version/latest/parameter/{parameter_id}/station.json"
-            response = requests.get(url, timeout=30)
+            response = self.session.get(url, timeout=30)
             response.raise_for_status()
 
             data = response.json()
@@ -215,7 +220,7 @@ class SMHIWeather:
             url = (f"{self.METOBS_BASE}/version/latest/parameter/{parameter_id}"
                    f"/station/{station_id}/period/latest-hour/data.json")
 
-            response = requests.get(url, timeout=15)
+            response = self.session.get(url, timeout=15)
             response.raise_for_status()
 
             data = response.json()
@@ -309,7 +314,7 @@ class SMHIWeather:
             temp_url = (f"{self.METOBS_BASE}/version/latest/parameter/{self.PARAM_TEMP}"
                        f"/station/{station.id}/period/latest-months/data.json")
 
-            response = requests.get(temp_url, timeout=30)
+            response = self.session.get(temp_url, timeout=30)
             response.raise_for_status()
             temp_data = response.json()
 
@@ -333,7 +338,7 @@ class SMHIWeather:
             try:
                 wind_url = (f"{self.METOBS_BASE}/version/latest/parameter/{self.PARAM_WIND_SPEED}"
                            f"/station/{station.id}/period/latest-months/data.json")
-                response = requests.get(wind_url, timeout=30)
+                response = self.session.get(wind_url, timeout=30)
                 if response.status_code == 200:
                     wind_data = response.json()
                     for value in wind_data.get('value', []):
@@ -352,7 +357,7 @@ class SMHIWeather:
             try:
                 humidity_url = (f"{self.METOBS_BASE}/version/latest/parameter/{self.PARAM_HUMIDITY}"
                                f"/station/{station.id}/period/latest-months/data.json")
-                response = requests.get(humidity_url, timeout=30)
+                response = self.session.get(humidity_url, timeout=30)
                 if response.status_code == 200:
                     humidity_data = response.json()
                     for value in humidity_data.get('value', []):
@@ -415,7 +420,7 @@ class SMHIWeather:
             url = f"{self.FORECAST_BASE}/geotype/point/lon/{self.longitude}/lat/{self.latitude}/data.json"
 
             self.logger.info(f"Fetching SMHI forecast for lat={self.latitude}, lon={self.longitude}")
-            response = requests.get(url, timeout=30)
+            response = self.session.get(url, timeout=30)
             response.raise_for_status()
 
             data = response.json()
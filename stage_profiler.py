@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Stage Profiler
+Per-stage timing breakdown of the fetcher's monitoring loop.
+
+Each iteration is split into named stages. A stage runs from its stage() call
+until the next stage() call (or end_iteration()), so long sequential loops can
+be annotated with one line per section instead of re-indenting them. Nested
+spans inside a stage use the span() context manager.
+
+Usage:
+    profiler = StageProfiler(seq_logger=seq, slow_threshold_seconds=60)
+
+    profiler.start_iteration(iteration)
+    profiler.stage('fetch')
+    ...
+    profiler.stage('forecast')
+    with profiler.span('energy_forecast'):
+        ...
+    profiler.end_iteration()
+
+Per-stage durations go to the metrics registry (homeside_stage_seconds) and a
+rolling window used for p50/p95/max summaries sent to Seq. Iterations slower
+than the threshold are logged with their full span tree.
+
+Sampling profiler (cProfile):
+    STAGE_PROFILE_ITERATIONS=N  profile the first N iterations
+    kill -USR1 <pid>            profile the next iteration
+Profiles are written to STAGE_PROFILE_DIR (default /tmp) as .prof files and the
+top functions are printed to stdout.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import signal
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from metrics import get_registry
+
+
+DEFAULT_WINDOW = 288             # iterations kept per stage (24h at 5-min polls)
+DEFAULT_SLOW_THRESHOLD = 60.0    # seconds
+DEFAULT_SUMMARY_EVERY = 12       # iterations between Seq summaries (1h at 5-min polls)
+PROFILE_TOP_N = 25               # functions printed from a cProfile dump
+
+
+class Span:
+    """One timed section of an iteration (may contain child spans)."""
+
+    __slots__ = ('name', 'start', 'end', 'children')
+
+    def __init__(self, name: str, start: float):
+        self.name = name
+        self.start = start
+        self.end: Optional[float] = None
+        self.children: List['Span'] = []
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def to_dict(self) -> dict:
+        result = {'name': self.name, 'seconds': round(self.duration, 3)}
+        if self.children:
+            result['children'] = [c.to_dict() for c in self.children]
+        return result
+
+    def format_tree(self, indent: int = 0) -> List[str]:
+        lines = [f"{'  ' * indent}{self.name}: {self.duration:.2f}s"]
+        for child in self.children:
+            lines.extend(child.format_tree(indent + 1))
+        return lines
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+class StageProfiler:
+    """Collects stage timings for each monitoring-loop iteration."""
+
+    def __init__(
+        self,
+        seq_logger=None,
+        logger=None,
+        slow_threshold_seconds: float = None,
+        window: int = DEFAULT_WINDOW,
+        summary_every: int = DEFAULT_SUMMARY_EVERY,
+        kind: str = 'house'
+    ):
+        """
+        Args:
+            seq_logger: Optional SeqLogger for slow-iteration and summary events
+            logger: Optional Python logger
+            slow_threshold_seconds: Log the span tree when an iteration exceeds this
+                (defaults to SLOW_ITERATION_SECONDS env var or 60)
+            window: Iterations kept per stage for percentile summaries
+            summary_every: Iterations between StageTimingSummary events (0 = never)
+            kind: Metrics label ('house' or 'building')
+        """
+        self.seq_logger = seq_logger
+        self.logger = logger
+        self.slow_threshold = slow_threshold_seconds or float(
+            os.getenv('SLOW_ITERATION_SECONDS', DEFAULT_SLOW_THRESHOLD))
+        self.window = window
+        self.summary_every = summary_every
+        self.kind = kind
+
+        self._durations: Dict[str, deque] = {}
+        self._root: Optional[Span] = None
+        self._stack: List[Span] = []
+        self._iteration = 0
+        self._completed = 0
+
+        self._stage_hist = get_registry().histogram(
+            'homeside_stage_seconds', 'Duration of each monitoring-loop stage')
+
+        # Sampling profiler
+        self._profile_remaining = int(os.getenv('STAGE_PROFILE_ITERATIONS', '0'))
+        self._profile_dir = os.getenv('STAGE_PROFILE_DIR', '/tmp')
+        self._profiler: Optional[cProfile.Profile] = None
+        if hasattr(signal, 'SIGUSR1'):
+            try:
+                signal.signal(signal.SIGUSR1, self._handle_profile_signal)
+            except ValueError:
+                pass  # Not on the main thread
+
+    # ------------------------------------------------------------------
+    #  Iteration / stage API
+    # ------------------------------------------------------------------
+
+    def start_iteration(self, iteration: int):
+        """Begin timing a new iteration (closes any unfinished one)."""
+        if self._root is not None:
+            self.end_iteration()
+        self._iteration = iteration
+        self._root = Span(f'iteration #{iteration}', time.perf_counter())
+        self._stack = [self._root]
+        if self._profile_remaining > 0 and self._profiler is None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stage(self, name: str):
+        """Start a top-level stage, ending the previous one."""
+        if self._root is None:
+            return
+        now = time.perf_counter()
+        self._close_to_root(now)
+        span = Span(name, now)
+        self._root.children.append(span)
+        self._stack.append(span)
+
+    @contextmanager
+    def span(self, name: str):
+        """Time a nested section inside the current stage."""
+        if self._root is None:
+            yield
+            return
+        span = Span(name, time.perf_counter())
+        self._stack[-1].children.append(span)
+        self._stack.append(span)
+        try:
+            yield
+        finally:
+            span.end = time.perf_counter()
+            if self._stack and self._stack[-1] is span:
+                self._stack.pop()
+
+    def end_iteration(self) -> Optional[float]:
+        """
+        Finish the iteration: record durations, log slow iterations.
+
+        Returns:
+            Total iteration seconds, or None if no iteration was started
+        """
+        if self._root is None:
+            return None
+        now = time.perf_counter()
+        if self._profiler is not None:
+            self._profiler.disable()
+        self._close_to_root(now)
+        root = self._root
+        root.end = now
+        self._root = None
+        self._stack = []
+
+        for span in root.children:
+            self._record(span.name, span.duration)
+        total = root.duration
+        self._record('total', total)
+        self._completed += 1
+
+        if self._profiler is not None:
+            self._finish_profile()
+
+        if total >= self.slow_threshold:
+            self._log_slow_iteration(root)
+
+        if self.summary_every and self._completed % self.summary_every == 0:
+            self._log_summary()
+
+        return total
+
+    def _close_to_root(self, now: float):
+        while len(self._stack) > 1:
+            span = self._stack.pop()
+            if span.end is None:
+                span.end = now
+
+    def _record(self, name: str, seconds: float):
+        durations = self._durations.get(name)
+        if durations is None:
+            durations = deque(maxlen=self.window)
+            self._durations[name] = durations
+        durations.append(seconds)
+        if name != 'total':
+            self._stage_hist.observe(seconds, stage=name, kind=self.kind)
+
+    # ------------------------------------------------------------------
+    #  Reporting
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Rolling p50/p95/max/count per stage (seconds)."""
+        stats = {}
+        for name, durations in self._durations.items():
+            values = sorted(durations)
+            stats[name] = {
+                'p50': round(_percentile(values, 50), 3),
+                'p95': round(_percentile(values, 95), 3),
+                'max': round(values[-1], 3) if values else 0.0,
+                'count': len(values),
+            }
+        return stats
+
+    def _log_slow_iteration(self, root: Span):
+        tree = '\n'.join(root.format_tree())
+        print(f"🐢 Slow iteration ({root.duration:.1f}s > {self.slow_threshold:.0f}s):\n{tree}")
+        if self.logger:
+            self.logger.warning(f"Slow iteration #{self._iteration}: {root.duration:.1f}s")
+        if self.seq_logger:
+            slowest = max(root.children, key=lambda s: s.duration, default=None)
+            self.seq_logger.log(
+                "Slow iteration #{Iteration}: {TotalSeconds}s (slowest stage {SlowestStage})",
+                level='Warning',
+                properties={
+                    'EventType': 'SlowIteration',
+                    'Iteration': self._iteration,
+                    'TotalSeconds': round(root.duration, 2),
+                    'SlowestStage': slowest.name if slowest else None,
+                    'SlowestStageSeconds': round(slowest.duration, 2) if slowest else None,
+                    'SpanTree': root.to_dict(),
+                }
+            )
+
+    def _log_summary(self):
+        if not self.seq_logger:
+            return
+        stats = self.get_stats()
+        total = stats.get('total', {})
+        props = {
+            'EventType': 'StageTimingSummary',
+            'Iterations': total.get('count', 0),
+            'TotalP50': total.get('p50'),
+            'TotalP95': total.get('p95'),
+            'TotalMax': total.get('max'),
+            'Stages': {k: v for k, v in stats.items() if k != 'total'},
+        }
+        self.seq_logger.log(
+            "Stage timing: p50={TotalP50}s p95={TotalP95}s max={TotalMax}s",
+            level='Information',
+            properties=props
+        )
+
+    # ------------------------------------------------------------------
+    #  cProfile
+    # ------------------------------------------------------------------
+
+    def _handle_profile_signal(self, signum, frame):
+        """SIGUSR1: profile the next iteration."""
+        self._profile_remaining = max(self._profile_remaining, 1)
+        print("🔬 Profiling armed for next iteration (SIGUSR1)")
+
+    def _finish_profile(self):
+        profiler = self._profiler
+        self._profiler = None
+        self._profile_remaining -= 1
+
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+        path = os.path.join(self._profile_dir, f"stage_profile_{os.getpid()}_{stamp}.prof")
+        try:
+            profiler.dump_stats(path)
+        except OSError as e:
+            path = None
+            print(f"⚠ Could not write profile: {e}")
+
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(PROFILE_TOP_N)
+        print(f"🔬 cProfile for iteration #{self._iteration}" + (f" → {path}" if path else ""))
+        print(out.getvalue())
+
+        if self.seq_logger:
+            self.seq_logger.log(
+                "cProfile captured for iteration #{Iteration}",
+                level='Information',
+                properties={
+                    'EventType': 'IterationProfiled',
+                    'Iteration': self._iteration,
+                    'ProfilePath': path,
+                    'TopFunctions': out.getvalue()[:4000],
+                }
+            )
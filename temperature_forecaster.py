@@ -10,9 +10,26 @@ Key principle: The thermostat is the dominant factor. Physics determines
 *how fast* temperature changes, but the setpoint determines *where it ends up*.
 
 All predictions include explanations for GUI transparency.
+
+generate_forecast_columns() computes a whole horizon column-wise (one read
+of the heat curves, bulk curve interpolation and effective temperature) for
+the InfluxDB writer; generate_forecast() returns the same values as
+ForecastPoints with explanations.
+
+Incremental updates: the outdoor/supply columns depend only on the weather
+forecast, the heat curve and the weather model, and are reused while those
+are unchanged - a regeneration with only a new indoor reading recomputes
+just the indoor chain. ForecastColumns.update_from() then tells which
+points moved by more than INCREMENTAL_TOLERANCE, so only those are
+rewritten.
+
+Benchmark (per-point path vs columns, 72h and 240h horizons):
+    python3 temperature_forecaster.py --bench
 """
 
+import argparse
 import logging
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field, asdict
@@ -20,6 +37,20 @@ from dataclasses import dataclass, field, asdict
 from customer_profile import CustomerProfile
 from energy_models.weather_energy_model import SimpleWeatherModel, WeatherConditions
 
+INCREMENTAL_TOLERANCE = 0.05    # °C; smaller changes are not rewritten
+
+
+def forecast_signature(weather_forecast: List[Dict[str, Any]]) -> tuple:
+    """
+    The fields of an SMHI forecast the forecasters use, per hour ('hour',
+    the lead time, changes with every fetch and is left out). Equal
+    signatures mean the weather forecast itself is unchanged.
+    """
+    return tuple(
+        (f.get('time'), f.get('temp'), f.get('wind_speed'), f.get('humidity'), f.get('cloud_cover'))
+        for f in weather_forecast
+    )
+
 
 @dataclass
 class ForecastExplanation:
@@ -69,6 +100,115 @@ class ForecastPoint:
         }
 
 
+@dataclass
+class ForecastColumns:
+    """
+    A forecast horizon as parallel columns (one entry per forecast hour).
+
+    supply_baseline / supply_ml are None where no heat curve was available.
+    Values are the same as the ForecastPoints of generate_forecast().
+    hour_generated_at is set by update_from() once an hour was refreshed
+    (empty = every hour is from generated_at).
+    """
+    # forecast_type -> column
+    SERIES = (
+        ('outdoor_temp', 'outdoor'),
+        ('supply_temp_baseline', 'supply_baseline'),
+        ('supply_temp_ml', 'supply_ml'),
+        ('indoor_temp', 'indoor'),
+    )
+
+    generated_at: datetime
+    timestamps: List[datetime] = field(default_factory=list)
+    lead_time_hours: List[float] = field(default_factory=list)
+    outdoor: List[float] = field(default_factory=list)
+    supply_baseline: List[Optional[float]] = field(default_factory=list)
+    supply_ml: List[Optional[float]] = field(default_factory=list)
+    indoor: List[float] = field(default_factory=list)
+    hour_generated_at: List[datetime] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def point_count(self) -> int:
+        """Number of ForecastPoints these columns represent."""
+        supply = sum(1 for v in self.supply_baseline if v is not None)
+        return 2 * len(self.timestamps) + 2 * supply
+
+    def first_indoor(self) -> Optional[Tuple[datetime, float, float]]:
+        """(timestamp, indoor, outdoor) of the first forecast hour, or None."""
+        if not self.timestamps:
+            return None
+        return self.timestamps[0], self.indoor[0], self.outdoor[0]
+
+    def update_from(
+        self,
+        newer: 'ForecastColumns',
+        tolerance: float = INCREMENTAL_TOLERANCE
+    ) -> Optional[Dict[str, List[bool]]]:
+        """
+        Fold a newer forecast for the same hours into these (written) columns.
+
+        Values that moved by more than tolerance are taken from newer, the
+        rest are kept, so the columns keep matching what is stored and small
+        changes can't drift. An hour with a moved value takes newer's lead
+        time and generation time (hour_generated_at): the rewritten points
+        are new predictions, not the old horizon's. The forecast_time tag
+        stays generated_at so the rewrite overwrites the stored row.
+
+        Returns:
+            forecast_type -> changed flag per hour (the `changed` mask for
+            InfluxDBWriter.write_forecast_columns()), or None if newer covers
+            other hours or gained/lost supply values and has to replace
+            these columns entirely
+        """
+        if newer.timestamps != self.timestamps:
+            return None
+        for _, name in self.SERIES:
+            if any((a is None) != (b is None) for a, b in zip(getattr(self, name), getattr(newer, name))):
+                return None
+
+        if not self.hour_generated_at:
+            self.hour_generated_at = [self.generated_at] * len(self.timestamps)
+        changed = {}
+        for forecast_type, name in self.SERIES:
+            values = getattr(self, name)
+            flags = []
+            for i, value in enumerate(getattr(newer, name)):
+                moved = value is not None and abs(value - values[i]) > tolerance
+                if moved:
+                    values[i] = value
+                    self.lead_time_hours[i] = newer.lead_time_hours[i]
+                    self.hour_generated_at[i] = newer.generated_at
+                flags.append(moved)
+            changed[forecast_type] = flags
+        return changed
+
+    def to_points(
+        self,
+        explanations: Optional[List[Optional[ForecastExplanation]]] = None
+    ) -> List[ForecastPoint]:
+        """
+        Expand to ForecastPoints in generate_forecast() order (outdoor,
+        supply baseline, supply ML, indoor per hour).
+
+        Args:
+            explanations: Optional explanation per hour for the indoor points
+        """
+        points = []
+        for i, ts in enumerate(self.timestamps):
+            lead = self.lead_time_hours[i]
+            points.append(ForecastPoint(ts, 'outdoor_temp', self.outdoor[i], lead))
+            if self.supply_baseline[i] is not None:
+                points.append(ForecastPoint(ts, 'supply_temp_baseline', self.supply_baseline[i], lead))
+                points.append(ForecastPoint(ts, 'supply_temp_ml', self.supply_ml[i], lead))
+            points.append(ForecastPoint(
+                ts, 'indoor_temp', self.indoor[i], lead,
+                explanations[i] if explanations else None
+            ))
+        return points
+
+
 class TemperatureForecaster:
     """
     Hybrid temperature forecaster (Model C).
@@ -121,6 +261,9 @@ class TemperatureForecaster:
         # Accuracy tracking for learning (in-memory buffer)
         self._accuracy_buffer: List[Dict[str, Any]] = []
 
+        # (key, weather columns) of the last forecast, see _weather_columns()
+        self._weather_cache: Optional[Tuple[tuple, tuple]] = None
+
     def generate_forecast(
         self,
         current_indoor: float,
@@ -146,98 +289,149 @@ class TemperatureForecaster:
         Returns:
             List of ForecastPoint objects ready for InfluxDB and GUI
         """
-        forecast_points = []
-        predicted_indoor = current_indoor
-        generation_time = datetime.now(timezone.utc)
+        columns = self.generate_forecast_columns(
+            current_indoor, current_outdoor, weather_forecast,
+            heat_curve=heat_curve, weather_model=weather_model,
+            latitude=latitude, longitude=longitude,
+        )
 
-        for forecast in weather_forecast:
-            # Parse forecast time
-            time_str = forecast.get('time')
-            if not time_str:
-                continue
+        # Explanations for the indoor chain (values come from the columns)
+        explanations = []
+        previous_indoor = current_indoor
+        for ts, outdoor, indoor in zip(columns.timestamps, columns.outdoor, columns.indoor):
+            explanations.append(self._predict_indoor(previous_indoor, outdoor, ts).explanation)
+            previous_indoor = indoor
 
-            forecast_time = datetime.fromisoformat(
-                time_str.replace('Z', '+00:00')
-            )
-            forecast_outdoor = forecast.get('temp')
+        return columns.to_points(explanations)
 
-            if forecast_outdoor is None:
-                continue
+    def generate_forecast_columns(
+        self,
+        current_indoor: float,
+        current_outdoor: float,
+        weather_forecast: List[Dict[str, Any]],
+        heat_curve=None,
+        weather_model: Optional[SimpleWeatherModel] = None,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        generation_time: Optional[datetime] = None,
+    ) -> ForecastColumns:
+        """
+        Generate the forecast horizon as columns (see generate_forecast()).
 
-            # Calculate lead time (hours from now to forecast time)
-            lead_time_hours = (forecast_time - generation_time).total_seconds() / 3600
+        The heat curves are read once per call and interpolated for all
+        hours at once, instead of two API + InfluxDB reads per hour. The
+        outdoor/supply columns are reused from the previous call while the
+        weather forecast, heat curve and weather model are unchanged.
 
-            # 1. Outdoor temperature (direct from weather)
-            forecast_points.append(ForecastPoint(
-                timestamp=forecast_time,
-                forecast_type='outdoor_temp',
-                value=forecast_outdoor,
-                lead_time_hours=round(lead_time_hours, 1)
-            ))
+        Args:
+            generation_time: Reference for lead times (default: now)
 
-            # 2. Supply temperature forecasts (from heat curve)
-            if heat_curve:
-                baseline_supply, _ = heat_curve.get_supply_temps_for_outdoor(
-                    forecast_outdoor
-                )
-                if baseline_supply is not None:
-                    forecast_points.append(ForecastPoint(
-                        timestamp=forecast_time,
-                        forecast_type='supply_temp_baseline',
-                        value=baseline_supply,
-                        lead_time_hours=round(lead_time_hours, 1)
-                    ))
-                    # ML supply: use effective temperature (accounts for wind chill
-                    # and solar gain) to look up the baseline curve. This predicts
-                    # what the ML controller will actually write when conditions
-                    # change — e.g., sunny afternoon → effective temp warmer →
-                    # lower supply needed.
-                    ml_supply = baseline_supply  # fallback: same as baseline
-                    if weather_model:
-                        try:
-                            conditions = WeatherConditions(
-                                timestamp=forecast_time,
-                                temperature=forecast_outdoor,
-                                wind_speed=forecast.get('wind_speed', 3.0),
-                                humidity=forecast.get('humidity', 50.0),
-                                cloud_cover=forecast.get('cloud_cover', 8.0),
-                                latitude=latitude,
-                                longitude=longitude,
-                            )
-                            eff = weather_model.effective_temperature(conditions)
-                            eff_supply, _ = heat_curve.get_supply_temps_for_outdoor(
-                                eff.effective_temp
-                            )
-                            if eff_supply is not None:
-                                ml_supply = eff_supply
-                        except Exception:
-                            pass  # Fall back to baseline
-                    forecast_points.append(ForecastPoint(
-                        timestamp=forecast_time,
-                        forecast_type='supply_temp_ml',
-                        value=ml_supply,
-                        lead_time_hours=round(lead_time_hours, 1)
-                    ))
-
-            # 3. Indoor temperature forecast (Model C)
-            indoor_forecast = self._predict_indoor(
-                current_indoor=predicted_indoor,
-                outdoor_temp=forecast_outdoor,
-                forecast_time=forecast_time
-            )
-            indoor_forecast.lead_time_hours = round(lead_time_hours, 1)
+        Returns:
+            ForecastColumns, ready for InfluxDBWriter.write_forecast_columns()
+        """
+        generation_time = generation_time or datetime.now(timezone.utc)
+        timestamps, outdoor, supply_baseline, supply_ml = self._weather_columns(
+            weather_forecast, heat_curve, weather_model, latitude, longitude
+        )
+        # Copies: the caller may fold later updates into these columns
+        columns = ForecastColumns(
+            generated_at=generation_time,
+            timestamps=list(timestamps),
+            lead_time_hours=[round((ts - generation_time).total_seconds() / 3600, 1) for ts in timestamps],
+            outdoor=list(outdoor),
+            supply_baseline=list(supply_baseline),
+            supply_ml=list(supply_ml),
+        )
 
-            forecast_points.append(indoor_forecast)
+        # 3. Indoor temperature forecast (Model C), chained hour to hour
+        target = self.profile.comfort.target_indoor_temp
+        acceptable_dev = self.profile.comfort.acceptable_deviation
+        min_temp = target - acceptable_dev - 1.0
+        max_temp = target + acceptable_dev + 0.5
+        effective_confidence, _ = self._bias_confidence()
+        hourly_bias = self.profile.learned.hourly_bias
+        adjustments = [hourly_bias.get(f"{hour:02d}", 0.0) * effective_confidence for hour in range(24)]
 
-            # Update for next iteration (chain predictions)
-            predicted_indoor = indoor_forecast.value
+        predicted_indoor = current_indoor
+        indoor = []
+        for ts, outdoor in zip(columns.timestamps, columns.outdoor):
+            physics = self._physics_step(predicted_indoor, outdoor, target, acceptable_dev)
+            predicted_indoor = round(max(min_temp, min(max_temp, physics + adjustments[ts.hour])), 2)
+            indoor.append(predicted_indoor)
+        columns.indoor = indoor
 
         self.logger.info(
-            f"Generated {len(forecast_points)} forecast points "
+            f"Generated {columns.point_count()} forecast points "
             f"(indoor: {current_indoor:.1f} -> {predicted_indoor:.1f})"
         )
 
-        return forecast_points
+        return columns
+
+    def _weather_columns(
+        self,
+        weather_forecast: List[Dict[str, Any]],
+        heat_curve=None,
+        weather_model: Optional[SimpleWeatherModel] = None,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+    ) -> tuple:
+        """
+        (timestamps, outdoor, supply_baseline, supply_ml) for a weather forecast.
+
+        These don't depend on the indoor temperature, so the last result is
+        returned again while the forecast, the baseline heat curve and the
+        weather model are unchanged (the heat curve is still read, to notice
+        changes).
+        """
+        # 1. Outdoor temperature (direct from weather)
+        rows = [f for f in weather_forecast if f.get('time') and f.get('temp') is not None]
+        baseline_curve = None
+        if heat_curve and rows:
+            baseline_curve, _ = heat_curve.get_supply_curves()
+
+        key = (
+            forecast_signature(rows),
+            tuple(sorted(baseline_curve.items())) if baseline_curve else None,
+            getattr(weather_model, 'model_version', id(weather_model)) if weather_model else None,
+            latitude,
+            longitude,
+        )
+        if self._weather_cache is not None and self._weather_cache[0] == key:
+            return self._weather_cache[1]
+
+        timestamps = [datetime.fromisoformat(f['time'].replace('Z', '+00:00')) for f in rows]
+        outdoor = [f['temp'] for f in rows]
+
+        # 2. Supply temperature forecasts (from heat curve)
+        supply_baseline = [None] * len(rows)
+        supply_ml = [None] * len(rows)
+        if baseline_curve:
+            baseline = heat_curve.interpolate_curve_many(outdoor, baseline_curve)
+            ml = baseline  # fallback: same as baseline
+            # ML supply: use effective temperature (wind chill and solar
+            # gain) to look up the baseline curve - what the ML controller
+            # will actually write when conditions change.
+            if weather_model:
+                try:
+                    effective = weather_model.effective_temperatures(
+                        timestamps,
+                        outdoor,
+                        [f.get('wind_speed', 3.0) for f in rows],
+                        [f.get('humidity', 50.0) for f in rows],
+                        [f.get('cloud_cover', 8.0) for f in rows],
+                        latitude=latitude,
+                        longitude=longitude,
+                    )
+                    effective_supply = heat_curve.interpolate_curve_many(effective, baseline_curve)
+                    ml = [e if e is not None else b for e, b in zip(effective_supply, baseline)]
+                except Exception:
+                    pass  # Fall back to baseline
+            supply_baseline = baseline
+            supply_ml = [m if b is not None else None for m, b in zip(ml, baseline)]
+
+        result = (timestamps, outdoor, supply_baseline, supply_ml)
+        self._weather_cache = (key, result)
+        return result
 
     def _predict_indoor(
         self,
@@ -278,18 +472,7 @@ class TemperatureForecaster:
             adjustment_reasoning = f"No historical data for {hour:02d}:00 yet"
 
         # --- Step 3: Confidence weighting ---
-        confidence = self.profile.learned.thermal_coefficient_confidence
-        total_samples = self.profile.learned.total_samples
-
-        if total_samples < 24:
-            confidence_reasoning = f"Learning phase ({total_samples}/24 initial samples)"
-            effective_confidence = 0.0  # Don't apply adjustments yet
-        elif confidence < 0.5:
-            confidence_reasoning = f"Low confidence ({confidence:.0%}), limited adjustment"
-            effective_confidence = confidence * 0.5
-        else:
-            confidence_reasoning = f"Good confidence ({confidence:.0%})"
-            effective_confidence = confidence
+        effective_confidence, confidence_reasoning = self._bias_confidence()
 
         # Apply adjustment weighted by confidence
         adjusted_prediction = physics_prediction + (hourly_bias * effective_confidence)
@@ -346,6 +529,23 @@ class TemperatureForecaster:
             explanation=explanation
         )
 
+    def _bias_confidence(self) -> Tuple[float, str]:
+        """
+        Weight for the hourly bias adjustment.
+
+        Returns:
+            Tuple of (effective_confidence, reasoning_string)
+        """
+        confidence = self.profile.learned.thermal_coefficient_confidence
+        total_samples = self.profile.learned.total_samples
+
+        if total_samples < 24:
+            # Don't apply adjustments yet
+            return 0.0, f"Learning phase ({total_samples}/24 initial samples)"
+        if confidence < 0.5:
+            return confidence * 0.5, f"Low confidence ({confidence:.0%}), limited adjustment"
+        return confidence, f"Good confidence ({confidence:.0%})"
+
     def _physics_model(
         self,
         current_indoor: float,
@@ -370,7 +570,40 @@ class TemperatureForecaster:
         Returns:
             Tuple of (predicted_temp, reasoning_string)
         """
-        thermal_coeff = self.profile.learned.thermal_coefficient
+        predicted = self._physics_step(current_indoor, outdoor_temp, target_temp, acceptable_deviation)
+
+        if current_indoor < target_temp - acceptable_deviation:
+            rise = max(0.1, self.response_rates["heating"] - (current_indoor - outdoor_temp) * 0.02)
+            reasoning = (
+                f"Below target ({current_indoor:.1f} < {target_temp:.1f}), "
+                f"heating active, rising ~{rise:.1f} C/h"
+            )
+        elif current_indoor < target_temp:
+            reasoning = (
+                f"Approaching target ({current_indoor:.1f} -> {target_temp:.1f}), "
+                f"heating modulating"
+            )
+        elif current_indoor <= target_temp + acceptable_deviation:
+            reasoning = (
+                f"At target ({current_indoor:.1f} ~ {target_temp:.1f}), "
+                f"thermostat maintaining"
+            )
+        else:
+            reasoning = (
+                f"Above target ({current_indoor:.1f} > {target_temp:.1f}), "
+                f"cooling toward setpoint"
+            )
+
+        return predicted, reasoning
+
+    def _physics_step(
+        self,
+        current_indoor: float,
+        outdoor_temp: float,
+        target_temp: float,
+        acceptable_deviation: float
+    ) -> float:
+        """One hour of the thermostat-aware physics model (see _physics_model)."""
         heating_rate = self.response_rates["heating"]
         cooling_rate = self.response_rates["cooling"]
 
@@ -382,59 +615,29 @@ class TemperatureForecaster:
             # Well below target: heating strongly active
             rise = heating_rate - heat_loss_pressure
             rise = max(0.1, rise)  # Always some progress when heating
-            predicted = current_indoor + rise
 
             # Don't overshoot target
-            predicted = min(predicted, target_temp)
+            return min(current_indoor + rise, target_temp)
 
-            reasoning = (
-                f"Below target ({current_indoor:.1f} < {target_temp:.1f}), "
-                f"heating active, rising ~{rise:.1f} C/h"
-            )
-
-        elif current_indoor < target_temp:
+        if current_indoor < target_temp:
             # Slightly below target: heating active but approaching setpoint
             gap = target_temp - current_indoor
             rise = min(heating_rate * 0.5, gap)  # Slow approach
-            predicted = current_indoor + rise
-
-            reasoning = (
-                f"Approaching target ({current_indoor:.1f} -> {target_temp:.1f}), "
-                f"heating modulating"
-            )
+            return current_indoor + rise
 
-        elif current_indoor <= target_temp + acceptable_deviation:
+        if current_indoor <= target_temp + acceptable_deviation:
             # At target: thermostat cycling, stable
             # Small drift toward equilibrium based on outdoor
-            if outdoor_temp < current_indoor - 10:
-                drift = -0.1  # Slight cooling pressure
-            else:
-                drift = 0.0
-
-            predicted = current_indoor + drift
+            drift = -0.1 if outdoor_temp < current_indoor - 10 else 0.0  # Slight cooling pressure
 
             # Thermostat prevents dropping below target
-            predicted = max(predicted, target_temp - acceptable_deviation * 0.5)
+            return max(current_indoor + drift, target_temp - acceptable_deviation * 0.5)
 
-            reasoning = (
-                f"At target ({current_indoor:.1f} ~ {target_temp:.1f}), "
-                f"thermostat maintaining"
-            )
-
-        else:
-            # Above target: heating off, cooling down
-            cooling = cooling_rate + heat_loss_pressure * 0.5
-            predicted = current_indoor - cooling
+        # Above target: heating off, cooling down
+        cooling = cooling_rate + heat_loss_pressure * 0.5
 
-            # Don't drop below target
-            predicted = max(predicted, target_temp)
-
-            reasoning = (
-                f"Above target ({current_indoor:.1f} > {target_temp:.1f}), "
-                f"cooling toward setpoint"
-            )
-
-        return predicted, reasoning
+        # Don't drop below target
+        return max(current_indoor - cooling, target_temp)
 
     def record_accuracy(
         self,
@@ -555,3 +758,146 @@ class TemperatureForecaster:
             "thermal_response": self.profile.building.thermal_response,
             "response_rates": self.response_rates
         }
+
+
+def _legacy_generate_forecast(forecaster, current_indoor, weather_forecast, heat_curve,
+                              weather_model, latitude, longitude, generation_time):
+    """Per-point generate_forecast before the columns path (benchmark reference)."""
+    points = []
+    predicted_indoor = current_indoor
+    for forecast in weather_forecast:
+        forecast_time = datetime.fromisoformat(forecast['time'].replace('Z', '+00:00'))
+        forecast_outdoor = forecast['temp']
+        lead = round((forecast_time - generation_time).total_seconds() / 3600, 1)
+        points.append(ForecastPoint(forecast_time, 'outdoor_temp', forecast_outdoor, lead))
+        baseline_supply, _ = heat_curve.get_supply_temps_for_outdoor(forecast_outdoor)
+        if baseline_supply is not None:
+            points.append(ForecastPoint(forecast_time, 'supply_temp_baseline', baseline_supply, lead))
+            ml_supply = baseline_supply
+            try:
+                eff = weather_model.effective_temperature(WeatherConditions(
+                    timestamp=forecast_time,
+                    temperature=forecast_outdoor,
+                    wind_speed=forecast.get('wind_speed', 3.0),
+                    humidity=forecast.get('humidity', 50.0),
+                    cloud_cover=forecast.get('cloud_cover', 8.0),
+                    latitude=latitude,
+                    longitude=longitude,
+                ))
+                eff_supply, _ = heat_curve.get_supply_temps_for_outdoor(eff.effective_temp)
+                if eff_supply is not None:
+                    ml_supply = eff_supply
+            except Exception:
+                pass
+            points.append(ForecastPoint(forecast_time, 'supply_temp_ml', ml_supply, lead))
+        indoor = forecaster._predict_indoor(predicted_indoor, forecast_outdoor, forecast_time)
+        indoor.lead_time_hours = lead
+        points.append(indoor)
+        predicted_indoor = indoor.value
+    return points
+
+
+class _BenchCurveSource:
+    """Stands in for HomeSideAPI and InfluxDBWriter, counting curve reads."""
+
+    def __init__(self, curve: Dict[int, float]):
+        self.curve = curve
+        self.reads = 0
+
+    def get_heating_data(self):
+        self.reads += 1
+        return {'variables': [
+            {'variable': f'Cwl.CurveAdaptation_Y_{num}', 'path': f'Cwl.Advise.A[{num + 10}]', 'value': value}
+            for num, value in self.curve.items()
+        ]}
+
+    def read_heat_curve_baseline(self):
+        self.reads += 1
+        return dict(self.curve)
+
+
+def bench_temperature_forecaster(horizons=(72, 240), runs: int = 5) -> None:
+    """Time the per-point forecast against generate_forecast_columns()."""
+    import math
+    import random
+    from heat_curve_controller import HeatCurveController
+
+    rng = random.Random(1)
+    profile = CustomerProfile(customer_id='bench')
+    profile.learned.total_samples = 500
+    profile.learned.thermal_coefficient_confidence = 0.7
+    profile.learned.hourly_bias = {f"{h:02d}": round(rng.uniform(-0.3, 0.3), 3) for h in range(24)}
+    forecaster = TemperatureForecaster(profile)
+    forecaster.logger.disabled = True
+
+    curve = {num: 55.0 - 2.5 * (num - 1) for num in range(1, 11)}
+    source = _BenchCurveSource(curve)
+    heat_curve = HeatCurveController(source, source, logging.getLogger('bench'))
+    weather_model = SimpleWeatherModel()
+    latitude, longitude = 59.33, 18.07
+    now = datetime(2026, 1, 15, 6, 0, tzinfo=timezone.utc)
+
+    for hours in horizons:
+        weather_forecast = [{
+            'time': (now + timedelta(hours=h + 1)).isoformat().replace('+00:00', 'Z'),
+            'temp': round(-5 + 6 * math.sin(2 * math.pi * h / 24) + rng.gauss(0, 1), 1),
+            'wind_speed': round(abs(rng.gauss(4, 2)), 1),
+            'humidity': round(rng.uniform(60, 95)),
+            'cloud_cover': rng.randint(0, 8),
+        } for h in range(hours)]
+
+        source.reads = 0
+        start = time.perf_counter()
+        for _ in range(runs):
+            legacy = _legacy_generate_forecast(forecaster, 20.5, weather_forecast, heat_curve,
+                                               weather_model, latitude, longitude, now)
+        legacy_time = (time.perf_counter() - start) / runs
+        legacy_reads = source.reads // runs
+
+        source.reads = 0
+        start = time.perf_counter()
+        for _ in range(runs):
+            forecaster._weather_cache = None
+            columns = forecaster.generate_forecast_columns(
+                20.5, -5.0, weather_forecast, heat_curve=heat_curve, weather_model=weather_model,
+                latitude=latitude, longitude=longitude, generation_time=now)
+        columns_time = (time.perf_counter() - start) / runs
+        columns_reads = source.reads // runs
+
+        points = columns.to_points()
+        same = len(points) == len(legacy) and all(
+            (p.timestamp, p.forecast_type, p.lead_time_hours) == (q.timestamp, q.forecast_type, q.lead_time_hours)
+            and abs(p.value - q.value) < 1e-9
+            for p, q in zip(points, legacy))
+
+        # Incremental: same weather, only the indoor reading moves
+        written = columns
+        rewritten = 0
+        start = time.perf_counter()
+        for run in range(runs):
+            update = forecaster.generate_forecast_columns(
+                20.5 + 0.1 * (run + 1), -5.0, weather_forecast, heat_curve=heat_curve,
+                weather_model=weather_model, latitude=latitude, longitude=longitude,
+                generation_time=now)
+            changed = written.update_from(update)
+            rewritten += sum(sum(flags) for flags in changed.values())
+        incremental_time = (time.perf_counter() - start) / runs
+
+        print(f"{hours}h horizon: {len(points)} points, matches per-point path: {same}")
+        print(f"  per-point: {legacy_time * 1000:7.2f} ms, {legacy_reads} curve reads")
+        print(f"  columns:   {columns_time * 1000:7.2f} ms, {columns_reads} curve reads "
+              f"({legacy_time / columns_time:.1f}x)")
+        print(f"  indoor-only update: {incremental_time * 1000:5.2f} ms, "
+              f"{rewritten // runs} of {columns.point_count()} points rewritten per update")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Temperature forecaster (Model C)')
+    parser.add_argument('--bench', action='store_true',
+                        help='Benchmark per-point vs columns forecast for 72h and 240h horizons')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+    if args.bench:
+        bench_temperature_forecaster(runs=args.runs)
+    else:
+        parser.print_help()
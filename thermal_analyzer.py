@@ -8,11 +8,36 @@ For buildings with:
 - Concrete foundation (high thermal mass)
 - Brick exterior walls (good insulation)
 - Expected thermal lag: 6-12 hours
+
+Samples live in a fixed-capacity ring buffer of typed arrays (timestamp,
+indoor, outdoor, heater flag) and the statistics behind the thermal
+coefficient are kept as sliding-window sums, so adding a sample and
+recalculating the coefficient are both O(1).
+
+Benchmark (per-iteration CPU and memory, old list-of-dicts vs ring buffer):
+    python3 thermal_analyzer.py --bench 5000
 """
 
+import argparse
+import math
+import statistics
+import time
+import tracemalloc
+from array import array
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta, timezone
-import statistics
+
+from thermal_lag import estimate_thermal_lag
+
+
+MAX_POINTS = 672              # 7 days at 15-min intervals
+RESUM_EVERY = MAX_POINTS      # recompute sliding sums from scratch this often (float drift)
+MAX_PAIR_GAP_HOURS = 2        # consecutive samples further apart don't form a pair
+MIN_OUTDOOR_DIFF = 2          # °C between outdoor and indoor for a usable pair
+MAX_PAIR_COEFFICIENT = 0.5    # |coefficient| above this is discarded as noise
+DEFAULT_THERMAL_LAG_HOURS = 6.0  # used until the correlation finds a clear peak
+MAX_THERMAL_LAG_HOURS = 24
+PAIR_REFERENCE_TOLERANCE = 0.1  # °C the window mean may drift from the pairs' reference before a rebuild
 
 
 def _ensure_timezone_aware(dt: datetime) -> datetime:
@@ -22,6 +47,168 @@ def _ensure_timezone_aware(dt: datetime) -> datetime:
     return dt
 
 
+def _parse_timestamp(value) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return _ensure_timezone_aware(value)
+
+
+class ThermalRingBuffer:
+    """
+    Fixed-capacity ring buffer of thermal samples with sliding-window sums.
+
+    Slot i also holds the cooling pair formed by sample i and the sample
+    before it (the coefficient the analyzer derives from that interval), so
+    evicting the oldest sample only has to drop one pair from the sums.
+
+    Pair coefficients are relative to the window's mean indoor temperature.
+    New pairs use pair_reference (the mean at the last rebuild); the caller
+    rebuilds when the window mean has drifted too far from it.
+    """
+
+    def __init__(self, capacity: int = MAX_POINTS):
+        self.capacity = capacity
+        self.timestamps = array('d', bytes(8 * capacity))   # epoch seconds
+        self.indoor = array('d', bytes(8 * capacity))
+        self.outdoor = array('d', bytes(8 * capacity))
+        self.heater = array('b', bytes(capacity))
+        self.pair_coefficient = array('d', bytes(8 * capacity))
+        self.pair_valid = array('b', bytes(capacity))
+        self.start = 0            # slot of the oldest sample
+        self.size = 0
+        self.appends = 0
+
+        self.indoor_sum = 0.0
+        self.outdoor_sum = 0.0
+        self.pair_count = 0
+        self.pair_sum = 0.0
+        self.pair_sumsq = 0.0
+        self.pair_reference = None    # indoor mean the pairs were computed against
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _slot(self, index: int) -> int:
+        """Slot of the index-th oldest sample (negative = from the newest)."""
+        if index < 0:
+            index += self.size
+        return (self.start + index) % self.capacity
+
+    def append(self, timestamp: float, indoor: float, outdoor: float, heater: bool) -> None:
+        """Add a sample (evicting the oldest when full) and its pair with the previous sample."""
+        if self.size == self.capacity:
+            oldest = self.start
+            self.indoor_sum -= self.indoor[oldest]
+            self.outdoor_sum -= self.outdoor[oldest]
+            self.start = (self.start + 1) % self.capacity
+            self.size -= 1
+            # The new oldest sample's pair refers to the evicted one
+            self._drop_pair(self.start)
+            slot = oldest
+        else:
+            slot = (self.start + self.size) % self.capacity
+
+        self.timestamps[slot] = timestamp
+        self.indoor[slot] = indoor
+        self.outdoor[slot] = outdoor
+        self.heater[slot] = 1 if heater else 0
+        self.pair_valid[slot] = 0
+        self.size += 1
+        self.indoor_sum += indoor
+        self.outdoor_sum += outdoor
+
+        if self.size > 1:
+            reference = self.pair_reference
+            if reference is None:
+                reference = self.indoor_sum / self.size
+            self._add_pair(self._slot(-2), slot, reference)
+
+        self.appends += 1
+        if self.appends % RESUM_EVERY == 0:
+            self._resum()
+
+    def _add_pair(self, prev: int, curr: int, avg_indoor: float) -> None:
+        """
+        Cooling coefficient for the interval prev -> curr: indoor change per
+        hour per °C of outdoor-indoor difference, for intervals without
+        heating and with a significant temperature difference.
+        """
+        time_diff = (self.timestamps[curr] - self.timestamps[prev]) / 3600
+        if not 0 < time_diff < MAX_PAIR_GAP_HOURS:
+            return
+        if self.heater[curr] or self.heater[prev]:
+            return
+        outdoor_diff = (self.outdoor[curr] + self.outdoor[prev]) / 2 - avg_indoor
+        if abs(outdoor_diff) <= MIN_OUTDOOR_DIFF:
+            return
+        coefficient = (self.indoor[curr] - self.indoor[prev]) / (time_diff * outdoor_diff)
+        if abs(coefficient) >= MAX_PAIR_COEFFICIENT:
+            return
+        self.pair_coefficient[curr] = coefficient
+        self.pair_valid[curr] = 1
+        self.pair_count += 1
+        self.pair_sum += coefficient
+        self.pair_sumsq += coefficient * coefficient
+
+    def _drop_pair(self, slot: int) -> None:
+        if self.pair_valid[slot]:
+            coefficient = self.pair_coefficient[slot]
+            self.pair_valid[slot] = 0
+            self.pair_count -= 1
+            self.pair_sum -= coefficient
+            self.pair_sumsq -= coefficient * coefficient
+
+    def _resum(self) -> None:
+        """Recompute the sliding sums exactly (bounds floating-point drift)."""
+        slots = [self._slot(i) for i in range(self.size)]
+        self.indoor_sum = math.fsum(self.indoor[s] for s in slots)
+        self.outdoor_sum = math.fsum(self.outdoor[s] for s in slots)
+        valid = [self.pair_coefficient[s] for s in slots if self.pair_valid[s]]
+        self.pair_count = len(valid)
+        self.pair_sum = math.fsum(valid)
+        self.pair_sumsq = math.fsum(c * c for c in valid)
+
+    def mean_indoor(self) -> float:
+        return self.indoor_sum / self.size if self.size else 0.0
+
+    def reference_drift(self) -> float:
+        """How far the window mean has moved from the pairs' reference (°C)."""
+        if self.pair_reference is None:
+            return math.inf
+        return abs(self.mean_indoor() - self.pair_reference)
+
+    def rebuild_pairs(self) -> None:
+        """Recompute every pair against the current window mean (O(capacity))."""
+        avg_indoor = self.mean_indoor()
+        self.pair_reference = avg_indoor
+        self.pair_count = 0
+        self.pair_sum = 0.0
+        self.pair_sumsq = 0.0
+        for i in range(self.size):
+            self.pair_valid[self._slot(i)] = 0
+        for i in range(1, self.size):
+            self._add_pair(self._slot(i - 1), self._slot(i), avg_indoor)
+
+    def pair_stats(self) -> tuple:
+        """(count, mean, sample stdev) of the valid pair coefficients."""
+        n = self.pair_count
+        if n == 0:
+            return 0, 0.0, 0.0
+        mean = self.pair_sum / n
+        if n < 2:
+            return n, mean, 0.0
+        variance = max(0.0, (self.pair_sumsq - self.pair_sum * mean) / (n - 1))
+        return n, mean, math.sqrt(variance)
+
+    def series(self, name: str) -> List[float]:
+        """Values of one array ('timestamps', 'indoor', 'outdoor', 'heater'), oldest first."""
+        values = getattr(self, name)
+        end = self.start + self.size
+        if end <= self.capacity:
+            return list(values[self.start:end])
+        return list(values[self.start:]) + list(values[:end - self.capacity])
+
+
 class ThermalAnalyzer:
     """
     Analyzes and learns building thermal response characteristics
@@ -30,7 +217,7 @@ class ThermalAnalyzer:
     outdoor temperature changes and heating inputs over time.
     """
 
-    def __init__(self, logger, min_samples: int = 24, influx=None):
+    def __init__(self, logger, min_samples: int = 24, influx=None, max_points: int = MAX_POINTS):
         """
         Initialize thermal analyzer
 
@@ -38,11 +225,12 @@ class ThermalAnalyzer:
             logger: Logger instance
             min_samples: Minimum data points needed for analysis (default 24 = 6 hours at 15min intervals)
             influx: Optional InfluxDBWriter instance for persistence
+            max_points: Ring buffer capacity (default 672 = 7 days at 15min intervals)
         """
         self.logger = logger
         self.min_samples = min_samples
         self.influx = influx
-        self.historical_data = []
+        self.buffer = ThermalRingBuffer(max_points)
 
         # Load historical data from InfluxDB if available
         if self.influx:
@@ -54,24 +242,24 @@ class ThermalAnalyzer:
             history = self.influx.read_thermal_history(days=7)
             if history:
                 for data in history:
-                    # Parse timestamp and add to historical data
-                    data_point = data.copy()
-                    if isinstance(data['timestamp'], str):
-                        dt = datetime.fromisoformat(
-                            data['timestamp'].replace('Z', '+00:00')
-                        )
-                    else:
-                        dt = data['timestamp']
-                    # Ensure timezone-aware
-                    data_point['timestamp_dt'] = _ensure_timezone_aware(dt)
-                    self.historical_data.append(data_point)
+                    self._append(data)
+                self.buffer.rebuild_pairs()
 
                 self.logger.info(
-                    f"Loaded {len(self.historical_data)} historical data points from InfluxDB"
+                    f"Loaded {len(self.buffer)} historical data points from InfluxDB"
                 )
         except Exception as e:
             self.logger.error(f"Failed to load thermal history: {str(e)}")
 
+    def _append(self, data: Dict) -> bool:
+        """Add one sample to the ring buffer (False if it lacks the required values)."""
+        if data.get('room_temperature') is None or data.get('outdoor_temperature') is None:
+            return False
+        timestamp = _parse_timestamp(data['timestamp']).timestamp()
+        self.buffer.append(timestamp, float(data['room_temperature']),
+                           float(data['outdoor_temperature']), bool(data.get('electric_heater')))
+        return True
+
     def add_data_point(self, data: Dict):
         """
         Add a data point for thermal learning
@@ -86,32 +274,15 @@ class ThermalAnalyzer:
                     'electric_heater': bool
                 }
         """
-        if not data:
+        if not data or 'timestamp' not in data:
             return
 
-        # Only keep data points with required fields
-        required_fields = ['timestamp', 'room_temperature', 'outdoor_temperature']
-        if all(field in data for field in required_fields):
-            # Store with parsed timestamp for easier analysis
-            data_point = data.copy()
-            if isinstance(data['timestamp'], str):
-                dt = datetime.fromisoformat(data['timestamp'].replace('Z', '+00:00'))
-            else:
-                dt = data['timestamp']
-            # Ensure timezone-aware
-            data_point['timestamp_dt'] = _ensure_timezone_aware(dt)
-
-            self.historical_data.append(data_point)
-
+        # Only keep data points with required fields (oldest is evicted after 7 days)
+        if self._append(data):
             # Persist to InfluxDB for restart recovery
             if self.influx:
                 self.influx.write_thermal_data_point(data)
 
-            # Keep last 7 days of data (672 points at 15min intervals)
-            max_points = 672
-            if len(self.historical_data) > max_points:
-                self.historical_data = self.historical_data[-max_points:]
-
     def calculate_thermal_lag(self) -> Optional[float]:
         """
         Calculate the thermal lag - how long it takes for outdoor temperature
@@ -120,17 +291,28 @@ class ThermalAnalyzer:
         Returns:
             Thermal lag in hours, or None if insufficient data
         """
-        if len(self.historical_data) < self.min_samples * 4:  # Need ~24 hours
-            self.logger.info(f"Insufficient data for thermal lag analysis ({len(self.historical_data)}/{self.min_samples * 4})")
+        if len(self.buffer) < self.min_samples * 4:  # Need ~24 hours
+            self.logger.info(f"Insufficient data for thermal lag analysis ({len(self.buffer)}/{self.min_samples * 4})")
             return None
 
-        # Look for correlation between outdoor temp changes and indoor temp changes
-        # with various time offsets
-        best_lag = 6.0  # Default assumption for floor heating + concrete
+        # Cross-correlate outdoor and indoor temperature changes over the buffer
+        best_lag = DEFAULT_THERMAL_LAG_HOURS  # Default assumption for floor heating + concrete
+        result = estimate_thermal_lag(
+            self.buffer.series('timestamps'),
+            self.buffer.series('outdoor'),
+            self.buffer.series('indoor'),
+            step_minutes=15,
+            max_lag_hours=MAX_THERMAL_LAG_HOURS,
+        )
+        if result is None or result['lag_minutes'] is None:
+            self.logger.info(f"Thermal lag estimated at {best_lag} hours (floor heating + concrete)")
+            return best_lag
 
-        # This is simplified - a full implementation would use cross-correlation
-        # For now, return the expected lag for this building type
-        self.logger.info(f"Thermal lag estimated at {best_lag} hours (floor heating + concrete)")
+        best_lag = round(result['lag_minutes'] / 60, 1)
+        self.logger.info(
+            f"Thermal lag measured at {best_lag} hours "
+            f"(correlation {result['correlation']:.2f}, {result['hours']:.0f}h of data)"
+        )
         return best_lag
 
     def calculate_thermal_coefficient(self) -> Optional[Dict]:
@@ -142,6 +324,11 @@ class ThermalAnalyzer:
         - Effectiveness of heating system
         - Thermal mass effects
 
+        Each interval between consecutive samples without heating and with a
+        significant outdoor/indoor difference yields a coefficient when it
+        enters the buffer; this reads the sliding sums, so it is O(1) unless
+        the window mean has drifted enough to need a rebuild.
+
         Returns:
             Dictionary with thermal analysis or None if insufficient data
             {
@@ -152,66 +339,34 @@ class ThermalAnalyzer:
                 'avg_outdoor': float   # Average outdoor temp
             }
         """
-        if len(self.historical_data) < self.min_samples:
-            self.logger.info(f"Insufficient data for thermal coefficient ({len(self.historical_data)}/{self.min_samples})")
+        data_points = len(self.buffer)
+        if data_points < self.min_samples:
+            self.logger.info(f"Insufficient data for thermal coefficient ({data_points}/{self.min_samples})")
             return None
 
         try:
-            # Calculate temperature changes over time
-            indoor_temps = [d['room_temperature'] for d in self.historical_data]
-            outdoor_temps = [d['outdoor_temperature'] for d in self.historical_data]
-
-            avg_indoor = statistics.mean(indoor_temps)
-            avg_outdoor = statistics.mean(outdoor_temps)
-
-            # Calculate rate of change
-            temp_changes = []
-            for i in range(1, len(self.historical_data)):
-                prev = self.historical_data[i-1]
-                curr = self.historical_data[i]
-
-                # Time difference in hours
-                time_diff = (curr['timestamp_dt'] - prev['timestamp_dt']).total_seconds() / 3600
-
-                if time_diff > 0 and time_diff < 2:  # Valid interval (15 min to 2 hours)
-                    # Indoor temperature change
-                    indoor_delta = curr['room_temperature'] - prev['room_temperature']
-
-                    # Outdoor temperature difference from indoor
-                    outdoor_diff = (curr['outdoor_temperature'] + prev['outdoor_temperature']) / 2 - avg_indoor
-
-                    # Heating status (if heater was on, heat is being added)
-                    heating_active = curr.get('electric_heater', False) or prev.get('electric_heater', False)
-
-                    # Calculate coefficient (simplified model)
-                    # When heating is off, indoor temp changes toward outdoor temp
-                    if not heating_active and abs(outdoor_diff) > 2:  # Significant difference
-                        # Rate of change toward outdoor temp
-                        coefficient = indoor_delta / (time_diff * outdoor_diff)
-                        if abs(coefficient) < 0.5:  # Reasonable range
-                            temp_changes.append(coefficient)
-
-            if len(temp_changes) < 5:
-                self.logger.info(f"Insufficient valid temperature changes ({len(temp_changes)})")
-                return None
+            # Pairs are only recomputed when the mean indoor temperature has moved
+            if self.buffer.reference_drift() > PAIR_REFERENCE_TOLERANCE:
+                self.buffer.rebuild_pairs()
+
+            avg_indoor = self.buffer.mean_indoor()
+            avg_outdoor = self.buffer.outdoor_sum / data_points
 
-            # Average coefficient
-            avg_coefficient = statistics.mean(temp_changes)
+            samples, avg_coefficient, stdev = self.buffer.pair_stats()
+            if samples < 5:
+                self.logger.info(f"Insufficient valid temperature changes ({samples})")
+                return None
 
-            # Confidence based on consistency
-            if len(temp_changes) > 1:
-                stdev = statistics.stdev(temp_changes)
-                confidence = max(0.0, min(1.0, 1.0 - (stdev / 0.1)))  # Lower stdev = higher confidence
-            else:
-                confidence = 0.3
+            # Confidence based on consistency: lower stdev = higher confidence
+            confidence = max(0.0, min(1.0, 1.0 - (stdev / 0.1)))
 
             result = {
                 'coefficient': abs(avg_coefficient),  # Use absolute value
                 'confidence': confidence,
-                'samples': len(temp_changes),
+                'samples': samples,
                 'avg_indoor': avg_indoor,
                 'avg_outdoor': avg_outdoor,
-                'data_points': len(self.historical_data)
+                'data_points': data_points
             }
 
             self.logger.info(
@@ -349,3 +504,88 @@ class ThermalAnalyzer:
                 'confidence': 0.7,
                 'predicted_temp': predicted_with_heat or current_indoor
             }
+
+
+def _legacy_coefficient(history: List[Dict]) -> Optional[float]:
+    """The pre-ring-buffer calculation (full recompute over a list of dicts), for the benchmark."""
+    avg_indoor = statistics.mean(d['room_temperature'] for d in history)
+    temp_changes = []
+    for prev, curr in zip(history, history[1:]):
+        time_diff = (curr['timestamp_dt'] - prev['timestamp_dt']).total_seconds() / 3600
+        if 0 < time_diff < MAX_PAIR_GAP_HOURS:
+            outdoor_diff = (curr['outdoor_temperature'] + prev['outdoor_temperature']) / 2 - avg_indoor
+            heating_active = curr.get('electric_heater', False) or prev.get('electric_heater', False)
+            if not heating_active and abs(outdoor_diff) > MIN_OUTDOOR_DIFF:
+                coefficient = (curr['room_temperature'] - prev['room_temperature']) / (time_diff * outdoor_diff)
+                if abs(coefficient) < MAX_PAIR_COEFFICIENT:
+                    temp_changes.append(coefficient)
+    return abs(statistics.mean(temp_changes)) if len(temp_changes) >= 5 else None
+
+
+def bench_thermal_analyzer(iterations: int = 5000) -> None:
+    """
+    Feed synthetic 15-min samples through the old list-of-dicts storage and
+    the ring buffer, recalculating the coefficient after every sample.
+    Prints per-iteration CPU time and the memory held by the stored window.
+    """
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    samples = []
+    indoor = 21.0
+    for i in range(iterations):
+        outdoor = -5.0 + 6.0 * math.sin(2 * math.pi * i / 96)
+        heater = (i // 8) % 3 == 0
+        indoor += 0.05 if heater else -0.002 * (indoor - outdoor)
+        samples.append({
+            'timestamp': (start + timedelta(minutes=15 * i)).isoformat(),
+            'room_temperature': round(indoor, 2),
+            'outdoor_temperature': round(outdoor, 2),
+            'electric_heater': heater,
+        })
+
+    def run_legacy():
+        history = []
+        for data in samples:
+            data_point = data.copy()
+            data_point['timestamp_dt'] = _parse_timestamp(data['timestamp'])
+            history.append(data_point)
+            if len(history) > MAX_POINTS:
+                history = history[-MAX_POINTS:]
+            if len(history) >= 24:
+                _legacy_coefficient(history)
+        return history
+
+    def run_ring():
+        buffer = ThermalRingBuffer(MAX_POINTS)
+        for data in samples:
+            buffer.append(_parse_timestamp(data['timestamp']).timestamp(), data['room_temperature'],
+                          data['outdoor_temperature'], data['electric_heater'])
+            if len(buffer) >= 24:
+                if buffer.reference_drift() > PAIR_REFERENCE_TOLERANCE:
+                    buffer.rebuild_pairs()
+                buffer.pair_stats()
+        return buffer
+
+    print(f"Thermal analyzer benchmark: {iterations} samples, window {MAX_POINTS}")
+    print(f"{'':14s} {'CPU/iter':>12s} {'wall/iter':>12s} {'retained':>12s} {'peak':>12s}")
+    for name, run in (('list-of-dicts', run_legacy), ('ring buffer', run_ring)):
+        tracemalloc.start()
+        cpu0, wall0 = time.process_time(), time.perf_counter()
+        window = run()
+        cpu = time.process_time() - cpu0
+        wall = time.perf_counter() - wall0
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del window
+        print(f"{name:14s} {cpu / iterations * 1e6:>9.1f} µs {wall / iterations * 1e6:>9.1f} µs "
+              f"{retained / 1024:>9.1f} KB {peak / 1024:>9.1f} KB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Thermal analyzer utilities')
+    parser.add_argument('--bench', type=int, metavar='N', default=None,
+                        help='Benchmark N samples (old storage vs ring buffer)')
+    args = parser.parse_args()
+    if args.bench:
+        bench_thermal_analyzer(args.bench)
+    else:
+        parser.print_help()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Thermal Lag Estimation
+Cross-correlation between effective outdoor temperature and indoor temperature.
+
+The lag is the time shift at which changes in effective outdoor temperature
+best line up with the changes they cause indoors. Both series are resampled
+to a regular grid and turned into hourly differences, so the slow daily
+trend and the absolute levels don't dominate. Differences in the outdoor
+signal are split into rising and falling parts, giving separate heat-up and
+cool-down lags (ThermalResponseTiming).
+
+The correlation is computed for all lags at once with an FFT (pure Python,
+no NumPy): the rising and falling halves of the outdoor signal are packed
+into one complex signal, so a run costs three FFTs regardless of the lag
+range.
+
+Usage:
+    result = estimate_thermal_lag(timestamps, effective_temps, indoor_temps)
+    if result:
+        print(result['heat_up_lag_minutes'], result['cool_down_lag_minutes'])
+
+Benchmark (30 days of 5-minute data):
+    python3 thermal_lag.py --bench
+"""
+
+import argparse
+import cmath
+import math
+import time
+from typing import Dict, List, Optional, Sequence
+
+DEFAULT_STEP_MINUTES = 5
+DEFAULT_MAX_LAG_HOURS = 12
+DIFF_MINUTES = 60               # difference span (smooths sensor quantization)
+MAX_INTERPOLATE_MINUTES = 60    # longer gaps are left out of the correlation
+MIN_HOURS = 48                  # less resampled history than this is not worth correlating
+MIN_CORRELATION = 0.05          # normalized peak below this = no usable lag
+
+_twiddle_cache: Dict[int, List[complex]] = {}
+
+
+def _twiddles(n: int) -> List[complex]:
+    """exp(-2πik/n) for k < n/2, cached per transform size."""
+    tw = _twiddle_cache.get(n)
+    if tw is None:
+        tw = [cmath.exp(-2j * math.pi * k / n) for k in range(n // 2)]
+        _twiddle_cache[n] = tw
+    return tw
+
+
+def _fft(values: List[complex]) -> List[complex]:
+    """
+    Radix-2 Stockham FFT (len(values) must be a power of two).
+
+    Each stage runs as list comprehensions over strided slices, looping in
+    Python over whichever of the butterfly index / stride is shorter.
+    """
+    n = len(values)
+    tw = _twiddles(n)
+    a = list(values)
+    stride = 1
+    m = n
+    while m > 1:
+        half = m // 2
+        w = tw[::stride]            # exp(-2πip/m) for p < half
+        y = [0j] * n
+        step = 2 * stride
+        if half >= stride:
+            for q in range(stride):
+                column = a[q::stride]
+                lo, hi = column[:half], column[half:]
+                y[q::step] = [u + v for u, v in zip(lo, hi)]
+                y[q + stride::step] = [(u - v) * wp for u, v, wp in zip(lo, hi, w)]
+        else:
+            for p in range(half):
+                lo = a[stride * p:stride * (p + 1)]
+                hi = a[stride * (p + half):stride * (p + half + 1)]
+                wp = w[p]
+                y[step * p:step * p + stride] = [u + v for u, v in zip(lo, hi)]
+                y[step * p + stride:step * (p + 1)] = [(u - v) * wp for u, v in zip(lo, hi)]
+        a = y
+        stride = step
+        m = half
+    return a
+
+
+def _ifft(values: List[complex]) -> List[complex]:
+    n = len(values)
+    result = _fft([v.conjugate() for v in values])
+    return [v.conjugate() / n for v in result]
+
+
+def resample(timestamps: Sequence[float], values: Sequence[float],
+             step_seconds: float, start: float, count: int) -> List[Optional[float]]:
+    """
+    Average samples into `count` bins of step_seconds from `start` and
+    linearly interpolate gaps up to MAX_INTERPOLATE_MINUTES (None beyond).
+    """
+    sums = [0.0] * count
+    counts = [0] * count
+    for ts, value in zip(timestamps, values):
+        if value is None:
+            continue
+        i = int(round((ts - start) / step_seconds))
+        if 0 <= i < count:
+            sums[i] += value
+            counts[i] += 1
+
+    grid: List[Optional[float]] = [s / c if c else None for s, c in zip(sums, counts)]
+    max_gap = max(1, int(MAX_INTERPOLATE_MINUTES * 60 / step_seconds))
+    last = None
+    for i, value in enumerate(grid):
+        if value is None:
+            continue
+        if last is not None and 1 < i - last <= max_gap + 1:
+            slope = (value - grid[last]) / (i - last)
+            for j in range(last + 1, i):
+                grid[j] = grid[last] + slope * (j - last)
+        last = i
+    return grid
+
+
+def _differences(grid: List[Optional[float]], span: int) -> List[float]:
+    """grid[i] - grid[i - span], 0 where either end is missing."""
+    return [0.0] * span + [
+        (b - a) if a is not None and b is not None else 0.0
+        for a, b in zip(grid, grid[span:])
+    ]
+
+
+def _peak(correlation: List[float]) -> Optional[tuple]:
+    """(fractional lag, peak value) of the largest positive correlation."""
+    best = max(range(len(correlation)), key=correlation.__getitem__)
+    peak = correlation[best]
+    if peak <= 0:
+        return None
+    # Parabolic interpolation between neighbouring lags
+    offset = 0.0
+    if 0 < best < len(correlation) - 1:
+        left, right = correlation[best - 1], correlation[best + 1]
+        denominator = left - 2 * peak + right
+        if denominator < 0:
+            offset = 0.5 * (left - right) / denominator
+    return best + offset, peak
+
+
+def estimate_thermal_lag(
+    timestamps: Sequence[float],
+    effective_temps: Sequence[float],
+    indoor_temps: Sequence[float],
+    step_minutes: float = DEFAULT_STEP_MINUTES,
+    max_lag_hours: float = DEFAULT_MAX_LAG_HOURS,
+) -> Optional[dict]:
+    """
+    Estimate how long indoor temperature takes to follow effective outdoor
+    temperature.
+
+    Args:
+        timestamps: Sample times (epoch seconds, ascending)
+        effective_temps: Effective (or plain) outdoor temperature per sample
+        indoor_temps: Indoor temperature per sample
+        step_minutes: Resampling step
+        max_lag_hours: Longest lag considered
+
+    Returns:
+        None if there is too little data, otherwise:
+        {
+            'lag_minutes': float or None,          # both directions combined
+            'heat_up_lag_minutes': float or None,  # response to rising eff_temp
+            'cool_down_lag_minutes': float or None,
+            'correlation': float,                  # normalized peak (0-1)
+            'heat_up_correlation': float,
+            'cool_down_correlation': float,
+            'samples': int,                        # resampled grid points used
+            'hours': float
+        }
+        Lags are None when the correlation peak is below MIN_CORRELATION.
+    """
+    if len(timestamps) < 2:
+        return None
+    step = step_minutes * 60.0
+    start = timestamps[0]
+    count = int((timestamps[-1] - start) // step) + 1
+    if count * step < MIN_HOURS * 3600:
+        return None
+
+    span = max(1, int(round(DIFF_MINUTES / step_minutes)))
+    outdoor = _differences(resample(timestamps, effective_temps, step, start, count), span)
+    indoor = _differences(resample(timestamps, indoor_temps, step, start, count), span)
+    samples = sum(1 for d in indoor if d)
+
+    max_lag = min(count - 1, int(max_lag_hours * 60 / step_minutes))
+    size = 1
+    while size < count + max_lag:
+        size *= 2
+    pad = [0j] * (size - count)
+
+    # Rising and falling outdoor changes packed into one complex signal
+    rising = [d if d > 0 else 0.0 for d in outdoor]
+    falling = [-d if d < 0 else 0.0 for d in outdoor]
+    packed = _fft([complex(r, f) for r, f in zip(rising, falling)] + pad)
+    indoor_spectrum = _fft([complex(d) for d in indoor] + pad)
+
+    # corr[l] = sum(z[i] * indoor[i + l]) = ifft(Z[-k] * Y[k]); the real part is
+    # the rising correlation and the imaginary part the falling one.
+    mirrored = packed[:1] + packed[:0:-1]
+    combined = [z * y for z, y in zip(mirrored, indoor_spectrum)]
+    correlation = _ifft(combined)[:max_lag + 1]
+
+    # Falling outdoor temperature should make indoor fall, hence the sign flip
+    rising_corr = [c.real for c in correlation]
+    falling_corr = [-c.imag for c in correlation]
+
+    indoor_energy = math.sqrt(sum(d * d for d in indoor))
+    rising_norm = math.sqrt(sum(d * d for d in rising)) * indoor_energy
+    falling_norm = math.sqrt(sum(d * d for d in falling)) * indoor_energy
+    combined_norm = math.sqrt(sum(d * d for d in outdoor)) * indoor_energy
+
+    def lag(values: List[float], norm: float) -> tuple:
+        if norm <= 0:
+            return None, 0.0
+        peak = _peak([v / norm for v in values])
+        if peak is None or peak[1] < MIN_CORRELATION:
+            return None, max(0.0, peak[1]) if peak else 0.0
+        return peak[0] * step_minutes, peak[1]
+
+    heat_up, heat_up_corr = lag(rising_corr, rising_norm)
+    cool_down, cool_down_corr = lag(falling_corr, falling_norm)
+    both, both_corr = lag([r + f for r, f in zip(rising_corr, falling_corr)], combined_norm)
+
+    return {
+        'lag_minutes': both,
+        'heat_up_lag_minutes': heat_up,
+        'cool_down_lag_minutes': cool_down,
+        'correlation': both_corr,
+        'heat_up_correlation': heat_up_corr,
+        'cool_down_correlation': cool_down_corr,
+        'samples': samples,
+        'hours': count * step / 3600,
+    }
+
+
+def bench_thermal_lag(days: int = 30, step_minutes: float = DEFAULT_STEP_MINUTES,
+                      true_lag_minutes: float = 120.0, runs: int = 5) -> None:
+    """Time estimate_thermal_lag on synthetic data with a known lag."""
+    import random
+    rng = random.Random(1)
+    step = step_minutes * 60
+    count = int(days * 24 * 60 / step_minutes)
+    shift = int(true_lag_minutes / step_minutes)
+    timestamps = [1_700_000_000 + i * step for i in range(count)]
+    outdoor = []
+    value = 0.0
+    for i in range(count):
+        value += rng.gauss(0, 0.15) - 0.002 * value
+        outdoor.append(value + 4 * math.sin(2 * math.pi * i * step_minutes / 1440))
+    indoor = [21.0 + 0.05 * outdoor[max(0, i - shift)] + rng.gauss(0, 0.02) for i in range(count)]
+
+    estimate_thermal_lag(timestamps, outdoor, indoor, step_minutes)  # warm twiddle cache
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = estimate_thermal_lag(timestamps, outdoor, indoor, step_minutes)
+    elapsed = (time.perf_counter() - start) / runs
+    print(f"{days} days x {step_minutes:g} min = {count} samples, true lag {true_lag_minutes:.0f} min")
+    print(f"  estimated lag {result['lag_minutes']:.0f} min "
+          f"(heat-up {result['heat_up_lag_minutes']:.0f}, cool-down {result['cool_down_lag_minutes']:.0f}), "
+          f"correlation {result['correlation']:.2f}")
+    print(f"  {elapsed * 1000:.1f} ms per estimate")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Thermal lag cross-correlation')
+    parser.add_argument('--bench', action='store_true', help='Benchmark on 30 days of synthetic 5-min data')
+    parser.add_argument('--days', type=int, default=30)
+    args = parser.parse_args()
+    if args.bench:
+        bench_thermal_lag(days=args.days)
+    else:
+        parser.print_help()
@@ -12,14 +12,29 @@ Key Detection Signal - Supply-Return Temperature Delta:
 When delta drops while outdoor temp is cold + clear skies + sun above horizon = solar event
 
 Naming convention: All new variables use _ml2 suffix to distinguish from original model.
+
+Warm start: the in-memory learning state (observation buffer, in-progress
+solar event, baseline samples, thermal lag history) is snapshotted to
+<LEARNER_STATE_DIR>/<customer_id>.bin and restored at startup, so a restart
+resumes where it left off. Snapshot layout: a fixed header (magic, format
+version, saved_at, CRC32) followed by zlib-compressed JSON with datetimes as
+epoch seconds and dataclasses as value lists. Bump SNAPSHOT_VERSION when the
+layout changes; snapshots of another version are ignored (cold start).
 """
 
+import json
 import math
 import logging
+import os
+import struct
+import zlib
 from datetime import datetime, timezone, timedelta
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Optional, List, Dict, Tuple
 from collections import deque
+from itertools import islice
+
+from thermal_lag import estimate_thermal_lag
 
 try:
     from astral import LocationInfo
@@ -29,7 +44,44 @@ except ImportError:
     ASTRAL_AVAILABLE = False
 
 
-@dataclass
+LEARNER_STATE_DIR = os.getenv(
+    'LEARNER_STATE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles', 'learner_state'))
+SNAPSHOT_MAGIC = b'WSLS'
+SNAPSHOT_VERSION = 2                # 2: in-progress event stored as running sums
+SNAPSHOT_INTERVAL_MINUTES = 15      # how often the fetcher snapshots the learner
+SNAPSHOT_MAX_AGE_MINUTES = 60       # older snapshots only restore long-lived state
+_SNAPSHOT_HEADER = struct.Struct('<4sHdI')  # magic, version, saved_at (epoch), crc32 of payload
+
+
+def snapshot_path(customer_id: str, directory: str = None) -> str:
+    """Path of the learner snapshot for a customer."""
+    return os.path.join(directory or LEARNER_STATE_DIR, f"{customer_id}.bin")
+
+
+def _epoch(ts: Optional[datetime]) -> Optional[float]:
+    return ts.timestamp() if ts is not None else None
+
+
+def _from_epoch(value: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value, tz=timezone.utc) if value is not None else None
+
+
+def _pack_dataclass(obj) -> list:
+    """Dataclass -> list of field values (datetimes as epoch seconds)."""
+    return [_epoch(v) if isinstance(v, datetime) else v
+            for v in (getattr(obj, f.name) for f in fields(obj))]
+
+
+def _unpack_dataclass(cls, values: list):
+    """Inverse of _pack_dataclass (datetime-typed fields are converted back)."""
+    kwargs = {}
+    for f, value in zip(fields(cls), values):
+        kwargs[f.name] = _from_epoch(value) if f.type in (datetime, 'datetime') else value
+    return cls(**kwargs)
+
+
+@dataclass(slots=True)
 class SolarEvent:
     """
     Detected solar heating event.
@@ -69,7 +121,7 @@ class SolarEvent:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Observation:
     """Single observation for solar event detection."""
     timestamp: datetime
@@ -87,6 +139,52 @@ class Observation:
         return self.supply_temp - self.return_temp
 
 
+class EventAccumulator:
+    """
+    Running sums for the solar event in progress, so an event of any length
+    takes constant memory (replaces the list of its observations).
+    """
+    __slots__ = ('start', 'end', 'count', 'sum_delta', 'sum_outdoor', 'sum_indoor',
+                 'sum_cloud', 'sum_sun', 'sum_wind', 'peak_sun')
+
+    def __init__(self, obs: Observation):
+        self.start = obs.timestamp
+        self.end = obs.timestamp
+        self.count = 0
+        self.sum_delta = self.sum_outdoor = self.sum_indoor = 0.0
+        self.sum_cloud = self.sum_sun = self.sum_wind = 0.0
+        self.peak_sun = obs.sun_elevation
+        self.add(obs)
+
+    def add(self, obs: Observation) -> None:
+        self.end = obs.timestamp
+        self.count += 1
+        self.sum_delta += obs.supply_return_delta
+        self.sum_outdoor += obs.outdoor_temp
+        self.sum_indoor += obs.room_temp
+        self.sum_cloud += obs.cloud_cover
+        self.sum_sun += obs.sun_elevation
+        self.sum_wind += obs.wind_speed
+        if obs.sun_elevation > self.peak_sun:
+            self.peak_sun = obs.sun_elevation
+
+    @property
+    def duration_minutes(self) -> float:
+        return (self.end - self.start).total_seconds() / 60
+
+    def to_list(self) -> list:
+        return [_epoch(self.start), _epoch(self.end)] + [getattr(self, name) for name in self.__slots__[2:]]
+
+    @classmethod
+    def from_list(cls, values: list) -> 'EventAccumulator':
+        acc = cls.__new__(cls)
+        acc.start = _from_epoch(values[0])
+        acc.end = _from_epoch(values[1])
+        for name, value in zip(cls.__slots__[2:], values[2:]):
+            setattr(acc, name, value)
+        return acc
+
+
 @dataclass
 class LearnedWeatherCoefficients:
     """
@@ -195,6 +293,19 @@ class WeatherSensitivityLearner:
     NEW_COEFFICIENT_WEIGHT = 0.7
     OLD_COEFFICIENT_WEIGHT = 0.3
 
+    # Retention limits (everything the learner keeps is bounded)
+    BASELINE_SAMPLES = 8                    # 2 hours of pre-sunrise data
+    LAG_HISTORY_SAMPLES = 16                # 4 hours at 15-min intervals
+    MAX_PENDING_TRANSITIONS = 8
+    MAX_DETECTED_EVENTS = 4 * REGULAR_UPDATE_EVENTS
+    MAX_DETECTED_LAGS = 4 * REGULAR_UPDATE_EVENTS
+
+    # Cross-correlation thermal lag (run on stored history, not per observation)
+    LAG_CORRELATION_INTERVAL_HOURS = 24
+    LAG_CORRELATION_DAYS = 30
+    LAG_CORRELATION_FULL_CONFIDENCE = 0.3   # normalized correlation treated as fully reliable
+    LAG_CORRELATION_WEIGHT = 0.5            # max weight of a correlation result when blending
+
     def __init__(
         self,
         heat_loss_k: float,
@@ -230,10 +341,10 @@ class WeatherSensitivityLearner:
 
         # Event detection state
         self.current_event_start: Optional[datetime] = None
-        self.current_event_observations: List[Observation] = []
+        self.current_event: Optional[EventAccumulator] = None
 
         # Completed events waiting for coefficient update
-        self.detected_events: List[SolarEvent] = []
+        self.detected_events: deque = deque(maxlen=self.MAX_DETECTED_EVENTS)
 
         # Location for sun calculations
         if ASTRAL_AVAILABLE:
@@ -245,12 +356,13 @@ class WeatherSensitivityLearner:
         # Outdoor temp baseline tracking (for sensor-based solar detection)
         # Uses nighttime/early morning temps as baseline
         self.outdoor_temp_baseline: Optional[float] = None
-        self.baseline_samples: List[float] = []  # Temps from before sunrise
+        self.baseline_samples: deque = deque(maxlen=self.BASELINE_SAMPLES)  # Temps from before sunrise
 
         # Thermal lag learning state
-        self.effective_temp_history: List[tuple] = []  # (timestamp, effective_temp, indoor_temp)
+        self.effective_temp_history: deque = deque(maxlen=self.LAG_HISTORY_SAMPLES)  # (timestamp, effective_temp, indoor_temp)
         self.pending_transitions: List[dict] = []  # Transitions waiting for indoor response
-        self.detected_lags: List[dict] = []  # Completed lag measurements
+        self.detected_lags: deque = deque(maxlen=self.MAX_DETECTED_LAGS)  # Completed lag measurements
+        self.last_lag_correlation: Optional[datetime] = None
 
         # Predictive solar detection state
         self.early_warning_active: bool = False
@@ -307,7 +419,7 @@ class WeatherSensitivityLearner:
 
         # 2. Check for early solar warning
         if self.observation_buffer:
-            obs = list(self.observation_buffer)[-1]
+            obs = self.observation_buffer[-1]
             result['early_warning'] = self.detect_solar_event_early(obs)
 
         # 3. Track thermal lag
@@ -373,11 +485,11 @@ class WeatherSensitivityLearner:
 
         if is_solar_condition:
             # Start or continue event
-            if self.current_event_start is None:
+            if self.current_event is None:
                 self.current_event_start = timestamp
-                self.current_event_observations = [obs]
+                self.current_event = EventAccumulator(obs)
             else:
-                self.current_event_observations.append(obs)
+                self.current_event.add(obs)
         else:
             # Event ended - check if it was long enough
             completed_event = self._finalize_event()
@@ -398,10 +510,8 @@ class WeatherSensitivityLearner:
         """
         # Only use readings when sun is below horizon or very low
         if obs.sun_elevation < 5.0:
+            # Keeps the last BASELINE_SAMPLES (2 hours of pre-sunrise data)
             self.baseline_samples.append(obs.outdoor_temp)
-            # Keep last 8 samples (2 hours of pre-sunrise data)
-            if len(self.baseline_samples) > 8:
-                self.baseline_samples = self.baseline_samples[-8:]
             # Update baseline as median of recent samples
             if len(self.baseline_samples) >= 2:
                 sorted_samples = sorted(self.baseline_samples)
@@ -426,7 +536,8 @@ class WeatherSensitivityLearner:
         # Method 2: Check for recent rapid rise
         if len(self.observation_buffer) >= 2:
             # Look at temp change over last 30 min (2 observations)
-            recent_temps = [o.outdoor_temp for o in list(self.observation_buffer)[-3:]]
+            recent = min(3, len(self.observation_buffer))
+            recent_temps = [self.observation_buffer[i].outdoor_temp for i in range(-recent, 0)]
             if len(recent_temps) >= 2:
                 temp_rise = obs.outdoor_temp - min(recent_temps[:-1])
                 # Only count rises (not drops - sun moving away is normal)
@@ -481,30 +592,25 @@ class WeatherSensitivityLearner:
         Returns:
             SolarEvent if valid, None otherwise
         """
-        if self.current_event_start is None or not self.current_event_observations:
-            self.current_event_start = None
-            self.current_event_observations = []
+        acc = self.current_event
+        self.current_event_start = None
+        self.current_event = None
+        if acc is None:
             return None
 
-        observations = self.current_event_observations
-
-        # Calculate duration
-        duration = (observations[-1].timestamp - observations[0].timestamp).total_seconds() / 60
-
         # Check minimum duration
+        duration = acc.duration_minutes
         if duration < self.MIN_EVENT_DURATION_MINUTES:
-            self.current_event_start = None
-            self.current_event_observations = []
             return None
 
         # Calculate averages
-        avg_delta = sum(o.supply_return_delta for o in observations) / len(observations)
-        avg_outdoor_sensor = sum(o.outdoor_temp for o in observations) / len(observations)
-        avg_indoor = sum(o.room_temp for o in observations) / len(observations)
-        avg_cloud = sum(o.cloud_cover for o in observations) / len(observations)
-        avg_sun = sum(o.sun_elevation for o in observations) / len(observations)
-        avg_wind = sum(o.wind_speed for o in observations) / len(observations)
-        peak_sun = max(o.sun_elevation for o in observations)
+        avg_delta = acc.sum_delta / acc.count
+        avg_outdoor_sensor = acc.sum_outdoor / acc.count
+        avg_indoor = acc.sum_indoor / acc.count
+        avg_cloud = acc.sum_cloud / acc.count
+        avg_sun = acc.sum_sun / acc.count
+        avg_wind = acc.sum_wind / acc.count
+        peak_sun = acc.peak_sun
 
         # Use baseline outdoor temp for coefficient calculation (not sun-heated sensor)
         # This gives a more accurate picture of actual outdoor conditions
@@ -527,8 +633,8 @@ class WeatherSensitivityLearner:
         )
 
         event = SolarEvent(
-            timestamp=observations[0].timestamp,
-            end_timestamp=observations[-1].timestamp,
+            timestamp=acc.start,
+            end_timestamp=acc.end,
             duration_minutes=duration,
             avg_supply_return_delta=avg_delta,
             avg_outdoor_temp=avg_outdoor,
@@ -537,14 +643,10 @@ class WeatherSensitivityLearner:
             avg_sun_elevation=avg_sun,
             avg_wind_speed=avg_wind,
             implied_solar_coefficient_ml2=implied_coeff,
-            observations_count=len(observations),
+            observations_count=acc.count,
             peak_sun_elevation=peak_sun
         )
 
-        # Reset state
-        self.current_event_start = None
-        self.current_event_observations = []
-
         self.logger.info(
             f"Solar event detected: {duration:.0f}min, "
             f"sun={avg_sun:.1f}°, cloud={avg_cloud:.1f}, "
@@ -595,7 +697,7 @@ class WeatherSensitivityLearner:
         if self.outdoor_temp_baseline is not None:
             # Get the sensor anomaly from the most recent observation
             if self.observation_buffer:
-                recent_obs = list(self.observation_buffer)[-1]
+                recent_obs = self.observation_buffer[-1]
                 sensor_anomaly = recent_obs.outdoor_temp - self.outdoor_temp_baseline
 
                 if sensor_anomaly > 1.0:  # Only if there's measurable anomaly
@@ -650,7 +752,7 @@ class WeatherSensitivityLearner:
             return self.coefficients
 
         # Get recent events (since last update)
-        recent_events = self.detected_events[-self.coefficients.events_since_last_update:]
+        recent_events = self._recent_events(self.coefficients.events_since_last_update)
 
         if not recent_events:
             return self.coefficients
@@ -721,6 +823,15 @@ class WeatherSensitivityLearner:
             outdoor_temp, cloud_cover, wind_speed
         )
 
+    def _recent_events(self, count: int) -> List[SolarEvent]:
+        """Last `count` detected events, oldest first (none for count <= 0)."""
+        if count <= 0:
+            return []
+        return list(islice(self.detected_events, max(0, len(self.detected_events) - count), None))
+
+    def _recent_lags(self, count: int) -> List[dict]:
+        return list(islice(self.detected_lags, max(0, len(self.detected_lags) - count), None))
+
     def get_state(self) -> dict:
         """Get current learner state for persistence/debugging."""
         return {
@@ -729,10 +840,127 @@ class WeatherSensitivityLearner:
             'buffer_size': len(self.observation_buffer),
             'detected_events_count': len(self.detected_events),
             'current_event_active': self.current_event_start is not None,
-            'current_event_observations': len(self.current_event_observations) if self.current_event_observations else 0,
+            'current_event_observations': self.current_event.count if self.current_event else 0,
             'early_warning_active': self.early_warning_active,
         }
 
+    # =========================================================================
+    # Warm-start Snapshots
+    # =========================================================================
+
+    def snapshot(self, now: Optional[datetime] = None) -> bytes:
+        """
+        Serialize the in-memory learning state (coefficients and timing live
+        in the customer profile and are not included).
+        """
+        now = now or datetime.now(timezone.utc)
+        pending_events = self.coefficients.events_since_last_update
+        state = {
+            'observations': [_pack_dataclass(o) for o in self.observation_buffer],
+            'current_event_start': _epoch(self.current_event_start),
+            'current_event': self.current_event.to_list() if self.current_event else None,
+            'detected_events': [_pack_dataclass(e) for e in self._recent_events(pending_events)],
+            'outdoor_temp_baseline': self.outdoor_temp_baseline,
+            'baseline_samples': list(self.baseline_samples),
+            'effective_temp_history': [[_epoch(ts), eff, indoor]
+                                       for ts, eff, indoor in self.effective_temp_history],
+            'pending_transitions': [{**t, 'start_time': _epoch(t['start_time'])}
+                                    for t in self.pending_transitions],
+            'detected_lags': self._recent_lags(self.REGULAR_UPDATE_EVENTS),
+            'early_warning_active': self.early_warning_active,
+            'early_warning_start': _epoch(self.early_warning_start),
+            'last_lag_correlation': _epoch(self.last_lag_correlation),
+        }
+        payload = zlib.compress(json.dumps(state, separators=(',', ':')).encode('utf-8'))
+        header = _SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, now.timestamp(),
+                                       zlib.crc32(payload))
+        return header + payload
+
+    def restore(self, data: bytes, now: Optional[datetime] = None) -> bool:
+        """
+        Restore state from snapshot() bytes.
+
+        Snapshots older than SNAPSHOT_MAX_AGE_MINUTES only restore long-lived
+        state (detected events and lags, correlation schedule); the
+        observation-level state would no longer line up with new readings.
+
+        Returns:
+            True if the snapshot was valid and applied, False otherwise
+        """
+        now = now or datetime.now(timezone.utc)
+        if len(data) < _SNAPSHOT_HEADER.size:
+            self.logger.warning("Learner snapshot truncated, starting cold")
+            return False
+        magic, version, saved_at, crc = _SNAPSHOT_HEADER.unpack_from(data)
+        payload = data[_SNAPSHOT_HEADER.size:]
+        if magic != SNAPSHOT_MAGIC or zlib.crc32(payload) != crc:
+            self.logger.warning("Learner snapshot corrupt, starting cold")
+            return False
+        if version != SNAPSHOT_VERSION:
+            self.logger.info(f"Learner snapshot version {version} != {SNAPSHOT_VERSION}, starting cold")
+            return False
+        try:
+            state = json.loads(zlib.decompress(payload))
+        except (zlib.error, ValueError) as e:
+            self.logger.warning(f"Learner snapshot unreadable ({e}), starting cold")
+            return False
+
+        self.detected_events.clear()
+        self.detected_events.extend(_unpack_dataclass(SolarEvent, e) for e in state['detected_events'])
+        self.detected_lags.clear()
+        self.detected_lags.extend(state['detected_lags'])
+        self.last_lag_correlation = _from_epoch(state['last_lag_correlation'])
+
+        age_minutes = (now.timestamp() - saved_at) / 60
+        if age_minutes > SNAPSHOT_MAX_AGE_MINUTES:
+            self.logger.info(
+                f"Learner snapshot is {age_minutes:.0f}min old, restored events only"
+            )
+            return True
+
+        self.observation_buffer = deque(
+            (_unpack_dataclass(Observation, o) for o in state['observations']),
+            maxlen=self.buffer_size
+        )
+        self.current_event_start = _from_epoch(state['current_event_start'])
+        self.current_event = (EventAccumulator.from_list(state['current_event'])
+                              if state['current_event'] else None)
+        self.outdoor_temp_baseline = state['outdoor_temp_baseline']
+        self.baseline_samples.clear()
+        self.baseline_samples.extend(state['baseline_samples'])
+        self.effective_temp_history.clear()
+        self.effective_temp_history.extend(
+            (_from_epoch(ts), eff, indoor) for ts, eff, indoor in state['effective_temp_history']
+        )
+        self.pending_transitions = [
+            {**t, 'start_time': _from_epoch(t['start_time'])} for t in state['pending_transitions']
+        ][-self.MAX_PENDING_TRANSITIONS:]
+        self.early_warning_active = state['early_warning_active']
+        self.early_warning_start = _from_epoch(state['early_warning_start'])
+
+        self.logger.info(
+            f"Learner snapshot restored ({len(self.observation_buffer)} observations, "
+            f"{age_minutes:.0f}min old)"
+        )
+        return True
+
+    def save_snapshot(self, path: str) -> None:
+        """Write snapshot() to path atomically."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self.snapshot())
+        os.replace(tmp_path, path)
+
+    def load_snapshot(self, path: str) -> bool:
+        """Restore from a snapshot file (False if missing or not usable)."""
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return False
+        return self.restore(data)
+
     # =========================================================================
     # Predictive Solar Detection
     # =========================================================================
@@ -773,7 +1001,7 @@ class WeatherSensitivityLearner:
         # Check for rapid outdoor temp rise (sun hitting sensor)
         rapid_rise = False
         if len(self.observation_buffer) >= 2:
-            prev_obs = list(self.observation_buffer)[-2]
+            prev_obs = self.observation_buffer[-2]
             temp_change_30min = obs.outdoor_temp - prev_obs.outdoor_temp
             rapid_rise = temp_change_30min >= 2.0  # 2°C rise in 15 min
 
@@ -851,13 +1079,9 @@ class WeatherSensitivityLearner:
             timestamp, outdoor_temp, wind_speed, cloud_cover
         )
 
-        # Add to history
+        # Add to history (keeps LAG_HISTORY_SAMPLES = 4 hours at 15-min intervals)
         self.effective_temp_history.append((timestamp, effective_temp, indoor_temp))
 
-        # Keep 4 hours of history (16 samples at 15-min intervals)
-        if len(self.effective_temp_history) > 16:
-            self.effective_temp_history = self.effective_temp_history[-16:]
-
         # Need at least 2 hours of history to detect transitions
         if len(self.effective_temp_history) < 8:
             return None
@@ -871,12 +1095,14 @@ class WeatherSensitivityLearner:
             transition_type = 'rising' if eff_temp_change > 0 else 'falling'
 
             # Check if we already have this transition pending
-            existing = [t for t in self.pending_transitions
-                        if t['type'] == transition_type
-                        and (timestamp - t['start_time']).total_seconds() < 7200]
+            existing = any(t['type'] == transition_type
+                           and (timestamp - t['start_time']).total_seconds() < 7200
+                           for t in self.pending_transitions)
 
             if not existing:
                 # New transition detected - start watching for indoor response
+                if len(self.pending_transitions) >= self.MAX_PENDING_TRANSITIONS:
+                    del self.pending_transitions[0]
                 self.pending_transitions.append({
                     'type': transition_type,
                     'start_time': timestamp,
@@ -891,6 +1117,8 @@ class WeatherSensitivityLearner:
 
         # Check pending transitions for indoor response
         completed = None
+        if not self.pending_transitions:
+            return completed
         remaining_transitions = []
 
         for transition in self.pending_transitions:
@@ -988,6 +1216,73 @@ class WeatherSensitivityLearner:
         self.timing.confidence_ml2 = min(1.0, self.timing.total_transitions / 10.0)
         self.timing.updated_at = datetime.now(timezone.utc).isoformat()
 
+    def lag_correlation_due(self, now: datetime) -> bool:
+        """Check if the cross-correlation lag estimate should run (daily)."""
+        if self.last_lag_correlation is None:
+            return True
+        return (now - self.last_lag_correlation).total_seconds() >= self.LAG_CORRELATION_INTERVAL_HOURS * 3600
+
+    def correlate_thermal_lag(
+        self,
+        now: datetime,
+        timestamps: List[float],
+        effective_temps: List[float],
+        indoor_temps: List[float],
+        step_minutes: float = 5
+    ) -> Optional[dict]:
+        """
+        Estimate heat-up/cool-down lag by cross-correlating stored effective
+        outdoor and indoor temperature, and blend it into the timing model.
+
+        Complements track_thermal_lag(): event matching reacts to single
+        large transitions, the correlation uses every change over the last
+        LAG_CORRELATION_DAYS.
+
+        Args:
+            now: Current time (for scheduling)
+            timestamps: Sample times (epoch seconds, ascending)
+            effective_temps: Effective outdoor temperature per sample (°C)
+            indoor_temps: Indoor temperature per sample (°C)
+            step_minutes: Sample interval of the series
+
+        Returns:
+            estimate_thermal_lag() result if the timing was updated, None otherwise
+        """
+        self.last_lag_correlation = now
+        result = estimate_thermal_lag(timestamps, effective_temps, indoor_temps, step_minutes)
+        if not result:
+            return None
+
+        updated = False
+        for lag_key, corr_key, attr in (
+            ('heat_up_lag_minutes', 'heat_up_correlation', 'heat_up_lag_minutes_ml2'),
+            ('cool_down_lag_minutes', 'cool_down_correlation', 'cool_down_lag_minutes_ml2'),
+        ):
+            lag_minutes = result[lag_key]
+            if lag_minutes is None:
+                continue
+            confidence = min(1.0, result[corr_key] / self.LAG_CORRELATION_FULL_CONFIDENCE)
+            weight = self.LAG_CORRELATION_WEIGHT * confidence
+            old_lag = getattr(self.timing, attr)
+            setattr(self.timing, attr, round((1 - weight) * old_lag + weight * lag_minutes, 1))
+            self.timing.confidence_ml2 = max(self.timing.confidence_ml2, round(confidence, 2))
+            updated = True
+
+        if not updated:
+            self.logger.info(
+                f"Thermal lag correlation inconclusive (correlation {result['correlation']:.2f}, "
+                f"{result['hours']:.0f}h of data)"
+            )
+            return None
+
+        self.timing.updated_at = datetime.now(timezone.utc).isoformat()
+        self.logger.info(
+            f"Thermal lag correlation: heat_up={self.timing.heat_up_lag_minutes_ml2:.0f}min, "
+            f"cool_down={self.timing.cool_down_lag_minutes_ml2:.0f}min "
+            f"(correlation {result['correlation']:.2f}, {result['hours']:.0f}h of data)"
+        )
+        return result
+
     def should_update_timing(self) -> bool:
         """Check if timing should be persisted (after significant updates)."""
         return self.timing.total_transitions > 0 and self.timing.total_transitions % 5 == 0
@@ -1015,7 +1310,7 @@ class WeatherSensitivityLearner:
             # Solar early warning is active - recommend reducing heat
             minutes_active = 0
             if self.observation_buffer:
-                latest = list(self.observation_buffer)[-1]
+                latest = self.observation_buffer[-1]
                 minutes_active = (latest.timestamp - self.early_warning_start).total_seconds() / 60
 
             # Only recommend if warning is fresh (< 30 min old)
@@ -1028,3 +1323,74 @@ class WeatherSensitivityLearner:
                 }
 
         return None
+
+
+def soak_weather_learner(days: int = 365, interval_minutes: int = 5, windows: int = 12) -> None:
+    """
+    Feed `days` of synthetic observations through process_observation() and
+    check that memory stays flat and per-call latency stays stable.
+
+    Memory (tracemalloc) and mean latency are sampled per window; after the
+    first window (buffers filling up) memory may not grow by more than
+    64 KB and no window may be more than 2x slower than the second.
+    """
+    import random
+    import time
+    import tracemalloc
+
+    rng = random.Random(7)
+    quiet = logging.getLogger('weather_learner_soak')
+    quiet.setLevel(logging.WARNING)
+    learner = WeatherSensitivityLearner(heat_loss_k=0.15, latitude=58.41, longitude=15.62, logger=quiet)
+
+    calls = days * 24 * 60 // interval_minutes
+    per_window = calls // windows
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    outdoor_base = 0.0
+    memory, latency = [], []
+
+    tracemalloc.start()
+    window_time = 0.0
+    for i in range(calls):
+        ts = start + timedelta(minutes=interval_minutes * i)
+        hour = ts.hour + ts.minute / 60
+        season = -8.0 * math.cos(2 * math.pi * ts.timetuple().tm_yday / 365)
+        outdoor_base += rng.gauss(0, 0.1) - 0.01 * outdoor_base
+        sunny = 10 <= hour <= 14 and rng.random() < 0.6
+        outdoor = season + outdoor_base + 3 * math.sin(math.pi * (hour - 8) / 12) + (5.0 if sunny else 0.0)
+        delta = 0.3 if sunny else 2.5
+        begin = time.perf_counter()
+        learner.process_observation(ts, 35.0, 35.0 - delta, 21.0 + rng.gauss(0, 0.2),
+                                    outdoor, 1.0 if sunny else 6.0, abs(rng.gauss(3, 1)))
+        window_time += time.perf_counter() - begin
+        if (i + 1) % per_window == 0:
+            memory.append(tracemalloc.get_traced_memory()[0])
+            latency.append(window_time / per_window * 1e6)
+            window_time = 0.0
+    tracemalloc.stop()
+
+    print(f"Weather learner soak: {calls} observations ({days} days at {interval_minutes} min)")
+    print(f"{'window':>6s} {'memory':>10s} {'µs/call':>9s}")
+    for n, (mem, lat) in enumerate(zip(memory, latency), 1):
+        print(f"{n:>6d} {mem / 1024:>7.1f} KB {lat:>9.1f}")
+    print(f"Detected {learner.coefficients.total_solar_events} solar events, "
+          f"{learner.timing.total_transitions} thermal transitions")
+
+    growth = max(memory[1:]) - memory[0]
+    assert growth < 64 * 1024, f"memory grew by {growth / 1024:.1f} KB after warm-up"
+    slowest = max(latency[1:])
+    assert slowest < 2 * latency[1], f"latency drifted: {latency[1]:.1f} -> {slowest:.1f} µs/call"
+    print(f"OK: memory growth {growth / 1024:.1f} KB, latency {min(latency[1:]):.1f}-{slowest:.1f} µs/call")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Weather sensitivity learner (ML2) utilities')
+    parser.add_argument('--soak', action='store_true',
+                        help='Feed a year of synthetic 5-minute observations and check memory/latency')
+    parser.add_argument('--days', type=int, default=365)
+    args = parser.parse_args()
+    if args.soak:
+        soak_weather_learner(days=args.days)
+    else:
+        parser.print_help()
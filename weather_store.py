@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Weather Store
+Station-keyed weather observations shared by every house/building.
+
+Observations used to be written once per house (weather_observation with a
+house_id tag), so N houses near the same SMHI station stored - and deduped
+against - N copies of one series. Now:
+
+    weather_station_observation   tag: station_id
+                                  fields: temperature, wind_speed, humidity,
+                                          station_name, source
+    weather_station_link          tag: house_id (or building_id)
+                                  fields: station_id, distance_km
+
+A house writes a link point when it starts using a station (or the station
+changes); the observation series itself is written once per station, and a
+rewrite of the same timestamp simply overwrites it.
+
+Readers go through read_entity_weather(), which resolves the entity's
+station(s) from the links and joins in the station series. Rows still in
+the legacy per-house measurement (before migrate_weather_to_stations.py has
+run) are merged in where the station series has no value.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from influxdb_client import Point, WritePrecision
+except ImportError:
+    Point = WritePrecision = None
+
+
+STATION_MEASUREMENT = "weather_station_observation"
+LINK_MEASUREMENT = "weather_station_link"
+LEGACY_MEASUREMENT = "weather_observation"
+LINK_LOOKBACK = "-400d"     # links are sparse; look back far enough to find the active one
+
+
+def _flux_time(value) -> str:
+    """Flux range() argument from a datetime or a relative duration like '-7d'."""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.isoformat()
+    return str(value)
+
+
+def _utc(ts: datetime) -> datetime:
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts
+
+
+def station_point(observation: Dict, source: str = None) -> 'Point':
+    """
+    Observation point for the shared station series.
+
+    Args:
+        observation: Dict with station_id, temperature, timestamp and optional
+            station_name, wind_speed, humidity
+        source: Optional origin (e.g. 'gap_fill', 'bootstrap'); stored as a
+            field so rewrites of the same timestamp stay one series
+    """
+    point = Point(STATION_MEASUREMENT) \
+        .tag("station_id", str(observation['station_id'])) \
+        .field("temperature", round(float(observation['temperature']), 2)) \
+        .field("station_name", observation.get('station_name') or 'unknown') \
+        .time(observation.get('timestamp') or datetime.now(timezone.utc), WritePrecision.S)
+
+    if observation.get('wind_speed') is not None:
+        point.field("wind_speed", round(float(observation['wind_speed']), 2))
+    if observation.get('humidity') is not None:
+        point.field("humidity", round(float(observation['humidity']), 2))
+    if source:
+        point.field("source", source)
+    return point
+
+
+def link_point(entity_id: str, station_id, distance_km: float = None,
+               timestamp: datetime = None, tag_key: str = "house_id") -> 'Point':
+    """Point recording that entity_id uses station_id from timestamp onwards."""
+    point = Point(LINK_MEASUREMENT) \
+        .tag(tag_key, entity_id) \
+        .field("station_id", str(station_id)) \
+        .time(timestamp or datetime.now(timezone.utc), WritePrecision.S)
+    if distance_km is not None:
+        point.field("distance_km", round(float(distance_km), 2))
+    return point
+
+
+def _query_links(query_api, bucket: str, org: str, entity_id: str, tag_key: str,
+                 start: str, selector: str = "") -> List[Tuple[datetime, str]]:
+    query = f'''
+        from(bucket: "{bucket}")
+        |> range(start: {start})
+        |> filter(fn: (r) => r["_measurement"] == "{LINK_MEASUREMENT}")
+        |> filter(fn: (r) => r["{tag_key}"] == "{entity_id}")
+        |> filter(fn: (r) => r["_field"] == "station_id")
+        {selector}
+        |> keep(columns: ["_time", "_value"])
+        |> sort(columns: ["_time"])
+    '''
+    links = []
+    for table in query_api.query(query, org=org):
+        for record in table.records:
+            if record.get_time() and record.get_value() is not None:
+                links.append((_utc(record.get_time()), str(record.get_value())))
+    return links
+
+
+def read_station_links(query_api, bucket: str, org: str, entity_id: str,
+                       tag_key: str = "house_id") -> List[Tuple[datetime, str]]:
+    """
+    Sorted (since, station_id) pairs for an entity.
+
+    Links within LINK_LOOKBACK are read; an entity whose only link is older
+    (station unchanged for longer than that) falls back to its last link
+    over all time.
+    """
+    links = _query_links(query_api, bucket, org, entity_id, tag_key, LINK_LOOKBACK)
+    if not links:
+        links = _query_links(query_api, bucket, org, entity_id, tag_key, "0", "|> last()")
+    links.sort()
+
+    # Collapse repeated links to the same station
+    collapsed = []
+    for since, station_id in links:
+        if not collapsed or collapsed[-1][1] != station_id:
+            collapsed.append((since, station_id))
+    return collapsed
+
+
+def current_station(query_api, bucket: str, org: str, entity_id: str,
+                    tag_key: str = "house_id") -> Optional[str]:
+    """Station the entity currently uses (None if it has no link yet)."""
+    links = read_station_links(query_api, bucket, org, entity_id, tag_key)
+    return links[-1][1] if links else None
+
+
+def _station_for(links: List[Tuple[datetime, str]], ts: datetime) -> Optional[str]:
+    """Station in effect at ts (the first link also covers earlier data)."""
+    station_id = links[0][1] if links else None
+    for since, sid in links:
+        if since <= ts:
+            station_id = sid
+        else:
+            break
+    return station_id
+
+
+def _read_rows(query_api, org: str, query: str) -> List[Dict]:
+    rows = []
+    for table in query_api.query(query, org=org):
+        for record in table.records:
+            ts = record.get_time()
+            if ts is None:
+                continue
+            values = record.values
+            rows.append({
+                'timestamp': _utc(ts),
+                'temperature': values.get('temperature'),
+                'wind_speed': values.get('wind_speed'),
+                'humidity': values.get('humidity'),
+                'station_id': values.get('station_id'),
+                'station_name': values.get('station_name'),
+            })
+    return rows
+
+
+def read_station_weather(query_api, bucket: str, org: str, station_ids: List[str],
+                         start, stop=None, fields: List[str] = None) -> List[Dict]:
+    """Pivoted observations for one or more stations, sorted by time."""
+    if not station_ids:
+        return []
+    stop_clause = f", stop: {_flux_time(stop)}" if stop is not None else ""
+    station_filter = ' or '.join(f'r["station_id"] == "{sid}"' for sid in station_ids)
+    field_filter = ''
+    if fields:
+        predicate = ' or '.join(f'r["_field"] == "{f}"' for f in fields)
+        field_filter = f'|> filter(fn: (r) => {predicate})'
+    query = f'''
+        from(bucket: "{bucket}")
+        |> range(start: {_flux_time(start)}{stop_clause})
+        |> filter(fn: (r) => r["_measurement"] == "{STATION_MEASUREMENT}")
+        |> filter(fn: (r) => {station_filter})
+        {field_filter}
+        |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")
+        |> sort(columns: ["_time"])
+    '''
+    rows = _read_rows(query_api, org, query)
+    rows.sort(key=lambda r: r['timestamp'])
+    return rows
+
+
+def read_entity_weather(query_api, bucket: str, org: str, entity_id: str,
+                        start, stop=None, tag_key: str = "house_id",
+                        fields: List[str] = None) -> List[Dict]:
+    """
+    Weather observations for an entity: its station series joined through the
+    link measurement, plus any legacy per-entity rows not yet migrated.
+
+    Args:
+        query_api: influxdb_client query API
+        bucket / org: Query target
+        entity_id: House or building id
+        start / stop: datetimes or Flux durations ('-7d'); stop defaults to now
+        tag_key: 'house_id' or 'building_id'
+        fields: Restrict to these fields (None = all)
+
+    Returns:
+        List of dicts (timestamp, temperature, wind_speed, humidity,
+        station_id, station_name) sorted by timestamp, one per timestamp
+    """
+    links = read_station_links(query_api, bucket, org, entity_id, tag_key)
+    by_time = {}
+    if links:
+        stations = sorted({sid for _, sid in links})
+        for row in read_station_weather(query_api, bucket, org, stations, start, stop, fields):
+            if _station_for(links, row['timestamp']) == row['station_id']:
+                by_time[row['timestamp']] = row
+
+    # Legacy per-entity copies (pre-migration) fill whatever the station series lacks
+    stop_clause = f", stop: {_flux_time(stop)}" if stop is not None else ""
+    field_filter = ''
+    if fields:
+        predicate = ' or '.join(f'r["_field"] == "{f}"' for f in fields)
+        field_filter = f'|> filter(fn: (r) => {predicate})'
+    legacy_query = f'''
+        from(bucket: "{bucket}")
+        |> range(start: {_flux_time(start)}{stop_clause})
+        |> filter(fn: (r) => r["_measurement"] == "{LEGACY_MEASUREMENT}")
+        |> filter(fn: (r) => r["{tag_key}"] == "{entity_id}")
+        {field_filter}
+        |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")
+    '''
+    for row in _read_rows(query_api, org, legacy_query):
+        by_time.setdefault(row['timestamp'], row)
+
+    return [by_time[ts] for ts in sorted(by_time)]
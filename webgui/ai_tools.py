@@ -214,24 +214,51 @@ def compare_periods(entity_id: str, period1_start: str, period1_end: str,
 
 
 def check_data_gaps(entity_id: str, days: int = 14, entity_type: str = 'house') -> dict:
-    """Find days with missing or sparse data."""
-    availability = get_data_availability(entity_id, days=days, entity_type=entity_type)
-    if 'error' in availability:
-        return availability
-
-    gaps = []
-    for day in availability.get('data', []):
-        count = day.get('count', 0)
-        if count == 0:
-            gaps.append({'date': day.get('date'), 'status': 'no_data', 'points': 0})
-        elif count < 200:  # Expect ~288 points/day at 5-min intervals
-            gaps.append({'date': day.get('date'), 'status': 'sparse', 'points': count})
+    """Find missing-data intervals (coverage index, else gap detection inside InfluxDB)."""
+    import sys
+    from datetime import timedelta
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+    from coverage_index import CoverageIndex
+    from gap_filler import find_gaps_flux
+
+    if entity_type == 'building':
+        config = _load_building(entity_id)
+        measurement, tag, fields = 'building_system', 'building_id', None
+        interval = config.get('poll_interval_minutes') or 5
+    else:
+        measurement, tag, fields = 'heating_system', 'house_id', ['room_temperature', 'outdoor_temperature']
+        interval = 5
+
+    end_time = datetime.now(timezone.utc)
+    start_time = end_time - timedelta(days=days)
+    index = CoverageIndex.load(entity_id, measurement)
+    if index.covers(start_time):
+        intervals = index.gaps(start_time, end_time, expected_interval_minutes=interval)
+    else:
+        influx = _get_influx()
+        if not influx.client:
+            return {'error': 'Cannot connect to InfluxDB.'}
+        try:
+            intervals = find_gaps_flux(
+                influx.client.query_api(), influx.bucket, influx.org, start_time, end_time,
+                measurement, tag, entity_id, fields, expected_interval_minutes=interval
+            )
+        except Exception as e:
+            return {'error': str(e)}
+
+    gaps = [{
+        'start': gap_start.astimezone(SWEDISH_TZ).strftime('%Y-%m-%d %H:%M'),
+        'end': gap_end.astimezone(SWEDISH_TZ).strftime('%Y-%m-%d %H:%M'),
+        'minutes': round((gap_end - gap_start).total_seconds() / 60),
+    } for gap_start, gap_end in intervals]
 
     return {
         'entity_id': entity_id,
         'days_checked': days,
+        'expected_interval_minutes': interval,
         'gaps_found': len(gaps),
-        'gaps': gaps,
+        'missing_hours': round(sum(g['minutes'] for g in gaps) / 60, 1),
+        'gaps': sorted(gaps, key=lambda g: g['minutes'], reverse=True)[:50],
     }
 
 
@@ -583,7 +610,7 @@ TOOL_DEFINITIONS = [
     },
     {
         'name': 'check_data_gaps',
-        'description': 'Find days with missing or sparse heating/sensor data.',
+        'description': 'Find time intervals with missing heating/sensor data (largest 50 gaps, Swedish time).',
         'input_schema': {
             'type': 'object',
             'properties': {
@@ -61,24 +61,14 @@ def inject_pending_count():
 
 def get_houses_with_names():
     """Get all houses with their friendly names"""
-    from customer_profile import CustomerProfile
-    profiles_dir = os.path.join(os.path.dirname(__file__), '..', 'profiles')
-    houses = []
-
-    if os.path.exists(profiles_dir):
-        for filename in os.listdir(profiles_dir):
-            if filename.endswith('.json') and '_signals.json' not in filename:
-                house_id = filename[:-5]
-                try:
-                    profile = CustomerProfile.load(house_id, profiles_dir)
-                    houses.append({
-                        'id': house_id,
-                        'friendly_name': profile.friendly_name or house_id
-                    })
-                except Exception:
-                    houses.append({'id': house_id, 'friendly_name': house_id})
-
-    return houses
+    from config_registry import get_config_registry
+    root = os.path.join(os.path.dirname(__file__), '..')
+    registry = get_config_registry(os.path.join(root, 'profiles'), os.path.join(root, 'buildings'))
+
+    return [
+        {'id': entry.entity_id, 'friendly_name': entry.friendly_name}
+        for entry in registry.entries('house')
+    ]
 
 
 # =============================================================================
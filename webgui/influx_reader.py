@@ -13,6 +13,9 @@ from influxdb_client import InfluxDBClient
 # Swedish timezone
 SWEDISH_TZ = ZoneInfo('Europe/Stockholm')
 
+# Fleet energy forecast totals older than this are ignored (fleet job stopped)
+FLEET_FORECAST_MAX_AGE_MINUTES = int(os.environ.get('FLEET_FORECAST_MAX_AGE_MINUTES', '180'))
+
 
 class InfluxReader:
     """Reads heating system data from InfluxDB"""
@@ -123,28 +126,17 @@ class InfluxReader:
             return None
 
         try:
-            query_api = self.client.query_api()
-
-            query = f'''
-                from(bucket: "{self.bucket}")
-                |> range(start: -2h)
-                |> filter(fn: (r) => r["_measurement"] == "weather_observation")
-                |> filter(fn: (r) => r["house_id"] == "{house_id}")
-                |> last()
-            '''
+            import sys
+            sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+            from weather_store import read_entity_weather
 
-            tables = query_api.query(query, org=self.org)
-
-            if not tables:
+            rows = read_entity_weather(self.client.query_api(), self.bucket, self.org,
+                                       house_id, '-2h')
+            if not rows:
                 return None
 
-            data = {}
-            for table in tables:
-                for record in table.records:
-                    field = record.get_field()
-                    value = record.get_value()
-                    data[field] = value
-
+            data = {key: value for key, value in rows[-1].items()
+                    if key != 'timestamp' and value is not None}
             return data if data else None
 
         except Exception as e:
@@ -213,7 +205,7 @@ class InfluxReader:
         # Define measurements to query
         measurements = [
             ('heating_system', 'Heating Data', 'measured'),
-            ('weather_observation', 'Weather Obs', 'measured'),
+            ('weather_station_observation', 'Weather Obs', 'measured'),
             ('weather_forecast', 'Weather Forecast', 'predicted'),
             ('temperature_forecast', 'Temp Predictions', 'predicted'),
             ('heating_control', 'ML Control', 'measured'),
@@ -226,6 +218,19 @@ class InfluxReader:
 
         for measurement, display_name, data_type in measurements:
             try:
+                if measurement == 'weather_station_observation':
+                    # Shared station series, reached through the house's station link
+                    daily_data = self._weather_daily_counts(house_id, days)
+                    if any(daily_data.values()):
+                        categories.append({
+                            'name': display_name,
+                            'measurement': measurement,
+                            'type': data_type,
+                            'data': [{'date': date, 'count': count}
+                                     for date, count in sorted(daily_data.items())]
+                        })
+                    continue
+
                 # Query daily counts for this measurement
                 query = f'''
                     from(bucket: "{self.bucket}")
@@ -290,6 +295,22 @@ class InfluxReader:
             'date_range': date_range
         }
 
+    def _weather_daily_counts(self, house_id: str, days: int) -> Dict[str, int]:
+        """Weather observations per day (YYYY-MM-DD, UTC) for a house, zero-filled."""
+        import sys
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+        from weather_store import read_entity_weather
+
+        today = datetime.now(timezone.utc).date()
+        daily_data = {(today - timedelta(days=offset)).isoformat(): 0
+                      for offset in range(days + 1)}
+        rows = read_entity_weather(self.client.query_api(), self.bucket, self.org,
+                                   house_id, f'-{days}d', fields=['temperature'])
+        for row in rows:
+            date_str = row['timestamp'].strftime('%Y-%m-%d')
+            daily_data[date_str] = daily_data.get(date_str, 0) + 1
+        return daily_data
+
     def get_cloud_cover_history(self, house_id: str, hours: int = 168) -> dict:
         """
         Get cloud cover data from weather_forecast measurement.
@@ -350,55 +371,37 @@ class InfluxReader:
             # Get cloud cover data first (from weather_forecast)
             cloud_data = self.get_cloud_cover_history(house_id, hours)
 
-            # Query weather observations
-            query = f'''
-                from(bucket: "{self.bucket}")
-                |> range(start: -{hours}h)
-                |> filter(fn: (r) => r["_measurement"] == "weather_observation")
-                |> filter(fn: (r) => r["house_id"] == "{house_id}")
-                |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")
-                |> sort(columns: ["_time"])
-            '''
+            # Station weather joined via the house's link (plus unmigrated legacy rows)
+            import sys
+            sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+            from weather_store import read_entity_weather
 
-            tables = query_api.query(query, org=self.org)
+            rows = read_entity_weather(query_api, self.bucket, self.org, house_id, f'-{hours}h')
 
             results = []
             last_cloud_cover = 4.0  # Default: partly cloudy
 
-            for table in tables:
-                for record in table.records:
-                    timestamp = record.get_time()
-                    if timestamp:
-                        # Convert to Swedish timezone for display
-                        if timestamp.tzinfo is None:
-                            timestamp = timestamp.replace(tzinfo=timezone.utc)
-                        swedish_time = timestamp.astimezone(SWEDISH_TZ)
+            for row in rows:
+                timestamp = row['timestamp']
+                # Convert to Swedish timezone for display
+                swedish_time = timestamp.astimezone(SWEDISH_TZ)
 
-                        # Find cloud cover for this hour
-                        hour_key = timestamp.replace(minute=0, second=0, microsecond=0).isoformat()
-                        cloud_cover = cloud_data.get(hour_key, last_cloud_cover)
-                        if hour_key in cloud_data:
-                            last_cloud_cover = cloud_cover
+                # Find cloud cover for this hour
+                hour_key = timestamp.replace(minute=0, second=0, microsecond=0).isoformat()
+                cloud_cover = cloud_data.get(hour_key, last_cloud_cover)
+                if hour_key in cloud_data:
+                    last_cloud_cover = cloud_cover
 
-                        results.append({
-                            'timestamp': timestamp.isoformat(),
-                            'timestamp_swedish': swedish_time.strftime('%Y-%m-%d %H:%M'),
-                            'temperature': record.values.get('temperature'),
-                            'wind_speed': record.values.get('wind_speed', 0),
-                            'humidity': record.values.get('humidity', 50),
-                            'cloud_cover': cloud_cover,
-                        })
+                results.append({
+                    'timestamp': timestamp.isoformat(),
+                    'timestamp_swedish': swedish_time.strftime('%Y-%m-%d %H:%M'),
+                    'temperature': row['temperature'],
+                    'wind_speed': row['wind_speed'] if row['wind_speed'] is not None else 0,
+                    'humidity': row['humidity'] if row['humidity'] is not None else 50,
+                    'cloud_cover': cloud_cover,
+                })
 
-            # Sort by timestamp and deduplicate (pivot may return multiple tables
-            # when records have different tag sets, e.g. with/without 'source' tag)
-            results.sort(key=lambda x: x['timestamp'])
-            seen = set()
-            deduped = []
-            for r in results:
-                if r['timestamp'] not in seen:
-                    seen.add(r['timestamp'])
-                    deduped.append(r)
-            return deduped
+            return results
 
         except Exception as e:
             print(f"Failed to query weather history: {e}")
@@ -2092,7 +2095,9 @@ class InfluxReader:
     def get_energy_forecast_all(self, hours: int = 24) -> dict:
         """
         Get aggregated energy forecast across ALL houses.
-        Sums hourly predictions by timestamp.
+        Uses the fleet totals (energy_forecast_fleet) of the latest fleet
+        run if it is less than FLEET_FORECAST_MAX_AGE_MINUTES old, otherwise
+        sums hourly predictions by timestamp.
         """
         self._ensure_connection()
         if not self.client:
@@ -2101,6 +2106,44 @@ class InfluxReader:
         try:
             query_api = self.client.query_api()
 
+            # Aggregate by hour across all houses
+            hour_data = {}  # iso_timestamp -> {energy, power, outdoor_temps, house_ids}
+
+            fleet_query = f'''
+                from(bucket: "{self.bucket}")
+                |> range(start: now(), stop: {hours}h)
+                |> filter(fn: (r) => r["_measurement"] == "energy_forecast_fleet")
+                |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
+                |> sort(columns: ["_time"])
+            '''
+
+            fleet_records = [record
+                             for table in query_api.query(fleet_query, org=self.org)
+                             for record in table.records
+                             if record.get_time() and record.values.get('generated_at')]
+            latest_run = max((int(r.values['generated_at']) for r in fleet_records), default=None)
+            max_age = FLEET_FORECAST_MAX_AGE_MINUTES * 60
+            if latest_run is not None and datetime.now(timezone.utc).timestamp() - latest_run > max_age:
+                latest_run = None   # fleet job no longer running, per-house rows are newer
+
+            for record in fleet_records:
+                if latest_run is None or int(record.values['generated_at']) != latest_run:
+                    continue
+                timestamp = record.get_time()
+                if timestamp.tzinfo is None:
+                    timestamp = timestamp.replace(tzinfo=timezone.utc)
+                hour_key = timestamp.replace(minute=0, second=0, microsecond=0)
+                outdoor = record.values.get('outdoor_temp')
+                hour_data[hour_key.isoformat()] = {
+                    'timestamp': hour_key,
+                    'energy': record.values.get('heating_energy_kwh', 0) or 0,
+                    'power': record.values.get('heating_power_kw', 0) or 0,
+                    'outdoor_temps': [outdoor] if outdoor is not None else [],
+                    'house_ids': set(),
+                    'house_count': int(record.values.get('house_count', 0) or 0),
+                    'lead_time_hours': record.values.get('lead_time_hours'),
+                }
+
             query = f'''
                 from(bucket: "{self.bucket}")
                 |> range(start: now(), stop: {hours}h)
@@ -2109,10 +2152,7 @@ class InfluxReader:
                 |> sort(columns: ["_time"])
             '''
 
-            tables = query_api.query(query, org=self.org)
-
-            # Aggregate by hour across all houses
-            hour_data = {}  # iso_timestamp -> {energy, power, outdoor_temps, house_ids}
+            tables = query_api.query(query, org=self.org) if not hour_data else []
 
             for table in tables:
                 for record in table.records:
@@ -2173,8 +2213,8 @@ class InfluxReader:
                     'effective_temp': None,
                     'solar_effect': None,
                     'wind_effect': None,
-                    'lead_time_hours': None,
-                    'house_count': len(d['house_ids']),
+                    'lead_time_hours': d.get('lead_time_hours'),
+                    'house_count': d.get('house_count', len(d['house_ids'])),
                 })
 
                 total_energy += d['energy']
@@ -2516,6 +2556,12 @@ class InfluxReader:
                             'solar_effect': record.values.get('solar_effect'),
                             'wind_effect': record.values.get('wind_effect'),
                             'lead_time_hours': round(lead_time, 1),
+                            # Ensemble bands (None for forecasts without scenarios)
+                            'heating_energy_kwh_p10': record.values.get('heating_energy_kwh_p10'),
+                            'heating_energy_kwh_p90': record.values.get('heating_energy_kwh_p90'),
+                            'effective_temp_p10': record.values.get('effective_temp_p10'),
+                            'effective_temp_p90': record.values.get('effective_temp_p90'),
+                            'free_heat_probability': record.values.get('free_heat_probability'),
                         })
 
                         total_energy += energy_kwh
@@ -2621,6 +2667,7 @@ class InfluxReader:
         measurements = [
             ('building_system', 'Building Data', 'measured', 'building_id'),
             ('building_alarms', 'Alarms', 'measured', 'building_id'),
+            ('building_alarm_events', 'Alarm Events', 'measured', 'building_id'),
             ('energy_meter', 'Energy Data', 'measured', 'building_id'),
         ]
 
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Zygote — preloaded fork server for fetcher subprocesses.
+
+Starting every fetcher with a fresh `python HSF_Fetcher.py` pays interpreter
+start-up plus importing influxdb_client, requests, astral, pytz, the energy
+models, … for each child and on every crash restart, and each child ends up
+with its own private copy of those modules.
+
+The zygote imports the fetcher modules once and then forks a child per spawn
+request. Children start with everything already imported and share the
+preloaded code/data pages copy-on-write with the zygote and each other.
+
+Protocol (JSON lines over a socketpair created by the orchestrator):
+    orchestrator → zygote   {"id": 1, "argv": ["HSF_Fetcher.py"], "env": {...}, "cwd": "/app"}
+    zygote → orchestrator   {"op": "ready", "preload_seconds": 1.9, "pid": 7}
+                            {"op": "spawned", "id": 1, "pid": 42}
+                            {"op": "exit", "pid": 42, "returncode": 1}
+
+The forked child sets its environment/argv from the request and calls the
+target module's main() (argv[0] "HSF_Fetcher.py" → HSF_Fetcher.main()).
+
+Orchestrator usage:
+    zygote = Zygote()
+    zygote.start()
+    proc = zygote.spawn(["HSF_Fetcher.py"], env)   # Popen-like: poll/terminate/kill/wait
+
+Measure start latency and memory (cold exec vs zygote fork):
+    python zygote.py --bench 5
+"""
+
+import gc
+import importlib
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+
+PRELOAD_MODULES = ['HSF_Fetcher', 'building_fetcher']
+START_TIMEOUT = 120.0     # seconds to wait for the zygote to finish preloading
+SPAWN_TIMEOUT = 10.0      # seconds to wait for a fork acknowledgement
+REAP_INTERVAL = 0.5       # seconds between waitpid sweeps in the zygote
+SHUTDOWN_TIMEOUT = 10.0   # seconds children get after SIGTERM before SIGKILL
+
+
+def log(msg: str) -> None:
+    ts = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    print(f"{ts} [zygote] {msg}", flush=True)
+
+
+class ZygoteError(Exception):
+    """The zygote could not be started or did not acknowledge a spawn."""
+
+
+# ---------------------------------------------------------------------------
+#  Zygote process (server side)
+# ---------------------------------------------------------------------------
+def preload(modules: List[str] = None) -> float:
+    """Import the fetcher modules; returns seconds spent."""
+    start = time.perf_counter()
+    for name in modules or PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            # Children that need it will import (and fail) on their own
+            log(f"Preload of {name} failed: {e}")
+    # Keep the GC from touching (and thereby un-sharing) preloaded objects
+    gc.collect()
+    gc.freeze()
+    return time.perf_counter() - start
+
+
+def _send(sock: socket.socket, message: dict) -> None:
+    sock.sendall(json.dumps(message).encode() + b'\n')
+
+
+def serve(sock: socket.socket) -> Optional[dict]:
+    """
+    Zygote main loop: fork a child for every request until the orchestrator
+    disconnects or SIGTERM arrives.
+
+    Returns:
+        The spawn request in the forked child (caller runs it), None in the
+        zygote itself when it is time to exit
+    """
+    stopping = False
+
+    def handle_signal(signum, _frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)   # Ctrl-C is handled by the orchestrator
+
+    preload_seconds = preload()
+    log(f"Preloaded {', '.join(PRELOAD_MODULES)} in {preload_seconds:.2f}s")
+    _send(sock, {'op': 'ready', 'preload_seconds': round(preload_seconds, 3), 'pid': os.getpid()})
+
+    children: set = set()
+    buffer = b''
+    sock.settimeout(REAP_INTERVAL)
+
+    while not stopping:
+        _reap(sock, children)
+        try:
+            data = sock.recv(65536)
+        except socket.timeout:
+            continue
+        except OSError:
+            break
+        if not data:
+            break  # Orchestrator went away
+        buffer += data
+        while b'\n' in buffer:
+            line, buffer = buffer.split(b'\n', 1)
+            request = json.loads(line)
+            pid = os.fork()
+            if pid == 0:
+                sock.close()
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                return request
+            children.add(pid)
+            _send(sock, {'op': 'spawned', 'id': request['id'], 'pid': pid})
+
+    _shutdown_children(children)
+    return None
+
+
+def _reap(sock: socket.socket, children: set) -> None:
+    """Collect exited children and report their return codes."""
+    while children:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            children.clear()
+            return
+        if pid == 0:
+            return
+        children.discard(pid)
+        try:
+            _send(sock, {'op': 'exit', 'pid': pid, 'returncode': os.waitstatus_to_exitcode(status)})
+        except OSError:
+            pass
+
+
+def _shutdown_children(children: set) -> None:
+    """SIGTERM remaining children, SIGKILL stragglers."""
+    for pid in children:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    deadline = time.monotonic() + SHUTDOWN_TIMEOUT
+    while children and time.monotonic() < deadline:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid:
+            children.discard(pid)
+        else:
+            time.sleep(0.1)
+    for pid in children:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+def run_child(request: dict) -> None:
+    """Runs in the forked child: become the requested fetcher."""
+    os.environ.clear()
+    os.environ.update(request['env'])
+    if request.get('cwd'):
+        os.chdir(request['cwd'])
+    sys.argv = list(request['argv'])
+    random.seed()   # Don't share the zygote's PRNG state between children
+
+    module_name = os.path.splitext(os.path.basename(sys.argv[0]))[0]
+    module = importlib.import_module(module_name)
+    module.main()
+
+
+# ---------------------------------------------------------------------------
+#  Orchestrator side (client)
+# ---------------------------------------------------------------------------
+class ZygoteProcess:
+    """Popen-like handle for a child forked by the zygote."""
+
+    def __init__(self, zygote: 'Zygote', pid: int, args: List[str]):
+        self._zygote = zygote
+        self.pid = pid
+        self.args = args
+        self.returncode: Optional[int] = None
+
+    def poll(self) -> Optional[int]:
+        if self.returncode is None and not self._zygote.alive():
+            # Orphaned by a dead zygote: reap it ourselves if we became its
+            # parent (PID 1 in the container), otherwise check it still exists
+            try:
+                pid, status = os.waitpid(self.pid, os.WNOHANG)
+                if pid:
+                    self.returncode = os.waitstatus_to_exitcode(status)
+            except ChildProcessError:
+                try:
+                    os.kill(self.pid, 0)
+                except ProcessLookupError:
+                    self.returncode = -1
+                except PermissionError:
+                    pass
+        return self.returncode
+
+    def wait(self, timeout: float = None) -> int:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.poll() is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise subprocess.TimeoutExpired(self.args, timeout)
+            time.sleep(0.05)
+        return self.returncode
+
+    def send_signal(self, sig: int) -> None:
+        if self.returncode is None:
+            try:
+                os.kill(self.pid, sig)
+            except ProcessLookupError:
+                pass
+
+    def terminate(self) -> None:
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self) -> None:
+        self.send_signal(signal.SIGKILL)
+
+
+class Zygote:
+    """Starts the zygote process and forwards spawn requests to it."""
+
+    def __init__(self, script: str = None):
+        self.script = script or os.path.abspath(__file__)
+        self.process: Optional[subprocess.Popen] = None
+        self.preload_seconds: Optional[float] = None
+        self._sock: Optional[socket.socket] = None
+        self._send_lock = threading.Lock()
+        self._next_id = 0
+        self._pending: Dict[int, dict] = {}
+        self._children: Dict[int, ZygoteProcess] = {}
+        self._exited: Dict[int, int] = {}   # exit reports that beat the spawn ack
+        self._ready = threading.Event()
+        self._reader: Optional[threading.Thread] = None
+
+    def start(self, timeout: float = START_TIMEOUT) -> None:
+        """Launch the zygote and wait until it has preloaded the fetcher modules."""
+        parent_sock, child_sock = socket.socketpair()
+        fd = child_sock.fileno()
+        self.process = subprocess.Popen(
+            [sys.executable, '-u', self.script, '--serve', str(fd)],
+            pass_fds=(fd,),
+        )
+        child_sock.close()
+        self._sock = parent_sock
+        self._ready.clear()
+        self._reader = threading.Thread(target=self._read_loop, name='zygote-reader', daemon=True)
+        self._reader.start()
+        if not self._ready.wait(timeout) or not self.alive():
+            self.stop()
+            raise ZygoteError(f"zygote did not become ready within {timeout:.0f}s")
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def spawn(self, argv: List[str], env: dict, cwd: str = None,
+              timeout: float = SPAWN_TIMEOUT) -> ZygoteProcess:
+        """Fork a child running argv[0]'s main() with *env*; returns a Popen-like handle."""
+        if not self.alive():
+            raise ZygoteError("zygote is not running")
+        with self._send_lock:
+            self._next_id += 1
+            request_id = self._next_id
+            pending = {'event': threading.Event(), 'pid': None}
+            self._pending[request_id] = pending
+            try:
+                _send(self._sock, {'id': request_id, 'argv': argv, 'env': env,
+                                   'cwd': cwd or os.getcwd()})
+            except OSError as e:
+                self._pending.pop(request_id, None)
+                raise ZygoteError(f"zygote connection lost: {e}") from e
+        if not pending['event'].wait(timeout) or pending['pid'] is None:
+            self._pending.pop(request_id, None)
+            raise ZygoteError("zygote did not acknowledge spawn")
+        pid = pending['pid']
+        proc = ZygoteProcess(self, pid, argv)
+        self._children[pid] = proc
+        if pid in self._exited:
+            proc.returncode = self._exited.pop(pid)
+        return proc
+
+    def stop(self, timeout: float = SHUTDOWN_TIMEOUT + 5) -> None:
+        """Stop the zygote (it terminates any children still running)."""
+        if self.process is None:
+            return
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait(timeout=5)
+        if self._sock:
+            self._sock.close()
+            self._sock = None
+
+    def _read_loop(self) -> None:
+        sock = self._sock
+        buffer = b''
+        while True:
+            try:
+                data = sock.recv(65536)
+            except OSError:
+                break
+            if not data:
+                break
+            buffer += data
+            while b'\n' in buffer:
+                line, buffer = buffer.split(b'\n', 1)
+                self._handle(json.loads(line))
+        # Zygote gone: release anyone waiting on an acknowledgement
+        for pending in list(self._pending.values()):
+            pending['event'].set()
+        self._ready.set()
+
+    def _handle(self, message: dict) -> None:
+        op = message.get('op')
+        if op == 'ready':
+            self.preload_seconds = message.get('preload_seconds')
+            self._ready.set()
+        elif op == 'spawned':
+            pending = self._pending.pop(message['id'], None)
+            if pending:
+                pending['pid'] = message['pid']
+                pending['event'].set()
+        elif op == 'exit':
+            proc = self._children.pop(message['pid'], None)
+            if proc:
+                proc.returncode = message['returncode']
+            else:
+                self._exited[message['pid']] = message['returncode']
+
+
+# ---------------------------------------------------------------------------
+#  Benchmark: cold exec vs zygote fork
+# ---------------------------------------------------------------------------
+def process_memory_kb(pid: int) -> Dict[str, int]:
+    """Rss/Pss (kB) from /proc/<pid>/smaps_rollup (Linux only)."""
+    result = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in ('Rss', 'Pss'):
+                    result[key] = int(value.split()[0])
+    except OSError:
+        pass
+    return result
+
+
+def _wait_for_file(path: str, timeout: float = START_TIMEOUT) -> bool:
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+def probe() -> None:
+    """Benchmark child: signal readiness via ZYGOTE_PROBE_FILE, then idle until killed."""
+    with open(os.environ['ZYGOTE_PROBE_FILE'], 'w') as f:
+        f.write(str(os.getpid()))
+    time.sleep(3600)
+
+
+def benchmark(count: int) -> None:
+    """Compare start latency and memory of `count` cold-started vs forked children."""
+    import tempfile
+
+    def measure(start_child, label):
+        procs, latencies, memory = [], [], []
+        for i in range(count):
+            path = os.path.join(tmpdir, f'{label}_{i}')
+            env = dict(os.environ, ZYGOTE_PROBE_FILE=path)
+            t0 = time.perf_counter()
+            proc = start_child(env)
+            if not _wait_for_file(path):
+                raise ZygoteError(f"{label} child {i} never became ready")
+            latencies.append(time.perf_counter() - t0)
+            procs.append(proc)
+        time.sleep(0.5)
+        for proc in procs:
+            memory.append(process_memory_kb(proc.pid))
+        for proc in procs:
+            proc.kill()
+            proc.wait(timeout=5)
+        rss = [m.get('Rss', 0) for m in memory]
+        pss = [m.get('Pss', 0) for m in memory]
+        print(f"{label:>6}: start {sum(latencies) / count * 1000:8.1f} ms avg "
+              f"(max {max(latencies) * 1000:.1f}) | "
+              f"RSS {sum(rss) / count / 1024:6.1f} MB avg | "
+              f"PSS {sum(pss) / count / 1024:6.1f} MB avg, {sum(pss) / 1024:6.1f} MB total")
+
+    script = os.path.abspath(__file__)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        print(f"Starting {count} children each way (preloading {', '.join(PRELOAD_MODULES)})")
+        measure(lambda env: subprocess.Popen([sys.executable, '-u', script, '--probe', '--preload'],
+                                             env=env), 'cold')
+        zygote = Zygote(script)
+        zygote.start()
+        print(f"zygote: preloaded in {zygote.preload_seconds:.2f}s "
+              f"(RSS {process_memory_kb(zygote.process.pid).get('Rss', 0) / 1024:.1f} MB)")
+        try:
+            measure(lambda env: zygote.spawn([script, '--probe'], env), 'zygote')
+        finally:
+            zygote.stop()
+
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ['--serve']:
+        sock = socket.socket(fileno=int(args[1]))
+        request = serve(sock)
+        if request is not None:
+            run_child(request)
+    elif args[:1] == ['--probe']:
+        if '--preload' in args:
+            preload()
+        probe()
+    elif args[:1] == ['--bench']:
+        benchmark(int(args[1]) if len(args) > 1 else 5)
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()